@@ -4,15 +4,22 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from flask_mail import Mail
-from flask_migrate import Migrate
 from config import Config
+from app.utils.json_provider import AppJSONProvider
+from app.utils.structured_logging import configure_logging, init_request_logging
+from app.utils.tracing import init_tracing
+import logging
 import os
 
 # Initialize extensions outside create_app function
 db = SQLAlchemy()
 jwt = JWTManager()
-migrate = Migrate()
 mail = Mail()
+# Flask-Migrate (and with it Alembic) is only loaded for ``flask`` commands;
+# see init_migrate
+migrate = None
+
+logger = logging.getLogger(__name__)
 
 def auto_seed_demo():
     """Auto-seed demo accounts if DEMO_MODE is enabled and no users exist"""
@@ -26,44 +33,75 @@ def auto_seed_demo():
     # Check if users already exist
     user_count = User.query.count()
     if user_count > 0:
-        print(f"Demo mode: {user_count} users already exist, skipping seed")
+        logger.info("Demo mode: %s users already exist, skipping seed", user_count)
         return
 
     # Seed demo accounts
-    print("Demo mode enabled: Seeding demo accounts...")
+    logger.info("Demo mode enabled: Seeding demo accounts...")
     try:
         from seed_demo_accounts import seed_demo_accounts
         count = seed_demo_accounts(silent=False)
-        print(f"Demo mode: Created {count} demo accounts")
-    except Exception as e:
-        print(f"Demo mode: Failed to seed accounts - {str(e)}")
+        logger.info("Demo mode: Created %s demo accounts", count)
+    except Exception:
+        logger.exception("Demo mode: Failed to seed accounts")
+
+def init_migrate(app):
+    """
+    Attach Flask-Migrate when the app is being built by the ``flask`` CLI,
+    where ``flask db`` needs it. Web workers never run migrations, so they
+    skip importing Alembic, the largest single cost of booting a worker.
+    """
+    global migrate
+    import click
+    if click.get_current_context(silent=True) is None:
+        return
+    from flask_migrate import Migrate
+    if migrate is None:
+        migrate = Migrate()
+    migrate.init_app(app, db)
+
+def _safe_url(url):
+    """A database URL with the password masked, for logs"""
+    from sqlalchemy.engine import make_url
+    try:
+        return make_url(url).render_as_string(hide_password=True)
+    except Exception:
+        return '<unparseable database URL>'
 
 def create_app(config_class=Config):
     
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.json = AppJSONProvider(app)
+    configure_logging(app)
     
     # Explicitly check and set SQLALCHEMY_DATABASE_URI from environment
     if os.environ.get('SQLALCHEMY_DATABASE_URI'):
         app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('SQLALCHEMY_DATABASE_URI')
-        print(f"Using DB URI from env: {app.config['SQLALCHEMY_DATABASE_URI']}")
+        logger.info("Using DB URI from env: %s", _safe_url(app.config['SQLALCHEMY_DATABASE_URI']))
     elif not app.config.get('SQLALCHEMY_DATABASE_URI'):
         # Fallback to a default if neither config nor env provides it
         app.config['SQLALCHEMY_DATABASE_URI'] = 'postgresql://propertypal:propertypal@db:5432/propertypal'
-        print(f"Using default DB URI: {app.config['SQLALCHEMY_DATABASE_URI']}")
+        logger.info("Using default DB URI: %s", _safe_url(app.config['SQLALCHEMY_DATABASE_URI']))
     
     if os.environ.get('UPLOAD_FOLDER'):
         app.config['UPLOAD_FOLDER'] = os.environ.get('UPLOAD_FOLDER')
-        print(f"Using upload folder from env: {app.config['UPLOAD_FOLDER']}")
+        logger.info("Using upload folder from env: %s", app.config['UPLOAD_FOLDER'])
     elif not app.config.get('UPLOAD_FOLDER'):
         app.config['UPLOAD_FOLDER'] = os.path.join(app.root_path, 'uploads')
-        print(f"Using default upload folder: {app.config['UPLOAD_FOLDER']}")
+        logger.info("Using default upload folder: %s", app.config['UPLOAD_FOLDER'])
         
     app.url_map.strict_slashes = False
     # Initialize extensions with app
     db.init_app(app)
     jwt.init_app(app)
-    migrate.init_app(app, db)
+    init_migrate(app)
+
+    # Request ids and the per-request access log (sampled for /uploads/)
+    init_request_logging(app)
+
+    # OpenTelemetry spans for requests and SQL, when TRACING_ENABLED
+    init_tracing(app)
     
     # Correct CORS configuration - don't use both CORS(app) and @app.after_request
     '''CORS(app, resources={r"/api/*": {
@@ -76,7 +114,7 @@ def create_app(config_class=Config):
     allowed_origins = os.environ.get('CORS_ALLOWED_ORIGINS', 
                                'http://localhost:3000,http://127.0.0.1:3000,http://localhost:3002,http://frontend:3000')
     origins = allowed_origins.split(',')
-    print(f"CORS allowing origins: {origins}")
+    logger.info("CORS allowing origins: %s", origins)
     CORS(app, resources={r"/*": {
     "origins": origins,
     "supports_credentials": True,
@@ -86,36 +124,54 @@ def create_app(config_class=Config):
     }})
     mail.init_app(app)
 
-    # Create upload directories - use the configured upload folder
-    upload_documents_path = os.path.join(app.config['UPLOAD_FOLDER'], 'documents')
-    upload_photos_path = os.path.join(app.config['UPLOAD_FOLDER'], 'documents/photos')
-    
-    os.makedirs(upload_documents_path, exist_ok=True)
-    os.makedirs(upload_photos_path, exist_ok=True)
+    # Local disk or an S3-compatible bucket, per STORAGE_BACKEND. The upload
+    # folders are made by `flask bootstrap` (and on demand by local saves)
+    from app.services.file_service import file_storage
+    file_storage.init_app(app)
     
     @app.route('/uploads/<path:filename>')
     def serve_uploads(filename):
-        # Make sure we're using the absolute path for UPLOAD_FOLDER
-        upload_folder = app.config['UPLOAD_FOLDER']
-        if not os.path.isabs(upload_folder):
-            upload_folder = os.path.join(app.root_path, upload_folder)
-            
-        full_path = os.path.join(upload_folder, filename)
-        print(f"Requested file: {filename}")
-        print(f"Full path: {full_path}")
-        print(f"File exists: {os.path.exists(full_path)}")
-        
-        if not os.path.exists(full_path):
+        path = file_storage.local.path(filename)
+        if path is None:
             return "File not found", 404
-            
-        # Extract the directory from the full path
-        directory = os.path.dirname(full_path)
-        # Extract just the filename part
-        basename = os.path.basename(full_path)
-        
-        return send_from_directory(directory, basename)
+        if os.path.exists(path):
+            return send_from_directory(file_storage.local.root, filename)
+
+        # Stored in a bucket: send the client straight there
+        response = file_storage.serve_upload(filename)
+        if response is None:
+            return "File not found", 404
+        return response
    
 
+    # Keep the unified search index current on every flush
+    from app.services import search_index  # noqa: F401
+
+    # ...expiry alerts and change notifications in step with edited records
+    from app.services import notification_service  # noqa: F401
+
+    # ...and the outbox feeding webhooks and the event stream
+    from app.services import outbox_service  # noqa: F401
+
+    # ...and tombstones for delta sync
+    from app.services import sync_service  # noqa: F401
+
+    # Cache list and report responses until the models behind them change
+    from app.services.response_cache import response_cache
+    response_cache.init_app(app)
+
+    # Token-bucket limits for the auth and API-key endpoints
+    from app.services.rate_limiter import rate_limiter
+    rate_limiter.init_app(app)
+
+    # On-demand request profiles for admins, when PROFILING_ENABLED
+    from app.services.profiler import request_profiler
+    request_profiler.init_app(app)
+
+    # Register custom flask CLI commands
+    from app.cli import register_commands
+    register_commands(app)
+
     @app.route('/health', methods=['GET'])
     def health_check():
         """Health check endpoint for container orchestration"""
@@ -123,39 +179,15 @@ def create_app(config_class=Config):
 
 
 
-    # Register blueprints for API routes - PropertyPal Core (Single property, multi-user)
-    from app.api.auth import auth_bp
-    from app.api.properties import properties_bp
-    from app.api.documents import documents_bp
-    from app.api.maintenance import maintenance_bp
-    from app.api.maintenance_checklist import checklist_bp
-    from app.api.appliances import appliances_bp
-    from app.api.projects import projects_bp
-    from app.api.property_photos import property_photos_bp
-    from app.api.finances import finances_bp
-    from app.api.users import users_bp
-    from app.api.settings import settings_bp
-    from app.api.integrations import integrations_bp
-
-    app.register_blueprint(auth_bp, url_prefix='/api/auth')
-    app.register_blueprint(properties_bp, url_prefix='/api/properties')
-    app.register_blueprint(documents_bp, url_prefix='/api/documents')
-    app.register_blueprint(maintenance_bp, url_prefix='/api/maintenance')
-    app.register_blueprint(checklist_bp)
-    app.register_blueprint(appliances_bp, url_prefix='/api/appliances')
-    app.register_blueprint(projects_bp, url_prefix='/api/projects')
-    app.register_blueprint(property_photos_bp, url_prefix='/api/property_photos')
-    app.register_blueprint(finances_bp, url_prefix='/api/finances')
-    app.register_blueprint(users_bp, url_prefix='/api/users')
-    app.register_blueprint(settings_bp, url_prefix='/api/settings')
-    app.register_blueprint(integrations_bp, url_prefix='/api/integrations')
-
-    # Auto-seed demo accounts if DEMO_MODE is enabled
-    with app.app_context():
-        try:
-            auto_seed_demo()
-        except Exception as e:
-            print(f"Auto-seed error (non-fatal): {str(e)}")
+    # Register blueprints for API routes - PropertyPal Core (Single property, multi-user).
+    # This imports every route module: Flask needs all routes before the first
+    # request. Under gunicorn --preload that happens once, in the master.
+    from app.api import register_blueprints
+    register_blueprints(app)
+
+    # No database or filesystem setup here: every worker runs this at boot.
+    # Schema setup, upload folders and demo seeding happen once per deploy in
+    # `flask bootstrap`.
 
     return app
 
@@ -14,6 +14,40 @@ Blueprints:
 - appliances_bp: Appliance tracking routes
 - projects_bp: Project management routes
 """
+from importlib import import_module
+
+# Every blueprint the app serves: (module, blueprint name, URL prefix).
+# Modules are only imported by register_blueprints, so importing this
+# package (e.g. for get_pagination_params) doesn't pull in every route.
+BLUEPRINTS = [
+    ('app.api.auth', 'auth_bp', '/api/auth'),
+    ('app.api.properties', 'properties_bp', '/api/properties'),
+    ('app.api.documents', 'documents_bp', '/api/documents'),
+    ('app.api.maintenance', 'maintenance_bp', '/api/maintenance'),
+    ('app.api.maintenance_checklist', 'checklist_bp', None),
+    ('app.api.appliances', 'appliances_bp', '/api/appliances'),
+    ('app.api.projects', 'projects_bp', '/api/projects'),
+    ('app.api.property_photos', 'property_photos_bp', '/api/property_photos'),
+    ('app.api.finances', 'finances_bp', '/api/finances'),
+    ('app.api.users', 'users_bp', '/api/users'),
+    ('app.api.settings', 'settings_bp', '/api/settings'),
+    ('app.api.integrations', 'integrations_bp', '/api/integrations'),
+    ('app.api.search', 'search_bp', '/api/search'),
+    ('app.api.dashboard', 'dashboard_bp', '/api/dashboard'),
+    ('app.api.sync', 'sync_bp', '/api/sync'),
+    ('app.api.admin', 'admin_bp', '/api/admin'),
+]
+
+
+def register_blueprints(app, blueprints=BLUEPRINTS):
+    """Import and register the API blueprints"""
+    for module_name, blueprint_name, url_prefix in blueprints:
+        blueprint = getattr(import_module(module_name), blueprint_name)
+        if url_prefix:
+            app.register_blueprint(blueprint, url_prefix=url_prefix)
+        else:
+            app.register_blueprint(blueprint)
+
 
 # You can define common API utilities or helper functions here
 def get_pagination_params(request):
@@ -0,0 +1,136 @@
+# api/admin.py
+from functools import wraps
+
+from flask import Blueprint, Response, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app import db
+from app.models.user import User
+from app.services.profiler import TOKEN_HEADER, request_profiler
+
+admin_bp = Blueprint('admin', __name__)
+
+# Profile fields left out of listings
+DETAIL_FIELDS = ('hotspots', 'stacks')
+
+
+def admin_required(view):
+    """Allow only admins; goes below ``@jwt_required()``"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        user = db.session.get(User, int(get_jwt_identity()))
+        if not user or not user.is_admin:
+            return jsonify({"error": "Admin access required"}), 403
+        return view(*args, **kwargs)
+
+    return wrapper
+
+
+def profiling_required(view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not request_profiler.enabled:
+            return jsonify({"error": "Profiling is disabled; set PROFILING_ENABLED=true"}), 404
+        return view(*args, **kwargs)
+
+    return wrapper
+
+
+@admin_bp.route('/profiling', methods=['GET'])
+@jwt_required()
+@admin_required
+@profiling_required
+def get_profiling():
+    """How requests are being picked for profiling"""
+    return jsonify({
+        "profiler": request_profiler.profiler,
+        "sample_rate": request_profiler.sample_rate,
+        "toggle": request_profiler.toggle(),
+    })
+
+
+@admin_bp.route('/profiling', methods=['PUT'])
+@jwt_required()
+@admin_required
+@profiling_required
+def set_profiling():
+    """
+    Switch profiling of every request on or off
+
+    Request Body:
+        enabled: true or false
+        minutes: how long to stay on (default 10, max 60)
+        path_prefix: only profile paths starting with this, e.g. /api/finances
+    """
+    data = request.get_json() or {}
+    minutes = 0
+    if data.get('enabled'):
+        try:
+            minutes = min(max(float(data.get('minutes', 10)), 0), 60)
+        except (TypeError, ValueError):
+            return jsonify({"error": "minutes must be a number"}), 400
+    try:
+        toggle = request_profiler.set_toggle(minutes, data.get('path_prefix'))
+    except Exception as e:
+        return jsonify({"error": f"Failed to update profiling: {str(e)}"}), 500
+    return jsonify({"toggle": toggle})
+
+
+@admin_bp.route('/profiling/token', methods=['POST'])
+@jwt_required()
+@admin_required
+@profiling_required
+def create_profiling_token():
+    """A token that gets any request carrying it in the X-Profile-Token header profiled"""
+    return jsonify({
+        "header": TOKEN_HEADER,
+        "token": request_profiler.issue_token(int(get_jwt_identity())),
+        "expires_in": request_profiler.token_max_age,
+    }), 201
+
+
+@admin_bp.route('/profiles', methods=['GET'])
+@jwt_required()
+@admin_required
+@profiling_required
+def list_profiles():
+    """The most recent request profiles, newest first"""
+    profiles = [
+        {key: value for key, value in profile.items() if key not in DETAIL_FIELDS}
+        for profile in request_profiler.profiles()
+    ]
+    return jsonify({"profiles": profiles})
+
+
+@admin_bp.route('/profiles/<profile_id>', methods=['GET'])
+@jwt_required()
+@admin_required
+@profiling_required
+def get_profile(profile_id):
+    """
+    One request profile
+
+    Query Parameters:
+        format: 'json' (default) for the summary and hottest functions, or
+            'collapsed' for folded stacks to load into speedscope or pipe
+            through flamegraph.pl
+    """
+    profile = request_profiler.get(profile_id)
+    if not profile:
+        return jsonify({"error": "Profile not found"}), 404
+
+    if request.args.get('format') == 'collapsed':
+        response = Response(profile['stacks'], mimetype='text/plain')
+        response.headers['Content-Disposition'] = f'attachment; filename=profile-{profile_id}.folded'
+        return response
+
+    return jsonify({key: value for key, value in profile.items() if key != 'stacks'})
+
+
+@admin_bp.route('/profiles', methods=['DELETE'])
+@jwt_required()
+@admin_required
+@profiling_required
+def clear_profiles():
+    """Discard the stored profiles"""
+    request_profiler.clear()
+    return jsonify({"message": "Profiles cleared"})
@@ -2,15 +2,20 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
+from app.models.alert import Alert
 from app.models.appliance import Appliance
-from app.models.property import Property
 from app.models.user import User
-from datetime import datetime
+from app.api.serializers import appliance_serializer
+from app.services import notification_service
+from app.services.response_cache import cached
+from app.utils.auth_utils import owns_property
+from datetime import date, datetime, timedelta
 
 appliances_bp = Blueprint('appliances', __name__)
 
 @appliances_bp.route('/', methods=['GET'])
 @jwt_required()
+@cached(Appliance)
 def get_appliances():
     """Get all appliances for the current user"""
     current_user_id = int(get_jwt_identity())
@@ -19,8 +24,7 @@ def get_appliances():
 
     # If property_id is provided, verify ownership
     if property_id:
-        property = Property.query.filter_by(id=property_id, user_id=current_user_id).first()
-        if not property:
+        if not owns_property(current_user_id, property_id):
             return jsonify({"error": "Property not found"}), 404
 
         query = Appliance.query.filter_by(property_id=property_id)
@@ -34,25 +38,58 @@ def get_appliances():
         query = query.filter_by(category=category)
 
     # Execute query
-    appliances = query.order_by(Appliance.created_at.desc()).all()
+    result = appliance_serializer.dump_query(query.order_by(Appliance.created_at.desc()))
+
+    return jsonify(result)
+
+@appliances_bp.route('/expiring', methods=['GET'])
+@jwt_required()
+def get_appliances_with_expiring_warranties():
+    """
+    Get appliances whose warranty expires soon (within 3 months by default)
+
+    Up to ALERT_WARRANTY_DAYS ahead this reads the precomputed alerts; longer
+    ranges query the appliances themselves.
+    """
+    current_user_id = int(get_jwt_identity())
+
+    property_id = request.args.get('property_id')
+    try:
+        months = int(request.args.get('months', 3))
+    except ValueError:
+        return jsonify({"error": "Months must be a valid integer"}), 400
+    if months < 0:
+        return jsonify({"error": "Months must not be negative"}), 400
+
+    # If property_id is provided, verify ownership
+    if property_id:
+        if not owns_property(current_user_id, property_id):
+            return jsonify({"error": "Property not found"}), 404
+
+    today = date.today()
+    days = months * 30
+    if timedelta(days=days) <= notification_service.alert_window(Alert.KIND_WARRANTY_EXPIRING):
+        # Read the precomputed alerts rather than scanning appliances
+        query = notification_service.expiring_alerts(
+            Alert.KIND_WARRANTY_EXPIRING, current_user_id, days=days,
+            property_id=int(property_id) if property_id else None, today=today
+        ).join(Appliance, Appliance.id == Alert.entity_id)
+    else:
+        # Past the alert window, where there are no alerts to read
+        query = Appliance.query.filter(
+            Appliance.warranty_expiration.between(today, today + timedelta(days=days))
+        )
+        if property_id:
+            query = query.filter(Appliance.property_id == int(property_id))
+        else:
+            query = query.filter(Appliance.user_id == current_user_id)
+        query = query.order_by(Appliance.warranty_expiration, Appliance.id)
 
     result = []
-    for appliance in appliances:
-        result.append({
-            'id': appliance.id,
-            'name': appliance.name,
-            'brand': appliance.brand,
-            'model': appliance.model,
-            'serial_number': appliance.serial_number,
-            'purchase_date': appliance.purchase_date.isoformat() if appliance.purchase_date else None,
-            'warranty_expiration': appliance.warranty_expiration.isoformat() if appliance.warranty_expiration else None,
-            'notes': appliance.notes,
-            'category': appliance.category,
-            'created_at': appliance.created_at.isoformat(),
-            'updated_at': appliance.updated_at.isoformat(),
-            'property_id': appliance.property_id,
-            'created_by': appliance.user_id
-        })
+    for row in appliance_serializer.select(query).all():
+        data = appliance_serializer.dump_row(row)
+        data['days_until_expiration'] = (row.warranty_expiration - today).days
+        result.append(data)
 
     return jsonify(result)
 
@@ -71,8 +108,7 @@ def create_appliance():
     # If a property_id is provided, verify ownership
     property_id = data.get('property_id')
     if property_id:
-        property = Property.query.filter_by(id=property_id, user_id=current_user_id).first()
-        if not property:
+        if not owns_property(current_user_id, property_id):
             return jsonify({"error": "Property not found"}), 404
 
     # Create new appliance
@@ -108,20 +144,7 @@ def get_appliance(appliance_id):
     if not appliance:
         return jsonify({"error": "Appliance not found"}), 404
 
-    result = {
-        'id': appliance.id,
-        'name': appliance.name,
-        'brand': appliance.brand,
-        'model': appliance.model,
-        'serial_number': appliance.serial_number,
-        'purchase_date': appliance.purchase_date.isoformat() if appliance.purchase_date else None,
-        'warranty_expiration': appliance.warranty_expiration.isoformat() if appliance.warranty_expiration else None,
-        'notes': appliance.notes,
-        'category': appliance.category,
-        'created_at': appliance.created_at.isoformat(),
-        'updated_at': appliance.updated_at.isoformat(),
-        'property_id': appliance.property_id
-    }
+    result = appliance_serializer.dump(appliance)
 
     return jsonify(result)
 
@@ -166,8 +189,7 @@ def update_appliance(appliance_id):
     if 'property_id' in data and data['property_id'] != appliance.property_id:
         new_property_id = data['property_id']
         if new_property_id:
-            property = Property.query.filter_by(id=new_property_id, user_id=current_user_id).first()
-            if not property:
+            if not owns_property(current_user_id, new_property_id):
                 return jsonify({"error": "Property not found"}), 404
         appliance.property_id = new_property_id
 
@@ -4,6 +4,7 @@ from werkzeug.security import generate_password_hash, check_password_hash
 from app.models.user import User
 from app.models.settings import Settings
 from app import db
+from app.services.rate_limiter import rate_limit
 from app.services.email_service import send_password_reset_email,send_welcome_email,send_verification_email
 import secrets
 from datetime import datetime, timedelta
@@ -13,6 +14,7 @@ auth_bp = Blueprint('auth', __name__)
 
 
 @auth_bp.route('/register', methods=['POST'])
+@rate_limit(ip='RATE_LIMIT_AUTH_PER_IP', route='RATE_LIMIT_AUTH_PER_ROUTE')
 def register():
     """Register a new user - PropertyPal Core (Single User)
 
@@ -49,21 +51,12 @@ def register():
         email_verified=True  # Auto-verify first user
     )
     new_user.password = data.get('password')
+    # Seeded here so reading settings never has to create them
+    new_user.settings = Settings.defaults()
 
     db.session.add(new_user)
     db.session.commit()
 
-    # Create default settings
-    settings = Settings(
-        user_id=new_user.id,
-        currency='USD',
-        date_format='MM/DD/YYYY',
-        notifications_enabled=True,
-        email_notifications=False
-    )
-    db.session.add(settings)
-    db.session.commit()
-
     # Auto-login first user by providing tokens
     access_token = create_access_token(identity=str(new_user.id))
     refresh_token = create_refresh_token(identity=str(new_user.id))
@@ -78,6 +71,7 @@ def register():
     }), 201
 
 @auth_bp.route('/login', methods=['POST'])
+@rate_limit(ip='RATE_LIMIT_AUTH_PER_IP', route='RATE_LIMIT_AUTH_PER_ROUTE')
 def login():
     """Authenticate user and return JWT token"""
     data = request.get_json()
@@ -146,6 +140,7 @@ def get_user():
     }), 200
 
 @auth_bp.route('/forgot-password', methods=['POST'])
+@rate_limit(ip='RATE_LIMIT_AUTH_PER_IP', route='RATE_LIMIT_AUTH_PER_ROUTE')
 def forgot_password():
     """Generate a password reset token and send reset email"""
     data = request.get_json()
@@ -184,6 +179,7 @@ def forgot_password():
     }), 200
 
 @auth_bp.route('/reset-password', methods=['POST'])
+@rate_limit(ip='RATE_LIMIT_AUTH_PER_IP', route='RATE_LIMIT_AUTH_PER_ROUTE')
 def reset_password():
     """Reset user password using token"""
     data = request.get_json()
@@ -212,6 +208,7 @@ def reset_password():
     }), 200
 
 @auth_bp.route('/verify-email', methods=['POST'])
+@rate_limit(ip='RATE_LIMIT_AUTH_PER_IP', route='RATE_LIMIT_AUTH_PER_ROUTE')
 def verify_email():
     """Verify user email with token"""
     data = request.get_json()
@@ -256,6 +253,7 @@ def demo_status():
     }), 200
 
 @auth_bp.route('/resend-verification', methods=['POST'])
+@rate_limit(ip='RATE_LIMIT_AUTH_PER_IP', route='RATE_LIMIT_AUTH_PER_ROUTE')
 def resend_verification():
     """Resend verification email"""
     data = request.get_json()
@@ -0,0 +1,25 @@
+# api/dashboard.py
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.services import dashboard_service
+from app.services.response_cache import cached
+from app.utils.auth_utils import owns_property
+
+dashboard_bp = Blueprint('dashboard', __name__)
+
+@dashboard_bp.route('/', methods=['GET'])
+@jwt_required()
+@cached(*dashboard_service.DASHBOARD_MODELS)
+def get_dashboard():
+    """Get dashboard counters and top-N lists in a single call"""
+    current_user_id = int(get_jwt_identity())
+
+    property_id = request.args.get('property_id', type=int)
+    limit = min(max(request.args.get('limit', 5, type=int), 1), 20)
+
+    # If property_id is provided, verify ownership
+    if property_id:
+        if not owns_property(current_user_id, property_id):
+            return jsonify({"error": "Property not found"}), 404
+
+    return jsonify(dashboard_service.build_dashboard(current_user_id, property_id, limit))
@@ -1,15 +1,21 @@
 # api/documents.py
-from flask import Blueprint, request, jsonify, send_file, current_app
+from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from werkzeug.utils import secure_filename
-import os
 import uuid
 from app import db
+from app.models.alert import Alert
 from app.models.document import Document
 from app.models.user import User
-from app.models.property import Property
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from app.utils.constants import DOCUMENT_CATEGORIES, EXPIRING_DOCUMENT_CATEGORIES
+from app.api import get_pagination_params
+from app.api.serializers import document_serializer, expiring_document_serializer, document_url
+from app.services import content_service, notification_service, search_service
+from app.services.file_service import file_storage
+from app.services.response_cache import cached
+from app.utils import tracing
+from app.utils.auth_utils import accessible_by, owns_property
 
 
 documents_bp = Blueprint('documents', __name__)
@@ -21,6 +27,7 @@ def allowed_file(filename):
 
 @documents_bp.route('/', methods=['GET'])
 @jwt_required()
+@cached(Document)
 def get_documents():
     """Get all documents for the current user"""
     current_user_id = int(get_jwt_identity())
@@ -31,26 +38,19 @@ def get_documents():
 
     # If property_id is provided, verify ownership
     if property_id:
-        property = Property.query.filter_by(id=property_id, user_id=current_user_id).first()
-        if not property:
+        if not owns_property(current_user_id, property_id):
             return jsonify({"error": "Property not found"}), 404
 
         query = Document.query.filter_by(property_id=property_id)
     elif appliance_id:
-        # Verify appliance exists and user has access
+        # Verify appliance exists and user owns it or owns its property
         from app.models.appliance import Appliance
-        appliance = Appliance.query.get(appliance_id)
+        appliance = Appliance.query.filter(
+            Appliance.id == appliance_id,
+            accessible_by(Appliance, current_user_id)
+        ).first()
         if not appliance:
-            return jsonify({"error": "Appliance not found"}), 404
-
-        # Check if user owns the appliance or owns its property
-        if appliance.user_id != current_user_id:
-            if appliance.property_id:
-                property = Property.query.filter_by(id=appliance.property_id, user_id=current_user_id).first()
-                if not property:
-                    return jsonify({"error": "Appliance not found or access denied"}), 404
-            else:
-                return jsonify({"error": "Appliance not found or access denied"}), 404
+            return jsonify({"error": "Appliance not found or access denied"}), 404
 
         query = Document.query.filter_by(appliance_id=appliance_id)
     else:
@@ -62,34 +62,13 @@ def get_documents():
         query = query.filter_by(category=category)
 
     # Execute query
-    documents = query.order_by(Document.created_at.desc()).all()
+    rows = document_serializer.select(query.order_by(Document.created_at.desc())).all()
 
     result = []
-    for doc in documents:
-        # Generate URL based on file path
-        filename = os.path.basename(doc.file_path)
-
-        # Determine the URL based on document association
-        if doc.property_id:
-            url = f"/uploads/documents/files/property_{doc.property_id}/{filename}"
-        else:
-            url = f"/uploads/documents/files/user_{current_user_id}/{filename}"
-
-        result.append({
-            'id': doc.id,
-            'title': doc.title,
-            'description': doc.description,
-            'file_type': doc.file_type,
-            'file_size': doc.file_size,
-            'category': doc.category,
-            'created_at': doc.created_at.isoformat(),
-            'updated_at': doc.updated_at.isoformat(),
-            'property_id': doc.property_id,
-            'appliance_id': doc.appliance_id,
-            'expiration_date': doc.expiration_date.isoformat() if doc.expiration_date else None,
-            'url': url,
-            'created_by': doc.user_id
-        })
+    for row in rows:
+        data = document_serializer.dump_row(row)
+        data['url'] = document_url(row.property_id, row.file_path, current_user_id)
+        result.append(data)
 
     return jsonify(result)
 
@@ -113,9 +92,6 @@ def upload_document():
     if not allowed_file(file.filename):
         return jsonify({"error": f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"}), 400
 
-    # Get base upload folder
-    base_upload_folder = os.path.join(current_app.root_path, 'uploads/documents')
-
     # Get form data
     title = request.form.get('title')
     description = request.form.get('description', '')
@@ -132,17 +108,14 @@ def upload_document():
 
     # If a property_id is provided, verify ownership
     if property_id:
-        property = Property.query.filter_by(id=property_id, user_id=current_user_id).first()
-        if not property:
+        if not owns_property(current_user_id, property_id):
             return jsonify({"error": "Property not found"}), 404
 
-        # Create property-specific folder
-        files_folder = os.path.join(base_upload_folder, 'files', f"property_{property_id}")
-        os.makedirs(files_folder, exist_ok=True)
+        # Property-specific folder
+        files_folder = f"documents/files/property_{property_id}"
     else:
         # If no property, use a user-specific folder
-        files_folder = os.path.join(base_upload_folder, 'files', f"user_{current_user_id}")
-        os.makedirs(files_folder, exist_ok=True)
+        files_folder = f"documents/files/user_{current_user_id}"
 
     # Validate appliance_id if provided
     if appliance_id:
@@ -154,8 +127,7 @@ def upload_document():
         # Check if user owns the appliance or owns its property
         if appliance.user_id != current_user_id:
             if appliance.property_id:
-                property = Property.query.filter_by(id=appliance.property_id, user_id=current_user_id).first()
-                if not property:
+                if not owns_property(current_user_id, appliance.property_id):
                     return jsonify({"error": "You don't have permission to upload documents for this appliance"}), 403
             else:
                 return jsonify({"error": "Appliance not found or access denied"}), 404
@@ -163,13 +135,14 @@ def upload_document():
     # Secure the filename and generate a unique filename
     filename = secure_filename(file.filename)
     unique_filename = f"{uuid.uuid4()}_{filename}"
-    file_path = os.path.join(files_folder, unique_filename)
+    key = f"{files_folder}/{unique_filename}"
 
     # Save the file
-    file.save(file_path)
+    with tracing.span('file.save', {'file.path': key, 'file.type': file.content_type or '',
+                                    'storage.backend': file_storage.backend.name}):
+        file_path, file_size = file_storage.save(file.stream, key, file.content_type)
 
     # Get file metadata
-    file_size = os.path.getsize(file_path)
     file_type = file.content_type or 'application/octet-stream'
 
     # Create document record
@@ -186,19 +159,18 @@ def upload_document():
         expiration_date=datetime.strptime(expiration_date, '%Y-%m-%d').date() if expiration_date else None
     )
 
+    new_document.content = content_service.new_content(file_path)
+
     db.session.add(new_document)
     db.session.commit()
 
-    # Determine the relative path for API responses
-    if property_id:
-        relative_path = f"/uploads/documents/files/property_{property_id}/{unique_filename}"
-    else:
-        relative_path = f"/uploads/documents/files/user_{current_user_id}/{unique_filename}"
+    # Pull the file's text into the search index in the background
+    content_service.queue_extraction(new_document)
 
     return jsonify({
         'id': new_document.id,
         'title': new_document.title,
-        'url': relative_path,
+        'url': document_url(new_document.property_id, file_path, current_user_id),
         'message': 'Document uploaded successfully'
     }), 201
 
@@ -215,8 +187,7 @@ def update_document(document_id):
     # Check if document belongs to user or if user owns the property
     if document.user_id != current_user_id:
         if document.property_id:
-            property = Property.query.filter_by(id=document.property_id, user_id=current_user_id).first()
-            if not property:
+            if not owns_property(current_user_id, document.property_id):
                 return jsonify({"error": "You don't have permission to update this document"}), 403
         else:
             return jsonify({"error": "Document not found or access denied"}), 404
@@ -235,8 +206,7 @@ def update_document(document_id):
     if 'property_id' in data:
         # Verify ownership of the new property
         if data['property_id']:
-            property = Property.query.filter_by(id=data['property_id'], user_id=current_user_id).first()
-            if not property:
+            if not owns_property(current_user_id, data['property_id']):
                 return jsonify({"error": "Property not found"}), 404
         document.property_id = data['property_id']
 
@@ -251,8 +221,7 @@ def update_document(document_id):
             # Check if user owns the appliance or owns its property
             if appliance.user_id != current_user_id:
                 if appliance.property_id:
-                    property = Property.query.filter_by(id=appliance.property_id, user_id=current_user_id).first()
-                    if not property:
+                    if not owns_property(current_user_id, appliance.property_id):
                         return jsonify({"error": "You don't have permission to link documents to this appliance"}), 403
                 else:
                     return jsonify({"error": "Appliance not found or access denied"}), 404
@@ -263,19 +232,10 @@ def update_document(document_id):
 
     db.session.commit()
 
-    # Get the filename from the file path
-    filename = os.path.basename(document.file_path)
-
-    # Generate URL for the response
-    if document.property_id:
-        url = f"/uploads/documents/files/property_{document.property_id}/{filename}"
-    else:
-        url = f"/uploads/documents/files/user_{current_user_id}/{filename}"
-
     return jsonify({
         'id': document.id,
         'title': document.title,
-        'url': url,
+        'url': document_url(document.property_id, document.file_path, current_user_id),
         'message': 'Document updated successfully'
     })
 
@@ -292,15 +252,13 @@ def delete_document(document_id):
     # Check if document belongs to user or if user owns the property
     if document.user_id != current_user_id:
         if document.property_id:
-            property = Property.query.filter_by(id=document.property_id, user_id=current_user_id).first()
-            if not property:
+            if not owns_property(current_user_id, document.property_id):
                 return jsonify({"error": "You don't have permission to delete this document"}), 403
         else:
             return jsonify({"error": "Document not found or access denied"}), 404
 
     # Delete the file from storage
-    if os.path.exists(document.file_path):
-        os.remove(document.file_path)
+    file_storage.delete(document.file_path)
 
     # Delete from database
     db.session.delete(document)
@@ -323,131 +281,112 @@ def download_document(document_id):
     # Check if document belongs to user or if user owns the property
     if document.user_id != current_user_id:
         if document.property_id:
-            property = Property.query.filter_by(id=document.property_id, user_id=current_user_id).first()
-            if not property:
+            if not owns_property(current_user_id, document.property_id):
                 return jsonify({"error": "You don't have permission to download this document"}), 403
         else:
             return jsonify({"error": "Document not found or access denied"}), 404
 
-    # Check if file exists
-    if not os.path.exists(document.file_path):
+    # Sent from local disk, or a redirect to a presigned URL for files in a bucket
+    response = file_storage.download_response(document.file_path)
+    if response is None:
         return jsonify({"error": "File not found"}), 404
 
-    return send_file(document.file_path, as_attachment=True)
+    return response
 
 @documents_bp.route('/expiring', methods=['GET'])
 @jwt_required()
 def get_expiring_documents():
-    """Get documents that are expiring soon (within 30 days by default)"""
-    current_user_id = int(get_jwt_identity())
-
-    days = int(request.args.get('days', 30))
+    """
+    Get documents that are expiring soon (within 30 days by default)
 
-    # Calculate the date threshold
-    today = datetime.now().date()
-    expiration_threshold = today + timedelta(days=days)
+    Up to ALERT_DOCUMENT_DAYS ahead this reads the precomputed alerts; longer
+    ranges query the documents themselves.
+    """
+    current_user_id = int(get_jwt_identity())
 
-    # Get documents that have an expiration date and are expiring within the threshold
-    documents = Document.query.filter(
-        Document.user_id == current_user_id,
-        Document.expiration_date.isnot(None),
-        Document.expiration_date <= expiration_threshold,
-        Document.expiration_date >= today
-    ).order_by(Document.expiration_date.asc()).all()
+    try:
+        days = int(request.args.get('days', 30))
+    except ValueError:
+        return jsonify({"error": "Days must be a valid integer"}), 400
+    if days < 0:
+        return jsonify({"error": "Days must not be negative"}), 400
+    today = date.today()
+
+    if timedelta(days=days) <= notification_service.alert_window(Alert.KIND_DOCUMENT_EXPIRING):
+        # Read the precomputed alerts rather than scanning documents
+        query = notification_service.expiring_alerts(
+            Alert.KIND_DOCUMENT_EXPIRING, current_user_id, days=days, today=today
+        ).join(Document, Document.id == Alert.entity_id)
+    else:
+        # Past the alert window, where there are no alerts to read
+        query = Document.query.filter(
+            Document.user_id == current_user_id,
+            Document.expiration_date.between(today, today + timedelta(days=days))
+        ).order_by(Document.expiration_date, Document.id)
+    rows = expiring_document_serializer.select(query).all()
 
     result = []
-    for doc in documents:
-        # Generate URL for the document
-        filename = os.path.basename(doc.file_path)
-        if doc.property_id:
-            url = f"/uploads/documents/files/property_{doc.property_id}/{filename}"
-        else:
-            url = f"/uploads/documents/files/user_{current_user_id}/{filename}"
-
-        result.append({
-            'id': doc.id,
-            'title': doc.title,
-            'file_type': doc.file_type,
-            'category': doc.category,
-            'expiration_date': doc.expiration_date.isoformat(),
-            'days_until_expiration': (doc.expiration_date - today).days,
-            'property_id': doc.property_id,
-            'url': url
-        })
+    for row in rows:
+        data = expiring_document_serializer.dump_row(row)
+        data['days_until_expiration'] = (row.expiration_date - today).days
+        data['url'] = document_url(row.property_id, row.file_path, current_user_id)
+        result.append(data)
 
     return jsonify(result)
 
 @documents_bp.route('/category/<category>', methods=['GET'])
 @jwt_required()
+@cached(Document)
 def get_documents_by_category(category):
     """Get documents by category"""
     current_user_id = int(get_jwt_identity())
 
     query = Document.query.filter_by(user_id=current_user_id, category=category)
 
-    documents = query.order_by(Document.created_at.desc()).all()
+    rows = document_serializer.select(query.order_by(Document.created_at.desc())).all()
 
     result = []
-    for doc in documents:
-        # Generate URL for the document
-        filename = os.path.basename(doc.file_path)
-        if doc.property_id:
-            url = f"/uploads/documents/files/property_{doc.property_id}/{filename}"
-        else:
-            url = f"/uploads/documents/files/user_{current_user_id}/{filename}"
-
-        result.append({
-            'id': doc.id,
-            'title': doc.title,
-            'description': doc.description,
-            'file_type': doc.file_type,
-            'file_size': doc.file_size,
-            'category': doc.category,
-            'created_at': doc.created_at.isoformat(),
-            'updated_at': doc.updated_at.isoformat(),
-            'property_id': doc.property_id,
-            'expiration_date': doc.expiration_date.isoformat() if doc.expiration_date else None,
-            'url': url
-        })
+    for row in rows:
+        data = document_serializer.dump_row(row)
+        data['url'] = document_url(row.property_id, row.file_path, current_user_id)
+        result.append(data)
 
     return jsonify(result)
 
 @documents_bp.route('/search', methods=['GET'])
 @jwt_required()
 def search_documents():
-    """Search documents by keyword"""
+    """Full-text search over the user's documents, ranked and paginated"""
     current_user_id = int(get_jwt_identity())
 
     keyword = request.args.get('q', '')
+    property_id = request.args.get('property_id')
+    page, per_page = get_pagination_params(request)
 
-    query = Document.query.filter(
-        Document.user_id == current_user_id,
-        (Document.title.ilike(f'%{keyword}%') | Document.description.ilike(f'%{keyword}%'))
-    )
+    query = Document.query.filter(Document.user_id == current_user_id)
 
-    documents = query.order_by(Document.created_at.desc()).all()
+    # If property_id is provided, verify ownership
+    if property_id:
+        if not owns_property(current_user_id, property_id):
+            return jsonify({"error": "Property not found"}), 404
+        query = query.filter(Document.property_id == int(property_id))
 
-    result = []
-    for doc in documents:
-        # Generate URL for the document
-        filename = os.path.basename(doc.file_path)
-        if doc.property_id:
-            url = f"/uploads/documents/files/property_{doc.property_id}/{filename}"
-        else:
-            url = f"/uploads/documents/files/user_{current_user_id}/{filename}"
-
-        result.append({
-            'id': doc.id,
-            'title': doc.title,
-            'description': doc.description,
-            'file_type': doc.file_type,
-            'file_size': doc.file_size,
-            'category': doc.category,
-            'created_at': doc.created_at.isoformat(),
-            'updated_at': doc.updated_at.isoformat(),
-            'property_id': doc.property_id,
-            'expiration_date': doc.expiration_date.isoformat() if doc.expiration_date else None,
-            'url': url
-        })
+    rows, total = search_service.search_documents(query, keyword, page=page, per_page=per_page)
 
-    return jsonify(result)
+    results = []
+    for row in rows:
+        data = document_serializer.dump_row(row)
+        data['url'] = document_url(row.property_id, row.file_path, current_user_id)
+        data['rank'] = row.rank
+        data['highlights'] = {
+            'title': search_service.render_highlight(row.title_highlight),
+            'description': search_service.render_highlight(row.snippet)
+        }
+        results.append(data)
+
+    return jsonify({
+        'results': results,
+        'total': total,
+        'page': page,
+        'per_page': per_page
+    })
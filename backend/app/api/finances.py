@@ -5,13 +5,18 @@ from app import db
 from app.models.finance import Expense, Budget
 from app.models.property import Property
 from app.models.user import User
+from app.utils.money import to_cents, cents_to_dollars
+from app.api.serializers import expense_serializer, budget_serializer
+from app.services.response_cache import cached
+from app.utils.auth_utils import accessible_by, owns_property
 from datetime import datetime
-from sqlalchemy import func
+from sqlalchemy import func, extract
 
 finances_bp = Blueprint('finances', __name__)
 
 @finances_bp.route('/expenses', methods=['GET'])
 @jwt_required()
+@cached(Expense)
 def get_expenses():
     """Get all expenses for the current user with optional filters"""
     current_user_id = int(get_jwt_identity())
@@ -24,18 +29,13 @@ def get_expenses():
 
     # If property_id is provided, verify ownership
     if property_id:
-        property = Property.query.filter_by(id=property_id, user_id=current_user_id).first()
-        if not property:
+        if not owns_property(current_user_id, property_id):
             return jsonify({"error": "Property not found"}), 404
 
         query = Expense.query.filter_by(property_id=property_id)
     else:
-        # Get expenses for all properties owned by user
-        user_property = Property.query.filter_by(user_id=current_user_id).first()
-        if user_property:
-            query = Expense.query.filter_by(property_id=user_property.id)
-        else:
-            query = Expense.query.filter_by(user_id=current_user_id)
+        # Get expenses for all properties owned by user, or their own if they have none
+        query = Expense.query.filter(accessible_by(Expense, current_user_id))
 
     # Apply date filters if provided
     if start_date:
@@ -57,14 +57,7 @@ def get_expenses():
         query = query.filter_by(category=category)
 
     # Execute query
-    expenses = query.order_by(Expense.date.desc()).all()
-
-    # Convert to dictionaries
-    result = []
-    for expense in expenses:
-        expense_dict = expense.to_dict()
-        expense_dict['created_by'] = expense.user_id
-        result.append(expense_dict)
+    result = expense_serializer.dump_query(query.order_by(Expense.date.desc()))
 
     return jsonify(result)
 
@@ -83,17 +76,16 @@ def create_expense():
 
     # Verify property ownership
     property_id = data['property_id']
-    property = Property.query.filter_by(id=property_id, user_id=current_user_id).first()
-    if not property:
+    if not owns_property(current_user_id, property_id):
         return jsonify({"error": "Property not found"}), 404
 
     # Validate amount is positive
     try:
-        amount_dollars = float(data['amount'])
-        if amount_dollars <= 0:
-            return jsonify({"error": "Amount must be positive"}), 400
-    except (ValueError, TypeError):
+        amount_cents = to_cents(data['amount'])
+    except ValueError:
         return jsonify({"error": "Amount must be a valid number"}), 400
+    if amount_cents is None or amount_cents <= 0:
+        return jsonify({"error": "Amount must be positive"}), 400
 
     # Parse date
     try:
@@ -106,7 +98,7 @@ def create_expense():
         user_id=current_user_id,
         property_id=property_id,
         title=data['title'],
-        amount=int(amount_dollars * 100),
+        amount=amount_cents,
         category=data['category'],
         date=expense_date,
         description=data.get('description', ''),
@@ -129,19 +121,16 @@ def get_expense(expense_id):
     """Get a specific expense"""
     current_user_id = int(get_jwt_identity())
 
-    expense = Expense.query.get(expense_id)
+    # Fetch the expense only if it belongs to one of the user's properties
+    expense = (
+        Expense.query.join(Property, Property.id == Expense.property_id)
+        .filter(Expense.id == expense_id, Property.user_id == current_user_id)
+        .first()
+    )
     if not expense:
         return jsonify({"error": "Expense not found"}), 404
 
-    # Verify property ownership
-    property = Property.query.filter_by(id=expense.property_id, user_id=current_user_id).first()
-    if not property:
-        return jsonify({"error": "Expense not found"}), 404
-
-    expense_dict = expense.to_dict()
-    expense_dict['created_by'] = expense.user_id
-
-    return jsonify(expense_dict)
+    return jsonify(expense_serializer.dump(expense))
 
 @finances_bp.route('/expenses/<int:expense_id>', methods=['PUT'])
 @jwt_required()
@@ -149,15 +138,15 @@ def update_expense(expense_id):
     """Update an expense"""
     current_user_id = int(get_jwt_identity())
 
-    expense = Expense.query.get(expense_id)
+    # Fetch the expense only if it belongs to one of the user's properties
+    expense = (
+        Expense.query.join(Property, Property.id == Expense.property_id)
+        .filter(Expense.id == expense_id, Property.user_id == current_user_id)
+        .first()
+    )
     if not expense:
         return jsonify({"error": "Expense not found"}), 404
 
-    # Verify property ownership
-    property = Property.query.filter_by(id=expense.property_id, user_id=current_user_id).first()
-    if not property:
-        return jsonify({"error": "Expense not found"}), 404
-
     data = request.get_json()
 
     # Update fields if provided
@@ -166,12 +155,12 @@ def update_expense(expense_id):
 
     if 'amount' in data:
         try:
-            amount_dollars = float(data['amount'])
-            if amount_dollars <= 0:
-                return jsonify({"error": "Amount must be positive"}), 400
-            expense.amount = int(amount_dollars * 100)
-        except (ValueError, TypeError):
+            amount_cents = to_cents(data['amount'])
+        except ValueError:
             return jsonify({"error": "Amount must be a valid number"}), 400
+        if amount_cents is None or amount_cents <= 0:
+            return jsonify({"error": "Amount must be positive"}), 400
+        expense.amount = amount_cents
 
     if 'category' in data:
         expense.category = data['category']
@@ -195,8 +184,7 @@ def update_expense(expense_id):
     if 'property_id' in data and data['property_id'] != expense.property_id:
         new_property_id = data['property_id']
         if new_property_id:
-            new_property = Property.query.filter_by(id=new_property_id, user_id=current_user_id).first()
-            if not new_property:
+            if not owns_property(current_user_id, new_property_id):
                 return jsonify({"error": "Property not found"}), 404
         expense.property_id = new_property_id
 
@@ -214,15 +202,15 @@ def delete_expense(expense_id):
     """Delete an expense"""
     current_user_id = int(get_jwt_identity())
 
-    expense = Expense.query.get(expense_id)
+    # Fetch the expense only if it belongs to one of the user's properties
+    expense = (
+        Expense.query.join(Property, Property.id == Expense.property_id)
+        .filter(Expense.id == expense_id, Property.user_id == current_user_id)
+        .first()
+    )
     if not expense:
         return jsonify({"error": "Expense not found"}), 404
 
-    # Verify property ownership
-    property = Property.query.filter_by(id=expense.property_id, user_id=current_user_id).first()
-    if not property:
-        return jsonify({"error": "Expense not found"}), 404
-
     db.session.delete(expense)
     db.session.commit()
 
@@ -245,6 +233,7 @@ def get_expense_categories():
 # Budget API endpoints
 @finances_bp.route('/budgets', methods=['GET'])
 @jwt_required()
+@cached(Budget)
 def get_budgets():
     """Get all budgets for the current user with optional filters"""
     current_user_id = int(get_jwt_identity())
@@ -256,18 +245,13 @@ def get_budgets():
 
     # If property_id is provided, verify ownership
     if property_id:
-        property = Property.query.filter_by(id=property_id, user_id=current_user_id).first()
-        if not property:
+        if not owns_property(current_user_id, property_id):
             return jsonify({"error": "Property not found"}), 404
 
         query = Budget.query.filter_by(property_id=property_id)
     else:
-        # Get budgets for user's property
-        user_property = Property.query.filter_by(user_id=current_user_id).first()
-        if user_property:
-            query = Budget.query.filter_by(property_id=user_property.id)
-        else:
-            query = Budget.query.filter_by(user_id=current_user_id)
+        # Get budgets for user's property, or their own if they have none
+        query = Budget.query.filter(accessible_by(Budget, current_user_id))
 
     # Apply filters
     if year:
@@ -286,14 +270,7 @@ def get_budgets():
             return jsonify({"error": "Month must be a valid integer"}), 400
 
     # Execute query
-    budgets = query.order_by(Budget.year, Budget.month, Budget.category).all()
-
-    # Convert to dictionaries
-    result = []
-    for budget in budgets:
-        budget_dict = budget.to_dict()
-        budget_dict['created_by'] = budget.user_id
-        result.append(budget_dict)
+    result = budget_serializer.dump_query(query.order_by(Budget.year, Budget.month, Budget.category))
 
     return jsonify(result)
 
@@ -312,17 +289,16 @@ def create_budget():
 
     # Verify property ownership
     property_id = data['property_id']
-    property = Property.query.filter_by(id=property_id, user_id=current_user_id).first()
-    if not property:
+    if not owns_property(current_user_id, property_id):
         return jsonify({"error": "Property not found"}), 404
 
     # Validate amount is positive
     try:
-        amount_dollars = float(data['amount'])
-        if amount_dollars <= 0:
-            return jsonify({"error": "Amount must be positive"}), 400
-    except (ValueError, TypeError):
+        amount_cents = to_cents(data['amount'])
+    except ValueError:
         return jsonify({"error": "Amount must be a valid number"}), 400
+    if amount_cents is None or amount_cents <= 0:
+        return jsonify({"error": "Amount must be positive"}), 400
 
     # Validate month
     try:
@@ -356,7 +332,7 @@ def create_budget():
         user_id=current_user_id,
         property_id=data['property_id'],
         category=data['category'],
-        amount=int(amount_dollars * 100),
+        amount=amount_cents,
         month=month,
         year=year
     )
@@ -376,19 +352,16 @@ def get_budget(budget_id):
     """Get a specific budget"""
     current_user_id = int(get_jwt_identity())
 
-    budget = Budget.query.get(budget_id)
+    # Fetch the budget only if it belongs to one of the user's properties
+    budget = (
+        Budget.query.join(Property, Property.id == Budget.property_id)
+        .filter(Budget.id == budget_id, Property.user_id == current_user_id)
+        .first()
+    )
     if not budget:
         return jsonify({"error": "Budget not found"}), 404
 
-    # Verify property ownership
-    property = Property.query.filter_by(id=budget.property_id, user_id=current_user_id).first()
-    if not property:
-        return jsonify({"error": "Budget not found"}), 404
-
-    budget_dict = budget.to_dict()
-    budget_dict['created_by'] = budget.user_id
-
-    return jsonify(budget_dict)
+    return jsonify(budget_serializer.dump(budget))
 
 @finances_bp.route('/budgets/<int:budget_id>', methods=['PUT'])
 @jwt_required()
@@ -396,15 +369,15 @@ def update_budget(budget_id):
     """Update a budget"""
     current_user_id = int(get_jwt_identity())
 
-    budget = Budget.query.get(budget_id)
+    # Fetch the budget only if it belongs to one of the user's properties
+    budget = (
+        Budget.query.join(Property, Property.id == Budget.property_id)
+        .filter(Budget.id == budget_id, Property.user_id == current_user_id)
+        .first()
+    )
     if not budget:
         return jsonify({"error": "Budget not found"}), 404
 
-    # Verify property ownership
-    property = Property.query.filter_by(id=budget.property_id, user_id=current_user_id).first()
-    if not property:
-        return jsonify({"error": "Budget not found"}), 404
-
     data = request.get_json()
 
     # Save original values for uniqueness check
@@ -419,12 +392,12 @@ def update_budget(budget_id):
 
     if 'amount' in data:
         try:
-            amount_dollars = float(data['amount'])
-            if amount_dollars <= 0:
-                return jsonify({"error": "Amount must be positive"}), 400
-            budget.amount = int(amount_dollars * 100)
-        except (ValueError, TypeError):
+            amount_cents = to_cents(data['amount'])
+        except ValueError:
             return jsonify({"error": "Amount must be a valid number"}), 400
+        if amount_cents is None or amount_cents <= 0:
+            return jsonify({"error": "Amount must be positive"}), 400
+        budget.amount = amount_cents
 
     if 'month' in data:
         try:
@@ -448,8 +421,7 @@ def update_budget(budget_id):
     if 'property_id' in data and data['property_id'] != budget.property_id:
         new_property_id = data['property_id']
         if new_property_id:
-            new_property = Property.query.filter_by(id=new_property_id, user_id=current_user_id).first()
-            if not new_property:
+            if not owns_property(current_user_id, new_property_id):
                 return jsonify({"error": "Property not found"}), 404
         budget.property_id = new_property_id
 
@@ -483,15 +455,15 @@ def delete_budget(budget_id):
     """Delete a budget"""
     current_user_id = int(get_jwt_identity())
 
-    budget = Budget.query.get(budget_id)
+    # Fetch the budget only if it belongs to one of the user's properties
+    budget = (
+        Budget.query.join(Property, Property.id == Budget.property_id)
+        .filter(Budget.id == budget_id, Property.user_id == current_user_id)
+        .first()
+    )
     if not budget:
         return jsonify({"error": "Budget not found"}), 404
 
-    # Verify property ownership
-    property = Property.query.filter_by(id=budget.property_id, user_id=current_user_id).first()
-    if not property:
-        return jsonify({"error": "Budget not found"}), 404
-
     db.session.delete(budget)
     db.session.commit()
 
@@ -502,6 +474,7 @@ def delete_budget(budget_id):
 # Reporting Endpoints
 @finances_bp.route('/reports/monthly-summary', methods=['GET'])
 @jwt_required()
+@cached(Expense, Budget)
 def monthly_summary_report():
     """Get monthly summary of expenses and budget comparison"""
     current_user_id = int(get_jwt_identity())
@@ -551,13 +524,20 @@ def monthly_summary_report():
         month=month_int
     ).all()
 
-    # Organize expenses by category
+    # Organize expenses by category, summing integer cents
     expenses_by_category = {}
+    expense_cents_by_category = {}
     for expense in expenses:
         category = expense.category
         if category not in expenses_by_category:
             expenses_by_category[category] = []
-        expenses_by_category[category].append(expense.to_dict())
+            expense_cents_by_category[category] = 0
+        expenses_by_category[category].append(expense_serializer.dump(expense))
+        expense_cents_by_category[category] += expense.amount
+
+    budget_cents_by_category = {}
+    for budget in budgets:
+        budget_cents_by_category[budget.category] = budget_cents_by_category.get(budget.category, 0) + budget.amount
 
     # Calculate totals and budget comparison
     category_summary = {}
@@ -565,17 +545,12 @@ def monthly_summary_report():
     total_budget = 0
 
     # Get all unique categories from both expenses and budgets
-    all_categories = set(expenses_by_category.keys())
-    for budget in budgets:
-        all_categories.add(budget.category)
+    all_categories = set(expense_cents_by_category) | set(budget_cents_by_category)
 
     for category in all_categories:
-        # Sum expenses for category
-        category_expenses = sum(float(expense['amount']) for expense in expenses_by_category.get(category, []))
+        category_expenses = expense_cents_by_category.get(category, 0)
+        category_budget = budget_cents_by_category.get(category, 0)
         total_expenses += category_expenses
-
-        # Find budget for category
-        category_budget = next((float(budget.amount) for budget in budgets if budget.category == category), 0)
         total_budget += category_budget
 
         # Calculate variance
@@ -583,9 +558,9 @@ def monthly_summary_report():
         variance_percent = (variance / category_budget * 100) if category_budget > 0 else None
 
         category_summary[category] = {
-            'expenses': category_expenses,
-            'budget': category_budget,
-            'variance': variance,
+            'expenses': cents_to_dollars(category_expenses),
+            'budget': cents_to_dollars(category_budget),
+            'variance': cents_to_dollars(variance),
             'variance_percent': variance_percent,
             'status': 'under_budget' if variance >= 0 else 'over_budget',
             'detail': expenses_by_category.get(category, [])
@@ -607,9 +582,9 @@ def monthly_summary_report():
             'month': month_int
         },
         'totals': {
-            'expenses': total_expenses,
-            'budget': total_budget,
-            'variance': total_variance,
+            'expenses': cents_to_dollars(total_expenses),
+            'budget': cents_to_dollars(total_budget),
+            'variance': cents_to_dollars(total_variance),
             'variance_percent': total_variance_percent,
             'status': 'under_budget' if total_variance >= 0 else 'over_budget'
         },
@@ -620,6 +595,7 @@ def monthly_summary_report():
 
 @finances_bp.route('/reports/yearly-summary', methods=['GET'])
 @jwt_required()
+@cached(Expense, Budget)
 def yearly_summary_report():
     """Get yearly summary of expenses by month"""
     current_user_id = int(get_jwt_identity())
@@ -645,21 +621,29 @@ def yearly_summary_report():
     if not property:
         return jsonify({"error": "Property not found"}), 404
 
-    # Get all expenses for the year
+    # Sum expenses for the year by month and category in the database (cents)
     start_date = datetime(year_int, 1, 1).date()
     end_date = datetime(year_int + 1, 1, 1).date()
 
-    expenses = Expense.query.filter(
+    expense_month = extract('month', Expense.date)
+    expense_totals = db.session.query(
+        expense_month,
+        Expense.category,
+        func.sum(Expense.amount)
+    ).filter(
         Expense.property_id == property_id,
         Expense.date >= start_date,
         Expense.date < end_date
-    ).all()
+    ).group_by(expense_month, Expense.category).all()
 
-    # Get all budgets for the year
-    budgets = Budget.query.filter_by(
+    # Sum budgets for the year by month
+    budget_totals = db.session.query(
+        Budget.month,
+        func.sum(Budget.amount)
+    ).filter_by(
         property_id=property_id,
         year=year_int
-    ).all()
+    ).group_by(Budget.month).all()
 
     # Organize expenses by month and category
     monthly_data = {}
@@ -671,35 +655,24 @@ def yearly_summary_report():
         }
 
     # Process expenses
-    for expense in expenses:
-        month = expense.date.month
-        category = expense.category
-
-        if category not in monthly_data[month]['expenses']:
-            monthly_data[month]['expenses'][category] = 0
-
-        monthly_data[month]['expenses'][category] += float(expense.amount)
-        monthly_data[month]['total_expenses'] += float(expense.amount)
+    category_totals = {}
+    for month, category, amount in expense_totals:
+        amount = int(amount)
+        month_data = monthly_data[int(month)]
+        month_data['expenses'][category] = month_data['expenses'].get(category, 0) + amount
+        month_data['total_expenses'] += amount
+        category_totals[category] = category_totals.get(category, 0) + amount
 
     # Process budgets
-    for budget in budgets:
-        month = budget.month
+    for month, amount in budget_totals:
         if month in monthly_data:
-            monthly_data[month]['total_budget'] += float(budget.amount)
+            monthly_data[month]['total_budget'] += int(amount)
 
     # Calculate yearly totals
     yearly_total_expenses = sum(data['total_expenses'] for data in monthly_data.values())
     yearly_total_budget = sum(data['total_budget'] for data in monthly_data.values())
 
-    # Get expenses by category for the entire year
-    category_totals = {}
-    for month_data in monthly_data.values():
-        for category, amount in month_data['expenses'].items():
-            if category not in category_totals:
-                category_totals[category] = 0
-            category_totals[category] += amount
-
-    # Format the response
+    # Format the response, converting cents to dollars
     summary = {
         'property': {
             'id': property.id,
@@ -710,18 +683,24 @@ def yearly_summary_report():
         'year': year_int,
         'monthly_data': {
             str(month): {
-                'total_expenses': data['total_expenses'],
-                'total_budget': data['total_budget'],
-                'variance': data['total_budget'] - data['total_expenses'],
-                'categories': data['expenses']
+                'total_expenses': cents_to_dollars(data['total_expenses']),
+                'total_budget': cents_to_dollars(data['total_budget']),
+                'variance': cents_to_dollars(data['total_budget'] - data['total_expenses']),
+                'categories': {
+                    category: cents_to_dollars(amount)
+                    for category, amount in data['expenses'].items()
+                }
             } for month, data in monthly_data.items()
         },
         'yearly_totals': {
-            'expenses': yearly_total_expenses,
-            'budget': yearly_total_budget,
-            'variance': yearly_total_budget - yearly_total_expenses
+            'expenses': cents_to_dollars(yearly_total_expenses),
+            'budget': cents_to_dollars(yearly_total_budget),
+            'variance': cents_to_dollars(yearly_total_budget - yearly_total_expenses)
         },
-        'category_totals': category_totals
+        'category_totals': {
+            category: cents_to_dollars(amount)
+            for category, amount in category_totals.items()
+        }
     }
 
     return jsonify(summary)
@@ -788,21 +767,22 @@ def property_comparison_report():
     # Group and execute
     results = query.group_by(Expense.property_id, Expense.category).all()
 
-    # Organize results
+    # Sum in cents, then convert once for the response
+    category_cents = {category_name: int(total_amount) for prop_id, category_name, total_amount in results}
+    total_cents = sum(category_cents.values())
+
     property_data = {
         'id': property.id,
         'address': property.address,
         'city': property.city,
         'state': property.state,
-        'categories': {},
-        'total_expenses': 0
+        'categories': {
+            category_name: cents_to_dollars(amount)
+            for category_name, amount in category_cents.items()
+        },
+        'total_expenses': cents_to_dollars(total_cents)
     }
 
-    # Fill in expense data
-    for prop_id, category_name, total_amount in results:
-        property_data['categories'][category_name] = float(total_amount)
-        property_data['total_expenses'] += float(total_amount)
-
     comparison = {
         'period': {
             'year': year_int,
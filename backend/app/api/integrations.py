@@ -1,10 +1,15 @@
 # api/integrations.py
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
 from app import db
 from app.models.api_key import APIKey
 from app.models.maintenance import Maintenance
+from app.models.outbox import WebhookEndpoint
 from app.models.property import Property
 from app.utils.api_key_auth import require_api_key, get_api_user_id
+from app.utils.auth_utils import owns_property
+from app.utils.validators import InvalidWebhookURL, validate_webhook_url
+from app.api.serializers import ha_maintenance_serializer, ha_property_serializer
+from app.services import outbox_service, sync_service
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 
@@ -111,10 +116,152 @@ def toggle_api_key(key_id):
     }), 200
 
 
+# ============================================================================
+# Webhook Endpoint Management (Require JWT authentication)
+# ============================================================================
+
+@integrations_bp.route('/webhooks', methods=['GET'])
+@jwt_required()
+def list_webhooks():
+    """List all webhook endpoints for the current user"""
+    user_id = get_jwt_identity()
+
+    endpoints = WebhookEndpoint.query.filter_by(user_id=user_id).all()
+
+    return jsonify({
+        'webhooks': [endpoint.to_dict() for endpoint in endpoints]
+    }), 200
+
+
+@integrations_bp.route('/webhooks', methods=['POST'])
+@jwt_required()
+def create_webhook():
+    """
+    Register a URL to push change events to, e.g. a Home Assistant webhook trigger
+
+    Body:
+        {
+            "name": "Home Assistant",
+            "url": "http://homeassistant.local:8123/api/webhook/propertypal",
+            "topics": ["maintenance.*", "checklist.*"]
+        }
+    """
+    user_id = get_jwt_identity()
+    data = request.get_json()
+
+    name = data.get('name')
+    url = data.get('url', '')
+    topics = data.get('topics', ['*'])
+
+    if not name:
+        return jsonify({'error': 'Webhook name is required'}), 400
+    try:
+        validate_webhook_url(url, current_app.config.get('WEBHOOK_ALLOW_PRIVATE_HOSTS', False))
+    except InvalidWebhookURL as e:
+        return jsonify({'error': str(e)}), 400
+
+    secret = WebhookEndpoint.generate_secret()
+    endpoint = WebhookEndpoint(
+        user_id=user_id,
+        name=name,
+        url=url,
+        secret=secret,
+        topics=','.join(topics) if isinstance(topics, list) else topics,
+        # Only changes from now on
+        last_event_id=outbox_service.latest_event_id()
+    )
+
+    db.session.add(endpoint)
+    db.session.commit()
+
+    # Return the secret ONLY on creation, like API keys
+    return jsonify({
+        'message': 'Webhook created successfully',
+        'secret': secret,
+        'webhook': endpoint.to_dict(),
+        'warning': 'Save this secret now to verify signatures! You will not be able to see it again.'
+    }), 201
+
+
+@integrations_bp.route('/webhooks/<int:webhook_id>', methods=['DELETE'])
+@jwt_required()
+def delete_webhook(webhook_id):
+    """Delete a webhook endpoint"""
+    user_id = get_jwt_identity()
+
+    endpoint = WebhookEndpoint.query.filter_by(id=webhook_id, user_id=user_id).first()
+
+    if not endpoint:
+        return jsonify({'error': 'Webhook not found'}), 404
+
+    db.session.delete(endpoint)
+    db.session.commit()
+
+    return jsonify({'message': 'Webhook deleted successfully'}), 200
+
+
+@integrations_bp.route('/webhooks/<int:webhook_id>/toggle', methods=['PUT'])
+@jwt_required()
+def toggle_webhook(webhook_id):
+    """Activate or deactivate a webhook endpoint"""
+    user_id = get_jwt_identity()
+
+    endpoint = WebhookEndpoint.query.filter_by(id=webhook_id, user_id=user_id).first()
+
+    if not endpoint:
+        return jsonify({'error': 'Webhook not found'}), 404
+
+    endpoint.is_active = not endpoint.is_active
+    if endpoint.is_active:
+        # Retry straight away
+        endpoint.failures = 0
+        endpoint.next_attempt_at = None
+    db.session.commit()
+
+    return jsonify({
+        'message': f'Webhook {"activated" if endpoint.is_active else "deactivated"}',
+        'webhook': endpoint.to_dict()
+    }), 200
+
+
 # ============================================================================
 # Home Assistant Integration Endpoints (Require API Key authentication)
 # ============================================================================
 
+def _parse_due_date(value):
+    """Parse an ISO date (or datetime) string from Home Assistant into a date"""
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).date()
+
+
+def _apply_task_changes(task, data):
+    """Apply the editable fields present in ``data``; raises ValueError for a bad due_date"""
+    # Parse first so a bad date leaves the task untouched
+    due_date = _parse_due_date(data['due_date']) if 'due_date' in data else task.due_date
+
+    if 'title' in data:
+        task.title = data['title']
+    if 'description' in data:
+        task.description = data['description']
+    if 'status' in data:
+        task.status = data['status']
+        if data['status'] == 'completed':
+            task.completed_at = datetime.utcnow()
+    if 'priority' in data:
+        task.priority = data['priority']
+    task.due_date = due_date
+    task.updated_at = datetime.utcnow()
+
+
+def _ha_task(task):
+    return {
+        'id': task.id,
+        'title': task.title,
+        'status': task.status,
+        'priority': task.priority,
+        'due_date': task.due_date.isoformat() if task.due_date else None
+    }
+
+
 @integrations_bp.route('/ha/maintenance', methods=['GET'])
 @require_api_key('read:maintenance')
 def ha_get_maintenance_tasks():
@@ -148,22 +295,8 @@ def ha_get_maintenance_tasks():
     if priority:
         query = query.filter_by(priority=priority)
 
-    tasks = query.order_by(Maintenance.due_date.asc()).all()
-
     # Format for Home Assistant
-    ha_tasks = []
-    for task in tasks:
-        ha_tasks.append({
-            'id': task.id,
-            'title': task.title,
-            'description': task.description,
-            'status': task.status,
-            'priority': task.priority,
-            'due_date': task.due_date.isoformat() if task.due_date else None,
-            'created_at': task.created_at.isoformat() if task.created_at else None,
-            'completed_at': task.completed_at.isoformat() if task.completed_at else None,
-            'property_id': task.property_id
-        })
+    ha_tasks = ha_maintenance_serializer.dump_query(query.order_by(Maintenance.due_date.asc()))
 
     return jsonify({
         'tasks': ha_tasks,
@@ -171,6 +304,38 @@ def ha_get_maintenance_tasks():
     }), 200
 
 
+@integrations_bp.route('/ha/maintenance/changes', methods=['GET'])
+@require_api_key('read:maintenance')
+def ha_get_maintenance_changes():
+    """
+    Get maintenance tasks created, updated or deleted since the last call
+
+    Headers:
+        X-API-Key: your_api_key_here
+
+    Query Parameters:
+        cursor: from the previous response; omit for a full sync
+        limit: changes per page (default 100, max 500)
+    """
+    user_id = get_api_user_id()
+
+    limit = min(max(request.args.get('limit', 100, type=int), 1), 500)
+    try:
+        changes = sync_service.changes_since(user_id, 'maintenance', request.args.get('cursor'), limit,
+                                             serializer=ha_maintenance_serializer)
+    except sync_service.CursorExpired as e:
+        return jsonify({'error': str(e)}), 410
+    except sync_service.CursorError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify({
+        'tasks': changes['changed'],
+        'deleted': changes['deleted'],
+        'cursor': changes['cursor'],
+        'has_more': changes['has_more']
+    }), 200
+
+
 @integrations_bp.route('/ha/maintenance', methods=['POST'])
 @require_api_key('write:maintenance')
 def ha_create_maintenance_task():
@@ -229,13 +394,7 @@ def ha_create_maintenance_task():
 
     return jsonify({
         'message': 'Maintenance task created',
-        'task': {
-            'id': task.id,
-            'title': task.title,
-            'status': task.status,
-            'priority': task.priority,
-            'due_date': task.due_date.isoformat() if task.due_date else None
-        }
+        'task': _ha_task(task)
     }), 201
 
 
@@ -263,24 +422,10 @@ def ha_update_maintenance_task(task_id):
 
     data = request.get_json()
 
-    # Update fields
-    if 'title' in data:
-        task.title = data['title']
-    if 'description' in data:
-        task.description = data['description']
-    if 'status' in data:
-        task.status = data['status']
-        if data['status'] == 'completed':
-            task.completed_at = datetime.utcnow()
-    if 'priority' in data:
-        task.priority = data['priority']
-    if 'due_date' in data:
-        try:
-            task.due_date = datetime.fromisoformat(data['due_date'].replace('Z', '+00:00')).date()
-        except:
-            return jsonify({'error': 'Invalid due_date format'}), 400
-
-    task.updated_at = datetime.utcnow()
+    try:
+        _apply_task_changes(task, data)
+    except (AttributeError, ValueError):
+        return jsonify({'error': 'Invalid due_date format'}), 400
     db.session.commit()
 
     return jsonify({
@@ -311,20 +456,157 @@ def ha_delete_maintenance_task(task_id):
     return jsonify({'message': 'Task deleted'}), 200
 
 
+@integrations_bp.route('/ha/maintenance/batch', methods=['POST'])
+@require_api_key('write:maintenance')
+def ha_batch_maintenance_tasks():
+    """
+    Create, update and delete several maintenance tasks in one call
+
+    Headers:
+        X-API-Key: your_api_key_here
+
+    Body:
+        {
+            "operations": [
+                {"op": "create", "title": "Check sump pump", "property_id": 1},
+                {"op": "update", "id": 12, "status": "completed"},
+                {"op": "delete", "id": 15}
+            ]
+        }
+
+    Valid operations are applied together in one transaction; invalid ones
+    are skipped. ``results`` has one entry per operation, in order.
+    """
+    user_id = get_api_user_id()
+    data = request.get_json(silent=True) or {}
+
+    operations = data.get('operations')
+    max_operations = current_app.config.get('HA_BATCH_MAX_OPERATIONS', 100)
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'error': 'operations must be a non-empty list'}), 400
+    if len(operations) > max_operations:
+        return jsonify({'error': f'At most {max_operations} operations per batch'}), 400
+
+    # Load every task the batch touches in one query
+    task_ids = {operation.get('id') for operation in operations
+                if isinstance(operation, dict) and isinstance(operation.get('id'), int)}
+    tasks = {}
+    if task_ids:
+        tasks = {task.id: task for task in
+                 Maintenance.query.filter(Maintenance.user_id == user_id, Maintenance.id.in_(task_ids))}
+
+    results = []
+    for index, operation in enumerate(operations):
+        result = {'index': index}
+        results.append(result)
+        if not isinstance(operation, dict):
+            result['error'] = 'Operation must be an object'
+            continue
+
+        kind = result['op'] = operation.get('op')
+        if kind == 'create':
+            if not operation.get('title'):
+                result['error'] = 'Title is required'
+                continue
+            # The user's property ids are loaded once for the whole batch
+            property_id = operation.get('property_id')
+            if property_id and not owns_property(user_id, property_id):
+                result['error'] = 'Property not found or access denied'
+                continue
+            try:
+                due_date = _parse_due_date(operation['due_date']) if operation.get('due_date') else None
+            except (AttributeError, ValueError):
+                result['error'] = 'Invalid due_date format. Use ISO format (YYYY-MM-DD)'
+                continue
+
+            task = Maintenance(
+                user_id=user_id,
+                property_id=property_id,
+                title=operation['title'],
+                description=operation.get('description'),
+                priority=operation.get('priority', 'medium'),
+                status=operation.get('status', 'pending'),
+                due_date=due_date
+            )
+            db.session.add(task)
+            result['task'] = task
+
+        elif kind in ('update', 'delete'):
+            task_id = operation.get('id')
+            task = tasks.get(task_id) if isinstance(task_id, int) else None
+            if task is None:
+                result['error'] = 'Task not found'
+                continue
+            if kind == 'delete':
+                db.session.delete(task)
+                del tasks[task.id]
+                result['id'] = task.id
+                continue
+            try:
+                _apply_task_changes(task, operation)
+            except (AttributeError, ValueError):
+                result['error'] = 'Invalid due_date format'
+                continue
+            result['task'] = task
+
+        else:
+            result['error'] = 'op must be one of: create, update, delete'
+
+    # A single flush, so the unit of work sends each kind of statement for
+    # all tasks at once; read the results before commit expires the tasks
+    db.session.flush()
+    for result in results:
+        if 'task' in result:
+            result['task'] = _ha_task(result['task'])
+    failed = sum('error' in result for result in results)
+    db.session.commit()
+
+    return jsonify({
+        'results': results,
+        'succeeded': len(results) - failed,
+        'failed': failed
+    }), 200
+
+
 @integrations_bp.route('/ha/properties', methods=['GET'])
 @require_api_key('read:maintenance')
 def ha_get_properties():
     """Get all properties for the user"""
     user_id = get_api_user_id()
 
-    properties = Property.query.filter_by(user_id=user_id).all()
+    query = Property.query.filter_by(user_id=user_id).order_by(Property.id)
+    properties = ha_property_serializer.dump_query(query)
 
     return jsonify({
-        'properties': [{
-            'id': p.id,
-            'address': p.address,
-            'city': p.city,
-            'state': p.state,
-            'zip_code': p.zip_code
-        } for p in properties]
+        'properties': properties
     }), 200
+
+
+@integrations_bp.route('/ha/events', methods=['GET'])
+@require_api_key('read:maintenance')
+def ha_event_stream():
+    """
+    Stream maintenance, checklist and document changes as Server-Sent Events
+
+    Headers:
+        X-API-Key: your_api_key_here
+        Last-Event-ID: resume after this event (sent automatically on reconnect)
+
+    Query Parameters:
+        since: Resume after this event ID (default: only new changes)
+    """
+    user_id = get_api_user_id()
+
+    after_id = request.headers.get('Last-Event-ID', type=int)
+    if after_id is None:
+        after_id = request.args.get('since', type=int)
+    if after_id is None:
+        after_id = outbox_service.latest_event_id()
+    # Don't hold the request's connection for the life of the stream
+    db.session.remove()
+
+    response = Response(stream_with_context(outbox_service.stream_events(user_id, after_id)),
+                        mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Tell nginx not to buffer the stream
+    return response
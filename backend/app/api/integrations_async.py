@@ -0,0 +1,212 @@
+# api/integrations_async.py
+"""
+Async variants of the read-only Home Assistant endpoints in
+``app/api/integrations.py``, served on an event loop by ``app/asgi.py``.
+
+Polling from many Home Assistant instances is almost all waiting on the
+database and the network. Here a waiting request is a suspended coroutine
+rather than a blocked worker thread, so one process can keep thousands of
+polls and event streams open. Queries run on async SQLAlchemy (asyncpg or
+aiosqlite) through a small shared connection pool.
+
+Responses and API-key checks match the WSGI endpoints. Writes stay on the
+WSGI app: the outbox, tombstones, search index and cache invalidation hang
+off the Flask session's flush events.
+"""
+import asyncio
+import time
+from datetime import datetime
+from functools import wraps
+
+from quart import Blueprint, Response, current_app, g, jsonify, request, stream_with_context
+from sqlalchemy import select, update
+from app.api.serializers import ha_maintenance_serializer, ha_property_serializer
+from app.models.api_key import APIKey
+from app.models.maintenance import Maintenance
+from app.models.property import Property
+from app.services import outbox_service, sync_service
+from app.services.rate_limiter import MemoryBackend, forwarded_ip, rate_limiter, too_many_requests
+from app.utils.api_key_auth import api_rate_limit_buckets, check_api_key, read_api_key
+
+integrations_async_bp = Blueprint('integrations_async', __name__)
+
+
+def require_api_key_async(required_scope=None):
+    """
+    ``require_api_key`` for async views. Also opens the request's database
+    session as ``g.db_session``, closed when the view returns.
+    """
+    def decorator(f):
+        @wraps(f)
+        async def decorated_function(*args, **kwargs):
+            api_key, error = read_api_key(request.headers)
+            if error:
+                return jsonify({'error': error}), 401
+
+            key_hash = APIKey.hash_key(api_key)
+            ip = forwarded_ip(request.remote_addr, request.headers.get('X-Forwarded-For'),
+                              current_app.config.get('RATE_LIMIT_TRUSTED_PROXIES', 0))
+            buckets = api_rate_limit_buckets(current_app.config, ip, key_hash)
+            if isinstance(rate_limiter.backend, MemoryBackend):
+                retry_after = rate_limiter.check(buckets)
+            else:
+                # A network round trip; keep it off the event loop
+                retry_after = await asyncio.to_thread(rate_limiter.check, buckets)
+            if retry_after:
+                return too_many_requests(retry_after)
+
+            async with current_app.extensions['async_session']() as session:
+                api_key_obj = (await session.execute(
+                    select(APIKey).where(APIKey.key_hash == key_hash)
+                )).scalar()
+
+                rejection = check_api_key(api_key_obj, required_scope)
+                if rejection:
+                    error, status = rejection
+                    return jsonify({'error': error}), status
+
+                await session.execute(
+                    update(APIKey).where(APIKey.id == api_key_obj.id).values(last_used_at=datetime.utcnow())
+                )
+                await session.commit()
+
+                g.api_user_id = api_key_obj.user_id
+                g.db_session = session
+                return await f(*args, **kwargs)
+
+        return decorated_function
+    return decorator
+
+
+def in_flask_context(fn):
+    """
+    Wrap a sync service call for ``run_sync``: the services read settings
+    from Flask's ``current_app``, so the call runs inside the WSGI app's
+    context.
+    """
+    flask_app = current_app.extensions['flask_app']
+
+    def call(*args, **kwargs):
+        with flask_app.app_context():
+            return fn(*args, **kwargs)
+    return call
+
+
+@integrations_async_bp.route('/ha/maintenance', methods=['GET'])
+@require_api_key_async('read:maintenance')
+async def ha_get_maintenance_tasks():
+    """Get all maintenance tasks for Home Assistant (see the WSGI endpoint)"""
+    query = select(*ha_maintenance_serializer.columns).where(Maintenance.user_id == g.api_user_id)
+
+    # Apply filters
+    property_id = request.args.get('property_id', type=int)
+    status = request.args.get('status')
+    priority = request.args.get('priority')
+
+    if property_id:
+        query = query.where(Maintenance.property_id == property_id)
+    if status:
+        query = query.where(Maintenance.status == status)
+    if priority:
+        query = query.where(Maintenance.priority == priority)
+
+    rows = await g.db_session.execute(query.order_by(Maintenance.due_date.asc()))
+    ha_tasks = ha_maintenance_serializer.dump_rows(rows)
+
+    return jsonify({
+        'tasks': ha_tasks,
+        'count': len(ha_tasks)
+    }), 200
+
+
+@integrations_async_bp.route('/ha/maintenance/changes', methods=['GET'])
+@require_api_key_async('read:maintenance')
+async def ha_get_maintenance_changes():
+    """Get maintenance tasks changed since the last call (see the WSGI endpoint)"""
+    user_id = g.api_user_id
+    cursor = request.args.get('cursor')
+    limit = min(max(request.args.get('limit', 100, type=int), 1), 500)
+    changes_since = in_flask_context(sync_service.changes_since)
+    try:
+        changes = await g.db_session.run_sync(
+            lambda session: changes_since(user_id, 'maintenance', cursor, limit,
+                                          serializer=ha_maintenance_serializer, session=session)
+        )
+    except sync_service.CursorExpired as e:
+        return jsonify({'error': str(e)}), 410
+    except sync_service.CursorError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify({
+        'tasks': changes['changed'],
+        'deleted': changes['deleted'],
+        'cursor': changes['cursor'],
+        'has_more': changes['has_more']
+    }), 200
+
+
+@integrations_async_bp.route('/ha/properties', methods=['GET'])
+@require_api_key_async('read:maintenance')
+async def ha_get_properties():
+    """Get all properties for the user"""
+    rows = await g.db_session.execute(
+        select(*ha_property_serializer.columns)
+        .where(Property.user_id == g.api_user_id)
+        .order_by(Property.id)
+    )
+
+    return jsonify({
+        'properties': ha_property_serializer.dump_rows(rows)
+    }), 200
+
+
+@integrations_async_bp.route('/ha/events', methods=['GET'])
+@require_api_key_async('read:maintenance')
+async def ha_event_stream():
+    """Stream maintenance, checklist and document changes as Server-Sent Events (see the WSGI endpoint)"""
+    user_id = g.api_user_id
+
+    after_id = request.headers.get('Last-Event-ID', type=int)
+    if after_id is None:
+        after_id = request.args.get('since', type=int)
+    if after_id is None:
+        after_id = await g.db_session.run_sync(in_flask_context(outbox_service.latest_event_id))
+
+    events = stream_with_context(_stream_events)(user_id, after_id)
+    response = Response(events, mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Tell nginx not to buffer the stream
+    response.timeout = None  # The stream ends itself after OUTBOX_STREAM_SECONDS
+    return response
+
+
+async def _stream_events(user_id, after_id):
+    """
+    ``outbox_service.stream_events`` on the event loop. Only polls: the
+    in-process wakeup there is for commits made by WSGI threads.
+    """
+    config = current_app.config
+    poll = config.get('OUTBOX_POLL_SECONDS', 1)
+    heartbeat = config.get('OUTBOX_HEARTBEAT_SECONDS', 15)
+    deadline = time.monotonic() + config.get('OUTBOX_STREAM_SECONDS', 300)
+    engine = current_app.extensions['async_engine']
+    events_after = in_flask_context(outbox_service.events_after)
+    to_json = current_app.json.dumps
+
+    yield f'retry: {int(poll * 1000)}\n\n'.encode()
+    quiet_since = time.monotonic()
+    while time.monotonic() < deadline:
+        async with engine.connect() as connection:
+            rows = await connection.run_sync(events_after, user_id, after_id)
+        for row in rows:
+            yield f'id: {row.id}\nevent: {row.topic}\ndata: {to_json(outbox_service.event_envelope(row))}\n\n'.encode()
+            after_id = row.id
+        if rows:
+            quiet_since = time.monotonic()
+            continue
+
+        if time.monotonic() - quiet_since >= heartbeat:
+            # Comment line; keeps proxies from closing an idle connection
+            yield b': keepalive\n\n'
+            quiet_since = time.monotonic()
+        await asyncio.sleep(poll)
@@ -3,14 +3,17 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models.maintenance import Maintenance
-from app.models.property import Property
 from app.models.user import User
+from app.api.serializers import maintenance_serializer
+from app.services.response_cache import cached
+from app.utils.auth_utils import owns_property
 from datetime import datetime
 
 maintenance_bp = Blueprint('maintenance', __name__)
 
 @maintenance_bp.route('/', methods=['GET'])
 @jwt_required()
+@cached(Maintenance)
 def get_maintenance_requests():
     """Get all maintenance requests for the current user"""
     current_user_id = int(get_jwt_identity())
@@ -19,8 +22,7 @@ def get_maintenance_requests():
 
     # If property_id is provided, verify ownership
     if property_id:
-        property = Property.query.filter_by(id=property_id, user_id=current_user_id).first()
-        if not property:
+        if not owns_property(current_user_id, property_id):
             return jsonify({"error": "Property not found"}), 404
 
         query = Maintenance.query.filter_by(property_id=property_id)
@@ -33,23 +35,7 @@ def get_maintenance_requests():
     if status:
         query = query.filter_by(status=status)
 
-    maintenance_requests = query.order_by(Maintenance.created_at.desc()).all()
-
-    result = []
-    for req in maintenance_requests:
-        result.append({
-            'id': req.id,
-            'title': req.title,
-            'description': req.description,
-            'priority': req.priority,
-            'status': req.status,
-            'due_date': req.due_date.isoformat() if req.due_date else None,
-            'created_at': req.created_at.isoformat(),
-            'updated_at': req.updated_at.isoformat(),
-            'completed_at': req.completed_at.isoformat() if req.completed_at else None,
-            'property_id': req.property_id,
-            'created_by': req.user_id
-        })
+    result = maintenance_serializer.dump_query(query.order_by(Maintenance.created_at.desc()))
 
     return jsonify(result)
 
@@ -68,8 +54,7 @@ def create_maintenance_request():
     # If a property_id is provided, verify ownership
     property_id = data.get('property_id')
     if property_id:
-        property = Property.query.filter_by(id=property_id, user_id=current_user_id).first()
-        if not property:
+        if not owns_property(current_user_id, property_id):
             return jsonify({"error": "Property not found"}), 404
 
     # Create new maintenance request
@@ -102,18 +87,7 @@ def get_maintenance_request(request_id):
     if not maintenance_request:
         return jsonify({"error": "Maintenance request not found"}), 404
 
-    result = {
-        'id': maintenance_request.id,
-        'title': maintenance_request.title,
-        'description': maintenance_request.description,
-        'priority': maintenance_request.priority,
-        'status': maintenance_request.status,
-        'due_date': maintenance_request.due_date.isoformat() if maintenance_request.due_date else None,
-        'created_at': maintenance_request.created_at.isoformat(),
-        'updated_at': maintenance_request.updated_at.isoformat(),
-        'completed_at': maintenance_request.completed_at.isoformat() if maintenance_request.completed_at else None,
-        'property_id': maintenance_request.property_id
-    }
+    result = maintenance_serializer.dump(maintenance_request)
 
     return jsonify(result)
 
@@ -151,8 +125,7 @@ def update_maintenance_request(request_id):
     if 'property_id' in data and data['property_id'] != maintenance_request.property_id:
         new_property_id = data['property_id']
         if new_property_id:
-            property = Property.query.filter_by(id=new_property_id, user_id=current_user_id).first()
-            if not property:
+            if not owns_property(current_user_id, new_property_id):
                 return jsonify({"error": "Property not found"}), 404
         maintenance_request.property_id = new_property_id
 
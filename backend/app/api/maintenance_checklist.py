@@ -4,7 +4,9 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models.maintenance_checklist import MaintenanceChecklistItem
 from app.models.user import User
-from app.models.property import Property
+from app.api.serializers import checklist_item_serializer
+from app.services.response_cache import cached
+from app.utils.auth_utils import owns_property
 from datetime import datetime
 
 # Create blueprint for checklist routes
@@ -12,6 +14,7 @@ checklist_bp = Blueprint('maintenance_checklist', __name__, url_prefix='/api/mai
 
 @checklist_bp.route('/<season>', methods=['GET'])
 @jwt_required()
+@cached(MaintenanceChecklistItem)
 def get_seasonal_checklist(season):
     """Get seasonal maintenance checklist for the current user"""
     current_user_id = int(get_jwt_identity())
@@ -24,8 +27,7 @@ def get_seasonal_checklist(season):
 
     # If property_id is provided, verify ownership
     if property_id:
-        property = Property.query.filter_by(id=property_id, user_id=current_user_id).first()
-        if not property:
+        if not owns_property(current_user_id, property_id):
             return jsonify({"error": "Property not found"}), 404
 
         # Build the query for this property
@@ -41,33 +43,20 @@ def get_seasonal_checklist(season):
         )
 
     # Execute the query
-    checklist_items = query.order_by(MaintenanceChecklistItem.is_completed,
-                                    MaintenanceChecklistItem.task).all()
+    result = checklist_item_serializer.dump_query(
+        query.order_by(MaintenanceChecklistItem.is_completed, MaintenanceChecklistItem.task)
+    )
 
     # If no items exist for this property, create default items
-    if not checklist_items and property_id:
+    if not result and property_id:
         checklist_items = create_default_checklist_items(current_user_id, property_id, season)
-
-    result = []
-    for item in checklist_items:
-        result.append({
-            'id': item.id,
-            'task': item.task,
-            'description': item.description,
-            'season': item.season,
-            'is_completed': item.is_completed,
-            'completed_at': item.completed_at.isoformat() if item.completed_at else None,
-            'is_default': item.is_default,
-            'property_id': item.property_id,
-            'created_at': item.created_at.isoformat(),
-            'updated_at': item.updated_at.isoformat(),
-            'created_by': item.user_id
-        })
+        result = checklist_item_serializer.dump_all(checklist_items)
 
     return jsonify(result)
 
 @checklist_bp.route('/', methods=['GET'])
 @jwt_required()
+@cached(MaintenanceChecklistItem)
 def get_all_checklists():
     """Get all checklist items for the current user, optionally filtered by property"""
     current_user_id = int(get_jwt_identity())
@@ -75,8 +64,7 @@ def get_all_checklists():
 
     # If property_id is provided, verify ownership
     if property_id:
-        property = Property.query.filter_by(id=property_id, user_id=current_user_id).first()
-        if not property:
+        if not owns_property(current_user_id, property_id):
             return jsonify({"error": "Property not found"}), 404
 
         # Build the query for this property
@@ -86,9 +74,11 @@ def get_all_checklists():
         query = MaintenanceChecklistItem.query.filter_by(user_id=current_user_id)
 
     # Execute the query
-    items = query.order_by(MaintenanceChecklistItem.season,
-                          MaintenanceChecklistItem.is_completed,
-                          MaintenanceChecklistItem.task).all()
+    items = checklist_item_serializer.dump_query(
+        query.order_by(MaintenanceChecklistItem.season,
+                       MaintenanceChecklistItem.is_completed,
+                       MaintenanceChecklistItem.task)
+    )
 
     # Group items by season
     result = {}
@@ -96,19 +86,7 @@ def get_all_checklists():
         result[season] = []
 
     for item in items:
-        result[item.season].append({
-            'id': item.id,
-            'task': item.task,
-            'description': item.description,
-            'season': item.season,
-            'is_completed': item.is_completed,
-            'completed_at': item.completed_at.isoformat() if item.completed_at else None,
-            'is_default': item.is_default,
-            'property_id': item.property_id,
-            'created_at': item.created_at.isoformat(),
-            'updated_at': item.updated_at.isoformat(),
-            'created_by': item.user_id
-        })
+        result[item['season']].append(item)
 
     # Check if any seasons have no items for a specific property, create defaults for them
     if property_id:
@@ -116,20 +94,7 @@ def get_all_checklists():
         for season in ['Spring', 'Summer', 'Fall', 'Winter']:
             if not result[season]:
                 new_items = create_default_checklist_items(current_user_id, property_id_int, season)
-                for item in new_items:
-                    result[season].append({
-                        'id': item.id,
-                        'task': item.task,
-                        'description': item.description,
-                        'season': item.season,
-                        'is_completed': item.is_completed,
-                        'completed_at': item.completed_at.isoformat() if item.completed_at else None,
-                        'is_default': item.is_default,
-                        'property_id': item.property_id,
-                        'created_at': item.created_at.isoformat(),
-                        'updated_at': item.updated_at.isoformat(),
-                        'created_by': item.user_id
-                    })
+                result[season] = checklist_item_serializer.dump_all(new_items)
 
     return jsonify(result)
 
@@ -167,19 +132,10 @@ def create_checklist_item():
     db.session.add(new_item)
     db.session.commit()
 
-    return jsonify({
-        'id': new_item.id,
-        'task': new_item.task,
-        'description': new_item.description,
-        'season': new_item.season,
-        'is_completed': new_item.is_completed,
-        'completed_at': new_item.completed_at.isoformat() if new_item.completed_at else None,
-        'is_default': new_item.is_default,
-        'property_id': new_item.property_id,
-        'created_at': new_item.created_at.isoformat(),
-        'updated_at': new_item.updated_at.isoformat(),
-        'message': 'Checklist item created successfully'
-    }), 201
+    result = checklist_item_serializer.dump(new_item)
+    result['message'] = 'Checklist item created successfully'
+
+    return jsonify(result), 201
 
 @checklist_bp.route('/<int:item_id>', methods=['GET'])
 @jwt_required()
@@ -195,18 +151,7 @@ def get_checklist_item(item_id):
     if not item:
         return jsonify({"error": "Checklist item not found or access denied"}), 404
 
-    result = {
-        'id': item.id,
-        'task': item.task,
-        'description': item.description,
-        'season': item.season,
-        'is_completed': item.is_completed,
-        'completed_at': item.completed_at.isoformat() if item.completed_at else None,
-        'is_default': item.is_default,
-        'property_id': item.property_id,
-        'created_at': item.created_at.isoformat(),
-        'updated_at': item.updated_at.isoformat()
-    }
+    result = checklist_item_serializer.dump(item)
 
     return jsonify(result)
 
@@ -258,19 +203,10 @@ def update_checklist_item(item_id):
 
     db.session.commit()
 
-    return jsonify({
-        'id': item.id,
-        'task': item.task,
-        'description': item.description,
-        'season': item.season,
-        'is_completed': item.is_completed,
-        'completed_at': item.completed_at.isoformat() if item.completed_at else None,
-        'is_default': item.is_default,
-        'property_id': item.property_id,
-        'created_at': item.created_at.isoformat(),
-        'updated_at': item.updated_at.isoformat(),
-        'message': 'Checklist item updated successfully'
-    })
+    result = checklist_item_serializer.dump(item)
+    result['message'] = 'Checklist item updated successfully'
+
+    return jsonify(result)
 
 @checklist_bp.route('/<int:item_id>/toggle', methods=['PUT'])
 @jwt_required()
@@ -347,27 +283,17 @@ def reset_seasonal_checklist(season):
     if property_id:
         query = query.filter_by(property_id=property_id)
 
-    query.delete()
+    # One by one through the session, so the flush listeners write sync
+    # tombstones and checklist.deleted events for each item
+    for item in query.all():
+        db.session.delete(item)
     db.session.commit()
 
     # Create new default items
     property_id_int = int(property_id) if property_id else None
     checklist_items = create_default_checklist_items(current_user_id, property_id_int, season)
 
-    result = []
-    for item in checklist_items:
-        result.append({
-            'id': item.id,
-            'task': item.task,
-            'description': item.description,
-            'season': item.season,
-            'is_completed': item.is_completed,
-            'completed_at': item.completed_at.isoformat() if item.completed_at else None,
-            'is_default': item.is_default,
-            'property_id': item.property_id,
-            'created_at': item.created_at.isoformat(),
-            'updated_at': item.updated_at.isoformat()
-        })
+    result = checklist_item_serializer.dump_all(checklist_items)
 
     return jsonify({
         'message': f'Checklist for {season} has been reset to defaults',
@@ -421,16 +347,11 @@ def batch_update_checklist():
 
             item.is_completed = item_data['is_completed']
 
-        updated_items.append({
-            'id': item.id,
-            'task': item.task,
-            'description': item.description,
-            'season': item.season,
-            'is_completed': item.is_completed,
-            'completed_at': item.completed_at.isoformat() if item.completed_at else None,
-            'is_default': item.is_default
-        })
+        updated_items.append(item)
 
+    # Serialize after the flush but before commit expires the instances
+    db.session.flush()
+    updated_items = checklist_item_serializer.dump_all(updated_items)
     db.session.commit()
 
     return jsonify({
@@ -441,6 +362,7 @@ def batch_update_checklist():
 
 @checklist_bp.route('/stats', methods=['GET'])
 @jwt_required()
+@cached(MaintenanceChecklistItem)
 def get_checklist_stats():
     """Get statistics about checklist completion by season"""
     current_user_id = int(get_jwt_identity())
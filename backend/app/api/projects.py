@@ -3,14 +3,18 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models.project import Project
-from app.models.property import Property
 from app.models.user import User
+from app.utils.money import to_cents
+from app.api.serializers import project_serializer
+from app.services.response_cache import cached
+from app.utils.auth_utils import owns_property
 from datetime import datetime
 
 projects_bp = Blueprint('projects', __name__)
 
 @projects_bp.route('/', methods=['GET'])
 @jwt_required()
+@cached(Project)
 def get_projects():
     """Get all projects for the current user"""
     current_user_id = int(get_jwt_identity())
@@ -20,8 +24,7 @@ def get_projects():
 
     # If a specific property is requested, verify ownership
     if property_id:
-        property = Property.query.filter_by(id=property_id, user_id=current_user_id).first()
-        if not property:
+        if not owns_property(current_user_id, property_id):
             return jsonify({"error": "Property not found"}), 404
 
         query = Project.query.filter_by(property_id=property_id)
@@ -34,24 +37,7 @@ def get_projects():
         query = query.filter_by(status=status)
 
     # Execute query and order results
-    projects = query.order_by(Project.created_at.desc()).all()
-
-    result = []
-    for project in projects:
-        result.append({
-            'id': project.id,
-            'name': project.name,
-            'description': project.description,
-            'status': project.status,
-            'budget': project.budget,
-            'spent': project.spent,
-            'start_date': project.start_date.isoformat() if project.start_date else None,
-            'projected_end_date': project.projected_end_date.isoformat() if project.projected_end_date else None,
-            'completed_date': project.completed_date.isoformat() if project.completed_date else None,
-            'created_at': project.created_at.isoformat(),
-            'updated_at': project.updated_at.isoformat(),
-            'property_id': project.property_id
-        })
+    result = project_serializer.dump_query(query.order_by(Project.created_at.desc()))
 
     return jsonify(result)
 
@@ -70,10 +56,16 @@ def create_project():
     # If a property_id is provided, verify ownership
     property_id = data.get('property_id')
     if property_id:
-        property = Property.query.filter_by(id=property_id, user_id=current_user_id).first()
-        if not property:
+        if not owns_property(current_user_id, property_id):
             return jsonify({"error": "Property not found"}), 404
 
+    # Convert money fields to cents
+    try:
+        budget = to_cents(data.get('budget'))
+        spent = to_cents(data.get('spent', 0))
+    except ValueError:
+        return jsonify({"error": "Budget and spent must be valid numbers"}), 400
+
     # Create new project
     new_project = Project(
         user_id=current_user_id,
@@ -81,8 +73,8 @@ def create_project():
         name=data.get('name'),
         description=data.get('description', ''),
         status=data.get('status', 'planning'),
-        budget=data.get('budget'),
-        spent=data.get('spent', 0),
+        budget=budget,
+        spent=spent,
         start_date=datetime.strptime(data.get('start_date'), '%Y-%m-%d').date() if data.get('start_date') else None,
         projected_end_date=datetime.strptime(data.get('projected_end_date'), '%Y-%m-%d').date() if data.get('projected_end_date') else None
     )
@@ -106,20 +98,7 @@ def get_project(project_id):
     if not project:
         return jsonify({"error": "Project not found"}), 404
 
-    result = {
-        'id': project.id,
-        'name': project.name,
-        'description': project.description,
-        'status': project.status,
-        'budget': project.budget,
-        'spent': project.spent,
-        'start_date': project.start_date.isoformat() if project.start_date else None,
-        'projected_end_date': project.projected_end_date.isoformat() if project.projected_end_date else None,
-        'completed_date': project.completed_date.isoformat() if project.completed_date else None,
-        'created_at': project.created_at.isoformat(),
-        'updated_at': project.updated_at.isoformat(),
-        'property_id': project.property_id
-    }
+    result = project_serializer.dump(project)
 
     return jsonify(result)
 
@@ -154,10 +133,16 @@ def update_project(project_id):
             project.completed_date = None
 
     if 'budget' in data:
-        project.budget = data['budget']
+        try:
+            project.budget = to_cents(data['budget'])
+        except ValueError:
+            return jsonify({"error": "Budget must be a valid number"}), 400
 
     if 'spent' in data:
-        project.spent = data['spent']
+        try:
+            project.spent = to_cents(data['spent'])
+        except ValueError:
+            return jsonify({"error": "Spent must be a valid number"}), 400
 
     if 'start_date' in data and data['start_date']:
         project.start_date = datetime.strptime(data['start_date'], '%Y-%m-%d').date()
@@ -169,8 +154,7 @@ def update_project(project_id):
     if 'property_id' in data and data['property_id'] != project.property_id:
         new_property_id = data['property_id']
         if new_property_id:
-            property = Property.query.filter_by(id=new_property_id, user_id=current_user_id).first()
-            if not property:
+            if not owns_property(current_user_id, new_property_id):
                 return jsonify({"error": "Property not found"}), 404
         project.property_id = new_property_id
 
@@ -4,12 +4,16 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.property import Property
 from app.models.user import User
 from app import db
+from app.utils.money import to_cents
+from app.api.serializers import property_serializer
+from app.services.response_cache import cached
 from datetime import datetime
 
 properties_bp = Blueprint('properties', __name__)
 
 @properties_bp.route('/', methods=['GET'])
 @jwt_required()
+@cached(Property)
 def get_properties():
     """Get the user's property (single property per instance)"""
     current_user_id = int(get_jwt_identity())
@@ -21,24 +25,10 @@ def get_properties():
         return jsonify([]), 200  # Return empty array for compatibility
 
     # Return as array for frontend compatibility
-    properties_data = [{
-        'id': property.id,
-        'address': property.address,
-        'city': property.city,
-        'state': property.state,
-        'zip': property.zip,
-        'property_type': property.property_type,
-        'status': property.status,
-        'purchase_date': property.purchase_date.isoformat() if property.purchase_date else None,
-        'purchase_price': property.purchase_price,
-        'current_value': property.current_value,
-        'bedrooms': property.bedrooms,
-        'bathrooms': property.bathrooms,
-        'square_footage': property.square_footage,
-        'is_primary_residence': True,  # Always primary in single-property mode
-        'created_at': property.created_at.isoformat(),
-        'role': 'owner'  # Always owner in single-user mode
-    }]
+    property_data = property_serializer.dump(property)
+    property_data['is_primary_residence'] = True  # Always primary in single-property mode
+    property_data['role'] = 'owner'  # Always owner in single-user mode
+    properties_data = [property_data]
 
     return jsonify(properties_data), 200
 
@@ -63,6 +53,13 @@ def create_property():
         if field not in data:
             return jsonify({"error": f"Missing required field: {field}"}), 400
 
+    # Convert money fields to cents
+    try:
+        purchase_price = to_cents(data.get('purchase_price'))
+        current_value = to_cents(data.get('current_value'))
+    except ValueError:
+        return jsonify({"error": "Purchase price and current value must be valid numbers"}), 400
+
     # Create new property
     new_property = Property(
         user_id=current_user_id,
@@ -76,8 +73,8 @@ def create_property():
         bathrooms=data.get('bathrooms'),
         square_footage=data.get('square_footage'),
         purchase_date=data.get('purchase_date'),
-        purchase_price=data.get('purchase_price'),
-        current_value=data.get('current_value'),
+        purchase_price=purchase_price,
+        current_value=current_value,
         description=data.get('description', ''),
         is_primary_residence=True  # Always primary in single-property mode
     )
@@ -103,23 +100,8 @@ def get_property(property_id):
     if not property:
         return jsonify({"error": "Property not found"}), 404
 
-    property_data = {
-        'id': property.id,
-        'address': property.address,
-        'city': property.city,
-        'state': property.state,
-        'zip': property.zip,
-        'property_type': property.property_type,
-        'status': property.status,
-        'purchase_date': property.purchase_date.isoformat() if property.purchase_date else None,
-        'purchase_price': property.purchase_price,
-        'current_value': property.current_value,
-        'bedrooms': property.bedrooms,
-        'bathrooms': property.bathrooms,
-        'square_footage': property.square_footage,
-        'created_at': property.created_at.isoformat(),
-        'role': 'owner'  # Always owner in single-user mode
-    }
+    property_data = property_serializer.dump(property)
+    property_data['role'] = 'owner'  # Always owner in single-user mode
 
     return jsonify(property_data), 200
 
@@ -159,9 +141,15 @@ def update_property(property_id):
     if 'purchase_date' in data:
         property.purchase_date = data['purchase_date']
     if 'purchase_price' in data:
-        property.purchase_price = data['purchase_price']
+        try:
+            property.purchase_price = to_cents(data['purchase_price'])
+        except ValueError:
+            return jsonify({"error": "Purchase price must be a valid number"}), 400
     if 'current_value' in data:
-        property.current_value = data['current_value']
+        try:
+            property.current_value = to_cents(data['current_value'])
+        except ValueError:
+            return jsonify({"error": "Current value must be a valid number"}), 400
     if 'description' in data:
         property.description = data['description']
 
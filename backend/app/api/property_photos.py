@@ -1,5 +1,5 @@
 # api/property_photos.py
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from werkzeug.utils import secure_filename
 import os
@@ -7,6 +7,8 @@ import uuid
 from app import db
 from app.models.document import Document
 from app.models.property import Property
+from app.services.file_service import file_storage
+from app.utils import tracing
 
 property_photos_bp = Blueprint('property_photos', __name__)
 
@@ -45,27 +47,21 @@ def upload_property_photo():
     if not allowed_file(file.filename):
         return jsonify({"error": f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"}), 400
 
-    # Get base folder path
-    photos_base_folder = os.path.join(current_app.root_path, 'uploads/documents/photos')
-
-    # Create property-specific folder
-    property_folder = os.path.join(photos_base_folder, f"property_{property_id}")
-    os.makedirs(property_folder, exist_ok=True)
-
-    # Secure the filename and generate a unique filename
+    # Secure the filename and generate a unique filename in the property's folder
     filename = secure_filename(file.filename)
     unique_filename = f"{uuid.uuid4()}_{filename}"
-    file_path = os.path.join(property_folder, unique_filename)
+    key = f"documents/photos/property_{property_id}/{unique_filename}"
 
     # Get form data
     title = request.form.get('title', 'Property Photo')
     is_primary = request.form.get('is_primary', 'false').lower() == 'true'
 
     # Save the file
-    file.save(file_path)
+    with tracing.span('file.save', {'file.path': key, 'file.type': file.content_type or '',
+                                    'storage.backend': file_storage.backend.name}):
+        file_path, file_size = file_storage.save(file.stream, key, file.content_type)
 
     # Get file metadata
-    file_size = os.path.getsize(file_path)
     file_type = file.content_type or 'image/jpeg'
 
     # Create document record
@@ -179,8 +175,7 @@ def delete_property_photo(photo_id):
         property.image_url = None
 
     # Delete the file from storage
-    if os.path.exists(photo.file_path):
-        os.remove(photo.file_path)
+    file_storage.delete(photo.file_path)
 
     # Delete from database
     db.session.delete(photo)
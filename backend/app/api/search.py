@@ -0,0 +1,48 @@
+# api/search.py
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.api import get_pagination_params
+from app.services import search_service
+from app.services.search_index import ENTITY_TYPES
+
+search_bp = Blueprint('search', __name__)
+
+@search_bp.route('/', methods=['GET'])
+@jwt_required()
+def search():
+    """Search documents, appliances, projects and maintenance requests in one call"""
+    current_user_id = int(get_jwt_identity())
+
+    keyword = request.args.get('q', '')
+    page, per_page = get_pagination_params(request)
+
+    # Optional comma-separated entity type filter, e.g. ?types=document,appliance
+    entity_types = None
+    if request.args.get('types'):
+        entity_types = [t.strip() for t in request.args['types'].split(',') if t.strip()]
+        invalid = [t for t in entity_types if t not in ENTITY_TYPES]
+        if invalid:
+            return jsonify({"error": f"Invalid types: {', '.join(invalid)}. Must be any of: {', '.join(ENTITY_TYPES)}"}), 400
+
+    rows, total = search_service.search_all(
+        current_user_id, keyword, entity_types=entity_types, page=page, per_page=per_page
+    )
+
+    results = [{
+        'type': row.entity_type,
+        'id': row.entity_id,
+        'title': row.title,
+        'property_id': row.property_id,
+        'rank': row.rank,
+        'highlights': {
+            'title': search_service.render_highlight(row.title_highlight),
+            'body': search_service.render_highlight(row.snippet)
+        }
+    } for row in rows]
+
+    return jsonify({
+        'results': results,
+        'total': total,
+        'page': page,
+        'per_page': per_page
+    })
@@ -0,0 +1,175 @@
+# api/serializers.py
+"""
+Response shapes for API resources.
+
+Each serializer is compiled once at import time. List endpoints select
+``serializer.columns`` and call ``dump_rows``; single-resource endpoints call
+``dump`` on the ORM instance.
+"""
+import os
+from app.models.appliance import Appliance
+from app.models.document import Document
+from app.models.finance import Expense, Budget
+from app.models.maintenance import Maintenance
+from app.models.maintenance_checklist import MaintenanceChecklistItem
+from app.models.project import Project
+from app.models.property import Property
+from app.utils.money import cents_to_dollars
+from app.utils.serializers import RowSerializer
+
+document_serializer = RowSerializer([
+    ('id', Document.id),
+    ('title', Document.title),
+    ('description', Document.description),
+    ('file_type', Document.file_type),
+    ('file_size', Document.file_size),
+    ('category', Document.category),
+    ('created_at', Document.created_at),
+    ('updated_at', Document.updated_at),
+    ('property_id', Document.property_id),
+    ('appliance_id', Document.appliance_id),
+    ('expiration_date', Document.expiration_date),
+    ('created_by', Document.user_id),
+], extra=(Document.file_path,))
+
+expiring_document_serializer = RowSerializer([
+    ('id', Document.id),
+    ('title', Document.title),
+    ('file_type', Document.file_type),
+    ('category', Document.category),
+    ('expiration_date', Document.expiration_date),
+    ('property_id', Document.property_id),
+], extra=(Document.file_path,))
+
+maintenance_serializer = RowSerializer([
+    ('id', Maintenance.id),
+    ('title', Maintenance.title),
+    ('description', Maintenance.description),
+    ('priority', Maintenance.priority),
+    ('status', Maintenance.status),
+    ('due_date', Maintenance.due_date),
+    ('created_at', Maintenance.created_at),
+    ('updated_at', Maintenance.updated_at),
+    ('completed_at', Maintenance.completed_at),
+    ('property_id', Maintenance.property_id),
+    ('created_by', Maintenance.user_id),
+])
+
+# Home Assistant task shape (kept stable for existing automations)
+ha_maintenance_serializer = RowSerializer([
+    ('id', Maintenance.id),
+    ('title', Maintenance.title),
+    ('description', Maintenance.description),
+    ('status', Maintenance.status),
+    ('priority', Maintenance.priority),
+    ('due_date', Maintenance.due_date),
+    ('created_at', Maintenance.created_at),
+    ('completed_at', Maintenance.completed_at),
+    ('property_id', Maintenance.property_id),
+])
+
+# Home Assistant property shape
+ha_property_serializer = RowSerializer([
+    ('id', Property.id),
+    ('address', Property.address),
+    ('city', Property.city),
+    ('state', Property.state),
+    ('zip_code', Property.zip),
+])
+
+checklist_item_serializer = RowSerializer([
+    ('id', MaintenanceChecklistItem.id),
+    ('task', MaintenanceChecklistItem.task),
+    ('description', MaintenanceChecklistItem.description),
+    ('season', MaintenanceChecklistItem.season),
+    ('is_completed', MaintenanceChecklistItem.is_completed),
+    ('completed_at', MaintenanceChecklistItem.completed_at),
+    ('is_default', MaintenanceChecklistItem.is_default),
+    ('property_id', MaintenanceChecklistItem.property_id),
+    ('created_at', MaintenanceChecklistItem.created_at),
+    ('updated_at', MaintenanceChecklistItem.updated_at),
+    ('created_by', MaintenanceChecklistItem.user_id),
+])
+
+appliance_serializer = RowSerializer([
+    ('id', Appliance.id),
+    ('name', Appliance.name),
+    ('brand', Appliance.brand),
+    ('model', Appliance.model),
+    ('serial_number', Appliance.serial_number),
+    ('purchase_date', Appliance.purchase_date),
+    ('warranty_expiration', Appliance.warranty_expiration),
+    ('notes', Appliance.notes),
+    ('category', Appliance.category),
+    ('created_at', Appliance.created_at),
+    ('updated_at', Appliance.updated_at),
+    ('property_id', Appliance.property_id),
+    ('created_by', Appliance.user_id),
+])
+
+project_serializer = RowSerializer([
+    ('id', Project.id),
+    ('name', Project.name),
+    ('description', Project.description),
+    ('status', Project.status),
+    ('budget', Project.budget, cents_to_dollars),
+    ('spent', Project.spent, cents_to_dollars),
+    ('start_date', Project.start_date),
+    ('projected_end_date', Project.projected_end_date),
+    ('completed_date', Project.completed_date),
+    ('created_at', Project.created_at),
+    ('updated_at', Project.updated_at),
+    ('property_id', Project.property_id),
+])
+
+property_serializer = RowSerializer([
+    ('id', Property.id),
+    ('address', Property.address),
+    ('city', Property.city),
+    ('state', Property.state),
+    ('zip', Property.zip),
+    ('property_type', Property.property_type),
+    ('status', Property.status),
+    ('purchase_date', Property.purchase_date),
+    ('purchase_price', Property.purchase_price, cents_to_dollars),
+    ('current_value', Property.current_value, cents_to_dollars),
+    ('bedrooms', Property.bedrooms),
+    ('bathrooms', Property.bathrooms),
+    ('square_footage', Property.square_footage),
+    ('created_at', Property.created_at),
+])
+
+expense_serializer = RowSerializer([
+    ('id', Expense.id),
+    ('title', Expense.title),
+    ('amount', Expense.amount, cents_to_dollars),
+    ('category', Expense.category),
+    ('date', Expense.date),
+    ('description', Expense.description),
+    ('recurring', Expense.recurring),
+    ('recurring_interval', Expense.recurring_interval),
+    ('property_id', Expense.property_id),
+    ('created_at', Expense.created_at),
+    ('updated_at', Expense.updated_at),
+    ('created_by', Expense.user_id),
+])
+
+budget_serializer = RowSerializer([
+    ('id', Budget.id),
+    ('category', Budget.category),
+    ('amount', Budget.amount, cents_to_dollars),
+    ('month', Budget.month),
+    ('year', Budget.year),
+    ('property_id', Budget.property_id),
+    ('created_at', Budget.created_at),
+    ('updated_at', Budget.updated_at),
+    ('created_by', Budget.user_id),
+])
+
+
+def document_url(property_id, file_path, user_id):
+    """Public URL for an uploaded document file"""
+    filename = os.path.basename(file_path)
+    if property_id:
+        return f"/uploads/documents/files/property_{property_id}/{filename}"
+    return f"/uploads/documents/files/user_{user_id}/{filename}"
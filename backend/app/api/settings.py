@@ -1,9 +1,10 @@
 # api/settings.py
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models.user import User
-from app.models.settings import Settings  # You'll need to create this model
+from app.models.settings import Settings
+from app.utils.validators import InvalidWebhookURL, validate_webhook_url
 
 settings_bp = Blueprint('settings', __name__)
 
@@ -13,27 +14,13 @@ def get_settings():
     """Get user settings"""
     current_user_id = int(get_jwt_identity())
     
-    # Get user settings from database
+    # Every user gets settings when they register, so reading never writes
     settings = Settings.query.filter_by(user_id=current_user_id).first()
-    
     if not settings:
-        # Create default settings if none exist
-        settings = Settings(
-            user_id=current_user_id,
-            notifications={
-                "email_notifications": True,
-                "maintenance_reminders": True,
-                "payment_reminders": True,
-                "project_updates": True,
-                "document_updates": False
-            },
-            appearance={
-                "theme": "dark",
-                "dashboard_layout": "default"
-            }
-        )
-        db.session.add(settings)
-        db.session.commit()
+        return jsonify({
+            "notifications": Settings.DEFAULT_NOTIFICATIONS,
+            "appearance": Settings.DEFAULT_APPEARANCE
+        }), 200
     
     return jsonify({
         "notifications": settings.notifications,
@@ -45,24 +32,27 @@ def get_settings():
 def update_notifications():
     """Update notification settings"""
     current_user_id = int(get_jwt_identity())
-    data = request.get_json()
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Notification settings must be a JSON object"}), 400
+
+    webhook_url = data.get('webhook_url')
+    if webhook_url:
+        try:
+            validate_webhook_url(webhook_url, current_app.config.get('WEBHOOK_ALLOW_PRIVATE_HOSTS', False))
+        except InvalidWebhookURL as e:
+            return jsonify({"error": str(e)}), 400
     
     settings = Settings.query.filter_by(user_id=current_user_id).first()
     
     if not settings:
         # Create settings if none exist
-        settings = Settings(
-            user_id=current_user_id,
-            notifications=data,
-            appearance={
-                "theme": "dark",
-                "dashboard_layout": "default"
-            }
-        )
+        settings = Settings.defaults()
+        settings.user_id = current_user_id
         db.session.add(settings)
-    else:
-        # Update existing settings
-        settings.notifications = data
+    
+    # Keys left out fall back to their defaults
+    settings.notifications = {**Settings.DEFAULT_NOTIFICATIONS, **data}
     
     db.session.commit()
     
@@ -76,27 +66,20 @@ def update_notifications():
 def update_appearance():
     """Update appearance settings"""
     current_user_id = int(get_jwt_identity())
-    data = request.get_json()
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Appearance settings must be a JSON object"}), 400
     
     settings = Settings.query.filter_by(user_id=current_user_id).first()
     
     if not settings:
         # Create settings if none exist
-        settings = Settings(
-            user_id=current_user_id,
-            notifications={
-                "email_notifications": True,
-                "maintenance_reminders": True,
-                "payment_reminders": True,
-                "project_updates": True,
-                "document_updates": False
-            },
-            appearance=data
-        )
+        settings = Settings.defaults()
+        settings.user_id = current_user_id
         db.session.add(settings)
-    else:
-        # Update existing settings
-        settings.appearance = data
+    
+    # Keys left out fall back to their defaults
+    settings.appearance = {**Settings.DEFAULT_APPEARANCE, **data}
     
     db.session.commit()
     
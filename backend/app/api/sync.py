@@ -0,0 +1,35 @@
+# api/sync.py
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.services import sync_service
+
+sync_bp = Blueprint('sync', __name__)
+
+@sync_bp.route('/<resource>', methods=['GET'])
+@jwt_required()
+def get_changes(resource):
+    """
+    Rows of a resource created, updated or deleted since a cursor
+
+    Query Parameters:
+        cursor: from the previous response; omit for a full sync
+        limit: changes per page (default 100, max 500)
+
+    Apply 'changed' (upsert by id) and 'deleted' (remove by id), keep
+    'cursor', and repeat straight away while 'has_more' is true. Deleting a
+    property also removes its records.
+    """
+    current_user_id = int(get_jwt_identity())
+
+    if resource not in sync_service.SYNC_RESOURCES:
+        return jsonify({"error": f"Unknown resource. Must be one of: {', '.join(sync_service.SYNC_RESOURCES)}"}), 404
+
+    limit = min(max(request.args.get('limit', 100, type=int), 1), 500)
+    try:
+        changes = sync_service.changes_since(current_user_id, resource, request.args.get('cursor'), limit)
+    except sync_service.CursorExpired as e:
+        return jsonify({"error": str(e)}), 410
+    except sync_service.CursorError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify(changes)
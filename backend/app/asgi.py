@@ -0,0 +1,91 @@
+# app/asgi.py
+"""
+ASGI app: the async Home Assistant endpoints in front of the Flask app.
+
+Requests for a route in ``app/api/integrations_async.py`` are served on the
+event loop. Everything else, including all writes, goes to the unchanged
+Flask app, which runs in a thread pool (a2wsgi) exactly as under gunicorn.
+
+Serve it with an ASGI server, e.g.::
+
+    gunicorn -k uvicorn.workers.UvicornWorker asgi:app
+
+(the Docker image does this when ``ASGI_SERVER=true``; see entrypoint.sh).
+"""
+from a2wsgi import WSGIMiddleware
+from quart import Quart
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from werkzeug.exceptions import HTTPException
+from app.utils.json_provider import AppJSONProvider
+
+# Sync driver -> its async counterpart
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'postgres': 'postgresql+asyncpg',
+}
+
+
+def async_database_url(url):
+    """The app's database URL with an async driver, e.g. postgresql+asyncpg"""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend} databases")
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+def create_asgi_app(flask_app):
+    """Build the ASGI app around an app from ``create_app``"""
+    async_app = Quart(__name__)
+    async_app.config.update(flask_app.config)
+    async_app.json = AppJSONProvider(async_app)
+    async_app.url_map.strict_slashes = False
+    async_app.extensions['flask_app'] = flask_app
+
+    from app.api.integrations_async import integrations_async_bp
+    async_app.register_blueprint(integrations_async_bp, url_prefix='/api/integrations')
+
+    @async_app.before_serving
+    async def open_database():
+        config = async_app.config
+        engine = create_async_engine(
+            async_database_url(config['SQLALCHEMY_DATABASE_URI']),
+            pool_size=config.get('ASYNC_DB_POOL_SIZE', 10),
+            max_overflow=config.get('ASYNC_DB_MAX_OVERFLOW', 10),
+            pool_pre_ping=True,
+        )
+        async_app.extensions['async_engine'] = engine
+        async_app.extensions['async_session'] = async_sessionmaker(engine, expire_on_commit=False)
+
+    @async_app.after_serving
+    async def close_database():
+        await async_app.extensions['async_engine'].dispose()
+
+    return IntegrationDispatcher(async_app, flask_app)
+
+
+class IntegrationDispatcher:
+    """Send each request to the async app if it has the route, else to Flask"""
+
+    def __init__(self, async_app, flask_app):
+        self.async_app = async_app
+        self.flask_app = flask_app
+        self.wsgi_app = WSGIMiddleware(flask_app, workers=flask_app.config.get('ASGI_WSGI_THREADS', 16))
+
+    def _is_async_route(self, scope):
+        adapter = self.async_app.url_map.bind('')
+        try:
+            adapter.match(scope['path'], method=scope['method'])
+        except HTTPException:
+            # No such route, a different method, or a redirect; Flask decides
+            return False
+        return True
+
+    async def __call__(self, scope, receive, send):
+        # Startup and shutdown (lifespan) open and close the async database
+        if scope['type'] == 'lifespan' or (scope['type'] == 'http' and self._is_async_route(scope)):
+            await self.async_app(scope, receive, send)
+        else:
+            await self.wsgi_app(scope, receive, send)
@@ -0,0 +1,216 @@
+# app/cli.py
+"""Custom ``flask`` CLI commands"""
+import click
+
+
+def register_commands(app):
+    """Attach the app's CLI commands"""
+
+    @app.cli.command('bootstrap')
+    def bootstrap():
+        """One-off start-up work: schema, upload folders, demo accounts, alerts and tombstones. Run once per deploy, before the workers."""
+        import os
+        from app import auto_seed_demo, db
+        from app.services.file_service import file_storage
+
+        # Each step used to be its own `flask` process (or ran inside every
+        # worker's create_app). A failed required step stops the command with
+        # a non-zero exit; other failures are reported and the rest still run
+        def step(name, fn, required=False):
+            try:
+                fn()
+            except Exception as e:
+                db.session.rollback()
+                if required:
+                    raise click.ClickException(f'{name} failed: {e}')
+                click.echo(f'{name} failed, continuing: {e}', err=True)
+
+        def schema():
+            from alembic import command
+            from alembic.runtime.migration import MigrationContext
+            from alembic.script import ScriptDirectory
+            from flask_migrate import upgrade
+
+            # Comparing revision ids is one query; only run Alembic's
+            # environment when there is something to apply
+            config = app.extensions['migrate'].migrate.get_config()
+            script = ScriptDirectory.from_config(config)
+            with db.engine.connect() as connection:
+                current = set(MigrationContext.configure(connection).get_current_heads())
+            if current == set(script.get_heads()):
+                click.echo('Database schema is up to date.')
+                return
+
+            unknown = current - {revision.revision for revision in script.walk_revisions()}
+            if unknown:
+                # Left by the migrations that used to be generated at start-up.
+                # Every revision skips what already exists, so replay them all.
+                click.echo(f"Unknown schema revision {', '.join(sorted(unknown))}; replaying migrations from the start")
+                command.stamp(config, 'base', purge=True)
+            click.echo('Applying pending migrations...')
+            upgrade()
+
+        def upload_folders():
+            # Local saves make their own subfolders; this is the tree nginx
+            # serves /uploads/ from
+            os.makedirs(os.path.join(file_storage.local.root, 'documents', 'photos'), exist_ok=True)
+
+        def alerts():
+            from app.services import notification_service
+            # Digest emails go out from the daily scheduled `flask scan-alerts`
+            notification_service.scan_alerts()
+
+        def tombstones():
+            from app.services import sync_service
+            click.echo(f'Pruned {sync_service.prune_tombstones()} tombstones.')
+
+        step('Schema setup', schema, required=True)
+        step('Upload folders', upload_folders)
+        step('Demo seeding', auto_seed_demo)
+        step('Alert scan', alerts)
+        step('Tombstone pruning', tombstones)
+
+    @app.cli.command('generate-data')
+    @click.option('--users', default=10, show_default=True, help='Users to create, each with one property.')
+    @click.option('--years', default=5, show_default=True, help='Years of expenses and budgets per property.')
+    @click.option('--expense-scale', default=1.0, show_default=True,
+                  help='Multiplier on how often variable expenses occur.')
+    @click.option('--documents', default=200, show_default=True, help='Documents per property.')
+    @click.option('--photos', default=10, show_default=True, help='Photos per property.')
+    @click.option('--appliances', default=15, show_default=True, help='Appliances per property.')
+    @click.option('--projects', default=5, show_default=True, help='Projects per property.')
+    @click.option('--maintenance', default=50, show_default=True, help='Maintenance tasks per property.')
+    @click.option('--checklist', default=40, show_default=True, help='Checklist items per property.')
+    @click.option('--file-size', default=0, show_default=True,
+                  help='Average bytes of the dummy file written for each document and photo; 0 writes none.')
+    @click.option('--workers', type=int, default=None, help='Worker processes (defaults to the CPU count).')
+    @click.option('--batch-size', default=20, show_default=True, help='Users inserted and committed per batch.')
+    @click.option('--seed', default=42, show_default=True, help='Random seed, for repeatable data.')
+    def generate_data(users, file_size, workers, batch_size, seed, **volumes):
+        """Create large volumes of synthetic data for benchmarks and index tuning. Not for production."""
+        import time
+        from generate_data import PASSWORD, generate
+
+        started = time.monotonic()
+        counts = generate(app.config['SQLALCHEMY_DATABASE_URI'], users, volumes, workers=workers,
+                          batch_size=batch_size, seed=seed, file_size=file_size)
+        elapsed = time.monotonic() - started
+        for table, count in sorted(counts.items()):
+            click.echo(f'{table}: {count:,}')
+        total = sum(counts.values())
+        click.echo(f'{total:,} rows in {elapsed:.1f}s ({total / max(elapsed, 0.001):,.0f} rows/s). '
+                   f'Users log in with password {PASSWORD}.')
+        click.echo('Run `flask rebuild-search-index` and `flask scan-alerts --no-email` to index the new rows.')
+
+    @app.cli.command('extract-documents')
+    @click.option('--batch-size', default=50, show_default=True,
+                  help='Documents extracted and committed per batch.')
+    @click.option('--workers', type=int, default=None,
+                  help='Worker processes (defaults to EXTRACTION_WORKERS).')
+    @click.option('--retry-failed', is_flag=True,
+                  help='Also retry documents whose extraction failed before.')
+    def extract_documents(batch_size, workers, retry_failed):
+        """Extract text from uploaded documents for search."""
+        from app.services import content_service
+
+        counts = content_service.extract_pending(
+            batch_size=batch_size, workers=workers, retry_failed=retry_failed
+        )
+        if not counts:
+            click.echo('All documents are up to date.')
+            return
+        for status, count in sorted(counts.items()):
+            click.echo(f'{status}: {count}')
+
+    @app.cli.command('rebuild-search-index')
+    @click.option('--batch-size', default=500, show_default=True,
+                  help='Rows inserted per statement.')
+    def rebuild_search_index(batch_size):
+        """Rebuild the unified search index from scratch."""
+        from app import db
+        from app.services import search_index
+
+        counts = search_index.rebuild_index(batch_size=batch_size)
+        db.session.commit()
+        for entity_type, count in counts.items():
+            click.echo(f'{entity_type}: {count}')
+
+    @app.cli.command('clear-cache')
+    def clear_cache():
+        """Drop every cached response, e.g. after bulk changes made outside the ORM."""
+        from app.services.response_cache import response_cache
+
+        if not response_cache.enabled:
+            click.echo('Response cache is disabled.')
+            return
+        response_cache.clear()
+        click.echo('Response cache cleared.')
+
+    @app.cli.command('scan-alerts')
+    @click.option('--batch-size', default=500, show_default=True,
+                  help='Records scanned and committed per batch.')
+    @click.option('--no-email', is_flag=True,
+                  help='Only refresh alerts; leave digest emails for the next run.')
+    def scan_alerts(batch_size, no_email):
+        """Refresh expiry alerts and email digests. Schedule this daily."""
+        from app.services import notification_service
+
+        counts = notification_service.scan_alerts(batch_size=batch_size)
+        for source in notification_service.ALERT_SOURCES:
+            click.echo(f'{source.kind}: {counts[source.kind]}')
+        if no_email:
+            return
+        sent = notification_service.send_digests()
+        click.echo(f'Digests sent: {sent}')
+
+    @app.cli.command('send-notifications')
+    @click.option('--batch-size', default=100, show_default=True,
+                  help='Users queued, or deliveries sent, per batch.')
+    def send_notifications(batch_size):
+        """Queue digests of buffered change events and send due deliveries. Schedule this every few minutes."""
+        from app.services import notification_service
+
+        queued = notification_service.queue_digests(batch_size=batch_size)
+        for channel, count in sorted(queued.items()):
+            click.echo(f'queued {channel}: {count}')
+        delivered = notification_service.deliver_pending(batch_size=batch_size)
+        for status, count in sorted(delivered.items()):
+            click.echo(f'{status}: {count}')
+        if not queued and not delivered:
+            click.echo('Nothing to send.')
+
+    @app.cli.command('prune-tombstones')
+    def prune_tombstones():
+        """Delete delta-sync tombstones past their retention. Schedule this daily."""
+        from app.services import sync_service
+
+        click.echo(f'Pruned {sync_service.prune_tombstones()} tombstones.')
+
+    @app.cli.command('dispatch-webhooks')
+    @click.option('--batch-size', default=100, show_default=True,
+                  help='Events per webhook request.')
+    @click.option('--follow', is_flag=True,
+                  help='Keep running, dispatching new events as they arrive.')
+    def dispatch_webhooks(batch_size, follow):
+        """Push outbox events to registered webhooks and prune old events."""
+        import time
+        from app import db
+        from app.services import outbox_service
+
+        interval = app.config.get('OUTBOX_POLL_SECONDS', 1)
+        next_prune = 0
+        while True:
+            if time.monotonic() >= next_prune:
+                pruned = outbox_service.prune_events()
+                if pruned:
+                    click.echo(f'Pruned {pruned} old events.')
+                next_prune = time.monotonic() + 3600
+
+            counts = outbox_service.dispatch_webhooks(batch_size=batch_size)
+            if counts or not follow:
+                click.echo(f"Events delivered: {counts['events']}, failed attempts: {counts['failures']}")
+            if not follow:
+                return
+            # Don't keep a connection checked out between rounds
+            db.session.remove()
+            time.sleep(interval)
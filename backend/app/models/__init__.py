@@ -3,9 +3,15 @@
 from app.models.user import User
 from app.models.property import Property
 from app.models.document import Document
+from app.models.document_content import DocumentContent
 from app.models.maintenance import Maintenance
 from app.models.maintenance_checklist import MaintenanceChecklistItem
 from app.models.appliance import Appliance
 from app.models.project import Project
 from app.models.finance import Expense, Budget
-from app.models.settings import Settings
\ No newline at end of file
+from app.models.settings import Settings
+from app.models.search_entry import SearchEntry
+from app.models.alert import Alert
+from app.models.notification import NotificationEvent, NotificationDelivery
+from app.models.outbox import OutboxEvent, WebhookEndpoint
+from app.models.tombstone import Tombstone
@@ -0,0 +1,35 @@
+# models/alert.py
+from app import db
+from datetime import datetime
+
+class Alert(db.Model):
+    """
+    A precomputed reminder that something is about to expire: a document's
+    expiration date or an appliance's warranty. Written by the scanner in
+    app/services/notification_service.py and kept current on every flush.
+    """
+    __tablename__ = 'alerts'
+    __table_args__ = (
+        db.UniqueConstraint('kind', 'entity_id', name='uq_alerts_kind_entity'),
+        db.Index('ix_alerts_user_id_due_date', 'user_id', 'due_date'),
+        db.Index('ix_alerts_property_id_due_date', 'property_id', 'due_date'),
+    )
+
+    KIND_DOCUMENT_EXPIRING = 'document_expiring'
+    KIND_WARRANTY_EXPIRING = 'warranty_expiring'
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(30), nullable=False)
+    entity_type = db.Column(db.String(20), nullable=False)  # document, appliance
+    entity_id = db.Column(db.Integer, nullable=False)
+    # Copied from the entity, without foreign keys, like search entries
+    user_id = db.Column(db.Integer, nullable=False)
+    property_id = db.Column(db.Integer, nullable=True)
+    title = db.Column(db.String(255), nullable=False)
+    due_date = db.Column(db.Date, nullable=False)
+    notified_at = db.Column(db.DateTime, nullable=True)  # Included in a digest email
+    scanned_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<Alert {self.kind}:{self.entity_id} due {self.due_date}>'
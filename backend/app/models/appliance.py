@@ -4,6 +4,11 @@ from datetime import datetime
 
 class Appliance(db.Model):
     __tablename__ = 'appliances'
+    __table_args__ = (
+        # Delta sync (see app/services/sync_service.py)
+        db.Index('ix_appliances_user_id_updated_at', 'user_id', 'updated_at', 'id'),
+        db.Index('ix_appliances_property_id_updated_at', 'property_id', 'updated_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -13,7 +18,7 @@ class Appliance(db.Model):
     model = db.Column(db.String(100), nullable=True)
     serial_number = db.Column(db.String(100), nullable=True)
     purchase_date = db.Column(db.Date, nullable=True)
-    warranty_expiration = db.Column(db.Date, nullable=True)
+    warranty_expiration = db.Column(db.Date, nullable=True, index=True)
     location = db.Column(db.String(100), nullable=True)
     notes = db.Column(db.Text, nullable=True)
     category = db.Column(db.String(50), nullable=False)
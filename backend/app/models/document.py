@@ -1,6 +1,7 @@
 # models/document.py
 from app import db
 from datetime import datetime
+from sqlalchemy import DDL, event
 
 class Document(db.Model):
     __tablename__ = 'documents'
@@ -15,7 +16,7 @@ class Document(db.Model):
     file_type = db.Column(db.String(100), nullable=False)
     file_size = db.Column(db.Integer, nullable=False)  # Size in bytes
     category = db.Column(db.String(50), nullable=False)
-    expiration_date = db.Column(db.Date, nullable=True)  # For documents that expire (leases, IDs)
+    expiration_date = db.Column(db.Date, nullable=True, index=True)  # For documents that expire (leases, IDs)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -23,6 +24,55 @@ class Document(db.Model):
     user = db.relationship('User', back_populates='documents')
     property = db.relationship('Property', back_populates='documents')
     appliance = db.relationship('Appliance', back_populates='documents')
+    content = db.relationship('DocumentContent', back_populates='document', uselist=False,
+                              cascade='all, delete-orphan')
 
     def __repr__(self):
-        return f'<Document {self.id}: {self.title}>'
\ No newline at end of file
+        return f'<Document {self.id}: {self.title}>'
+
+# Full-text search index
+#
+# Postgres keeps a generated tsvector column with a GIN index; SQLite keeps an
+# FTS5 table (rowid = documents.id) in step through triggers. Both are created
+# alongside the documents table here and by migrations cbccd6da6ffe and
+# e5f22d6a5e3c for existing databases. Extracted file text is indexed from
+# models/document_content.py. Queries live in app/services/search_service.py.
+DOCUMENT_SEARCH_DDL = {
+    'postgresql': [
+        """
+        ALTER TABLE documents ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B')
+        ) STORED
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_documents_search_vector ON documents USING GIN (search_vector)",
+    ],
+    'sqlite': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(title, description, body, tokenize='porter unicode61')",
+        """
+        CREATE TRIGGER IF NOT EXISTS documents_fts_insert AFTER INSERT ON documents BEGIN
+            INSERT INTO documents_fts (rowid, title, description, body)
+            VALUES (new.id, new.title, coalesce(new.description, ''), '');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS documents_fts_update AFTER UPDATE OF title, description ON documents BEGIN
+            UPDATE documents_fts SET title = new.title, description = coalesce(new.description, '')
+            WHERE rowid = new.id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS documents_fts_delete AFTER DELETE ON documents BEGIN
+            DELETE FROM documents_fts WHERE rowid = old.id;
+        END
+        """,
+    ],
+}
+
+for _dialect, _statements in DOCUMENT_SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(Document.__table__, 'after_create', DDL(_statement).execute_if(dialect=_dialect))
+
+event.listen(Document.__table__, 'before_drop',
+             DDL("DROP TABLE IF EXISTS documents_fts").execute_if(dialect='sqlite'))
@@ -0,0 +1,64 @@
+# models/document_content.py
+from app import db
+from datetime import datetime
+from sqlalchemy import DDL, event
+
+class DocumentContent(db.Model):
+    """Plain text extracted from a document's file, fed to the search index"""
+    __tablename__ = 'document_contents'
+
+    STATUS_PENDING = 'pending'
+    STATUS_EXTRACTED = 'extracted'
+    STATUS_UNSUPPORTED = 'unsupported'  # File type we can't read
+    STATUS_FAILED = 'failed'
+
+    document_id = db.Column(db.Integer, db.ForeignKey('documents.id', ondelete='CASCADE'), primary_key=True)
+    status = db.Column(db.String(20), nullable=False, default=STATUS_PENDING, index=True)
+    body = db.Column(db.Text, nullable=True)
+    file_size = db.Column(db.Integer, nullable=True)  # Size of the file the body was extracted from
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.String(500), nullable=True)
+    extracted_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    document = db.relationship('Document', back_populates='content')
+
+    def __repr__(self):
+        return f'<DocumentContent {self.document_id}: {self.status}>'
+
+
+# Search index for extracted bodies; see DOCUMENT_SEARCH_DDL in models/document.py.
+# Postgres indexes the body in its own generated tsvector column; SQLite copies
+# it into the body column of documents_fts.
+DOCUMENT_CONTENT_SEARCH_DDL = {
+    'postgresql': [
+        """
+        ALTER TABLE document_contents ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (setweight(to_tsvector('english', coalesce(body, '')), 'C')) STORED
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_document_contents_search_vector ON document_contents USING GIN (search_vector)",
+    ],
+    'sqlite': [
+        """
+        CREATE TRIGGER IF NOT EXISTS document_contents_fts_insert AFTER INSERT ON document_contents BEGIN
+            UPDATE documents_fts SET body = coalesce(new.body, '') WHERE rowid = new.document_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS document_contents_fts_update AFTER UPDATE OF body ON document_contents BEGIN
+            UPDATE documents_fts SET body = coalesce(new.body, '') WHERE rowid = new.document_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS document_contents_fts_delete AFTER DELETE ON document_contents BEGIN
+            UPDATE documents_fts SET body = '' WHERE rowid = old.document_id;
+        END
+        """,
+    ],
+}
+
+for _dialect, _statements in DOCUMENT_CONTENT_SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(DocumentContent.__table__, 'after_create', DDL(_statement).execute_if(dialect=_dialect))
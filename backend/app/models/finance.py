@@ -1,5 +1,6 @@
 # models/finance.py
 from app import db
+from app.utils.money import Money, to_cents, cents_to_dollars
 from datetime import datetime
 
 class Expense(db.Model):
@@ -7,8 +8,7 @@ class Expense(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
-    # Keep same column name but use Integer instead of Numeric
-    amount = db.Column(db.Integer, nullable=False)  # Store in cents
+    amount = db.Column(Money, nullable=False)  # Stored in cents
     category = db.Column(db.String(50), nullable=False)
     date = db.Column(db.Date, nullable=False)
     description = db.Column(db.Text)
@@ -28,25 +28,14 @@ class Expense(db.Model):
     
     # Helper methods for conversion
     def get_amount_dollars(self):
-        return self.amount / 100.0 if self.amount is not None else None
+        return cents_to_dollars(self.amount)
     
     def set_amount_dollars(self, dollars):
-        self.amount = int(float(dollars) * 100) if dollars is not None else None
+        self.amount = to_cents(dollars)
     
     def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'amount': self.get_amount_dollars(),  # Convert to dollars for API
-            'category': self.category,
-            'date': self.date.isoformat() if self.date else None,
-            'description': self.description,
-            'recurring': self.recurring,
-            'recurring_interval': self.recurring_interval,
-            'property_id': self.property_id,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        from app.api.serializers import expense_serializer
+        return expense_serializer.dump(self)
 
 
 class Budget(db.Model):
@@ -54,8 +43,7 @@ class Budget(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     category = db.Column(db.String(50), nullable=False)
-    # Keep same column name but use Integer instead of Numeric
-    amount = db.Column(db.Integer, nullable=False)  # Store in cents
+    amount = db.Column(Money, nullable=False)  # Stored in cents
     month = db.Column(db.Integer, nullable=False)  # 1-12
     year = db.Column(db.Integer, nullable=False)
     property_id = db.Column(db.Integer, db.ForeignKey('properties.id', ondelete='CASCADE'), nullable=False)
@@ -74,22 +62,14 @@ class Budget(db.Model):
     
     # Helper methods for conversion
     def get_amount_dollars(self):
-        return self.amount / 100.0 if self.amount is not None else None
+        return cents_to_dollars(self.amount)
     
     def set_amount_dollars(self, dollars):
-        self.amount = int(float(dollars) * 100) if dollars is not None else None
+        self.amount = to_cents(dollars)
     
     def __repr__(self):
         return f'<Budget {self.id}: {self.category} ({self.month}/{self.year})>'
     
     def to_dict(self):
-        return {
-            'id': self.id,
-            'category': self.category,
-            'amount': self.get_amount_dollars(),  # Convert to dollars for API
-            'month': self.month,
-            'year': self.year,
-            'property_id': self.property_id,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+        from app.api.serializers import budget_serializer
+        return budget_serializer.dump(self)
@@ -4,6 +4,11 @@ from datetime import datetime
 
 class Maintenance(db.Model):
     __tablename__ = 'maintenance_requests'
+    __table_args__ = (
+        # Delta sync (see app/services/sync_service.py)
+        db.Index('ix_maintenance_requests_user_id_updated_at', 'user_id', 'updated_at', 'id'),
+        db.Index('ix_maintenance_requests_property_id_updated_at', 'property_id', 'updated_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -0,0 +1,66 @@
+# models/notification.py
+from app import db
+from datetime import datetime
+
+class NotificationEvent(db.Model):
+    """
+    A change to a user's records waiting to go out in their next digest.
+
+    Repeated changes to the same record fold into one event (see
+    app/services/notification_service.py), which is deleted once it has been
+    put into a delivery.
+    """
+    __tablename__ = 'notification_events'
+    __table_args__ = (
+        db.Index('ix_notification_events_user_id_entity', 'user_id', 'entity_type', 'entity_id'),
+    )
+
+    ACTION_CREATED = 'created'
+    ACTION_UPDATED = 'updated'
+    ACTION_COMPLETED = 'completed'
+    ACTION_DELETED = 'deleted'
+
+    id = db.Column(db.Integer, primary_key=True)
+    # No foreign keys: events outlive the records they describe
+    user_id = db.Column(db.Integer, nullable=False)
+    category = db.Column(db.String(50), nullable=False)  # Notification setting that enables it
+    entity_type = db.Column(db.String(20), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    property_id = db.Column(db.Integer, nullable=True)
+    action = db.Column(db.String(20), nullable=False)
+    title = db.Column(db.String(255), nullable=False)
+    occurrences = db.Column(db.Integer, nullable=False, default=1)  # Changes folded into this event
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<NotificationEvent {self.entity_type}:{self.entity_id} {self.action} for User {self.user_id}>'
+
+
+class NotificationDelivery(db.Model):
+    """One digest for one user over one channel, queued until it is sent"""
+    __tablename__ = 'notification_deliveries'
+    __table_args__ = (
+        db.Index('ix_notification_deliveries_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+
+    CHANNEL_EMAIL = 'email'
+    CHANNEL_WEBHOOK = 'webhook'
+
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'  # Gave up after NOTIFICATION_MAX_ATTEMPTS
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False, index=True)
+    channel = db.Column(db.String(20), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default=STATUS_PENDING)
+    payload = db.Column(db.Text, nullable=False)  # JSON digest, rendered per channel when sent
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.String(500), nullable=True)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<NotificationDelivery {self.id}: {self.channel} {self.status}>'
@@ -0,0 +1,81 @@
+# models/outbox.py
+from app import db
+from datetime import datetime
+from fnmatch import fnmatchcase
+import secrets
+
+class OutboxEvent(db.Model):
+    """
+    A change to a maintenance task, checklist item or document, written in
+    the same transaction as the change itself (see app/services/outbox_service.py).
+
+    The id is the stream position: webhook endpoints and event stream clients
+    remember the last id they got and resume after it.
+    """
+    __tablename__ = 'outbox_events'
+    __table_args__ = (
+        db.Index('ix_outbox_events_user_id_id', 'user_id', 'id'),
+        db.Index('ix_outbox_events_property_id_id', 'property_id', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    topic = db.Column(db.String(50), nullable=False)  # e.g. maintenance.updated
+    entity_type = db.Column(db.String(20), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    # No foreign keys: events outlive the records they describe
+    user_id = db.Column(db.Integer, nullable=False)
+    property_id = db.Column(db.Integer, nullable=True)
+    payload = db.Column(db.Text, nullable=False)  # JSON snapshot of the record
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f'<OutboxEvent {self.id}: {self.topic} {self.entity_id}>'
+
+
+class WebhookEndpoint(db.Model):
+    """A URL (e.g. a Home Assistant webhook trigger) that outbox events are pushed to"""
+    __tablename__ = 'webhook_endpoints'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    name = db.Column(db.String(100), nullable=False)
+    url = db.Column(db.String(500), nullable=False)
+    secret = db.Column(db.String(100), nullable=False)  # Signs every delivery
+    topics = db.Column(db.String(500), nullable=False, default='*')  # Comma-separated patterns
+    is_active = db.Column(db.Boolean, default=True)
+    last_event_id = db.Column(db.Integer, nullable=False, default=0)  # Delivered up to here
+    failures = db.Column(db.Integer, nullable=False, default=0)  # Consecutive failed deliveries
+    next_attempt_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.String(500), nullable=True)
+    last_delivered_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Relationships
+    user = db.relationship('User', backref=db.backref('webhook_endpoints', lazy=True, cascade='all, delete-orphan'))
+
+    @staticmethod
+    def generate_secret():
+        """Generate a signing secret"""
+        return f"whsec_{secrets.token_hex(24)}"
+
+    def wants(self, topic):
+        """Check if this endpoint subscribes to a topic"""
+        return any(fnmatchcase(topic, pattern.strip()) for pattern in (self.topics or '*').split(','))
+
+    def to_dict(self):
+        """Return endpoint info (without the secret)"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'url': self.url,
+            'topics': self.topics.split(',') if self.topics else [],
+            'is_active': self.is_active,
+            'last_event_id': self.last_event_id,
+            'failures': self.failures,
+            'last_error': self.last_error,
+            'last_delivered_at': self.last_delivered_at.isoformat() if self.last_delivered_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+    def __repr__(self):
+        return f'<WebhookEndpoint {self.id}: {self.name}>'
@@ -1,9 +1,15 @@
 # models/project.py
 from app import db
+from app.utils.money import Money
 from datetime import datetime
 
 class Project(db.Model):
     __tablename__ = 'projects'
+    __table_args__ = (
+        # Delta sync (see app/services/sync_service.py)
+        db.Index('ix_projects_user_id_updated_at', 'user_id', 'updated_at', 'id'),
+        db.Index('ix_projects_property_id_updated_at', 'property_id', 'updated_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -11,8 +17,8 @@ class Project(db.Model):
     name = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text, nullable=True)
     status = db.Column(db.String(20), default='planning')  # planning, in-progress, on-hold, completed
-    budget = db.Column(db.Float, nullable=True)
-    spent = db.Column(db.Float, nullable=True)
+    budget = db.Column(Money, nullable=True)  # Stored in cents
+    spent = db.Column(Money, nullable=True)  # Stored in cents
     start_date = db.Column(db.Date, nullable=True)
     projected_end_date = db.Column(db.Date, nullable=True)
     completed_date = db.Column(db.Date, nullable=True)
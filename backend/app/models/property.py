@@ -1,8 +1,13 @@
 from app import db
+from app.utils.money import Money
 from datetime import datetime
 
 class Property(db.Model):
     __tablename__ = 'properties'
+    __table_args__ = (
+        # Delta sync (see app/services/sync_service.py)
+        db.Index('ix_properties_user_id_updated_at', 'user_id', 'updated_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -13,8 +18,8 @@ class Property(db.Model):
     property_type = db.Column(db.String(50), nullable=False)  # residential, commercial, vacation, etc.
     status = db.Column(db.String(20), default='active')  # active, vacant, maintenance, inactive
     purchase_date = db.Column(db.Date, nullable=True)
-    purchase_price = db.Column(db.Float, nullable=True)
-    current_value = db.Column(db.Float, nullable=True)
+    purchase_price = db.Column(Money, nullable=True)  # Stored in cents
+    current_value = db.Column(Money, nullable=True)  # Stored in cents
     bedrooms = db.Column(db.Integer, nullable=True)
     bathrooms = db.Column(db.Float, nullable=True)  # Float to handle 1.5, 2.5 etc.
     square_footage = db.Column(db.Integer, nullable=True)
@@ -0,0 +1,70 @@
+# models/search_entry.py
+from app import db
+from datetime import datetime
+from sqlalchemy import DDL, event
+
+class SearchEntry(db.Model):
+    """
+    One row per searchable record across documents, appliances, projects and
+    maintenance requests. Kept current by app/services/search_index.py.
+    """
+    __tablename__ = 'search_entries'
+    __table_args__ = (
+        db.UniqueConstraint('entity_type', 'entity_id', name='uq_search_entries_entity'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity_type = db.Column(db.String(20), nullable=False)  # document, appliance, project, maintenance
+    entity_id = db.Column(db.Integer, nullable=False)
+    # Copied from the entity for access checks; no foreign keys so deleting a
+    # user or property can remove its entries in the same flush
+    user_id = db.Column(db.Integer, nullable=False, index=True)
+    property_id = db.Column(db.Integer, nullable=True, index=True)
+    title = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.Text, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<SearchEntry {self.entity_type}:{self.entity_id}>'
+
+
+# Full-text index over title and body, same layout as the document index in
+# models/document.py: a generated tsvector on Postgres, an FTS5 table
+# (rowid = search_entries.id) on SQLite.
+SEARCH_ENTRY_DDL = {
+    'postgresql': [
+        """
+        ALTER TABLE search_entries ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(body, '')), 'B')
+        ) STORED
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_search_entries_search_vector ON search_entries USING GIN (search_vector)",
+    ],
+    'sqlite': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_entries_fts USING fts5(title, body, tokenize='porter unicode61')",
+        """
+        CREATE TRIGGER IF NOT EXISTS search_entries_fts_insert AFTER INSERT ON search_entries BEGIN
+            INSERT INTO search_entries_fts (rowid, title, body) VALUES (new.id, new.title, coalesce(new.body, ''));
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS search_entries_fts_update AFTER UPDATE OF title, body ON search_entries BEGIN
+            UPDATE search_entries_fts SET title = new.title, body = coalesce(new.body, '') WHERE rowid = new.id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS search_entries_fts_delete AFTER DELETE ON search_entries BEGIN
+            DELETE FROM search_entries_fts WHERE rowid = old.id;
+        END
+        """,
+    ],
+}
+
+for _dialect, _statements in SEARCH_ENTRY_DDL.items():
+    for _statement in _statements:
+        event.listen(SearchEntry.__table__, 'after_create', DDL(_statement).execute_if(dialect=_dialect))
+
+event.listen(SearchEntry.__table__, 'before_drop',
+             DDL("DROP TABLE IF EXISTS search_entries_fts").execute_if(dialect='sqlite'))
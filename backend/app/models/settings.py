@@ -1,36 +1,42 @@
 # models/settings.py
 from app import db
 from datetime import datetime
-import json
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.mutable import MutableDict
+
+# JSONB on Postgres, JSON text on SQLite. Values are decoded once when the row
+# loads, and changing a key in place marks the row for saving.
+JSONDict = MutableDict.as_mutable(db.JSON().with_variant(JSONB(), 'postgresql'))
 
 class Settings(db.Model):
     __tablename__ = 'user_settings'
-    
+
+    DEFAULT_NOTIFICATIONS = {
+        "email_notifications": True,
+        "maintenance_reminders": True,
+        "payment_reminders": True,
+        "project_updates": True,
+        "document_updates": False
+    }
+    DEFAULT_APPEARANCE = {
+        "theme": "dark",
+        "dashboard_layout": "default"
+    }
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    _notifications = db.Column('notifications', db.Text, nullable=False, default='{}')
-    _appearance = db.Column('appearance', db.Text, nullable=False, default='{}')
+    notifications = db.Column(JSONDict, nullable=False, default=dict)
+    appearance = db.Column(JSONDict, nullable=False, default=dict)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
+
     # Define relationship with user
     user = db.relationship('User', back_populates='settings')
-    
-    @property
-    def notifications(self):
-        return json.loads(self._notifications)
-    
-    @notifications.setter
-    def notifications(self, value):
-        self._notifications = json.dumps(value)
-    
-    @property
-    def appearance(self):
-        return json.loads(self._appearance)
-    
-    @appearance.setter
-    def appearance(self, value):
-        self._appearance = json.dumps(value)
-    
+
+    @classmethod
+    def defaults(cls):
+        """Settings for a new user; every user gets a row when they register"""
+        return cls(notifications=dict(cls.DEFAULT_NOTIFICATIONS), appearance=dict(cls.DEFAULT_APPEARANCE))
+
     def __repr__(self):
-        return f'<Settings {self.id} for User {self.user_id}>'
\ No newline at end of file
+        return f'<Settings {self.id} for User {self.user_id}>'
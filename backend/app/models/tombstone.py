@@ -0,0 +1,27 @@
+# models/tombstone.py
+from app import db
+from datetime import datetime
+
+class Tombstone(db.Model):
+    """
+    Marker left behind by a deleted record, so delta-sync clients learn about
+    the delete (see app/services/sync_service.py). Kept for
+    SYNC_TOMBSTONE_RETENTION_DAYS; clients that were away longer sync again
+    from scratch.
+    """
+    __tablename__ = 'tombstones'
+    __table_args__ = (
+        db.Index('ix_tombstones_entity_type_user_id_id', 'entity_type', 'user_id', 'id'),
+        db.Index('ix_tombstones_entity_type_property_id_id', 'entity_type', 'property_id', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity_type = db.Column(db.String(20), nullable=False)  # sync resource, e.g. maintenance
+    entity_id = db.Column(db.Integer, nullable=False)
+    # No foreign keys: the user or property may be gone too
+    user_id = db.Column(db.Integer, nullable=False)
+    property_id = db.Column(db.Integer, nullable=True)
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f'<Tombstone {self.entity_type} {self.entity_id}>'
@@ -0,0 +1,281 @@
+# services/content_service.py
+"""
+Text extraction for uploaded documents.
+
+Files are parsed in a bounded process pool so a large PDF never ties up a
+request thread. Progress is stored in the document_contents table, which makes
+the work incremental and restartable: anything still pending, never queued or
+changed since it was extracted is picked up by ``flask extract-documents``.
+"""
+import multiprocessing
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from functools import partial
+
+from flask import current_app
+from sqlalchemy import and_, or_
+from app import db
+from app.models.document import Document
+from app.models.document_content import DocumentContent
+from app.services.file_service import file_storage, local_copy
+from app.utils import tracing
+
+# Subset of documents.ALLOWED_EXTENSIONS we can read text from
+EXTRACTABLE_EXTENSIONS = {'pdf', 'docx', 'xlsx', 'csv', 'txt'}
+
+# Background jobs allowed to wait per worker before uploads stop queueing
+QUEUE_DEPTH_PER_WORKER = 4
+
+_executor = None
+_slots = None
+_executor_lock = threading.Lock()
+
+
+class UnsupportedDocument(Exception):
+    """Raised when there is no way to read text from a file"""
+
+
+def file_extension(file_path):
+    return file_path.rsplit('.', 1)[-1].lower() if '.' in file_path else ''
+
+
+def new_content(file_path):
+    """Content row to attach to a newly uploaded document"""
+    if file_extension(file_path) in EXTRACTABLE_EXTENSIONS:
+        return DocumentContent(status=DocumentContent.STATUS_PENDING)
+    return DocumentContent(status=DocumentContent.STATUS_UNSUPPORTED)
+
+
+# Extraction (runs in worker processes)
+
+def extract_text(file_path, max_chars, s3_options=None):
+    """
+    Return up to ``max_chars`` of plain text from a file. Files in a bucket
+    are downloaded to a temporary file first, using ``s3_options`` from
+    ``file_storage.worker_options()``.
+    """
+    extension = file_extension(file_path)
+    extractor = _EXTRACTORS.get(extension)
+    if extractor is None:
+        raise UnsupportedDocument(f"No text extractor for .{extension} files")
+
+    chunks = []
+    size = 0
+    try:
+        with local_copy(file_path, s3_options) as path:
+            for chunk in extractor(path):
+                if chunk:
+                    chunks.append(chunk)
+                    size += len(chunk) + 1
+                if size >= max_chars:
+                    break
+    except ImportError as e:
+        raise UnsupportedDocument(f"Missing dependency for .{extension} files: {e.name}")
+
+    return '\n'.join(chunks)[:max_chars]
+
+
+def _read_text(file_path, chunk_size=64 * 1024):
+    with open(file_path, encoding='utf-8', errors='replace') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _read_pdf(file_path):
+    from pypdf import PdfReader
+
+    for page in PdfReader(file_path).pages:
+        yield page.extract_text()
+
+
+def _read_docx(file_path):
+    import docx
+
+    document = docx.Document(file_path)
+    for paragraph in document.paragraphs:
+        yield paragraph.text
+    for table in document.tables:
+        for row in table.rows:
+            yield ' '.join(cell.text for cell in row.cells)
+
+
+def _read_xlsx(file_path):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            yield sheet.title
+            for row in sheet.iter_rows(values_only=True):
+                yield ' '.join(str(value) for value in row if value is not None)
+    finally:
+        workbook.close()
+
+
+_EXTRACTORS = {
+    'txt': _read_text,
+    'csv': _read_text,
+    'pdf': _read_pdf,
+    'docx': _read_docx,
+    'xlsx': _read_xlsx,
+}
+
+
+# Storing results
+
+def _store_result(document_id, file_size, future):
+    """Record a finished extraction on the document's content row; returns its status"""
+    content = db.session.get(DocumentContent, document_id)
+    if content is None:
+        if db.session.get(Document, document_id) is None:
+            return None  # Document was deleted while it was being extracted
+        content = DocumentContent(document_id=document_id)
+        db.session.add(content)
+
+    content.attempts = (content.attempts or 0) + 1
+    try:
+        body = future.result()
+    except UnsupportedDocument as e:
+        content.status = DocumentContent.STATUS_UNSUPPORTED
+        content.error = str(e)[:500]
+    except Exception as e:
+        content.status = DocumentContent.STATUS_FAILED
+        content.error = f"{type(e).__name__}: {e}"[:500]
+    else:
+        content.status = DocumentContent.STATUS_EXTRACTED
+        content.body = body
+        content.error = None
+    content.file_size = file_size
+    content.extracted_at = datetime.utcnow()
+    return content.status
+
+
+def _process_pool(workers):
+    # spawn, not fork: the web process has threads and open DB connections
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+# Upload path
+
+def _get_executor(app):
+    global _executor, _slots
+    with _executor_lock:
+        if _executor is None:
+            workers = app.config.get('EXTRACTION_WORKERS', 2)
+            _executor = _process_pool(workers)
+            _slots = threading.BoundedSemaphore(workers * QUEUE_DEPTH_PER_WORKER)
+    return _executor, _slots
+
+
+def queue_extraction(document):
+    """
+    Extract a newly committed document in the background.
+
+    Returns False without queueing when extraction on upload is disabled or
+    the pool is saturated; the document stays pending for the next
+    ``flask extract-documents`` run.
+    """
+    app = current_app._get_current_object()
+    if not app.config.get('EXTRACT_ON_UPLOAD', True):
+        return False
+    if document.content is None or document.content.status != DocumentContent.STATUS_PENDING:
+        return False
+
+    executor, slots = _get_executor(app)
+    if not slots.acquire(blocking=False):
+        return False
+
+    try:
+        future = executor.submit(extract_text, document.file_path, app.config.get('EXTRACTION_MAX_CHARS'),
+                                 file_storage.worker_options())
+    except Exception:
+        slots.release()
+        app.logger.exception("Could not queue text extraction for document %s", document.id)
+        return False
+
+    # The span covers queueing and extraction, and ends once the result is stored
+    extract_span = tracing.start_span('document.extract_text',
+                                      {'document.id': document.id, 'file.size': document.file_size or 0})
+    future.add_done_callback(partial(_on_extracted, app, document.id, document.file_size, slots, extract_span))
+    return True
+
+
+def _on_extracted(app, document_id, file_size, slots, extract_span, future):
+    slots.release()
+    with tracing.use_span(extract_span), app.app_context():
+        try:
+            _store_result(document_id, file_size, future)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            app.logger.exception("Could not store extracted text for document %s", document_id)
+
+
+# Batch path
+
+def documents_needing_extraction(retry_failed=False):
+    """Query (id, file_path, file_size) of documents with missing or stale text"""
+    needs_extraction = or_(
+        DocumentContent.document_id.is_(None),
+        DocumentContent.status == DocumentContent.STATUS_PENDING,
+        # File changed since it was extracted
+        and_(DocumentContent.status == DocumentContent.STATUS_EXTRACTED,
+             DocumentContent.file_size != Document.file_size),
+    )
+    if retry_failed:
+        needs_extraction = or_(needs_extraction, DocumentContent.status == DocumentContent.STATUS_FAILED)
+
+    return (
+        db.session.query(Document.id, Document.file_path, Document.file_size)
+        .outerjoin(DocumentContent, DocumentContent.document_id == Document.id)
+        .filter(needs_extraction)
+        .order_by(Document.id)
+    )
+
+
+def extract_pending(batch_size=50, workers=None, retry_failed=False):
+    """
+    Extract every document that needs it, committing after each batch.
+
+    Safe to interrupt and re-run: committed batches are not redone.
+
+    Returns:
+        Counter: number of documents per resulting status
+    """
+    app = current_app._get_current_object()
+    workers = workers or app.config.get('EXTRACTION_WORKERS', 2)
+    max_chars = app.config.get('EXTRACTION_MAX_CHARS')
+    s3_options = file_storage.worker_options()
+
+    counts = Counter()
+    last_id = 0
+    with _process_pool(workers) as executor:
+        while True:
+            batch = (
+                documents_needing_extraction(retry_failed)
+                .filter(Document.id > last_id)
+                .limit(batch_size)
+                .all()
+            )
+            if not batch:
+                break
+
+            futures = {
+                executor.submit(extract_text, row.file_path, max_chars, s3_options): row
+                for row in batch
+            }
+            for future in as_completed(futures):
+                row = futures[future]
+                status = _store_result(row.id, row.file_size, future)
+                if status:
+                    counts[status] += 1
+
+            db.session.commit()
+            last_id = batch[-1].id
+
+    return counts
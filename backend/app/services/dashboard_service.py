@@ -0,0 +1,267 @@
+# services/dashboard_service.py
+"""
+Everything the dashboard shows, in one response.
+
+Each section runs its aggregate queries on its own pooled connection in a
+small shared thread pool, so a dashboard takes about as long as its slowest
+section instead of the sum of all of them. The view caches the result with
+``@cached(*DASHBOARD_MODELS)`` (see app/services/response_cache.py).
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import case, func, select
+from app import db
+from app.api.serializers import (
+    appliance_serializer, document_serializer, document_url, maintenance_serializer, project_serializer
+)
+from app.models.appliance import Appliance
+from app.models.document import Document
+from app.models.finance import Budget, Expense
+from app.models.maintenance import Maintenance
+from app.models.maintenance_checklist import MaintenanceChecklistItem
+from app.models.project import Project
+from app.models.property import Property
+from app.utils import tracing
+from app.utils.auth_utils import accessible_by
+from app.utils.money import cents_to_dollars
+
+SEASONS = ['Spring', 'Summer', 'Fall', 'Winter']
+OPEN_MAINTENANCE_STATUSES = ('pending', 'in-progress')
+
+DOCUMENT_EXPIRY_WINDOW = timedelta(days=30)
+WARRANTY_EXPIRY_WINDOW = timedelta(days=90)
+
+# Models whose changes can alter a dashboard
+DASHBOARD_MODELS = (
+    Maintenance, MaintenanceChecklistItem, Document, Appliance, Project, Expense, Budget, Property
+)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class _Scope:
+    """Which records a dashboard covers, mirroring the list endpoints"""
+
+    def __init__(self, user_id, property_id):
+        self.user_id = user_id
+        self.property_id = property_id
+
+    def owned(self, model):
+        if self.property_id:
+            return model.property_id == self.property_id
+        return accessible_by(model, self.user_id)
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = current_app.config.get('DASHBOARD_WORKERS', len(SECTIONS))
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dashboard')
+    return _executor
+
+
+def build_dashboard(user_id, property_id=None, limit=5):
+    """
+    Build the dashboard for a user.
+
+    Args:
+        user_id: the requesting user
+        property_id: restrict to one property the caller has verified access to
+        limit: length of the top-N lists
+    """
+    # Workers have no app context, so hand them the engine itself
+    engine = db.engine
+    scope = _Scope(user_id, property_id)
+    today = date.today()
+
+    executor = _get_executor()
+    trace_context = tracing.current_context()
+    futures = {
+        name: executor.submit(_run_section, engine, name, section, scope, today, limit, trace_context)
+        for name, section in SECTIONS.items()
+    }
+    result = {name: future.result() for name, future in futures.items()}
+    result['property_id'] = property_id
+    result['generated_at'] = datetime.utcnow()
+    return result
+
+
+def _run_section(engine, name, section, scope, today, limit, trace_context=None):
+    with tracing.span(f'dashboard.{name}', context=trace_context), engine.connect() as connection:
+        return section(connection, scope, today, limit)
+
+
+def _percentage(part, whole):
+    return round(part / whole * 100, 1) if whole else 0
+
+
+# Sections
+
+def _maintenance_section(connection, scope, today, limit):
+    rows = connection.execute(
+        select(
+            Maintenance.status,
+            func.count(),
+            func.sum(case((Maintenance.due_date < today, 1), else_=0)),
+        )
+        .where(scope.owned(Maintenance))
+        .group_by(Maintenance.status)
+    ).all()
+
+    upcoming = connection.execute(
+        select(*maintenance_serializer.columns)
+        .where(scope.owned(Maintenance), Maintenance.status == 'pending')
+        .order_by(Maintenance.due_date.is_(None), Maintenance.due_date, Maintenance.created_at.desc())
+        .limit(limit)
+    )
+
+    return {
+        'counts': {status: count for status, count, _ in rows},
+        'overdue': sum(overdue or 0 for status, _, overdue in rows if status in OPEN_MAINTENANCE_STATUSES),
+        'upcoming': maintenance_serializer.dump_rows(upcoming),
+    }
+
+
+def _checklist_section(connection, scope, today, limit):
+    rows = connection.execute(
+        select(
+            MaintenanceChecklistItem.season,
+            func.count(),
+            func.sum(case((MaintenanceChecklistItem.is_completed.is_(True), 1), else_=0)),
+        )
+        .where(scope.owned(MaintenanceChecklistItem))
+        .group_by(MaintenanceChecklistItem.season)
+    ).all()
+    by_season = {season: (total, completed or 0) for season, total, completed in rows}
+
+    stats = {}
+    for season in SEASONS:
+        total, completed = by_season.get(season, (0, 0))
+        stats[season] = {'total': total, 'completed': completed, 'percentage': _percentage(completed, total)}
+
+    total_all = sum(s['total'] for s in stats.values())
+    completed_all = sum(s['completed'] for s in stats.values())
+    stats['overall'] = {
+        'total': total_all,
+        'completed': completed_all,
+        'percentage': _percentage(completed_all, total_all),
+    }
+    return stats
+
+
+def _documents_section(connection, scope, today, limit):
+    count, expiring = connection.execute(
+        select(
+            func.count(),
+            func.sum(case((Document.expiration_date.between(today, today + DOCUMENT_EXPIRY_WINDOW), 1), else_=0)),
+        )
+        .where(scope.owned(Document))
+    ).one()
+
+    rows = connection.execute(
+        select(*document_serializer.columns)
+        .where(scope.owned(Document))
+        .order_by(Document.created_at.desc())
+        .limit(limit)
+    )
+    recent = []
+    for row in rows:
+        data = document_serializer.dump_row(row)
+        data['url'] = document_url(row.property_id, row.file_path, scope.user_id)
+        recent.append(data)
+
+    return {'count': count, 'expiring_soon': expiring or 0, 'recent': recent}
+
+
+def _appliances_section(connection, scope, today, limit):
+    count, warranties_expiring = connection.execute(
+        select(
+            func.count(),
+            func.sum(case(
+                (Appliance.warranty_expiration.between(today, today + WARRANTY_EXPIRY_WINDOW), 1), else_=0
+            )),
+        )
+        .where(scope.owned(Appliance))
+    ).one()
+
+    recent = connection.execute(
+        select(*appliance_serializer.columns)
+        .where(scope.owned(Appliance))
+        .order_by(Appliance.created_at.desc())
+        .limit(limit)
+    )
+
+    return {
+        'count': count,
+        'warranties_expiring': warranties_expiring or 0,
+        'recent': appliance_serializer.dump_rows(recent),
+    }
+
+
+def _projects_section(connection, scope, today, limit):
+    rows = connection.execute(
+        select(Project.status, func.count(), func.sum(Project.budget), func.sum(Project.spent))
+        .where(scope.owned(Project))
+        .group_by(Project.status)
+    ).all()
+
+    active = connection.execute(
+        select(*project_serializer.columns)
+        .where(scope.owned(Project), Project.status != 'completed')
+        .order_by(Project.created_at.desc())
+        .limit(limit)
+    )
+
+    return {
+        'counts': {status: count for status, count, _, _ in rows},
+        'total_budget': cents_to_dollars(sum(int(budget or 0) for _, _, budget, _ in rows)),
+        'total_spent': cents_to_dollars(sum(int(spent or 0) for _, _, _, spent in rows)),
+        'active': project_serializer.dump_rows(active),
+    }
+
+
+def _finances_section(connection, scope, today, limit):
+    month_start = today.replace(day=1)
+    next_month = (month_start + timedelta(days=32)).replace(day=1)
+
+    # Sums are integer cents; convert once for the response
+    expenses = connection.execute(
+        select(func.coalesce(func.sum(Expense.amount), 0))
+        .where(scope.owned(Expense), Expense.date >= month_start, Expense.date < next_month)
+    ).scalar()
+    budget = connection.execute(
+        select(func.coalesce(func.sum(Budget.amount), 0))
+        .where(scope.owned(Budget), Budget.year == today.year, Budget.month == today.month)
+    ).scalar()
+    expenses, budget = int(expenses), int(budget)
+
+    variance = budget - expenses
+    if not budget:
+        status = 'no_budget'
+    else:
+        status = 'under_budget' if variance >= 0 else 'over_budget'
+
+    return {
+        'year': today.year,
+        'month': today.month,
+        'expenses': cents_to_dollars(expenses),
+        'budget': cents_to_dollars(budget),
+        'variance': cents_to_dollars(variance),
+        'variance_percent': _percentage(variance, budget),
+        'status': status,
+    }
+
+
+SECTIONS = {
+    'maintenance': _maintenance_section,
+    'checklist': _checklist_section,
+    'documents': _documents_section,
+    'appliances': _appliances_section,
+    'projects': _projects_section,
+    'finances': _finances_section,
+}
@@ -2,12 +2,16 @@
 from flask import current_app, render_template
 from flask_mail import Message
 from app import mail
+from datetime import date
+from markupsafe import escape
 import os
 from threading import Thread
+from app.utils import tracing
 
-def send_async_email(app, msg):
+def send_async_email(app, msg, trace_context=None):
     """Send email asynchronously"""
-    with app.app_context():
+    with app.app_context(), tracing.span('email.send', {'email.recipients': len(msg.recipients)},
+                                         context=trace_context):
         mail.send(msg)
 
 def send_email(subject, recipients, html_body, sender=None):
@@ -19,7 +23,7 @@ def send_email(subject, recipients, html_body, sender=None):
     msg.html = html_body
     
     # Send email asynchronously to not block the request
-    Thread(target=send_async_email, args=(app, msg)).start()
+    Thread(target=send_async_email, args=(app, msg, tracing.current_context())).start()
 
 def get_frontend_url():
     """Helper function to get the configured frontend URL"""
@@ -103,4 +107,81 @@ def send_verification_email(user, verification_url):
     <p>Best regards,<br>The HomieHQ Team</p>
     """
     
-    send_email(subject, recipients, html_body)
\ No newline at end of file
+    send_email(subject, recipients, html_body)
+
+def alert_digest_message(user, alerts):
+    """
+    Build (but don't send) the digest email listing a user's upcoming expirations.
+
+    Returned as a Message so batch senders can deliver many digests over one
+    SMTP connection.
+    """
+    today = date.today()
+    items = []
+    for alert in alerts:
+        what = 'warranty expires' if alert.kind == 'warranty_expiring' else 'expires'
+        days = (alert.due_date - today).days
+        when = 'today' if days == 0 else f"in {days} day{'s' if days != 1 else ''}"
+        items.append(
+            f"<li><strong>{escape(alert.title)}</strong>: {what} {when} "
+            f"({alert.due_date.strftime('%B %d, %Y')})</li>"
+        )
+
+    html_body = f"""
+    <h1>Upcoming expirations</h1>
+    <p>Hello {escape(user.first_name or 'there')},</p>
+    <p>These items need your attention soon:</p>
+    <ul>
+        {''.join(items)}
+    </ul>
+    <p><a href="{get_frontend_url()}">Open HomieHQ</a> to review them.</p>
+    <p>Best regards,<br>The HomieHQ Team</p>
+    """
+
+    msg = Message(f"{len(alerts)} item{'s' if len(alerts) != 1 else ''} expiring soon",
+                  sender=current_app.config['MAIL_DEFAULT_SENDER'],
+                  recipients=[user.email])
+    msg.html = html_body
+    return msg
+
+# Digest headings for each notification category
+CATEGORY_HEADINGS = {
+    'maintenance_reminders': 'Maintenance',
+    'project_updates': 'Projects',
+    'document_updates': 'Documents',
+    'payment_reminders': 'Expenses',
+}
+
+def notification_digest_message(user, events):
+    """
+    Build (but don't send) the digest email of recent changes to a user's records.
+
+    ``events`` are the event dicts of a queued delivery's payload.
+    """
+    by_category = {}
+    for event in events:
+        by_category.setdefault(event['category'], []).append(event)
+
+    sections = []
+    for category, items in by_category.items():
+        lines = []
+        for event in items:
+            times = f" ({event['occurrences']} changes)" if event['occurrences'] > 1 else ''
+            lines.append(f"<li><strong>{escape(event['title'])}</strong> was {event['action']}{times}</li>")
+        heading = CATEGORY_HEADINGS.get(category, category.replace('_', ' ').title())
+        sections.append(f"<h2>{escape(heading)}</h2><ul>{''.join(lines)}</ul>")
+
+    html_body = f"""
+    <h1>What's new</h1>
+    <p>Hello {escape(user.first_name or 'there')},</p>
+    <p>Here is what changed since your last update:</p>
+    {''.join(sections)}
+    <p><a href="{get_frontend_url()}">Open HomieHQ</a> for the details.</p>
+    <p>Best regards,<br>The HomieHQ Team</p>
+    """
+
+    msg = Message(f"{len(events)} update{'s' if len(events) != 1 else ''} to your home",
+                  sender=current_app.config['MAIL_DEFAULT_SENDER'],
+                  recipients=[user.email])
+    msg.html = html_body
+    return msg
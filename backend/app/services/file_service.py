@@ -0,0 +1,303 @@
+# services/file_service.py
+"""
+Where uploaded files are kept.
+
+Files are saved under a key relative to the upload root, e.g.
+``documents/files/property_3/<uuid>_lease.pdf``, which is also their public
+URL (``/uploads/<key>``). ``Document.file_path`` records where the bytes
+went: an absolute path for the local backend, ``s3://bucket/key`` for S3.
+Reads and deletes go by that location, not by the current backend, so files
+saved before a switch keep working.
+
+Backends (``STORAGE_BACKEND``):
+- ``local``: ``UPLOAD_FOLDER`` on this node's disk
+- ``s3``: any S3-compatible store (AWS, MinIO, ...), so every node sees the
+  same files. Uploads are streamed from the request in multipart chunks and
+  never held whole in memory; ``/uploads/<key>`` and document downloads
+  redirect to short-lived presigned URLs, so the bytes never pass through
+  Python. One boto3 client per process, with a connection pool of
+  ``STORAGE_S3_MAX_POOL_CONNECTIONS``.
+"""
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+
+from flask import redirect, send_file
+from werkzeug.security import safe_join
+
+S3_SCHEME = 's3://'
+
+# Read size when copying a stream to disk
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def is_s3(location):
+    return location.startswith(S3_SCHEME)
+
+
+def parse_s3(location):
+    """``s3://bucket/some/key`` -> ('bucket', 'some/key')"""
+    bucket, _, key = location[len(S3_SCHEME):].partition('/')
+    return bucket, key
+
+
+class _CountingReader:
+    """Wraps a stream to count the bytes read from it"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.size = 0
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.size += len(data)
+        return data
+
+
+class LocalStorage:
+    """Files on this node's disk, under ``root``"""
+
+    name = 'local'
+
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, key):
+        """Where ``key`` lives under the root, or None if it points outside it"""
+        return safe_join(self.root, key)
+
+    def save(self, stream, key, content_type=None):
+        path = self.path(key)
+        if path is None:
+            raise ValueError(f'Invalid storage key: {key}')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            shutil.copyfileobj(stream, f, COPY_BUFFER_SIZE)
+        return path, os.path.getsize(path)
+
+    def delete(self, path):
+        if os.path.exists(path):
+            os.remove(path)
+
+    def download_response(self, path, download_name=None):
+        if not os.path.exists(path):
+            return None
+        return send_file(path, as_attachment=True, download_name=download_name)
+
+
+class S3Storage:
+    """Files in an S3-compatible bucket"""
+
+    name = 's3'
+
+    def __init__(self, bucket=None, prefix='', endpoint_url=None, public_endpoint_url=None, region=None,
+                 access_key_id=None, secret_access_key=None, addressing_style='auto',
+                 max_pool_connections=10, multipart_threshold_mb=8, multipart_chunk_mb=8,
+                 max_concurrency=4, url_expires=900):
+        self.bucket = bucket
+        self.prefix = prefix
+        self.endpoint_url = endpoint_url
+        self.public_endpoint_url = public_endpoint_url
+        self.region = region
+        self.access_key_id = access_key_id
+        self.secret_access_key = secret_access_key
+        self.addressing_style = addressing_style
+        self.max_pool_connections = max_pool_connections
+        self.multipart_threshold_mb = multipart_threshold_mb
+        self.multipart_chunk_mb = multipart_chunk_mb
+        self.max_concurrency = max_concurrency
+        self.url_expires = url_expires
+        self._client = None
+        self._signer = None
+        self._transfer_config = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            bucket=config.get('S3_BUCKET'),
+            prefix=config.get('STORAGE_S3_PREFIX', ''),
+            endpoint_url=config.get('STORAGE_S3_ENDPOINT_URL'),
+            public_endpoint_url=config.get('STORAGE_S3_PUBLIC_ENDPOINT_URL'),
+            region=config.get('AWS_REGION'),
+            access_key_id=config.get('AWS_ACCESS_KEY_ID'),
+            secret_access_key=config.get('AWS_SECRET_ACCESS_KEY'),
+            addressing_style=config.get('STORAGE_S3_ADDRESSING_STYLE', 'auto'),
+            max_pool_connections=config.get('STORAGE_S3_MAX_POOL_CONNECTIONS', 10),
+            multipart_threshold_mb=config.get('STORAGE_S3_MULTIPART_THRESHOLD_MB', 8),
+            multipart_chunk_mb=config.get('STORAGE_S3_MULTIPART_CHUNK_MB', 8),
+            max_concurrency=config.get('STORAGE_S3_MAX_CONCURRENCY', 4),
+            url_expires=config.get('STORAGE_URL_EXPIRES', 900),
+        )
+
+    def options(self):
+        """Constructor arguments, to rebuild this backend in a worker process"""
+        return {
+            'bucket': self.bucket,
+            'prefix': self.prefix,
+            'endpoint_url': self.endpoint_url,
+            'public_endpoint_url': self.public_endpoint_url,
+            'region': self.region,
+            'access_key_id': self.access_key_id,
+            'secret_access_key': self.secret_access_key,
+            'addressing_style': self.addressing_style,
+            'max_pool_connections': self.max_pool_connections,
+            'multipart_threshold_mb': self.multipart_threshold_mb,
+            'multipart_chunk_mb': self.multipart_chunk_mb,
+            'max_concurrency': self.max_concurrency,
+            'url_expires': self.url_expires,
+        }
+
+    def _make_client(self, endpoint_url):
+        import boto3
+        from botocore.config import Config as BotoConfig
+
+        return boto3.session.Session().client(
+            's3',
+            endpoint_url=endpoint_url or None,
+            region_name=self.region,
+            aws_access_key_id=self.access_key_id,
+            aws_secret_access_key=self.secret_access_key,
+            config=BotoConfig(
+                signature_version='s3v4',
+                max_pool_connections=self.max_pool_connections,
+                retries={'mode': 'standard', 'max_attempts': 3},
+                s3={'addressing_style': self.addressing_style},
+            ),
+        )
+
+    @property
+    def client(self):
+        # Made on first use, so a worker forked from a preloaded app gets its own pool
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from boto3.s3.transfer import TransferConfig
+
+                    mb = 1024 * 1024
+                    self._transfer_config = TransferConfig(
+                        multipart_threshold=self.multipart_threshold_mb * mb,
+                        multipart_chunksize=self.multipart_chunk_mb * mb,
+                        max_concurrency=self.max_concurrency,
+                    )
+                    self._client = self._make_client(self.endpoint_url)
+        return self._client
+
+    @property
+    def signer(self):
+        """Client for presigning URLs, which must name the endpoint browsers can reach"""
+        if not self.public_endpoint_url:
+            return self.client
+        if self._signer is None:
+            with self._lock:
+                if self._signer is None:
+                    self._signer = self._make_client(self.public_endpoint_url)
+        return self._signer
+
+    def object_key(self, key):
+        return self.prefix + key
+
+    def save(self, stream, key, content_type=None):
+        object_key = self.object_key(key)
+        reader = _CountingReader(stream)
+        # Reads the stream a chunk at a time and sends the chunks as a
+        # multipart upload once the file is past the threshold
+        self.client.upload_fileobj(
+            reader, self.bucket, object_key,
+            ExtraArgs={'ContentType': content_type} if content_type else None,
+            Config=self._transfer_config,
+        )
+        return f'{S3_SCHEME}{self.bucket}/{object_key}', reader.size
+
+    def delete(self, location):
+        bucket, object_key = parse_s3(location)
+        self.client.delete_object(Bucket=bucket, Key=object_key)
+
+    def presigned_url(self, bucket, object_key, download_name=None):
+        params = {'Bucket': bucket, 'Key': object_key}
+        if download_name:
+            params['ResponseContentDisposition'] = f'attachment; filename="{download_name}"'
+        return self.signer.generate_presigned_url('get_object', Params=params, ExpiresIn=self.url_expires)
+
+    def redirect(self, bucket, object_key, download_name=None):
+        response = redirect(self.presigned_url(bucket, object_key, download_name))
+        # Browsers may reuse the redirect while the URL it points to is still valid
+        response.headers['Cache-Control'] = f'private, max-age={self.url_expires // 2}'
+        return response
+
+    def download_response(self, location, download_name=None):
+        bucket, object_key = parse_s3(location)
+        return self.redirect(bucket, object_key, download_name)
+
+    def download(self, location, path):
+        bucket, object_key = parse_s3(location)
+        self.client.download_file(bucket, object_key, path, Config=self._transfer_config)
+
+
+class FileStorage:
+    """The configured backend for new uploads, and access to files by their location"""
+
+    def __init__(self):
+        self.local = None
+        self.s3 = None
+        self.backend = None
+
+    def init_app(self, app):
+        backend = app.config.get('STORAGE_BACKEND', 'local')
+        if backend not in ('local', 's3'):
+            raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
+        # The folder /uploads/ is served from (by nginx, or serve_uploads)
+        self.local = LocalStorage(os.path.join(app.root_path, app.config['UPLOAD_FOLDER']))
+        # Also kept when storing locally, to reach files saved to S3 before a switch back
+        self.s3 = S3Storage.from_config(app.config)
+        self.backend = self.s3 if backend == 's3' else self.local
+
+    def _for(self, location):
+        return self.s3 if is_s3(location) else self.local
+
+    def save(self, stream, key, content_type=None):
+        """Store a stream under ``key``; returns (location, size in bytes)"""
+        return self.backend.save(stream, key, content_type)
+
+    def delete(self, location):
+        self._for(location).delete(location)
+
+    def download_response(self, location, download_name=None):
+        """A response sending the file as an attachment, or None if it's missing"""
+        return self._for(location).download_response(location, download_name or os.path.basename(location))
+
+    def serve_upload(self, key):
+        """A redirect to an object for ``/uploads/<key>``, or None when storing locally"""
+        if self.backend is not self.s3:
+            return None
+        return self.s3.redirect(self.s3.bucket, self.s3.object_key(key))
+
+    def worker_options(self):
+        """What ``local_copy`` needs to read S3 files in another process"""
+        return self.s3.options() if self.s3 is not None else None
+
+
+@contextmanager
+def local_copy(location, s3_options=None):
+    """
+    A path on local disk with the file's contents: the file itself when it is
+    local, otherwise a temporary download removed on exit. Usable outside the
+    app, e.g. in extraction worker processes.
+    """
+    if not is_s3(location):
+        yield location
+        return
+
+    suffix = os.path.splitext(location)[1]
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    os.close(fd)
+    try:
+        S3Storage(**(s3_options or {})).download(location, path)
+        yield path
+    finally:
+        os.remove(path)
+
+
+file_storage = FileStorage()
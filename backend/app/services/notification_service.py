@@ -0,0 +1,736 @@
+# services/notification_service.py
+"""
+Notifications: expiry alerts, and digests of changes to a user's records.
+
+Alerts. ``scan_alerts`` walks ``Document.expiration_date`` and
+``Appliance.warranty_expiration`` with range queries on their indexes, in
+keyset-paginated batches so memory stays flat however many users there are,
+and upserts one ``Alert`` row per record expiring within its window. Alerts the
+scan no longer sees are deleted at the end. Between scans an ``after_flush``
+listener keeps alerts in step with edited and deleted records, so endpoints
+only ever read the alerts table. ``send_digests`` emails each user a single
+digest of the alerts they haven't been told about yet.
+
+Change digests run in three stages:
+
+1. An ``after_flush`` listener turns changes to maintenance, projects,
+   documents and expenses into ``NotificationEvent`` rows, in the same
+   transaction, for the record's owner and the property's owner. Changes a
+   user makes themselves in the app aren't news to them and are skipped,
+   as are categories they turned off. Further changes to a record fold into
+   its pending event, so the buffer holds at most one event per record.
+2. ``queue_digests`` folds each user's buffer into one ``NotificationDelivery``
+   per channel (email, and ``webhook_url`` when set) once it has been quiet
+   for NOTIFICATION_COALESCE_SECONDS, or has waited NOTIFICATION_MAX_DELAY_SECONDS.
+3. ``deliver_pending`` works through the delivery queue, retrying failures
+   with exponential backoff up to NOTIFICATION_MAX_ATTEMPTS.
+
+Notification settings are loaded once per user and kept for
+NOTIFICATION_SETTINGS_TTL seconds, and dropped as soon as a settings change
+commits in this process.
+
+Alerts run from ``flask scan-alerts``, meant to be scheduled once a day, and
+digests from ``flask send-notifications``, meant for every few minutes. Run
+one of each at a time.
+"""
+import json
+import threading
+import time
+import urllib.request
+from collections import Counter, defaultdict, namedtuple
+from contextlib import ExitStack
+from datetime import date, datetime, timedelta
+
+from flask import current_app, has_request_context
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import and_, event, func, inspect, or_, select, tuple_, update
+from app import db, mail
+from app.models.alert import Alert
+from app.models.appliance import Appliance
+from app.models.document import Document
+from app.models.finance import Expense
+from app.models.maintenance import Maintenance
+from app.models.notification import NotificationDelivery, NotificationEvent
+from app.models.project import Project
+from app.models.property import Property
+from app.models.settings import Settings
+from app.models.user import User
+from app.services import email_service
+from app.utils import tracing
+from app.utils.model_events import changed_instances
+from app.utils.validators import InvalidWebhookURL, validate_webhook_url, webhook_opener
+
+AlertSource = namedtuple('AlertSource', ['kind', 'model', 'entity_type', 'date_attr', 'title_attr', 'window_setting'])
+
+ALERT_SOURCES = (
+    AlertSource(Alert.KIND_DOCUMENT_EXPIRING, Document, 'document',
+                'expiration_date', 'title', 'ALERT_DOCUMENT_DAYS'),
+    AlertSource(Alert.KIND_WARRANTY_EXPIRING, Appliance, 'appliance',
+                'warranty_expiration', 'name', 'ALERT_WARRANTY_DAYS'),
+)
+
+SOURCES_BY_KIND = {source.kind: source for source in ALERT_SOURCES}
+
+_SOURCES_BY_MODEL = {source.model: source for source in ALERT_SOURCES}
+
+# Attributes whose changes can create, move or remove an alert
+_WATCHED_ATTRIBUTES = {
+    source.model: (source.date_attr, source.title_attr, 'user_id', 'property_id')
+    for source in ALERT_SOURCES
+}
+
+# What an alert is built from: a projected row in the scan, an instance on flush
+_AlertRecord = namedtuple('_AlertRecord', ['id', 'user_id', 'property_id', 'title', 'due_date'])
+
+EventSource = namedtuple('EventSource', ['model', 'entity_type', 'category', 'title_attr', 'watched'])
+
+# category is the notification setting that turns the events on
+EVENT_SOURCES = (
+    EventSource(Maintenance, 'maintenance', 'maintenance_reminders', 'title',
+                ('title', 'status', 'priority', 'due_date')),
+    EventSource(Project, 'project', 'project_updates', 'name',
+                ('name', 'status', 'projected_end_date')),
+    EventSource(Document, 'document', 'document_updates', 'title',
+                ('title', 'file_path', 'expiration_date')),
+    EventSource(Expense, 'expense', 'payment_reminders', 'title',
+                ('title', 'amount', 'date')),
+)
+
+_EVENT_SOURCES_BY_MODEL = {source.model: source for source in EVENT_SOURCES}
+
+# user_id -> (expires_at, parsed notification settings)
+_settings_cache = {}
+_settings_lock = threading.Lock()
+
+
+def alert_window(kind):
+    """How far ahead alerts of ``kind`` are raised"""
+    return timedelta(days=current_app.config[SOURCES_BY_KIND[kind].window_setting])
+
+
+def _alert_values(source, record, scanned_at):
+    return {
+        'kind': source.kind,
+        'entity_type': source.entity_type,
+        'entity_id': record.id,
+        'user_id': record.user_id,
+        'property_id': record.property_id,
+        'title': (record.title or '')[:255],
+        'due_date': record.due_date,
+        'scanned_at': scanned_at,
+    }
+
+
+def _upsert_alerts(connection, source, records, scanned_at):
+    """Insert or refresh the alerts for a batch of records of one source"""
+    table = Alert.__table__
+    records = {record.id: record for record in records}
+    existing = {
+        row.entity_id: row for row in connection.execute(
+            select(table.c.id, table.c.entity_id, table.c.user_id, table.c.property_id,
+                   table.c.title, table.c.due_date)
+            .where(table.c.kind == source.kind, table.c.entity_id.in_(records))
+        )
+    }
+
+    inserts = []
+    unchanged = []
+    for entity_id, record in records.items():
+        values = _alert_values(source, record, scanned_at)
+        row = existing.get(entity_id)
+        if row is None:
+            inserts.append(values)
+        elif (row.user_id, row.property_id, row.title, row.due_date) == \
+                (values['user_id'], values['property_id'], values['title'], values['due_date']):
+            unchanged.append(row.id)
+        else:
+            if row.due_date != values['due_date']:
+                # A new date is news again
+                values['notified_at'] = None
+            connection.execute(table.update().where(table.c.id == row.id).values(**values))
+
+    if unchanged:
+        connection.execute(table.update().where(table.c.id.in_(unchanged)).values(scanned_at=scanned_at))
+    if inserts:
+        connection.execute(table.insert(), inserts)
+
+
+def _delete_alert(connection, source, entity_id):
+    table = Alert.__table__
+    connection.execute(table.delete().where(table.c.kind == source.kind, table.c.entity_id == entity_id))
+
+
+# Scanning
+
+def scan_alerts(batch_size=500, today=None):
+    """
+    Recompute every alert from the source tables, committing after each batch.
+
+    Returns:
+        Counter: number of alerts per kind
+    """
+    today = today or date.today()
+    scanned_at = datetime.utcnow()
+    counts = Counter()
+
+    for source in ALERT_SOURCES:
+        model = source.model
+        due_date = getattr(model, source.date_attr)
+        columns = (
+            model.id,
+            model.user_id,
+            model.property_id,
+            getattr(model, source.title_attr).label('title'),
+            due_date.label('due_date'),
+        )
+        in_window = due_date.between(today, today + alert_window(source.kind))
+
+        last = None
+        while True:
+            query = select(*columns).where(in_window)
+            if last is not None:
+                last_due, last_id = last
+                query = query.where(or_(due_date > last_due, and_(due_date == last_due, model.id > last_id)))
+            rows = db.session.execute(query.order_by(due_date, model.id).limit(batch_size)).all()
+            if not rows:
+                break
+
+            _upsert_alerts(db.session.connection(), source, rows, scanned_at)
+            db.session.commit()
+            counts[source.kind] += len(rows)
+            last = (rows[-1].due_date, rows[-1].id)
+
+        # Anything this scan didn't touch has expired or moved out of the window
+        db.session.execute(
+            Alert.__table__.delete().where(Alert.kind == source.kind, Alert.scanned_at < scanned_at)
+        )
+        db.session.commit()
+
+    return counts
+
+
+@event.listens_for(db.session, 'after_flush')
+def update_alerts(session, flush_context):
+    """Keep alerts current for records changed between scans"""
+    changes = list(changed_instances(session, tuple(_SOURCES_BY_MODEL), _WATCHED_ATTRIBUTES))
+    if not changes:
+        return
+
+    connection = session.connection()
+    today = date.today()
+    now = datetime.utcnow()
+    for instance, deleted in changes:
+        source = _SOURCES_BY_MODEL[type(instance)]
+        due_date = None if deleted else getattr(instance, source.date_attr)
+        if due_date is not None and today <= due_date <= today + alert_window(source.kind):
+            record = _AlertRecord(instance.id, instance.user_id, instance.property_id,
+                                  getattr(instance, source.title_attr), due_date)
+            _upsert_alerts(connection, source, [record], now)
+        else:
+            _delete_alert(connection, source, instance.id)
+
+
+# Reading
+
+def expiring_alerts(kind, user_id, days=None, property_id=None, today=None):
+    """
+    Query the alerts of ``kind`` due within ``days``, soonest first.
+
+    ``days`` is capped at the scan window, beyond which there are no alerts;
+    callers wanting a longer range must query the records themselves.
+    With ``property_id`` (already verified) alerts for the property are
+    returned, otherwise the user's own.
+    """
+    today = today or date.today()
+    window = alert_window(kind)
+    if days is not None:
+        window = min(window, timedelta(days=max(days, 0)))
+
+    query = Alert.query.filter(Alert.kind == kind, Alert.due_date.between(today, today + window))
+    if property_id:
+        query = query.filter(Alert.property_id == property_id)
+    else:
+        query = query.filter(Alert.user_id == user_id)
+    return query.order_by(Alert.due_date, Alert.entity_id)
+
+
+# Settings
+
+def _with_defaults(notifications):
+    settings = dict(Settings.DEFAULT_NOTIFICATIONS)
+    settings.update(notifications or {})
+    return settings
+
+
+def notification_settings(user_ids, connection=None):
+    """
+    Notification settings of each of ``user_ids``, with defaults filled in.
+
+    Settings are loaded once and reused for NOTIFICATION_SETTINGS_TTL seconds;
+    whatever isn't cached is loaded in one query. Pass ``connection`` when
+    calling from inside a flush.
+    """
+    ttl = current_app.config.get('NOTIFICATION_SETTINGS_TTL', 60)
+    now = time.monotonic()
+    result = {}
+    with _settings_lock:
+        for user_id in user_ids:
+            expires_at, settings = _settings_cache.get(user_id, (0, None))
+            if expires_at > now:
+                result[user_id] = settings
+
+    missing = set(user_ids) - set(result)
+    if missing:
+        rows = dict((connection or db.session).execute(
+            select(Settings.user_id, Settings.notifications).where(Settings.user_id.in_(missing))
+        ).all())
+        loaded = {user_id: _with_defaults(rows.get(user_id)) for user_id in missing}
+        if ttl:
+            with _settings_lock:
+                for user_id, settings in loaded.items():
+                    _settings_cache[user_id] = (now + ttl, settings)
+        result.update(loaded)
+    return result
+
+
+@event.listens_for(db.session, 'after_flush')
+def _collect_changed_settings(session, flush_context):
+    for settings, _ in changed_instances(session, Settings, {Settings: ('notifications', 'user_id')}):
+        session.info.setdefault('changed_notification_settings', set()).add(settings.user_id)
+
+
+@event.listens_for(db.session, 'after_commit')
+def _forget_changed_settings(session):
+    user_ids = session.info.pop('changed_notification_settings', None)
+    if user_ids:
+        with _settings_lock:
+            for user_id in user_ids:
+                _settings_cache.pop(user_id, None)
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_changed_settings(session):
+    session.info.pop('changed_notification_settings', None)
+
+
+# Alert digests
+
+def send_digests(batch_size=100, today=None):
+    """
+    Email every user with alerts they haven't been notified about.
+
+    Users are processed in keyset-paginated batches, each batch over one SMTP
+    connection (opened only if someone in it gets mail) and committed on its
+    own. Alerts of users who turned email off are marked notified without
+    sending. A failed send leaves that user's alerts pending for the next
+    run; if the mail server can't be reached, the rest of the run sends
+    nothing and only marks the alerts of users without email.
+
+    Returns:
+        int: number of digests sent
+    """
+    today = today or date.today()
+    pending = and_(Alert.notified_at.is_(None), Alert.due_date >= today)
+    sent = 0
+    last_user_id = 0
+    mail_reachable = True
+
+    while True:
+        user_ids = db.session.execute(
+            select(Alert.user_id)
+            .where(pending, Alert.user_id > last_user_id)
+            .group_by(Alert.user_id)
+            .order_by(Alert.user_id)
+            .limit(batch_size)
+        ).scalars().all()
+        if not user_ids:
+            break
+
+        users = db.session.execute(
+            select(User.id, User.email, User.first_name).where(User.id.in_(user_ids))
+        ).all()
+        settings = notification_settings(user_ids)
+        alerts_by_user = defaultdict(list)
+        for alert in db.session.execute(
+            select(Alert.id, Alert.user_id, Alert.kind, Alert.title, Alert.due_date)
+            .where(pending, Alert.user_id.in_(user_ids))
+            .order_by(Alert.user_id, Alert.due_date)
+        ):
+            alerts_by_user[alert.user_id].append(alert)
+
+        notified = []
+        with ExitStack() as stack:
+            smtp = None
+            if mail_reachable and any(settings[user.id].get('email_notifications')
+                                      for user in users if user.id in alerts_by_user):
+                try:
+                    smtp = stack.enter_context(mail.connect())
+                except Exception:
+                    # Digests wait for the next run; don't try again for every batch
+                    current_app.logger.exception("Could not connect to the mail server")
+                    mail_reachable = False
+
+            for user in users:
+                alerts = alerts_by_user.get(user.id)
+                if not alerts:
+                    continue
+                if settings[user.id].get('email_notifications'):
+                    if smtp is None:
+                        continue
+                    try:
+                        smtp.send(email_service.alert_digest_message(user, alerts))
+                    except Exception:
+                        current_app.logger.exception("Could not send alert digest to user %s", user.id)
+                        continue
+                    sent += 1
+                notified.extend(alert.id for alert in alerts)
+
+        if notified:
+            db.session.execute(
+                update(Alert).where(Alert.id.in_(notified)).values(notified_at=datetime.utcnow())
+            )
+        db.session.commit()
+        last_user_id = user_ids[-1]
+
+    return sent
+
+
+# Change events
+
+def _acting_user_id():
+    """The user making the current request in the app, if any"""
+    if not has_request_context():
+        return None
+    try:
+        return int(get_jwt_identity())
+    except (RuntimeError, TypeError, ValueError):
+        # No JWT: an API key (e.g. Home Assistant), the CLI, a background job
+        return None
+
+
+def _event_action(session, source, instance, deleted):
+    if deleted:
+        return NotificationEvent.ACTION_DELETED
+    if instance in session.new:
+        return NotificationEvent.ACTION_CREATED
+    if 'status' in source.watched and 'completed' in inspect(instance).attrs.status.history.added:
+        return NotificationEvent.ACTION_COMPLETED
+    return NotificationEvent.ACTION_UPDATED
+
+
+def _fold(previous, action):
+    """Action of a buffered event after another change to its record; None drops it"""
+    if previous == NotificationEvent.ACTION_CREATED:
+        # Still new to the recipient, unless it's already gone again
+        return None if action == NotificationEvent.ACTION_DELETED else previous
+    if previous == NotificationEvent.ACTION_COMPLETED and action == NotificationEvent.ACTION_UPDATED:
+        return previous
+    return action
+
+
+def _buffer_events(connection, events, now):
+    """Insert new events and fold the rest into the ones already buffered"""
+    table = NotificationEvent.__table__
+    buffered = {
+        (row.user_id, row.entity_type, row.entity_id): row
+        for row in connection.execute(
+            select(table.c.id, table.c.user_id, table.c.entity_type, table.c.entity_id,
+                   table.c.action, table.c.occurrences)
+            .where(table.c.user_id.in_({user_id for user_id, _, _ in events}),
+                   table.c.entity_id.in_({entity_id for _, _, entity_id in events}))
+        )
+    }
+
+    inserts = []
+    for key, values in events.items():
+        row = buffered.get(key)
+        if row is None:
+            inserts.append(values)
+            continue
+        action = _fold(row.action, values['action'])
+        if action is None:
+            connection.execute(table.delete().where(table.c.id == row.id))
+        else:
+            connection.execute(table.update().where(table.c.id == row.id).values(
+                action=action,
+                title=values['title'],
+                property_id=values['property_id'],
+                occurrences=row.occurrences + 1,
+                updated_at=now,
+            ))
+
+    if inserts:
+        connection.execute(table.insert(), inserts)
+
+
+@event.listens_for(db.session, 'after_flush')
+def record_events(session, flush_context):
+    """Buffer an event for every recipient of a change this flush wrote"""
+    changes = list(changed_instances(
+        session, tuple(_EVENT_SOURCES_BY_MODEL), {source.model: source.watched for source in EVENT_SOURCES}
+    ))
+    if not changes:
+        return
+
+    connection = session.connection()
+    property_ids = {instance.property_id for instance, _ in changes if instance.property_id}
+    owners = dict(connection.execute(
+        select(Property.id, Property.user_id).where(Property.id.in_(property_ids))
+    ).all()) if property_ids else {}
+
+    actor = _acting_user_id()
+    recipients = {}
+    for instance, deleted in changes:
+        recipients[instance] = {instance.user_id, owners.get(instance.property_id)} - {None, actor}
+    settings = notification_settings(set().union(*recipients.values()), connection)
+
+    now = datetime.utcnow()
+    events = {}
+    for instance, deleted in changes:
+        source = _EVENT_SOURCES_BY_MODEL[type(instance)]
+        for user_id in recipients[instance]:
+            if not settings[user_id].get(source.category):
+                continue
+            events[(user_id, source.entity_type, instance.id)] = {
+                'user_id': user_id,
+                'category': source.category,
+                'entity_type': source.entity_type,
+                'entity_id': instance.id,
+                'property_id': instance.property_id,
+                'action': _event_action(session, source, instance, deleted),
+                'title': (getattr(instance, source.title_attr) or '')[:255],
+                'occurrences': 1,
+                'created_at': now,
+                'updated_at': now,
+            }
+
+    if events:
+        _buffer_events(connection, events, now)
+
+
+# Change digests
+
+def _ready_users(now, after, batch_size):
+    """Users whose buffer has settled, or has waited long enough"""
+    quiet = timedelta(seconds=current_app.config.get('NOTIFICATION_COALESCE_SECONDS', 300))
+    max_delay = timedelta(seconds=current_app.config.get('NOTIFICATION_MAX_DELAY_SECONDS', 3600))
+    return db.session.execute(
+        select(NotificationEvent.user_id)
+        .where(NotificationEvent.user_id > after)
+        .group_by(NotificationEvent.user_id)
+        .having(or_(func.max(NotificationEvent.updated_at) <= now - quiet,
+                    func.min(NotificationEvent.created_at) <= now - max_delay))
+        .order_by(NotificationEvent.user_id)
+        .limit(batch_size)
+    ).scalars().all()
+
+
+def _channels(settings):
+    if settings.get('email_notifications'):
+        yield NotificationDelivery.CHANNEL_EMAIL
+    if settings.get('webhook_url'):
+        yield NotificationDelivery.CHANNEL_WEBHOOK
+
+
+def _digest_payload(user_id, events, now):
+    return {
+        'user_id': user_id,
+        'generated_at': now.isoformat(),
+        'events': [
+            {
+                'category': item.category,
+                'entity_type': item.entity_type,
+                'entity_id': item.entity_id,
+                'property_id': item.property_id,
+                'action': item.action,
+                'title': item.title,
+                'occurrences': item.occurrences,
+                'updated_at': item.updated_at.isoformat(),
+            }
+            for item in events
+        ],
+    }
+
+
+def queue_digests(batch_size=100, now=None):
+    """
+    Fold each ready user's buffered events into one delivery per channel.
+
+    Queued events are deleted in the same transaction, committed per batch
+    of users. Events of users with every channel turned off are dropped.
+
+    Returns:
+        Counter: number of deliveries queued per channel
+    """
+    now = now or datetime.utcnow()
+    counts = Counter()
+    last_user_id = 0
+
+    while True:
+        user_ids = _ready_users(now, last_user_id, batch_size)
+        if not user_ids:
+            break
+
+        events_by_user = defaultdict(list)
+        for row in db.session.execute(
+            select(NotificationEvent)
+            .where(NotificationEvent.user_id.in_(user_ids))
+            .order_by(NotificationEvent.user_id, NotificationEvent.updated_at, NotificationEvent.id)
+        ).scalars():
+            events_by_user[row.user_id].append(row)
+        settings = notification_settings(user_ids)
+
+        deliveries = []
+        for user_id, events in events_by_user.items():
+            payload = json.dumps(_digest_payload(user_id, events, now))
+            for channel in _channels(settings[user_id]):
+                deliveries.append({
+                    'user_id': user_id,
+                    'channel': channel,
+                    'status': NotificationDelivery.STATUS_PENDING,
+                    'payload': payload,
+                    'attempts': 0,
+                    'next_attempt_at': now,
+                    'created_at': now,
+                })
+                counts[channel] += 1
+
+        if deliveries:
+            db.session.execute(NotificationDelivery.__table__.insert(), deliveries)
+        # Only the versions that went into a digest; an event folded again
+        # meanwhile stays buffered for the next one
+        db.session.execute(
+            NotificationEvent.__table__.delete().where(tuple_(NotificationEvent.id, NotificationEvent.updated_at).in_([
+                (item.id, item.updated_at) for events in events_by_user.values() for item in events
+            ]))
+        )
+        db.session.commit()
+        last_user_id = user_ids[-1]
+
+    return counts
+
+
+class DeliveryError(Exception):
+    """Raised when a delivery can never succeed, so retrying is pointless"""
+
+
+def _post_webhook(url, body):
+    # Checked again on every send: the host may resolve elsewhere by now
+    try:
+        validate_webhook_url(url, current_app.config.get('WEBHOOK_ALLOW_PRIVATE_HOSTS', False))
+    except InvalidWebhookURL as e:
+        raise DeliveryError(str(e))
+    webhook_request = urllib.request.Request(
+        url, data=body.encode(), method='POST',
+        headers={'Content-Type': 'application/json', 'User-Agent': 'PropertyPal'},
+    )
+    timeout = current_app.config.get('NOTIFICATION_WEBHOOK_TIMEOUT', 10)
+    # Raises HTTPError for any non-2xx response, redirects included
+    with webhook_opener.open(webhook_request, timeout=timeout) as response:
+        response.read()
+
+
+def _deliver(delivery, user, settings, smtp):
+    if user is None:
+        raise DeliveryError("User no longer exists")
+
+    with tracing.span('notification.deliver', {'notification.channel': delivery.channel,
+                                               'notification.delivery_id': delivery.id}):
+        _send(delivery, user, settings, smtp)
+
+
+def _send(delivery, user, settings, smtp):
+    if delivery.channel == NotificationDelivery.CHANNEL_EMAIL:
+        if smtp is None:
+            raise ConnectionError("Mail server unavailable")
+        events = json.loads(delivery.payload)['events']
+        smtp.send(email_service.notification_digest_message(user, events))
+    elif delivery.channel == NotificationDelivery.CHANNEL_WEBHOOK:
+        if not settings.get('webhook_url'):
+            raise DeliveryError("No webhook URL configured")
+        _post_webhook(settings['webhook_url'], delivery.payload)
+    else:
+        raise DeliveryError(f"Unknown channel: {delivery.channel}")
+
+
+def _record_failure(delivery, error, now, max_attempts):
+    delivery.error = f"{type(error).__name__}: {error}"[:500]
+    if isinstance(error, DeliveryError) or delivery.attempts >= max_attempts:
+        delivery.status = NotificationDelivery.STATUS_FAILED
+    else:
+        # 2, 4, 8, 16... minutes
+        delivery.next_attempt_at = now + timedelta(minutes=2 ** delivery.attempts)
+
+
+def deliver_pending(batch_size=100, now=None):
+    """
+    Send every queued delivery that is due, committing after each batch.
+
+    Email deliveries in a batch share one SMTP connection. Failed attempts
+    are retried with exponential backoff until NOTIFICATION_MAX_ATTEMPTS;
+    deliveries that can never succeed fail straight away.
+
+    Returns:
+        Counter: number of deliveries per resulting status
+    """
+    now = now or datetime.utcnow()
+    max_attempts = current_app.config.get('NOTIFICATION_MAX_ATTEMPTS', 5)
+    counts = Counter()
+    last_id = 0
+
+    while True:
+        deliveries = (
+            NotificationDelivery.query
+            .filter(NotificationDelivery.status == NotificationDelivery.STATUS_PENDING,
+                    NotificationDelivery.next_attempt_at <= now,
+                    NotificationDelivery.id > last_id)
+            .order_by(NotificationDelivery.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not deliveries:
+            break
+
+        user_ids = {delivery.user_id for delivery in deliveries}
+        users = {
+            user.id: user for user in db.session.execute(
+                select(User.id, User.email, User.first_name).where(User.id.in_(user_ids))
+            )
+        }
+        settings = notification_settings(user_ids)
+
+        with ExitStack() as stack:
+            smtp = None
+            if any(delivery.channel == NotificationDelivery.CHANNEL_EMAIL for delivery in deliveries):
+                try:
+                    smtp = stack.enter_context(mail.connect())
+                except Exception:
+                    # Email deliveries fail this attempt; webhooks still go out
+                    current_app.logger.exception("Could not connect to the mail server")
+
+            for delivery in deliveries:
+                delivery.attempts += 1
+                try:
+                    _deliver(delivery, users.get(delivery.user_id), settings[delivery.user_id], smtp)
+                except Exception as e:
+                    current_app.logger.warning("Notification delivery %s failed: %s", delivery.id, e)
+                    _record_failure(delivery, e, now, max_attempts)
+                else:
+                    delivery.status = NotificationDelivery.STATUS_SENT
+                    delivery.sent_at = datetime.utcnow()
+                    delivery.error = None
+                counts[delivery.status] += 1
+
+        db.session.commit()
+        last_id = deliveries[-1].id
+
+    # Keep sent deliveries around for a while for troubleshooting only
+    retention = timedelta(days=current_app.config.get('NOTIFICATION_RETENTION_DAYS', 30))
+    db.session.execute(
+        NotificationDelivery.__table__.delete().where(
+            NotificationDelivery.status == NotificationDelivery.STATUS_SENT,
+            NotificationDelivery.sent_at < now - retention,
+        )
+    )
+    db.session.commit()
+    return counts
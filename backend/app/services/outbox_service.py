@@ -0,0 +1,318 @@
+# services/outbox_service.py
+"""
+Change feed for Home Assistant and other integrations, so they don't have to poll.
+
+An ``after_flush`` listener writes an ``OutboxEvent`` for every change to a
+maintenance task, checklist item or document, in the same transaction as the
+change: an event exists exactly when its change committed. Events reach
+clients two ways:
+
+- ``dispatch_webhooks`` pushes them in batches to each user's
+  ``WebhookEndpoint``, signed with the endpoint's secret. Each endpoint keeps
+  its own position, so a failing endpoint is retried with exponential
+  backoff and catches up in order without holding up the others.
+  ``flask dispatch-webhooks --follow`` runs it continuously.
+- ``stream_events`` serves them as Server-Sent Events. Commits in this
+  process wake the stream at once; commits in other workers are picked up
+  within OUTBOX_POLL_SECONDS. Either way an event is sent once it has
+  settled (see ``events_after``): usually about a second after its commit,
+  later while an older transaction is still open.
+
+Events are kept for OUTBOX_RETENTION_DAYS.
+"""
+import hashlib
+import hmac
+import json
+import threading
+import time
+import urllib.request
+from collections import Counter
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import event, func, or_, select
+from app import db
+from app.api.serializers import checklist_item_serializer, document_serializer, ha_maintenance_serializer
+from app.models.document import Document
+from app.models.maintenance import Maintenance
+from app.models.maintenance_checklist import MaintenanceChecklistItem
+from app.models.outbox import OutboxEvent, WebhookEndpoint
+from app.utils import tracing
+from app.utils.auth_utils import accessible_by
+from app.utils.model_events import changed_instances
+from app.utils.validators import validate_webhook_url, webhook_opener
+from app.utils.write_horizon import write_horizon
+
+# model -> (entity type, snapshot serializer)
+OUTBOX_SOURCES = {
+    Maintenance: ('maintenance', ha_maintenance_serializer),
+    MaintenanceChecklistItem: ('checklist', checklist_item_serializer),
+    Document: ('document', document_serializer),
+}
+
+SIGNATURE_HEADER = 'X-PropertyPal-Signature'
+TIMESTAMP_HEADER = 'X-PropertyPal-Timestamp'
+
+# Bumped and broadcast whenever a commit in this process wrote events
+_new_events = threading.Condition()
+_generation = 0
+
+
+# Producing
+
+@event.listens_for(db.session, 'after_flush')
+def record_changes(session, flush_context):
+    """Write an outbox event for every tracked record this flush changed"""
+    rows = []
+    now = datetime.utcnow()
+    for instance, deleted in changed_instances(session, tuple(OUTBOX_SOURCES)):
+        entity_type, serializer = OUTBOX_SOURCES[type(instance)]
+        if deleted:
+            action, snapshot = 'deleted', {'id': instance.id}
+        else:
+            action = 'created' if instance in session.new else 'updated'
+            snapshot = serializer.dump(instance)
+        rows.append({
+            'topic': f'{entity_type}.{action}',
+            'entity_type': entity_type,
+            'entity_id': instance.id,
+            'user_id': instance.user_id,
+            'property_id': instance.property_id,
+            'payload': current_app.json.dumps(snapshot),
+            'created_at': now,
+        })
+
+    if rows:
+        session.connection().execute(OutboxEvent.__table__.insert(), rows)
+        session.info['outbox_written'] = True
+
+
+@event.listens_for(db.session, 'after_commit')
+def _announce_changes(session):
+    global _generation
+    if session.info.pop('outbox_written', False):
+        with _new_events:
+            _generation += 1
+            _new_events.notify_all()
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_changes(session):
+    session.info.pop('outbox_written', None)
+
+
+# Reading
+
+def latest_event_id(session=None):
+    """Current end of the stream; clients that start here only get new events"""
+    return (session or db.session).execute(select(func.coalesce(func.max(OutboxEvent.id), 0))).scalar()
+
+
+def settled_time(connection):
+    """Events written at or before this time can be read (see ``events_after``)"""
+    return write_horizon(connection, current_app.config.get('OUTBOX_SETTLE_SECONDS', 1))
+
+
+def settled_event_id(connection, settled):
+    """Highest event id written by ``settled``; no event below it can still appear"""
+    return connection.execute(
+        select(func.coalesce(func.max(OutboxEvent.id), 0)).where(OutboxEvent.created_at <= settled)
+    ).scalar()
+
+
+def events_after(connection, user_id, after_id, limit=100, settled=None):
+    """
+    Events visible to ``user_id`` after position ``after_id``, oldest first.
+
+    Ids are assigned on insert, not on commit, so a transaction still open
+    can commit an id below one already read. Events only become visible once
+    they were written before every transaction still open began, less
+    OUTBOX_SETTLE_SECONDS (``settled``, default ``settled_time()``; see
+    ``app/utils/write_horizon.py``), so a reader moving past an id doesn't
+    skip such a transaction.
+    """
+    settled = settled or settled_time(connection)
+    return connection.execute(
+        select(OutboxEvent.id, OutboxEvent.topic, OutboxEvent.entity_type, OutboxEvent.entity_id,
+               OutboxEvent.property_id, OutboxEvent.payload, OutboxEvent.created_at)
+        .where(accessible_by(OutboxEvent, user_id), OutboxEvent.id > after_id,
+               OutboxEvent.created_at <= settled)
+        .order_by(OutboxEvent.id)
+        .limit(limit)
+    ).all()
+
+
+def event_envelope(row):
+    return {
+        'id': row.id,
+        'topic': row.topic,
+        'entity_type': row.entity_type,
+        'entity_id': row.entity_id,
+        'property_id': row.property_id,
+        'created_at': row.created_at,
+        'data': json.loads(row.payload),
+    }
+
+
+def stream_events(user_id, after_id):
+    """
+    Generate Server-Sent Events for ``user_id`` starting after ``after_id``.
+
+    Ends after OUTBOX_STREAM_SECONDS; clients reconnect with
+    ``Last-Event-ID`` and continue where they left off. Each poll borrows a
+    connection only for its query, so an idle stream holds none.
+    """
+    config = current_app.config
+    poll = config.get('OUTBOX_POLL_SECONDS', 1)
+    heartbeat = config.get('OUTBOX_HEARTBEAT_SECONDS', 15)
+    deadline = time.monotonic() + config.get('OUTBOX_STREAM_SECONDS', 300)
+    engine = db.engine
+    to_json = current_app.json.dumps
+
+    yield f'retry: {int(poll * 1000)}\n\n'
+    quiet_since = time.monotonic()
+    while time.monotonic() < deadline:
+        with _new_events:
+            generation = _generation
+
+        with engine.connect() as connection:
+            rows = events_after(connection, user_id, after_id)
+        for row in rows:
+            yield f'id: {row.id}\nevent: {row.topic}\ndata: {to_json(event_envelope(row))}\n\n'
+            after_id = row.id
+        if rows:
+            quiet_since = time.monotonic()
+            continue
+
+        if time.monotonic() - quiet_since >= heartbeat:
+            # Comment line; keeps proxies from closing an idle connection
+            yield ': keepalive\n\n'
+            quiet_since = time.monotonic()
+        with _new_events:
+            if _generation == generation:
+                _new_events.wait(poll)
+
+
+# Webhooks
+
+def sign(secret, timestamp, body):
+    """Signature of a delivery: HMAC-SHA256 of ``"<timestamp>.<body>"``"""
+    message = f'{timestamp}.'.encode() + body
+    return 'sha256=' + hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+def _post(endpoint, events):
+    # Checked again on every send: the host may resolve elsewhere by now
+    validate_webhook_url(endpoint.url, current_app.config.get('WEBHOOK_ALLOW_PRIVATE_HOSTS', False))
+    body = current_app.json.dumps({
+        'endpoint_id': endpoint.id,
+        'events': [event_envelope(row) for row in events],
+    }).encode()
+    timestamp = str(int(time.time()))
+    webhook_request = urllib.request.Request(
+        endpoint.url, data=body, method='POST',
+        headers={
+            'Content-Type': 'application/json',
+            'User-Agent': 'PropertyPal',
+            TIMESTAMP_HEADER: timestamp,
+            SIGNATURE_HEADER: sign(endpoint.secret, timestamp, body),
+        },
+    )
+    timeout = current_app.config.get('OUTBOX_WEBHOOK_TIMEOUT', 10)
+    # Raises HTTPError for any non-2xx response, redirects included
+    with tracing.span('webhook.post', {'webhook.endpoint_id': endpoint.id, 'webhook.events': len(events)}):
+        with webhook_opener.open(webhook_request, timeout=timeout) as response:
+            response.read()
+
+
+def _dispatch_endpoint(endpoint, batch_size, now, settled, latest):
+    """
+    Deliver the next batch of events to one endpoint; returns events delivered.
+
+    ``latest`` is the settled end of the stream. Once an endpoint has had
+    everything up to it (or none of it was for the endpoint's user) it moves
+    there, so an idle endpoint isn't picked up and queried again every pass.
+    """
+    rows = events_after(db.session.connection(), endpoint.user_id, endpoint.last_event_id, batch_size, settled)
+    if not rows:
+        endpoint.last_event_id = latest
+        return 0
+
+    wanted = [row for row in rows if endpoint.wants(row.topic)]
+    if wanted:
+        try:
+            _post(endpoint, wanted)
+        except Exception as e:
+            endpoint.failures += 1
+            endpoint.last_error = f"{type(e).__name__}: {e}"[:500]
+            max_backoff = current_app.config.get('OUTBOX_MAX_BACKOFF_SECONDS', 3600)
+            endpoint.next_attempt_at = now + timedelta(seconds=min(10 * 2 ** endpoint.failures, max_backoff))
+            current_app.logger.warning("Webhook %s failed: %s", endpoint.id, e)
+            return 0
+        endpoint.last_delivered_at = now
+
+    # A short batch is everything up to ``latest``
+    endpoint.last_event_id = rows[-1].id if len(rows) == batch_size else max(rows[-1].id, latest)
+    endpoint.failures = 0
+    endpoint.next_attempt_at = None
+    endpoint.last_error = None
+    return len(wanted)
+
+
+def dispatch_webhooks(batch_size=100, now=None):
+    """
+    Deliver pending events to every due endpoint until all are caught up
+    or waiting to retry. Each endpoint's batch is committed on its own,
+    with the endpoint row locked where the database supports it.
+
+    Returns:
+        Counter: 'events' delivered and 'failures'
+    """
+    now = now or datetime.utcnow()
+    counts = Counter()
+    connection = db.session.connection()
+    settled = settled_time(connection)
+    latest = settled_event_id(connection, settled)
+    db.session.commit()
+
+    while True:
+        endpoint_ids = db.session.execute(
+            select(WebhookEndpoint.id).where(
+                WebhookEndpoint.is_active.is_(True),
+                WebhookEndpoint.last_event_id < latest,
+                or_(WebhookEndpoint.next_attempt_at.is_(None), WebhookEndpoint.next_attempt_at <= now),
+            )
+        ).scalars().all()
+        progressed = False
+
+        for endpoint_id in endpoint_ids:
+            endpoint = db.session.execute(
+                select(WebhookEndpoint).where(WebhookEndpoint.id == endpoint_id)
+                .with_for_update(skip_locked=True)
+            ).scalar()
+            if endpoint is None:
+                # Another dispatcher has it
+                db.session.rollback()
+                continue
+
+            position = endpoint.last_event_id
+            delivered = _dispatch_endpoint(endpoint, batch_size, now, settled, latest)
+            counts['events'] += delivered
+            if endpoint.failures:
+                counts['failures'] += 1
+            progressed = progressed or endpoint.last_event_id != position
+            db.session.commit()
+
+        if not progressed:
+            return counts
+
+
+def prune_events(now=None):
+    """Delete events older than OUTBOX_RETENTION_DAYS; returns how many"""
+    now = now or datetime.utcnow()
+    retention = timedelta(days=current_app.config.get('OUTBOX_RETENTION_DAYS', 7))
+    result = db.session.execute(
+        OutboxEvent.__table__.delete().where(OutboxEvent.created_at < now - retention)
+    )
+    db.session.commit()
+    return result.rowcount
@@ -0,0 +1,454 @@
+# services/profiler.py
+"""
+On-demand profiling of individual requests.
+
+Off unless ``PROFILING_ENABLED``; then a request is profiled when:
+- it carries a valid ``X-Profile-Token`` header, signed with SECRET_KEY and
+  issued by ``POST /api/admin/profiling/token``, so one slow call can be
+  reproduced with curl against production
+- an admin has switched profiling on (``PUT /api/admin/profiling``) for a
+  few minutes, optionally only for paths under a prefix
+- it is picked at random at ``PROFILING_SAMPLE_RATE``
+
+Only one request per process is profiled at a time; others that would be
+are served normally. Requests that aren't profiled pay for a header lookup
+and a random number.
+
+The profiler is ``cprofile`` (deterministic, stdlib) or ``pyinstrument``
+(statistical, lower overhead; optional dependency). Either way the result is
+stored as collapsed stacks (``frame;frame;frame weight``, weights in
+microseconds), the input format of flamegraph.pl, inferno and speedscope.
+From the stacks each profile gets a breakdown of its time into SQL (waiting
+on the database and fetching rows), serialization (building and encoding
+response bodies) and the remaining Python, plus the hottest functions; SQL
+statements are also counted and timed directly.
+
+The most recent ``PROFILING_MAX_PROFILES`` profiles are kept in memory per
+process, or in Redis shared by all workers when ``PROFILING_REDIS_URL`` (or
+CACHE_REDIS_URL) is set; the admin toggle is shared the same way.
+"""
+import cProfile
+import importlib.util
+import json
+import logging
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from datetime import datetime
+from functools import lru_cache
+
+from flask import g, request
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+TOKEN_HEADER = 'X-Profile-Token'
+TOKEN_SALT = 'request-profile'
+
+# Paths never profiled: the endpoints reading the profiles back
+EXCLUDED_PREFIX = '/api/admin/'
+
+# A stack belongs to the first category with a matching frame, so rows
+# lazy-loaded while serializing count as SQL
+CATEGORIES = [
+    ('sql', [('sqlalchemy/engine/default.py', 'do_execute'), ('sqlalchemy/engine/cursor.py', 'fetch')]),
+    ('serialization', [('<row serializer>', ''), ('app/utils/serializers.py', ''), ('app/api/serializers.py', ''),
+                       ('app/utils/json_provider.py', ''), ('flask/json/', ''), ('json/encoder.py', ''),
+                       ('', 'orjson.dumps'), ('', 'to_dict')]),
+]
+HOTSPOTS = 20
+# cProfile call-graph paths carrying less time than this are dropped
+MIN_STACK_SECONDS = 0.00002
+MAX_STACK_DEPTH = 200
+
+
+@lru_cache(maxsize=4096)
+def short_path(filename):
+    """``filename`` relative to the sys.path entry it was imported from"""
+    filename = filename.replace(os.sep, '/')
+    best = ''
+    for entry in sys.path:
+        entry = (entry or os.getcwd()).replace(os.sep, '/').rstrip('/') + '/'
+        if filename.startswith(entry) and len(entry) > len(best):
+            best = entry
+    return filename[len(best):]
+
+
+def frame_label(function, filename, line):
+    if filename in ('~', ''):
+        return function
+    return f'{function} ({short_path(filename)}:{line})'
+
+
+def cprofile_stacks(profile):
+    """
+    Collapsed stacks from a cProfile call graph.
+
+    cProfile keeps caller -> callee totals rather than whole stacks, so a
+    function's time is split among the paths reaching it in proportion to
+    the time each caller spent in it.
+    """
+    stats = pstats.Stats(profile).stats
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    stacks = Counter()
+
+    def walk(func, path, seen, share):
+        _, _, self_time, total_time, _ = stats[func]
+        path = path + (frame_label(func[2], func[0], func[1]),)
+        if self_time * share >= MIN_STACK_SECONDS / 10:
+            stacks[';'.join(path)] += self_time * share
+        if len(path) >= MAX_STACK_DEPTH:
+            return
+        for callee, edge_time in callees.get(func, ()):
+            callee_total = stats[callee][3]
+            if callee in seen or not callee_total or edge_time * share < MIN_STACK_SECONDS:
+                continue
+            walk(callee, path, seen | {callee}, share * edge_time / callee_total)
+
+    # Functions with no recorded caller were already running when profiling began
+    for func, (_, _, _, _, callers) in stats.items():
+        if not callers:
+            walk(func, (), frozenset([func]), 1.0)
+    return stacks
+
+
+def pyinstrument_stacks(session):
+    """Collapsed stacks from a pyinstrument session's call tree"""
+    stacks = Counter()
+
+    def walk(frame, path):
+        # pyinstrument 5 puts a function's own time in a synthetic [self] child
+        if getattr(frame, 'is_synthetic', False) and path:
+            stacks[';'.join(path)] += frame.time
+            return
+        path = path + (frame_label(frame.function, frame.file_path or '', frame.line_no),)
+        self_time = frame.time - sum(child.time for child in frame.children)
+        if self_time > 0:
+            stacks[';'.join(path)] += self_time
+        for child in frame.children:
+            walk(child, path)
+
+    root = session.root_frame()
+    if root is not None:
+        walk(root, ())
+    return stacks
+
+
+@lru_cache(maxsize=8192)
+def frame_category(label):
+    for category, patterns in CATEGORIES:
+        for path, function in patterns:
+            if path in label and function in label:
+                return category
+    return None
+
+
+def summarize(stacks, duration):
+    """(time per category scaled to ``duration``, hottest leaf functions) from stacks in seconds"""
+    total = sum(stacks.values()) or 1
+    categories = Counter()
+    leaves = Counter()
+    for stack, seconds in stacks.items():
+        frames = stack.split(';')
+        category = 'python'
+        for name, _ in CATEGORIES:
+            if any(frame_category(frame) == name for frame in frames):
+                category = name
+                break
+        categories[category] += seconds
+        leaves[frames[-1]] += seconds
+
+    breakdown = {name: round(categories[name] / total * duration * 1000, 2)
+                 for name in ('sql', 'serialization', 'python')}
+    hotspots = [{'function': function, 'self_ms': round(seconds * 1000, 3),
+                 'percent': round(seconds / total * 100, 1)}
+                for function, seconds in leaves.most_common(HOTSPOTS)]
+    return breakdown, hotspots
+
+
+def collapsed(stacks):
+    """Collapsed-stack text, weights in whole microseconds"""
+    lines = [f'{stack} {round(seconds * 1e6)}' for stack, seconds in stacks.items() if seconds >= 5e-7]
+    return '\n'.join(sorted(lines)) + '\n'
+
+
+# SQL timing for the profiled request's thread
+
+_active = threading.local()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    session = getattr(_active, 'session', None)
+    if session is not None:
+        session.sql_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    session = getattr(_active, 'session', None)
+    if session is not None and session.sql_started is not None:
+        session.sql_seconds += time.perf_counter() - session.sql_started
+        session.sql_queries += 1
+        session.sql_started = None
+
+
+class ProfileSession:
+    """One request being profiled"""
+
+    def __init__(self, profiler, reason):
+        self.profiler = profiler
+        self.reason = reason
+        self.sql_queries = 0
+        self.sql_seconds = 0.0
+        self.sql_started = None
+        self.started = time.perf_counter()
+        _active.session = self
+        if profiler == 'pyinstrument':
+            from pyinstrument import Profiler
+            self._profiler = Profiler(interval=0.0005, async_mode='disabled')
+            self._profiler.start()
+        else:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop(self):
+        """Stop profiling; returns the collapsed stacks, in seconds"""
+        if self.profiler == 'pyinstrument':
+            session = self._profiler.stop()
+        else:
+            self._profiler.disable()
+        self.duration = time.perf_counter() - self.started
+        _active.session = None
+        if self.profiler == 'pyinstrument':
+            return pyinstrument_stacks(session)
+        return cprofile_stacks(self._profiler)
+
+
+# Backends
+
+class MemoryBackend:
+    """The latest profiles and the admin toggle, in this process only"""
+
+    def __init__(self, max_profiles):
+        self._profiles = deque(maxlen=max_profiles)
+        self._toggle = None
+        self._lock = threading.Lock()
+
+    def add(self, profile):
+        with self._lock:
+            self._profiles.appendleft(profile)
+
+    def all(self):
+        with self._lock:
+            return list(self._profiles)
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
+
+    def get_toggle(self):
+        return self._toggle
+
+    def set_toggle(self, toggle, ttl):
+        self._toggle = toggle
+
+
+class RedisBackend:
+    """Profiles in a capped Redis list, shared by every worker"""
+
+    def __init__(self, url, max_profiles, prefix='propertypal:profiles:'):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.max_profiles = max_profiles
+        self.prefix = prefix
+
+    def add(self, profile):
+        pipe = self.client.pipeline(transaction=False)
+        pipe.lpush(self.prefix + 'list', json.dumps(profile))
+        pipe.ltrim(self.prefix + 'list', 0, self.max_profiles - 1)
+        pipe.execute()
+
+    def all(self):
+        return [json.loads(value) for value in self.client.lrange(self.prefix + 'list', 0, -1)]
+
+    def clear(self):
+        self.client.delete(self.prefix + 'list')
+
+    def get_toggle(self):
+        value = self.client.get(self.prefix + 'toggle')
+        return json.loads(value) if value else None
+
+    def set_toggle(self, toggle, ttl):
+        if toggle:
+            self.client.set(self.prefix + 'toggle', json.dumps(toggle), ex=max(1, int(ttl)))
+        else:
+            self.client.delete(self.prefix + 'toggle')
+
+
+class RequestProfiler:
+    """Decides which requests to profile and keeps the results"""
+
+    # Seconds a worker may reuse the admin toggle before re-reading it
+    TOGGLE_REFRESH = 5
+
+    def __init__(self):
+        self.backend = None
+        self.profiler = 'cprofile'
+        self.sample_rate = 0
+        self._serializer = None
+        self._busy = threading.Lock()
+        self._toggle_cache = (0, None)
+
+    @property
+    def enabled(self):
+        return self.backend is not None
+
+    def init_app(self, app):
+        if not app.config.get('PROFILING_ENABLED', False):
+            self.backend = None
+            return
+
+        max_profiles = app.config.get('PROFILING_MAX_PROFILES', 50)
+        redis_url = app.config.get('PROFILING_REDIS_URL')
+        self.backend = RedisBackend(redis_url, max_profiles) if redis_url else MemoryBackend(max_profiles)
+        self.sample_rate = app.config.get('PROFILING_SAMPLE_RATE', 0)
+        self.token_max_age = app.config.get('PROFILING_TOKEN_MAX_AGE', 3600)
+        self._serializer = URLSafeTimedSerializer(app.config['SECRET_KEY'], salt=TOKEN_SALT)
+
+        self.profiler = app.config.get('PROFILER', 'cprofile')
+        if self.profiler not in ('cprofile', 'pyinstrument'):
+            raise ValueError(f"Unknown PROFILER: {self.profiler}")
+        if self.profiler == 'pyinstrument' and importlib.util.find_spec('pyinstrument') is None:
+            logger.warning("PROFILER is pyinstrument but it isn't installed, using cprofile")
+            self.profiler = 'cprofile'
+
+        if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+        app.before_request(self._start)
+        app.after_request(self._record_status)
+        app.teardown_request(self._finish)
+
+    # Admin controls
+
+    def issue_token(self, user_id):
+        return self._serializer.dumps({'user_id': user_id})
+
+    def token_valid(self, token):
+        try:
+            self._serializer.loads(token, max_age=self.token_max_age)
+            return True
+        except BadSignature:
+            return False
+
+    def toggle(self):
+        """The admin toggle, if switched on and not expired"""
+        checked_at, toggle = self._toggle_cache
+        now = time.time()
+        if now - checked_at > self.TOGGLE_REFRESH:
+            try:
+                toggle = self.backend.get_toggle()
+            except Exception:
+                logger.warning("Profile store unavailable", exc_info=True)
+                toggle = None
+            self._toggle_cache = (now, toggle)
+        if toggle and toggle['until'] > now:
+            return toggle
+        return None
+
+    def set_toggle(self, minutes, path_prefix=None):
+        """Profile every request (under ``path_prefix``) for ``minutes``; 0 switches off"""
+        toggle = None
+        if minutes > 0:
+            toggle = {'until': time.time() + minutes * 60, 'path_prefix': path_prefix or None}
+        self.backend.set_toggle(toggle, minutes * 60)
+        self._toggle_cache = (time.time(), toggle)
+        return toggle
+
+    def profiles(self):
+        try:
+            return self.backend.all()
+        except Exception:
+            logger.warning("Profile store unavailable", exc_info=True)
+            return []
+
+    def get(self, profile_id):
+        return next((profile for profile in self.profiles() if profile['id'] == profile_id), None)
+
+    def clear(self):
+        self.backend.clear()
+
+    # Request hooks
+
+    def _reason(self):
+        if request.path.startswith(EXCLUDED_PREFIX):
+            return None
+        token = request.headers.get(TOKEN_HEADER)
+        if token and self.token_valid(token):
+            return 'header'
+        toggle = self.toggle()
+        if toggle and request.path.startswith(toggle['path_prefix'] or '/'):
+            return 'toggle'
+        if self.sample_rate and random.random() < self.sample_rate:
+            return 'sample'
+        return None
+
+    def _start(self):
+        reason = self._reason()
+        # One profile at a time: cProfile can't nest, and it bounds the overhead
+        if reason and self._busy.acquire(blocking=False):
+            try:
+                g.profile_session = ProfileSession(self.profiler, reason)
+            except Exception:
+                self._busy.release()
+                raise
+
+    def _record_status(self, response):
+        if 'profile_session' in g:
+            g.profile_status = response.status_code
+        return response
+
+    def _finish(self, exc):
+        session = g.pop('profile_session', None)
+        if session is None:
+            return
+        try:
+            stacks = session.stop()
+            breakdown, hotspots = summarize(stacks, session.duration)
+            self.backend.add({
+                'id': uuid.uuid4().hex[:12],
+                'request_id': g.get('request_id'),
+                'created_at': datetime.utcnow().isoformat(),
+                'method': request.method,
+                'path': request.full_path.rstrip('?'),
+                'endpoint': request.endpoint,
+                'status': g.pop('profile_status', 500),
+                'reason': session.reason,
+                'profiler': session.profiler,
+                'duration_ms': round(session.duration * 1000, 2),
+                'sql_queries': session.sql_queries,
+                'sql_ms': round(session.sql_seconds * 1000, 2),
+                'breakdown_ms': breakdown,
+                'hotspots': hotspots,
+                'stacks': collapsed(stacks),
+            })
+        except Exception:
+            logger.warning("Failed to store request profile", exc_info=True)
+        finally:
+            _active.session = None
+            self._busy.release()
+
+
+request_profiler = RequestProfiler()
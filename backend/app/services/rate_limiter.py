@@ -0,0 +1,232 @@
+# services/rate_limiter.py
+"""
+Token-bucket rate limiting for the API-key and authentication endpoints.
+
+A limit such as ``10/minute`` is a bucket holding up to 10 tokens that
+refills at 10 per minute. Each request takes a token; a request that finds
+the bucket empty gets ``429 Too Many Requests`` with a ``Retry-After`` of
+the seconds until the next token. That allows short bursts while holding
+the sustained rate, and a flood is turned away before it reaches the
+database or a password hash.
+
+Buckets are keyed by what they limit:
+- ``ip``: one client address (see RATE_LIMIT_TRUSTED_PROXIES)
+- ``route``: everyone calling an endpoint, capping its total load
+- API key: each Home Assistant key (see app/utils/api_key_auth.py)
+
+Views opt in with ``@rate_limit(ip=..., route=...)``. Buckets are checked
+in order, and a request refused by one doesn't spend tokens from the next,
+so a single flooding client can't drain a route's shared budget.
+
+Backends:
+- ``memory``: per-process; each worker enforces the limit on its own
+- ``redis``: one set of buckets shared by all workers, updated atomically
+- ``null``: limiting disabled
+
+A backend error lets the request through rather than failing it.
+"""
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache, wraps
+
+from flask import current_app, jsonify, request
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+@lru_cache(maxsize=None)
+def parse_rate(rate):
+    """``"10/minute"`` -> (capacity 10, refill 10/60 tokens per second)"""
+    try:
+        count, period = rate.split('/')
+        capacity = int(count)
+        seconds = PERIODS[period.strip().rstrip('s')]
+    except (AttributeError, KeyError, ValueError):
+        raise ValueError(f"Invalid rate limit {rate!r}, expected e.g. '10/minute'")
+    if capacity < 1:
+        raise ValueError(f"Invalid rate limit {rate!r}, needs at least 1 request")
+    return capacity, capacity / seconds
+
+
+# Backends
+
+class MemoryBackend:
+    """Buckets in a bounded in-process LRU"""
+
+    def __init__(self, max_buckets=10000):
+        self.max_buckets = max_buckets
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, refill):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0
+            else:
+                wait = (1 - tokens) / refill
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            # An evicted bucket was idle longest; it comes back full
+            while len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+# Refill and take a token in one round trip, on the server's clock so workers
+# with skewed clocks agree. Returns the wait as a string: Lua numbers are
+# truncated to integers on the way out.
+_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * refill)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / refill
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / refill) + 1)
+return tostring(wait)
+"""
+
+
+class RedisBackend:
+    """
+    Buckets in Redis, shared by every worker. A bucket expires once it
+    would have refilled completely, so idle clients cost nothing.
+    """
+
+    def __init__(self, url, prefix='propertypal:ratelimit:'):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._take = self.client.register_script(_TAKE_SCRIPT)
+
+    def take(self, key, capacity, refill):
+        return float(self._take(keys=[self.prefix + key], args=[capacity, refill]))
+
+
+class RateLimiter:
+    """Holds the configured backend"""
+
+    def __init__(self):
+        self.backend = None
+
+    def init_app(self, app):
+        backend = app.config.get('RATE_LIMIT_BACKEND', 'memory')
+        if not app.config.get('RATE_LIMIT_ENABLED', True) or backend == 'null':
+            self.backend = None
+        elif backend == 'redis':
+            self.backend = RedisBackend(app.config['RATE_LIMIT_REDIS_URL'])
+        elif backend == 'memory':
+            self.backend = MemoryBackend(app.config.get('RATE_LIMIT_MAX_BUCKETS', 10000))
+        else:
+            raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {backend}")
+
+    @property
+    def enabled(self):
+        return self.backend is not None
+
+    def hit(self, key, rate):
+        """Take a token from bucket ``key``; returns 0, or the seconds until one is available"""
+        capacity, refill = parse_rate(rate)
+        try:
+            return self.backend.take(key, capacity, refill)
+        except Exception:
+            logger.warning("Rate limiter unavailable, allowing request", exc_info=True)
+            return 0
+
+    def check(self, buckets):
+        """
+        Take a token from each of ``buckets`` ((key, rate) pairs) in turn,
+        stopping at the first that is empty.
+
+        Returns:
+            float: 0 if the request may proceed, else seconds to wait
+        """
+        if not self.enabled:
+            return 0
+        for key, rate in buckets:
+            wait = self.hit(key, rate)
+            if wait:
+                return wait
+        return 0
+
+
+rate_limiter = RateLimiter()
+
+
+# Views
+
+def client_ip():
+    """
+    The client's address. Behind RATE_LIMIT_TRUSTED_PROXIES reverse proxies
+    (e.g. the bundled nginx) it's taken from X-Forwarded-For, counting from
+    the right so a client can't pick its own bucket by sending the header.
+    """
+    return forwarded_ip(request.remote_addr, request.headers.get('X-Forwarded-For'),
+                        current_app.config.get('RATE_LIMIT_TRUSTED_PROXIES', 0))
+
+
+def forwarded_ip(remote_addr, forwarded_for, proxies):
+    """``client_ip`` for any request object, e.g. the async integration app's"""
+    if proxies:
+        forwarded = [ip.strip() for ip in (forwarded_for or '').split(',') if ip.strip()]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return remote_addr or 'unknown'
+
+
+def too_many_requests(retry_after):
+    response = jsonify({"error": "Too many requests, please try again later"})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def rate_limit(**limits):
+    """
+    Limit a view with token buckets.
+
+    Each keyword names what a bucket is keyed on, ``ip`` or ``route``, and
+    gives the config key holding its rate; buckets are checked in keyword
+    order. Goes above ``@jwt_required()`` so floods are refused first::
+
+        @rate_limit(ip='RATE_LIMIT_AUTH_PER_IP', route='RATE_LIMIT_AUTH_PER_ROUTE')
+    """
+    unknown = set(limits) - {'ip', 'route'}
+    if unknown:
+        raise ValueError(f"Unknown rate limit scopes: {', '.join(sorted(unknown))}")
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if rate_limiter.enabled:
+                buckets = []
+                for scope, config_key in limits.items():
+                    identity = client_ip() if scope == 'ip' else 'all'
+                    buckets.append((f'{request.endpoint}:{scope}:{identity}', current_app.config[config_key]))
+                retry_after = rate_limiter.check(buckets)
+                if retry_after:
+                    return too_many_requests(retry_after)
+            return view(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
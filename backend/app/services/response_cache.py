@@ -0,0 +1,309 @@
+# services/response_cache.py
+"""
+Cache of serialized GET responses, invalidated by model changes.
+
+Views opt in with ``@cached(Model, ...)``, naming the models their response
+is built from. Entries are keyed by endpoint, user and normalized query
+arguments, plus a *generation* for each (model, scope) the response depends
+on: the user for unscoped requests, the property for ``?property_id=``
+requests. An ``after_flush`` listener records which scopes a write touched and
+``after_commit`` bumps their generations, so later requests compute new keys
+and stale entries are never read again; they simply age out of the backend.
+
+Reading generations before the view runs makes this safe against writes that
+commit while a response is being built: such a response is stored under the
+old generation, which nobody asks for anymore.
+
+Backends:
+- ``memory``: per-process LRU, fine for a single process (the dev server)
+- ``redis``: shared by all workers; works with any Redis-compatible server
+- ``null``: caching disabled
+
+Writes that bypass the ORM session (bulk ``query.update()``, raw SQL,
+migrations) don't invalidate anything; run ``flask clear-cache`` after them.
+"""
+import hashlib
+import logging
+import random
+import threading
+from collections import OrderedDict
+from datetime import date
+from functools import wraps
+
+from flask import current_app, make_response, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event, inspect, select
+from app import db
+from app.models.property import Property
+from app.utils.model_events import changed_instances
+
+logger = logging.getLogger(__name__)
+
+# Models some cached view depends on; filled in by @cached
+_tracked_models = {Property}
+
+
+def scope_tag(model, scope, scope_id):
+    """Generation name for one model's records in one user's or property's scope"""
+    return f'{model.__tablename__}:{scope}:{scope_id}'
+
+
+# Backends
+
+class MemoryBackend:
+    """In-process LRU of responses plus a dict of generation counters"""
+
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        # Entries only go stale by generation, so the LRU bound is all we need
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def generations(self, tags):
+        with self._lock:
+            return [self._generations.get(tag, 0) for tag in tags]
+
+    def bump(self, tags):
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisBackend:
+    """
+    Responses and generations in Redis, shared by every worker.
+
+    Entries are written with a TTL and generations without one, so a server
+    running ``maxmemory-policy volatile-lru`` evicts responses but never
+    counters. A counter that is lost anyway is re-seeded with a random value
+    rather than restarting at 0, which could match old entries.
+    """
+
+    def __init__(self, url, prefix='propertypal:cache:'):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, value, ex=ttl or None)
+
+    def generations(self, tags):
+        keys = [f'{self.prefix}gen:{tag}' for tag in tags]
+        values = self.client.mget(keys)
+        if None in values:
+            pipe = self.client.pipeline()
+            for key, value in zip(keys, values):
+                if value is None:
+                    pipe.set(key, random.getrandbits(48), nx=True)
+            pipe.execute()
+            values = self.client.mget(keys)
+        return [int(value) for value in values]
+
+    def bump(self, tags):
+        pipe = self.client.pipeline(transaction=False)
+        for tag in tags:
+            pipe.incr(f'{self.prefix}gen:{tag}')
+        pipe.execute()
+
+    def clear(self):
+        keys = []
+        for key in self.client.scan_iter(match=self.prefix + '*', count=1000):
+            keys.append(key)
+            if len(keys) >= 1000:
+                self.client.delete(*keys)
+                keys = []
+        if keys:
+            self.client.delete(*keys)
+
+
+class ResponseCache:
+    """Holds the configured backend; a backend error never fails a request"""
+
+    def __init__(self):
+        self.backend = None
+        self.ttl = None
+
+    def init_app(self, app):
+        cache_type = app.config.get('CACHE_TYPE', 'memory')
+        if cache_type == 'redis':
+            self.backend = RedisBackend(app.config['CACHE_REDIS_URL'])
+        elif cache_type == 'memory':
+            self.backend = MemoryBackend(app.config.get('CACHE_MAX_ENTRIES', 2048))
+        elif cache_type == 'null':
+            self.backend = None
+        else:
+            raise ValueError(f"Unknown CACHE_TYPE: {cache_type}")
+        self.ttl = app.config.get('CACHE_TTL')
+
+    @property
+    def enabled(self):
+        return self.backend is not None
+
+    def get(self, key):
+        try:
+            return self.backend.get(key)
+        except Exception:
+            logger.warning("Response cache read failed", exc_info=True)
+            return None
+
+    def set(self, key, value):
+        try:
+            self.backend.set(key, value, self.ttl)
+        except Exception:
+            logger.warning("Response cache write failed", exc_info=True)
+
+    def generations(self, tags):
+        try:
+            return self.backend.generations(tags)
+        except Exception:
+            logger.warning("Response cache generation read failed", exc_info=True)
+            return None
+
+    def invalidate(self, tags):
+        if not self.enabled or not tags:
+            return
+        try:
+            self.backend.bump(sorted(tags))
+        except Exception:
+            logger.exception("Response cache invalidation failed")
+
+    def clear(self):
+        if self.enabled:
+            self.backend.clear()
+
+
+response_cache = ResponseCache()
+
+
+# Views
+
+def _request_tags(models, user_id, property_id):
+    models = sorted(set(models) | {Property}, key=lambda model: model.__tablename__)
+    if property_id:
+        return [scope_tag(model, 'property', property_id) for model in models]
+    return [scope_tag(model, 'user', user_id) for model in models]
+
+
+def _request_key(user_id, generations):
+    # Today's date is part of the key: "expiring soon" and "this month"
+    # responses change at midnight without any write. Path parameters tell
+    # apart e.g. /checklist/Spring and /checklist/Summer
+    args = sorted(request.args.items(multi=True))
+    view_args = sorted((request.view_args or {}).items())
+    digest = hashlib.sha1(repr((view_args, args, date.today().isoformat(), generations)).encode()).hexdigest()
+    return f'response:{request.endpoint}:{user_id}:{digest}'
+
+
+def cached(*models):
+    """
+    Cache a GET view's successful JSON responses.
+
+    Goes below ``@jwt_required()``. ``models`` are the models the response is
+    built from; Property is always included since ownership decides what a
+    user may see.
+    """
+    _tracked_models.update(models)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not response_cache.enabled:
+                return view(*args, **kwargs)
+
+            user_id = get_jwt_identity()
+            property_id = request.args.get('property_id', type=int)
+            generations = response_cache.generations(_request_tags(models, user_id, property_id))
+            if generations is None:
+                return view(*args, **kwargs)
+
+            key = _request_key(user_id, generations)
+            body = response_cache.get(key)
+            if body is not None:
+                response = current_app.response_class(body, mimetype='application/json')
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200 and response.is_json:
+                response_cache.set(key, response.get_data())
+                response.headers['X-Cache'] = 'MISS'
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+# Invalidation: collect what a flush touched, bump it once the commit lands
+
+def _column_values(instance, name):
+    """Current and pre-flush values of a column, so moved records invalidate both scopes"""
+    history = inspect(instance).attrs[name].history
+    return {value for value in history.sum() if value is not None}
+
+
+@event.listens_for(db.session, 'after_flush')
+def _collect_stale_scopes(session, flush_context):
+    changed = list(changed_instances(session, tuple(_tracked_models)))
+    if not changed:
+        return
+
+    tags = session.info.setdefault('stale_responses', set())
+    record_properties = set()
+    for instance, _ in changed:
+        model = type(instance)
+        if model is Property:
+            tags.add(scope_tag(Property, 'property', instance.id))
+            for user_id in _column_values(instance, 'user_id'):
+                tags.add(scope_tag(Property, 'user', user_id))
+            continue
+
+        for user_id in _column_values(instance, 'user_id'):
+            tags.add(scope_tag(model, 'user', user_id))
+        for property_id in _column_values(instance, 'property_id'):
+            tags.add(scope_tag(model, 'property', property_id))
+            record_properties.add((model, property_id))
+
+    # Unscoped views can include records other users added to the user's
+    # property, so the property owner's user scope goes stale too
+    if record_properties:
+        owners = dict(session.connection().execute(
+            select(Property.id, Property.user_id)
+            .where(Property.id.in_({property_id for _, property_id in record_properties}))
+        ).all())
+        for model, property_id in record_properties:
+            if property_id in owners:
+                tags.add(scope_tag(model, 'user', owners[property_id]))
+
+
+@event.listens_for(db.session, 'after_commit')
+def _invalidate_responses(session):
+    response_cache.invalidate(session.info.pop('stale_responses', None))
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_stale_scopes(session):
+    session.info.pop('stale_responses', None)
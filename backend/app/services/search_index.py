@@ -0,0 +1,121 @@
+# services/search_index.py
+"""
+Maintains the unified search index (the search_entries table).
+
+Entries are written in the same transaction as the records they describe: an
+``after_flush`` listener upserts or deletes the entry for every indexed
+instance the flush touched. ``rebuild_index`` recreates everything from the
+source tables, for databases populated before the index existed or after bulk
+changes that bypass the ORM.
+"""
+from collections import namedtuple
+from datetime import datetime
+from sqlalchemy import event, insert
+from app import db
+from app.models.appliance import Appliance
+from app.models.document import Document
+from app.models.maintenance import Maintenance
+from app.models.project import Project
+from app.models.search_entry import SearchEntry
+from app.utils.model_events import changed_instances
+
+IndexSpec = namedtuple('IndexSpec', ['entity_type', 'title', 'body'])
+
+# What each model contributes: the attribute used as the entry title and the
+# attributes concatenated into its body
+INDEXED_MODELS = {
+    Document: IndexSpec('document', 'title', ('description', 'category')),
+    Appliance: IndexSpec('appliance', 'name', ('brand', 'model', 'serial_number', 'category')),
+    Project: IndexSpec('project', 'name', ('description',)),
+    Maintenance: IndexSpec('maintenance', 'title', ('description',)),
+}
+
+ENTITY_TYPES = tuple(spec.entity_type for spec in INDEXED_MODELS.values())
+
+_INDEXED_CLASSES = tuple(INDEXED_MODELS)
+
+# Attributes whose changes require re-indexing an entry
+_INDEXED_ATTRIBUTES = {
+    model: (spec.title,) + spec.body + ('user_id', 'property_id')
+    for model, spec in INDEXED_MODELS.items()
+}
+
+
+def entry_values(spec, record):
+    """Column values of the search entry for an instance or a projected row"""
+    body = ' '.join(str(value) for value in (getattr(record, name) for name in spec.body) if value)
+    return {
+        'entity_type': spec.entity_type,
+        'entity_id': record.id,
+        'user_id': record.user_id,
+        'property_id': record.property_id,
+        'title': getattr(record, spec.title) or '',
+        'body': body,
+        'updated_at': datetime.utcnow(),
+    }
+
+
+def _upsert(connection, values):
+    table = SearchEntry.__table__
+    result = connection.execute(
+        table.update()
+        .where(table.c.entity_type == values['entity_type'], table.c.entity_id == values['entity_id'])
+        .values(**values)
+    )
+    if result.rowcount == 0:
+        connection.execute(table.insert().values(**values))
+
+
+def _delete(connection, entity_type, entity_id):
+    table = SearchEntry.__table__
+    connection.execute(
+        table.delete().where(table.c.entity_type == entity_type, table.c.entity_id == entity_id)
+    )
+
+
+@event.listens_for(db.session, 'after_flush')
+def update_index(session, flush_context):
+    """Write search entries for indexed instances changed by the flush"""
+    changes = list(changed_instances(session, _INDEXED_CLASSES, _INDEXED_ATTRIBUTES))
+    if not changes:
+        return
+
+    connection = session.connection()
+    for instance, deleted in changes:
+        spec = INDEXED_MODELS[type(instance)]
+        if deleted:
+            _delete(connection, spec.entity_type, instance.id)
+        else:
+            _upsert(connection, entry_values(spec, instance))
+
+
+def rebuild_index(batch_size=500):
+    """
+    Recreate every search entry from the source tables.
+
+    Runs in the current transaction; the caller commits.
+
+    Returns:
+        dict: number of entries written per entity type
+    """
+    table = SearchEntry.__table__
+    db.session.execute(table.delete())
+
+    counts = {}
+    for model, spec in INDEXED_MODELS.items():
+        columns = [getattr(model, name) for name in ('id', 'user_id', 'property_id', spec.title) + spec.body]
+        rows = db.session.query(*columns).order_by(model.id).yield_per(batch_size)
+
+        counts[spec.entity_type] = 0
+        batch = []
+        for row in rows:
+            batch.append(entry_values(spec, row))
+            if len(batch) >= batch_size:
+                db.session.execute(insert(table), batch)
+                counts[spec.entity_type] += len(batch)
+                batch = []
+        if batch:
+            db.session.execute(insert(table), batch)
+            counts[spec.entity_type] += len(batch)
+
+    return counts
@@ -0,0 +1,277 @@
+# services/search_service.py
+"""
+Full-text search.
+
+``search_documents`` searches documents including their extracted text;
+``search_all`` searches the unified index of documents, appliances, projects
+and maintenance requests (see app/services/search_index.py).
+
+For documents, Postgres matches against the generated ``search_vector`` columns of
+documents and document_contents (GIN indexed) and SQLite against the
+``documents_fts`` FTS5 table; both are defined in app/models/document.py and
+app/models/document_content.py. Extracted file text is searched alongside the
+title and description. Databases that don't have the index yet fall back to
+a substring match until they are migrated.
+
+Highlights come back from the database with matches between ``MATCH_START``
+and ``MATCH_STOP`` control characters. ``render_highlight`` HTML-escapes the
+text and only then turns those into ``<mark>`` tags, so markup in a title or
+in extracted text is shown as text, never rendered.
+"""
+import html
+import re
+import weakref
+from sqlalchemy import column, func, inspect, literal_column, null, or_, select, table, union
+from app import db
+from app.models.document import Document
+from app.models.document_content import DocumentContent
+from app.models.property import Property
+from app.models.search_entry import SearchEntry
+from app.api.serializers import document_serializer
+
+MATCH_START = '\x02'
+MATCH_STOP = '\x03'
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_STOP = '</mark>'
+
+# Longest search box input we turn into index terms
+MAX_TERMS = 8
+
+# Extracted text considered when building a Postgres snippet
+SNIPPET_SOURCE_CHARS = 50000
+
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+# Index name -> (tables that need a Postgres search_vector column,
+#                SQLite FTS table, columns the FTS table must have)
+SEARCH_INDEXES = {
+    'documents': (('documents', 'document_contents'), 'documents_fts', {'title', 'description', 'body'}),
+    'entries': (('search_entries',), 'search_entries_fts', {'title', 'body'}),
+}
+
+# engine -> {index name: 'postgresql' | 'sqlite' | None}, detected once per engine
+_backends = weakref.WeakKeyDictionary()
+
+
+def search_terms(keyword):
+    """Split search box input into lower-cased index terms"""
+    return _TERM_RE.findall((keyword or '').lower())[:MAX_TERMS]
+
+
+def render_highlight(text):
+    """A title highlight or snippet as HTML: escaped, with matches in <mark> tags"""
+    if text is None:
+        return None
+    return html.escape(text).replace(MATCH_START, HIGHLIGHT_START).replace(MATCH_STOP, HIGHLIGHT_STOP)
+
+
+def search_backend(index='documents', engine=None):
+    """Return which kind of full-text index the database has for ``index``, or None"""
+    engine = engine or db.engine
+    detected = _backends.setdefault(engine, {})
+    if index not in detected:
+        detected[index] = _detect_backend(engine, *SEARCH_INDEXES[index])
+    return detected[index]
+
+
+def _detect_backend(engine, vector_tables, fts_table, fts_columns):
+    inspector = inspect(engine)
+    if engine.dialect.name == 'postgresql':
+        indexed = all(
+            inspector.has_table(table_name) and
+            'search_vector' in {col['name'] for col in inspector.get_columns(table_name)}
+            for table_name in vector_tables
+        )
+        return 'postgresql' if indexed else None
+    if engine.dialect.name == 'sqlite':
+        if not inspector.has_table(fts_table):
+            return None
+        columns = {col['name'] for col in inspector.get_columns(fts_table)}
+        return 'sqlite' if fts_columns <= columns else None
+    return None
+
+
+def _prefix_tsquery(terms):
+    """Postgres tsquery matching every term as a prefix"""
+    return func.to_tsquery('english', ' & '.join(f"'{term}':*" for term in terms))
+
+
+def _prefix_fts_match(terms):
+    """FTS5 query matching every term as a prefix"""
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def _like_pattern(term):
+    return '%{}%'.format(term.replace('_', '\\_'))
+
+
+def search_documents(query, keyword, page=1, per_page=10):
+    """
+    Rank the documents matched by ``query`` against ``keyword``.
+
+    Every term is matched as a prefix, so partial words typed into the search
+    box already find results. With no terms the query is returned newest
+    first.
+
+    Args:
+        query: Document query already filtered to what the caller may see
+        keyword: raw search box input
+        page, per_page: pagination (1-based page)
+
+    Returns:
+        tuple: (rows, total) where each row has the ``document_serializer``
+        columns followed by ``rank``, ``title_highlight`` and ``snippet``
+    """
+    terms = search_terms(keyword)
+    backend = search_backend('documents') if terms else None
+
+    if backend == 'postgresql':
+        query, rank, title_highlight, snippet = _postgres_search(query, terms)
+    elif backend == 'sqlite':
+        query, rank, title_highlight, snippet = _sqlite_search(query, terms)
+    else:
+        query, rank, title_highlight, snippet = _substring_search(query, terms)
+
+    total = query.order_by(None).count()
+
+    ordering = [Document.created_at.desc(), Document.id.desc()]
+    if terms and backend:
+        ordering.insert(0, rank.desc())
+
+    rows = (
+        document_serializer.select(query)
+        .add_columns(rank.label('rank'), title_highlight.label('title_highlight'), snippet.label('snippet'))
+        .order_by(*ordering)
+        .offset((page - 1) * per_page)
+        .limit(per_page)
+        .all()
+    )
+    return rows, total
+
+
+def _postgres_search(query, terms):
+    document_vector = literal_column('documents.search_vector')
+    content_vector = literal_column('document_contents.search_vector')
+    tsquery = _prefix_tsquery(terms)
+    highlight_options = f'StartSel={MATCH_START}, StopSel={MATCH_STOP}'
+
+    # One index-backed lookup per GIN index. An OR of the two across the
+    # outer join can use neither, and evaluates both vectors on every row.
+    matched_ids = union(
+        select(Document.id).where(document_vector.op('@@')(tsquery)).correlate(None),
+        select(DocumentContent.document_id).where(content_vector.op('@@')(tsquery)).correlate(None),
+    )
+    query = (
+        query.outerjoin(DocumentContent, DocumentContent.document_id == Document.id)
+        .filter(Document.id.in_(matched_ids))
+    )
+    combined_vector = document_vector.op('||')(func.coalesce(content_vector, func.to_tsvector('')))
+    rank = func.ts_rank_cd(combined_vector, tsquery)
+    title_highlight = func.ts_headline('english', Document.title, tsquery,
+                                       f'{highlight_options}, HighlightAll=true')
+    snippet_source = func.concat_ws(' ', Document.description, func.left(DocumentContent.body, SNIPPET_SOURCE_CHARS))
+    snippet = func.ts_headline('english', snippet_source, tsquery,
+                               f'{highlight_options}, MaxWords=20, MinWords=8, MaxFragments=2')
+    return query, rank, title_highlight, snippet
+
+
+def _sqlite_search(query, terms):
+    fts = table('documents_fts', column('rowid'))
+    fts_ref = literal_column('documents_fts')
+    query = query.join(fts, fts.c.rowid == Document.id).filter(fts_ref.op('MATCH')(_prefix_fts_match(terms)))
+    # bm25() is lower-is-better; negate it so every backend sorts rank descending.
+    # Column weights: title, description, extracted body
+    rank = -func.bm25(fts_ref, 10.0, 2.0, 1.0)
+    title_highlight = func.highlight(fts_ref, 0, MATCH_START, MATCH_STOP)
+    # Column -1 lets FTS5 take the snippet from description or body, whichever matches best
+    snippet = func.snippet(fts_ref, -1, MATCH_START, MATCH_STOP, '...', 16)
+    return query, rank, title_highlight, snippet
+
+
+def _substring_search(query, terms):
+    for term in terms:
+        pattern = _like_pattern(term)
+        query = query.filter(Document.title.ilike(pattern, escape='\\') |
+                             Document.description.ilike(pattern, escape='\\'))
+    return query, null(), Document.title, null()
+
+
+def search_all(user_id, keyword, entity_types=None, page=1, per_page=10):
+    """
+    Search documents, appliances, projects and maintenance requests at once.
+
+    One query over the unified index, ranked across entity types, with every
+    term matched as a prefix for type-ahead.
+
+    Args:
+        user_id: only records the user owns, or that belong to their
+            properties, are returned
+        keyword: raw search box input
+        entity_types: optional list of entity types to restrict to
+        page, per_page: pagination (1-based page)
+
+    Returns:
+        tuple: (rows, total) with ``entity_type``, ``entity_id``, ``title``,
+        ``property_id``, ``rank``, ``title_highlight`` and ``snippet`` per row
+    """
+    terms = search_terms(keyword)
+    if not terms:
+        return [], 0
+
+    owned_properties = select(Property.id).where(Property.user_id == user_id)
+    query = SearchEntry.query.filter(
+        or_(SearchEntry.user_id == user_id, SearchEntry.property_id.in_(owned_properties))
+    )
+    if entity_types:
+        query = query.filter(SearchEntry.entity_type.in_(entity_types))
+
+    backend = search_backend('entries')
+    if backend == 'postgresql':
+        search_vector = literal_column('search_entries.search_vector')
+        tsquery = _prefix_tsquery(terms)
+        highlight_options = f'StartSel={MATCH_START}, StopSel={MATCH_STOP}'
+        query = query.filter(search_vector.op('@@')(tsquery))
+        rank = func.ts_rank_cd(search_vector, tsquery)
+        title_highlight = func.ts_headline('english', SearchEntry.title, tsquery,
+                                           f'{highlight_options}, HighlightAll=true')
+        snippet = func.ts_headline('english', func.coalesce(SearchEntry.body, ''), tsquery,
+                                   f'{highlight_options}, MaxWords=20, MinWords=8')
+    elif backend == 'sqlite':
+        fts = table('search_entries_fts', column('rowid'))
+        fts_ref = literal_column('search_entries_fts')
+        query = (
+            query.join(fts, fts.c.rowid == SearchEntry.id)
+            .filter(fts_ref.op('MATCH')(_prefix_fts_match(terms)))
+        )
+        rank = -func.bm25(fts_ref, 5.0, 1.0)
+        title_highlight = func.highlight(fts_ref, 0, MATCH_START, MATCH_STOP)
+        snippet = func.snippet(fts_ref, 1, MATCH_START, MATCH_STOP, '...', 16)
+    else:
+        for term in terms:
+            pattern = _like_pattern(term)
+            query = query.filter(SearchEntry.title.ilike(pattern, escape='\\') |
+                                 SearchEntry.body.ilike(pattern, escape='\\'))
+        rank, title_highlight, snippet = null(), SearchEntry.title, null()
+
+    total = query.count()
+
+    ordering = [SearchEntry.updated_at.desc(), SearchEntry.id.desc()]
+    if backend:
+        ordering.insert(0, rank.desc())
+
+    rows = (
+        query.with_entities(
+            SearchEntry.entity_type,
+            SearchEntry.entity_id,
+            SearchEntry.title,
+            SearchEntry.property_id,
+            rank.label('rank'),
+            title_highlight.label('title_highlight'),
+            snippet.label('snippet'),
+        )
+        .order_by(*ordering)
+        .offset((page - 1) * per_page)
+        .limit(per_page)
+        .all()
+    )
+    return rows, total
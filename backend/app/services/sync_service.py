@@ -0,0 +1,204 @@
+# services/sync_service.py
+"""
+Delta sync for Home Assistant and mobile clients.
+
+Instead of downloading a whole list on every refresh, a client keeps the
+opaque cursor from its last response and asks only for what changed since:
+
+- created and updated rows, found by ``updated_at`` (keyset-paginated on
+  ``(updated_at, id)`` so each page is an index range scan)
+- deleted rows, from the tombstones an ``after_flush`` listener writes in
+  the same transaction as the delete. Only deletes that go through the
+  session are seen: a bulk ``Query.delete()`` or Core ``DELETE`` leaves no
+  tombstone (and no outbox event), so delete synced rows with
+  ``db.session.delete()``
+
+Timestamps and ids are assigned before commit, so a transaction still open
+could commit a change behind a cursor that already moved past it. Rows and
+tombstones are only returned once they were written before every
+transaction still open began, less SYNC_SETTLE_SECONDS (see
+``app/utils/write_horizon.py``); a long-running writer holds the cursor back
+until it commits.
+
+Tombstones are pruned after SYNC_TOMBSTONE_RETENTION_DAYS. A cursor older
+than that may have missed deletes and is refused; the client then syncs
+again from scratch.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import event, func, select, tuple_
+from app import db
+from app.api.serializers import (appliance_serializer, checklist_item_serializer, maintenance_serializer,
+                                 project_serializer, property_serializer)
+from app.models.appliance import Appliance
+from app.models.maintenance import Maintenance
+from app.models.maintenance_checklist import MaintenanceChecklistItem
+from app.models.project import Project
+from app.models.property import Property
+from app.models.tombstone import Tombstone
+from app.utils.auth_utils import accessible_by
+from app.utils.model_events import changed_instances
+from app.utils.write_horizon import write_horizon
+
+# resource name -> (model, default serializer)
+SYNC_RESOURCES = {
+    'properties': (Property, property_serializer),
+    'maintenance': (Maintenance, maintenance_serializer),
+    'checklist': (MaintenanceChecklistItem, checklist_item_serializer),
+    'appliances': (Appliance, appliance_serializer),
+    'projects': (Project, project_serializer),
+}
+_RESOURCE_NAMES = {model: name for name, (model, _) in SYNC_RESOURCES.items()}
+
+
+class CursorError(ValueError):
+    """The cursor is malformed or belongs to another resource"""
+
+
+class CursorExpired(CursorError):
+    """The cursor predates the oldest kept tombstone; sync again from scratch"""
+
+
+# Tombstones
+
+@event.listens_for(db.session, 'after_flush')
+def record_deletes(session, flush_context):
+    """Leave a tombstone for every synced record this flush deleted"""
+    rows = []
+    now = datetime.utcnow()
+    for instance, deleted in changed_instances(session, tuple(_RESOURCE_NAMES)):
+        if not deleted:
+            continue
+        rows.append({
+            'entity_type': _RESOURCE_NAMES[type(instance)],
+            'entity_id': instance.id,
+            'user_id': instance.user_id,
+            'property_id': instance.id if isinstance(instance, Property) else instance.property_id,
+            'deleted_at': now,
+        })
+
+    if rows:
+        session.connection().execute(Tombstone.__table__.insert(), rows)
+
+
+def prune_tombstones(now=None):
+    """Delete tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS; returns how many"""
+    now = now or datetime.utcnow()
+    retention = timedelta(days=current_app.config.get('SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+    result = db.session.execute(
+        Tombstone.__table__.delete().where(Tombstone.deleted_at < now - retention)
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+# Cursors
+
+def encode_cursor(state):
+    payload = json.dumps(state, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(cursor, resource):
+    """Parse a cursor issued for ``resource``; raises CursorError if it can't be used"""
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        state = {
+            'r': state['r'],
+            't': state['t'] and datetime.fromisoformat(state['t']),
+            'i': int(state['i']),
+            'd': int(state['d']),
+            'at': datetime.fromisoformat(state['at']),
+        }
+    except (binascii.Error, UnicodeDecodeError, KeyError, TypeError, ValueError) as e:
+        raise CursorError("Invalid cursor") from e
+    if state['r'] != resource:
+        raise CursorError("Cursor belongs to another resource")
+    return state
+
+
+# Reading
+
+def _visible(model, user_id):
+    if model is Property:
+        return Property.user_id == user_id
+    return accessible_by(model, user_id)
+
+
+def changes_since(user_id, resource, cursor=None, limit=100, serializer=None, session=None):
+    """
+    One page of changes to ``resource`` visible to ``user_id``.
+
+    Args:
+        cursor: from the previous response; None for a full initial sync
+        limit: rows (and, separately, deletes) per page
+        serializer: response shape for changed rows (default: the
+            resource's usual API shape)
+        session: session to query with (default: ``db.session``)
+
+    Returns:
+        dict: 'changed' rows, 'deleted' ids, the next 'cursor' and
+        'has_more' (call again straight away with the new cursor)
+
+    Raises:
+        CursorError: the cursor is invalid, or CursorExpired if too old
+    """
+    model, default_serializer = SYNC_RESOURCES[resource]
+    serializer = serializer or default_serializer
+    session = session or db.session
+    config = current_app.config
+    now = datetime.utcnow()
+    settled = write_horizon(session.connection(), config.get('SYNC_SETTLE_SECONDS', 1), now)
+
+    if cursor:
+        state = decode_cursor(cursor, resource)
+        retention = timedelta(days=config.get('SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+        if state['at'] < now - retention:
+            raise CursorExpired("Cursor expired, sync again without a cursor")
+    else:
+        # A full sync returns every current row, so only later deletes matter
+        state = {'t': None, 'i': 0, 'd': session.execute(
+            select(func.coalesce(func.max(Tombstone.id), 0)).where(Tombstone.deleted_at <= settled)
+        ).scalar()}
+
+    query = (
+        select(*serializer.columns, model.updated_at, model.id)
+        .where(_visible(model, user_id), model.updated_at <= settled)
+        .order_by(model.updated_at, model.id)
+        .limit(limit + 1)
+    )
+    if state['t'] is not None:
+        query = query.where(tuple_(model.updated_at, model.id) > tuple_(state['t'], state['i']))
+    rows = session.execute(query).all()
+
+    tombstones = session.execute(
+        select(Tombstone.id, Tombstone.entity_id)
+        .where(Tombstone.entity_type == resource, accessible_by(Tombstone, user_id),
+               Tombstone.id > state['d'], Tombstone.deleted_at <= settled)
+        .order_by(Tombstone.id)
+        .limit(limit + 1)
+    ).all()
+
+    has_more = len(rows) > limit or len(tombstones) > limit
+    rows, tombstones = rows[:limit], tombstones[:limit]
+    if rows:
+        state['t'], state['i'] = rows[-1][-2], rows[-1][-1]
+    if tombstones:
+        state['d'] = tombstones[-1].id
+
+    return {
+        'changed': serializer.dump_rows(rows),
+        'deleted': [tombstone.entity_id for tombstone in tombstones],
+        'cursor': encode_cursor({
+            'r': resource,
+            't': state['t'] and state['t'].isoformat(),
+            'i': state['i'],
+            'd': state['d'],
+            'at': settled.isoformat(),
+        }),
+        'has_more': has_more,
+    }
@@ -3,8 +3,69 @@ from functools import wraps
 from flask import request, jsonify, current_app
 from app import db
 from app.models.api_key import APIKey
+from app.services.rate_limiter import client_ip, rate_limiter, too_many_requests
 from datetime import datetime
 
+# The checks below are shared with the async integration endpoints
+# (app/api/integrations_async.py), so both paths accept the same keys.
+
+def read_api_key(headers):
+    """
+    Get the API key from request headers
+
+    Returns:
+        tuple: (api_key, None) or (None, error message)
+    """
+    auth_header = headers.get('Authorization')
+    api_key = headers.get('X-API-Key')
+
+    # Try Authorization: Bearer <key> or X-API-Key: <key>
+    if auth_header and auth_header.startswith('Bearer '):
+        api_key = auth_header.replace('Bearer ', '', 1)
+
+    if not api_key:
+        return None, 'API key required'
+
+    # Validate API key format
+    if not api_key.startswith('pp_live_'):
+        return None, 'Invalid API key format'
+
+    return api_key, None
+
+
+def api_rate_limit_buckets(config, ip, key_hash):
+    """Token buckets an API-key request takes from, narrowest last"""
+    return [
+        (f'api:ip:{ip}', config['RATE_LIMIT_API_PER_IP']),
+        (f'api:key:{key_hash}', config['RATE_LIMIT_PER_API_KEY']),
+    ]
+
+
+def check_api_key(api_key_obj, required_scope=None):
+    """
+    Check a looked-up key is usable
+
+    Returns:
+        tuple: (error message, status) or None if the key is good
+    """
+    if not api_key_obj:
+        return 'Invalid API key', 401
+
+    # Check if key is active
+    if not api_key_obj.is_active:
+        return 'API key is inactive', 401
+
+    # Check if key is expired
+    if api_key_obj.expires_at and api_key_obj.expires_at < datetime.utcnow():
+        return 'API key has expired', 401
+
+    # Check scope if required
+    if required_scope and not api_key_obj.has_scope(required_scope):
+        return f'API key missing required scope: {required_scope}', 403
+
+    return None
+
+
 def require_api_key(required_scope=None):
     """
     Decorator to require API key authentication
@@ -16,39 +77,23 @@ def require_api_key(required_scope=None):
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            # Get API key from header
-            auth_header = request.headers.get('Authorization')
-            api_key = request.headers.get('X-API-Key')
+            api_key, error = read_api_key(request.headers)
+            if error:
+                return jsonify({'error': error}), 401
 
-            # Try Authorization: Bearer <key> or X-API-Key: <key>
-            if auth_header and auth_header.startswith('Bearer '):
-                api_key = auth_header.replace('Bearer ', '', 1)
-
-            if not api_key:
-                return jsonify({'error': 'API key required'}), 401
-
-            # Validate API key format
-            if not api_key.startswith('pp_live_'):
-                return jsonify({'error': 'Invalid API key format'}), 401
-
-            # Hash and look up the key
+            # Throttle floods, even of made-up keys, before touching the database
             key_hash = APIKey.hash_key(api_key)
-            api_key_obj = APIKey.query.filter_by(key_hash=key_hash).first()
+            retry_after = rate_limiter.check(api_rate_limit_buckets(current_app.config, client_ip(), key_hash))
+            if retry_after:
+                return too_many_requests(retry_after)
 
-            if not api_key_obj:
-                return jsonify({'error': 'Invalid API key'}), 401
-
-            # Check if key is active
-            if not api_key_obj.is_active:
-                return jsonify({'error': 'API key is inactive'}), 401
-
-            # Check if key is expired
-            if api_key_obj.expires_at and api_key_obj.expires_at < datetime.utcnow():
-                return jsonify({'error': 'API key has expired'}), 401
+            # Look up the key
+            api_key_obj = APIKey.query.filter_by(key_hash=key_hash).first()
 
-            # Check scope if required
-            if required_scope and not api_key_obj.has_scope(required_scope):
-                return jsonify({'error': f'API key missing required scope: {required_scope}'}), 403
+            rejection = check_api_key(api_key_obj, required_scope)
+            if rejection:
+                error, status = rejection
+                return jsonify({'error': error}), status
 
             # Update last used timestamp
             api_key_obj.last_used_at = datetime.utcnow()
@@ -0,0 +1,115 @@
+# utils/auth_utils.py
+"""
+Property ownership checks.
+
+Handlers used to look the property up again for every check, sometimes two
+or three times a request. ``owned_property_ids`` loads the ids of a user's
+properties once per request (``flask.g``) and every check after that is
+answered from memory. With ``OWNERSHIP_CACHE_TTL`` set, the ids are also kept
+process-wide for that many seconds; they are dropped as soon as a property
+change commits in this process, and a property missing from the cached ids is
+re-checked against the database before access is denied.
+"""
+import threading
+import time
+
+from flask import current_app, g, has_app_context
+from sqlalchemy import event, inspect, or_, select
+from app import db
+from app.models.property import Property
+from app.utils.model_events import changed_instances
+
+# user_id -> (expires_at, frozenset of property ids)
+_ownership_cache = {}
+_ownership_lock = threading.Lock()
+
+
+def _load_property_ids(user_id):
+    return frozenset(db.session.execute(
+        select(Property.id).where(Property.user_id == user_id)
+    ).scalars())
+
+
+def owned_property_ids(user_id, refresh=False):
+    """Ids of the properties ``user_id`` owns, loaded at most once per request"""
+    user_id = int(user_id)
+    memo = g.setdefault('owned_property_ids', {})
+    if not refresh and user_id in memo:
+        return memo[user_id]
+
+    ttl = current_app.config.get('OWNERSHIP_CACHE_TTL', 0)
+    ids = None
+    if ttl and not refresh:
+        with _ownership_lock:
+            expires_at, cached_ids = _ownership_cache.get(user_id, (0, None))
+        if expires_at > time.monotonic():
+            ids = cached_ids
+
+    if ids is None:
+        ids = _load_property_ids(user_id)
+        if ttl:
+            with _ownership_lock:
+                _ownership_cache[user_id] = (time.monotonic() + ttl, ids)
+
+    memo[user_id] = ids
+    return ids
+
+
+def owns_property(user_id, property_id):
+    """
+    Check that ``user_id`` owns ``property_id``.
+
+    ``property_id`` may be the raw string from a request; anything that isn't
+    a valid id is simply not owned.
+    """
+    try:
+        property_id = int(property_id)
+    except (TypeError, ValueError):
+        return False
+
+    if property_id in owned_property_ids(user_id):
+        return True
+    # Could be a property created since the ids were cached, possibly by
+    # another worker; only a fresh load can deny access
+    if current_app.config.get('OWNERSHIP_CACHE_TTL', 0):
+        return property_id in owned_property_ids(user_id, refresh=True)
+    return False
+
+
+def accessible_by(model, user_id):
+    """
+    SQL condition for records ``user_id`` may access: their own, or any
+    record on a property they own.
+
+    Lets a handler fold the ownership check into its main query.
+    """
+    owned_properties = select(Property.id).where(Property.user_id == user_id)
+    return or_(model.user_id == user_id, model.property_id.in_(owned_properties))
+
+
+@event.listens_for(db.session, 'after_flush')
+def _collect_changed_owners(session, flush_context):
+    for instance, _ in changed_instances(session, Property, {Property: ('user_id',)}):
+        history = inspect(instance).attrs.user_id.history
+        owners = session.info.setdefault('changed_property_owners', set())
+        owners.update(user_id for user_id in history.sum() if user_id is not None)
+
+
+@event.listens_for(db.session, 'after_commit')
+def _forget_changed_owners(session):
+    owners = session.info.pop('changed_property_owners', None)
+    if not owners:
+        return
+    with _ownership_lock:
+        for user_id in owners:
+            _ownership_cache.pop(user_id, None)
+    if has_app_context():
+        memo = g.get('owned_property_ids')
+        if memo:
+            for user_id in owners:
+                memo.pop(user_id, None)
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_changed_owners(session):
+    session.info.pop('changed_property_owners', None)
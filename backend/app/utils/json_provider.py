@@ -0,0 +1,54 @@
+# utils/json_provider.py
+from datetime import date
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def _default(o):
+    """Encode values the JSON encoder doesn't handle natively"""
+    if isinstance(o, date):
+        # Covers datetime too; Flask's default would emit an HTTP date
+        return o.isoformat()
+    return DefaultJSONProvider.default(o)
+
+
+class AppJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider backed by orjson when it is installed.
+
+    Dates and datetimes are always encoded as ISO 8601, matching the
+    ``.isoformat()`` strings the API has always returned. Without orjson it
+    falls back to the stdlib encoder with the same output.
+    """
+    default = staticmethod(_default)
+    sort_keys = False
+
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self.ORJSON_OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        option = self.ORJSON_OPTIONS
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=option),
+            mimetype=self.mimetype
+        )
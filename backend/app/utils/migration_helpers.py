@@ -0,0 +1,86 @@
+# utils/migration_helpers.py
+"""
+Schema changes that stay online on large PostgreSQL tables, for use in
+Alembic revisions.
+
+``create_index`` builds indexes with CREATE INDEX CONCURRENTLY, which doesn't
+block writes; ``backfill`` updates a table in primary-key ranges, each
+committed on its own, so no statement holds row locks on the whole table.
+Neither can run inside a transaction, so on PostgreSQL they step out of the
+revision's transaction (finish schema changes that must be atomic before
+calling them). On other databases they are plain statements.
+
+All of them are safe to re-run, like the revisions themselves.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+def _is_postgresql():
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def index_exists(name, table):
+    return name in {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def create_index(name, table, columns, **kwargs):
+    """Create an index unless it exists; concurrently on PostgreSQL"""
+    if not _is_postgresql():
+        if not index_exists(name, table):
+            op.create_index(name, table, columns, **kwargs)
+        return
+
+    with op.get_context().autocommit_block():
+        valid = op.get_bind().execute(
+            sa.text('SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)'),
+            {'name': name}
+        ).scalar()
+        if valid:
+            return
+        if valid is not None:
+            # An interrupted concurrent build leaves an invalid index behind
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+        op.create_index(name, table, columns, postgresql_concurrently=True, **kwargs)
+
+
+def drop_index(name, table):
+    """Drop an index if it exists; concurrently on PostgreSQL"""
+    if not _is_postgresql():
+        if index_exists(name, table):
+            op.drop_index(name, table_name=table)
+        return
+
+    with op.get_context().autocommit_block():
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+def backfill(table, assignments, where=None, batch_size=10000, key='id'):
+    """
+    ``UPDATE table SET assignments WHERE where`` in ranges of ``batch_size``
+    primary keys, committing after each range on PostgreSQL.
+
+    ``assignments`` and ``where`` are SQL fragments, e.g.
+    ``backfill('projects', 'updated_at = created_at', 'updated_at IS NULL')``.
+    Returns the number of rows updated.
+    """
+    bind = op.get_bind()
+    low, high = bind.execute(sa.text(f'SELECT MIN({key}), MAX({key}) FROM {table}')).one()
+    if low is None:
+        return 0
+
+    condition = f' AND ({where})' if where else ''
+    statement = sa.text(
+        f'UPDATE {table} SET {assignments} WHERE {key} >= :start AND {key} < :stop{condition}'
+    )
+
+    def run():
+        updated = 0
+        for start in range(low, high + 1, batch_size):
+            updated += op.get_bind().execute(statement, {'start': start, 'stop': start + batch_size}).rowcount
+        return updated
+
+    if not _is_postgresql():
+        return run()
+    with op.get_context().autocommit_block():
+        return run()
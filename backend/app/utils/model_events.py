@@ -0,0 +1,41 @@
+# utils/model_events.py
+from sqlalchemy import inspect
+
+
+def changed_instances(session, classes, attributes=None):
+    """
+    Instances of ``classes`` written by the flush that just ran.
+
+    Meant for ``after_flush`` listeners, where ``session.new``, ``dirty`` and
+    ``deleted`` still describe the flush and attribute history hasn't been
+    reset yet.
+
+    Args:
+        session: the flushing session
+        classes: model class or tuple of classes to report
+        attributes: optional ``{class: attribute names}``; updates that
+            didn't touch any of the listed attributes are skipped
+
+    Yields:
+        tuple: (instance, deleted)
+    """
+    for instance in session.new:
+        if isinstance(instance, classes):
+            yield instance, False
+
+    for instance in session.dirty:
+        if isinstance(instance, classes) and _was_modified(session, instance, attributes):
+            yield instance, False
+
+    for instance in session.deleted:
+        if isinstance(instance, classes):
+            yield instance, True
+
+
+def _was_modified(session, instance, attributes):
+    names = attributes.get(type(instance)) if attributes else None
+    if names is None:
+        return session.is_modified(instance, include_collections=False)
+
+    state_attrs = inspect(instance).attrs
+    return any(state_attrs[name].history.has_changes() for name in names)
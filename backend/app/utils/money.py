@@ -0,0 +1,57 @@
+# utils/money.py
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from sqlalchemy.types import TypeDecorator, BigInteger
+
+CENT = Decimal('0.01')
+
+
+class Money(TypeDecorator):
+    """
+    Monetary amount stored as an integer number of cents.
+
+    Values are plain ``int`` cents on the Python side so sums and comparisons
+    stay exact. Use ``to_cents`` when accepting user input and
+    ``cents_to_dollars`` only when building the JSON response.
+    """
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, int):
+            raise TypeError(f"Money columns expect integer cents, got {type(value).__name__}")
+        return value
+
+    def process_result_value(self, value, dialect):
+        return int(value) if value is not None else None
+
+
+def to_cents(value):
+    """
+    Convert a dollar amount (number or numeric string) to integer cents.
+
+    Rounds half-up to the nearest cent, so 19.99 becomes 1999 rather than the
+    1998 that ``int(19.99 * 100)`` produces.
+
+    Raises:
+        ValueError: if the value is not a valid number
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool):
+        raise ValueError("Amount must be a valid number")
+    try:
+        dollars = Decimal(str(value)).quantize(CENT, rounding=ROUND_HALF_UP)
+    except (InvalidOperation, ValueError, TypeError):
+        raise ValueError("Amount must be a valid number")
+    if not dollars.is_finite():
+        raise ValueError("Amount must be a valid number")
+    return int(dollars * 100)
+
+
+def cents_to_dollars(cents):
+    """Convert integer cents to a dollar amount for JSON responses"""
+    if cents is None:
+        return None
+    return cents / 100
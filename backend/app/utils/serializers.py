@@ -0,0 +1,87 @@
+# utils/serializers.py
+from operator import attrgetter
+
+
+class RowSerializer:
+    """
+    Compiled serializer that turns column tuples into response dicts.
+
+    Each field is ``(key, column)`` or ``(key, column, transform)``. The
+    serializer compiles a single function for its field list, so dumping a
+    row is one dict display with positional tuple lookups instead of an ORM
+    attribute access per field.
+
+    Dates and datetimes are emitted as-is and encoded to ISO 8601 by the
+    app's JSON provider.
+
+    Usage:
+        result = serializer.dump_query(query)  # read-only list endpoints
+
+        rows = serializer.select(query).all()  # when the caller needs extras
+        result = serializer.dump_rows(rows)
+
+        result = serializer.dump(instance)  # single ORM instance
+    """
+
+    def __init__(self, fields, extra=()):
+        """
+        Args:
+            fields: sequence of (key, column[, transform]) tuples to emit
+            extra: columns selected alongside the fields but not emitted,
+                for values the caller derives itself (e.g. a download URL)
+        """
+        fields = [field if len(field) == 3 else (field[0], field[1], None) for field in fields]
+        self.keys = tuple(key for key, _, _ in fields)
+        self.columns = tuple(column for _, column, _ in fields) + tuple(extra)
+        self.dump_row = _compile_row_dumper(self.keys, [transform for _, _, transform in fields])
+
+        getter = attrgetter(*(column.key for column in self.columns))
+        if len(self.columns) == 1:
+            self._row_from_instance = lambda obj: (getter(obj),)
+        else:
+            self._row_from_instance = getter
+
+    def select(self, query):
+        """
+        Narrow a query to this serializer's columns.
+
+        The query returns plain rows instead of ORM instances, so only the
+        listed columns are loaded and nothing goes through the identity map
+        or attribute instrumentation. Apply filters and ordering first.
+        """
+        return query.with_entities(*self.columns)
+
+    def dump_query(self, query):
+        """Run a column-projected query and serialize the rows"""
+        return self.dump_rows(self.select(query))
+
+    def dump_rows(self, rows):
+        """Serialize an iterable of column tuples"""
+        dump_row = self.dump_row
+        return [dump_row(row) for row in rows]
+
+    def dump(self, obj):
+        """Serialize a single ORM instance"""
+        return self.dump_row(self._row_from_instance(obj))
+
+    def dump_all(self, objs):
+        """Serialize an iterable of ORM instances"""
+        dump_row = self.dump_row
+        row_from_instance = self._row_from_instance
+        return [dump_row(row_from_instance(obj)) for obj in objs]
+
+
+def _compile_row_dumper(keys, transforms):
+    """Build ``dump_row(row)`` returning a dict literal over ``row[i]`` lookups"""
+    namespace = {}
+    items = []
+    for index, (key, transform) in enumerate(zip(keys, transforms)):
+        if transform is None:
+            items.append(f'{key!r}: row[{index}]')
+        else:
+            namespace[f'_transform_{index}'] = transform
+            items.append(f'{key!r}: _transform_{index}(row[{index}])')
+
+    source = f"def dump_row(row):\n    return {{{', '.join(items)}}}\n"
+    exec(compile(source, '<row serializer>', 'exec'), namespace)
+    return namespace['dump_row']
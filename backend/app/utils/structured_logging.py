@@ -0,0 +1,259 @@
+# utils/structured_logging.py
+"""
+JSON-lines logging and one access log line per request.
+
+``configure_logging`` sends every logger to stdout through a queue: the
+request thread only formats the message and enqueues the record, and a
+listener thread does the JSON encoding and the blocking write. Each line is
+one JSON object with ``ts``, ``level``, ``logger``, ``message``, the
+``request_id`` when logged during a request, any ``extra=`` fields and the
+traceback as ``exc_info``. ``LOG_FORMAT=text`` gives plain lines instead.
+
+``init_request_logging`` gives each request an id (the client's
+``X-Request-ID`` if sane, else a new one, echoed in the response) and logs
+method, path, status, duration and the SQL statements the request's thread
+ran with their total time. High-volume paths are sampled per
+``LOG_SAMPLE_RATES`` (``/uploads/=0.01`` logs 1% of uploads); errors and
+requests slower than ``LOG_SLOW_REQUEST_MS`` are always logged, and sampled
+lines carry ``sample_rate`` so counts can be scaled back up.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+access_logger = logging.getLogger('app.access')
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+_request_id_pattern = re.compile(r'^[A-Za-z0-9._:-]{1,64}$')
+
+# LogRecord attributes that aren't ``extra=`` fields
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'request_id'}
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        request_id = getattr(record, 'request_id', None)
+        if request_id:
+            entry['request_id'] = request_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc_info'] = record.exc_text
+        if orjson is not None:
+            return orjson.dumps(entry, default=str).decode()
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Plain lines, with the request id when there is one"""
+
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)s %(name)s %(message)s')
+
+    def formatMessage(self, record):
+        line = super().formatMessage(record)
+        request_id = getattr(record, 'request_id', None)
+        return f'{line} [request_id={request_id}]' if request_id else line
+
+
+class RequestIdFilter(logging.Filter):
+    """Tag records logged during a request with its id"""
+
+    def filter(self, record):
+        if not hasattr(record, 'request_id'):
+            record.request_id = g.get('request_id') if has_request_context() else None
+        return True
+
+
+class _QueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread. Unlike the stdlib version it
+    doesn't pre-format the whole record, so ``extra=`` fields and the
+    traceback reach the JSON formatter separately.
+    """
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_handler = None
+_listener = None
+_lock = threading.Lock()
+
+
+def _start_listener(formatter):
+    global _listener
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(formatter)
+    _handler.queue = queue.SimpleQueue()
+    _listener = QueueListener(_handler.queue, output, respect_handler_level=False)
+    _listener.start()
+
+
+def _restart_in_child():
+    """A forked worker (gunicorn --preload) doesn't inherit the listener thread"""
+    if _listener is not None:
+        _start_listener(_listener.handlers[0].formatter)
+
+
+def _stop_listener():
+    if _listener is not None:
+        _listener.stop()
+
+
+def configure_logging(app):
+    """Route all logging through the queue to stdout, once per process"""
+    global _handler
+    level = app.config.get('LOG_LEVEL', 'INFO')
+    if app.config.get('LOG_FORMAT', 'json') == 'text':
+        formatter = TextFormatter()
+    else:
+        formatter = JSONFormatter()
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    with _lock:
+        if _handler is None:
+            _handler = _QueueHandler(queue.SimpleQueue())
+            _handler.addFilter(RequestIdFilter())
+            for existing in list(root.handlers):
+                root.removeHandler(existing)
+            root.addHandler(_handler)
+            _start_listener(formatter)
+            atexit.register(_stop_listener)
+            if hasattr(os, 'register_at_fork'):
+                os.register_at_fork(after_in_child=_restart_in_child)
+        else:
+            _listener.handlers[0].setFormatter(formatter)
+
+    # Flask's own stderr handler would print everything a second time
+    from flask.logging import default_handler
+    app.logger.removeHandler(default_handler)
+
+
+# SQL statements run by the current request's thread
+
+_stats = threading.local()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = getattr(_stats, 'current', None)
+    if stats is not None:
+        stats['started'] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = getattr(_stats, 'current', None)
+    if stats is not None and stats['started'] is not None:
+        stats['sql_ms'] += (time.perf_counter() - stats['started']) * 1000
+        stats['sql_queries'] += 1
+        stats['started'] = None
+
+
+def parse_sample_rates(value):
+    """``"/uploads/=0.01,/health=0"`` -> [('/uploads/', 0.01), ('/health', 0.0)], longest prefix first"""
+    if isinstance(value, dict):
+        rates = value.items()
+    else:
+        rates = []
+        for item in (value or '').split(','):
+            if item.strip():
+                prefix, _, rate = item.strip().rpartition('=')
+                if not prefix:
+                    raise ValueError(f"Invalid LOG_SAMPLE_RATES entry {item!r}, expected e.g. '/uploads/=0.01'")
+                rates.append((prefix, rate))
+    return sorted(((prefix, float(rate)) for prefix, rate in rates), key=lambda pair: -len(pair[0]))
+
+
+def init_request_logging(app):
+    """Request ids everywhere, and an access log line per (sampled) request"""
+    sample_rates = parse_sample_rates(app.config.get('LOG_SAMPLE_RATES'))
+    slow_ms = app.config.get('LOG_SLOW_REQUEST_MS', 1000)
+    log_requests = app.config.get('LOG_REQUESTS', True)
+
+    if log_requests and not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+    @app.before_request
+    def start_request_log():
+        request_id = request.headers.get(REQUEST_ID_HEADER, '')
+        g.request_id = request_id if _request_id_pattern.match(request_id) else uuid.uuid4().hex
+        if log_requests:
+            g.request_started = time.perf_counter()
+            _stats.current = {'sql_queries': 0, 'sql_ms': 0.0, 'started': None}
+
+    @app.after_request
+    def tag_response(response):
+        if 'request_id' in g:
+            response.headers[REQUEST_ID_HEADER] = g.request_id
+            g.response_status = response.status_code
+        return response
+
+    if not log_requests:
+        return
+
+    @app.teardown_request
+    def log_request(exc):
+        stats = getattr(_stats, 'current', None)
+        _stats.current = None
+        started = g.pop('request_started', None)
+        if started is None:
+            return
+        duration_ms = (time.perf_counter() - started) * 1000
+        status = g.get('response_status', 500)
+
+        sample_rate = next((rate for prefix, rate in sample_rates if request.path.startswith(prefix)), 1.0)
+        if status < 500 and duration_ms < slow_ms and sample_rate < 1 and random.random() >= sample_rate:
+            return
+
+        fields = {
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': status,
+            'duration_ms': round(duration_ms, 2),
+            'sql_queries': stats['sql_queries'] if stats else 0,
+            'sql_ms': round(stats['sql_ms'], 2) if stats else 0,
+            'remote_addr': request.remote_addr,
+        }
+        if sample_rate < 1:
+            fields['sample_rate'] = sample_rate
+        access_logger.log(logging.ERROR if status >= 500 else logging.INFO,
+                          '%s %s %s %.1fms', request.method, request.path, status, duration_ms, extra=fields)
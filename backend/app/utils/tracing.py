@@ -0,0 +1,231 @@
+# utils/tracing.py
+"""
+OpenTelemetry tracing, when ``TRACING_ENABLED`` and the SDK is installed.
+
+Spans recorded:
+- one server span per request, continuing the caller's trace when it sends
+  a W3C ``traceparent`` header
+- one client span per SQL statement, with the statement text
+- ``span()`` blocks around disk writes in the upload paths, email and
+  webhook sends, and background work
+
+Work handed to another thread or process doesn't inherit the current span.
+Call ``current_context()`` where the work is queued and pass the result as
+``span(..., context=...)`` where it runs, so its spans join the request's
+trace.
+
+``TRACING_EXPORTER`` picks where spans go: ``otlp`` (OTLP over HTTP to
+OTEL_EXPORTER_OTLP_ENDPOINT, default http://localhost:4318, e.g. a local
+collector or Jaeger), ``file`` (one JSON span per line in TRACING_FILE) or
+``console``. Spans are exported in batches from a background thread.
+
+When tracing is off, ``span()`` is a no-op and nothing else is hooked in.
+"""
+import logging
+import os
+import threading
+from contextlib import contextmanager
+
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# SQL text recorded on a span is cut off after this many characters
+MAX_STATEMENT_LENGTH = 2000
+
+_tracer = None
+_lock = threading.Lock()
+
+
+@contextmanager
+def _no_span():
+    yield None
+
+
+def enabled():
+    return _tracer is not None
+
+
+def span(name, attributes=None, context=None):
+    """
+    ``with span('file.save', {'file.size': n}):`` records the block as a
+    child of the current span, or of ``context`` from ``current_context()``.
+    Exceptions are recorded on the span and re-raised.
+    """
+    if _tracer is None:
+        return _no_span()
+    from opentelemetry.propagate import extract
+    parent = extract(context) if context is not None else None
+    return _tracer.start_as_current_span(name, context=parent, attributes=attributes)
+
+
+def current_context():
+    """The current trace context as a dict of headers, to hand to other threads or processes"""
+    if _tracer is None:
+        return None
+    from opentelemetry.propagate import inject
+    carrier = {}
+    inject(carrier)
+    return carrier
+
+
+def start_span(name, attributes=None, context=None):
+    """A span that isn't made current, for work ending in a callback; None when tracing is off"""
+    if _tracer is None:
+        return None
+    from opentelemetry.propagate import extract
+    parent = extract(context) if context is not None else None
+    return _tracer.start_span(name, context=parent, attributes=attributes)
+
+
+@contextmanager
+def use_span(current, end_on_exit=True):
+    """Make a span from ``start_span`` current for a block (a no-op for None)"""
+    if current is None:
+        yield None
+        return
+    from opentelemetry import trace
+    with trace.use_span(current, end_on_exit=end_on_exit, record_exception=True, set_status_on_exception=True):
+        yield current
+
+
+# Setup
+
+def _exporter(app):
+    exporter = app.config.get('TRACING_EXPORTER', 'otlp')
+    if exporter == 'otlp':
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        endpoint = app.config.get('TRACING_OTLP_ENDPOINT')
+        return OTLPSpanExporter(endpoint=endpoint) if endpoint else OTLPSpanExporter()
+    if exporter in ('file', 'console'):
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+        if exporter == 'console':
+            return ConsoleSpanExporter()
+        path = app.config.get('TRACING_FILE') or os.path.join(app.instance_path, 'traces.jsonl')
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        return ConsoleSpanExporter(out=open(path, 'a', buffering=1),
+                                   formatter=lambda s: s.to_json(indent=None) + '\n')
+    raise ValueError(f"Unknown TRACING_EXPORTER: {exporter}")
+
+
+def init_tracing(app):
+    """Set up the tracer provider once per process and trace this app's requests"""
+    global _tracer
+    if not app.config.get('TRACING_ENABLED', False):
+        return
+
+    with _lock:
+        if _tracer is None:
+            try:
+                from opentelemetry import trace
+                from opentelemetry.sdk.resources import Resource
+                from opentelemetry.sdk.trace import TracerProvider
+                from opentelemetry.sdk.trace.export import BatchSpanProcessor
+                from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+            except ImportError:
+                logger.warning("TRACING_ENABLED is set but opentelemetry-sdk isn't installed; tracing is off")
+                return
+
+            provider = TracerProvider(
+                resource=Resource.create({'service.name': app.config.get('TRACING_SERVICE_NAME', 'propertypal-api')}),
+                sampler=ParentBased(TraceIdRatioBased(app.config.get('TRACING_SAMPLE_RATE', 1.0))),
+            )
+            provider.add_span_processor(BatchSpanProcessor(_exporter(app)))
+            trace.set_tracer_provider(provider)
+            _tracer = trace.get_tracer('app')
+
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+            event.listen(Engine, 'handle_error', _handle_error)
+
+    app.before_request(_start_request_span)
+    app.after_request(_record_response)
+    app.teardown_request(_end_request_span)
+
+
+# Requests
+
+def _start_request_span():
+    from opentelemetry import context, trace
+    from opentelemetry.propagate import extract
+
+    route = request.url_rule.rule if request.url_rule else None
+    current = _tracer.start_span(
+        f'{request.method} {route or request.path}',
+        context=extract(request.headers),
+        kind=trace.SpanKind.SERVER,
+        attributes={
+            'http.request.method': request.method,
+            'http.route': route or '',
+            'url.path': request.path,
+            'client.address': request.remote_addr or '',
+            'app.request_id': g.get('request_id') or '',
+        },
+    )
+    g.trace_span = current
+    g.trace_token = context.attach(trace.set_span_in_context(current))
+
+
+def _record_response(response):
+    current = g.get('trace_span')
+    if current is not None:
+        current.set_attribute('http.response.status_code', response.status_code)
+        if response.status_code >= 500:
+            from opentelemetry.trace import Status, StatusCode
+            current.set_status(Status(StatusCode.ERROR))
+    return response
+
+
+def _end_request_span(exc):
+    current = g.pop('trace_span', None)
+    token = g.pop('trace_token', None)
+    if current is None:
+        return
+    if exc is not None:
+        from opentelemetry.trace import Status, StatusCode
+        current.record_exception(exc)
+        current.set_status(Status(StatusCode.ERROR, type(exc).__name__))
+    current.end()
+    if token is not None:
+        from opentelemetry import context
+        context.detach(token)
+
+
+# SQL statements
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    from opentelemetry import trace
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else 'SQL'
+    current = _tracer.start_span(
+        operation,
+        kind=trace.SpanKind.CLIENT,
+        attributes={
+            'db.system': conn.dialect.name,
+            'db.operation': operation,
+            'db.statement': statement[:MAX_STATEMENT_LENGTH],
+            'db.executemany': executemany,
+        },
+    )
+    conn.info.setdefault('trace_spans', []).append(current)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get('trace_spans')
+    if spans:
+        current = spans.pop()
+        if cursor is not None and cursor.rowcount is not None and cursor.rowcount >= 0:
+            current.set_attribute('db.rows_affected', cursor.rowcount)
+        current.end()
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    spans = conn.info.get('trace_spans') if conn is not None else None
+    if spans:
+        from opentelemetry.trace import Status, StatusCode
+        current = spans.pop()
+        current.record_exception(exception_context.original_exception)
+        current.set_status(Status(StatusCode.ERROR))
+        current.end()
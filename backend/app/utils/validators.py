@@ -0,0 +1,60 @@
+# utils/validators.py
+import ipaddress
+import socket
+import urllib.request
+from urllib.parse import urlsplit
+
+
+class InvalidWebhookURL(ValueError):
+    """A webhook URL the server must not post to"""
+
+
+def _is_public(address):
+    address = ipaddress.ip_address(address.split('%', 1)[0])
+    if address.version == 6 and address.ipv4_mapped:
+        address = address.ipv4_mapped
+    return address.is_global and not address.is_multicast
+
+
+def validate_webhook_url(url, allow_private=False):
+    """
+    Check a user-supplied URL the server will POST to.
+
+    It must be http(s), and every address its host resolves to must be
+    public, so webhooks can't be aimed at the database, Redis or cloud
+    metadata on the server's own network. ``allow_private``
+    (WEBHOOK_ALLOW_PRIVATE_HOSTS) skips the address check for self-hosted
+    installs posting to e.g. Home Assistant on the LAN.
+
+    Raises:
+        InvalidWebhookURL: with a message fit to show the user
+    """
+    if not isinstance(url, str) or not url:
+        raise InvalidWebhookURL("Webhook URL is required")
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        raise InvalidWebhookURL("Webhook URL must start with http:// or https://")
+    try:
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+    except ValueError:
+        raise InvalidWebhookURL("Webhook URL has an invalid port")
+    if allow_private:
+        return url
+
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(parts.hostname, port, proto=socket.IPPROTO_TCP)}
+    except (socket.gaierror, UnicodeError):
+        raise InvalidWebhookURL(f"Webhook host {parts.hostname} could not be resolved")
+    if not all(_is_public(address) for address in addresses):
+        raise InvalidWebhookURL("Webhook URL must not point to a private, loopback or link-local address")
+    return url
+
+
+class _NoRedirects(urllib.request.HTTPRedirectHandler):
+    """Treat redirects as errors: a public URL could otherwise redirect to a private one"""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+webhook_opener = urllib.request.build_opener(_NoRedirects)
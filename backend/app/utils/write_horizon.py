@@ -0,0 +1,45 @@
+# utils/write_horizon.py
+"""
+How far a change feed can read without skipping a transaction still open.
+
+Delta sync and the outbox read rows in the order of a timestamp or id
+assigned at flush time, and hand out the last one read as a cursor. A
+transaction that flushed before that point but commits after it would land
+behind the cursor and never be read. Readers therefore stop at the horizon:
+the start of the oldest transaction that has written and not yet committed,
+less a settle margin for the moment between stamping a row in Python and the
+database starting its transaction.
+
+On PostgreSQL the open writers come from ``pg_stat_activity`` (a backend has
+a ``backend_xid`` once its transaction has written), so a 100-operation
+batch or a slow extraction commit holds the horizon back for as long as it
+runs. Only sessions of the app's own database role are visible there, which
+is every writer of these tables. SQLite allows one writer at a time, holding
+the database lock from its first write until it commits, so rows commit in
+the order they were written and the settle margin alone is enough.
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+# Seconds since the oldest other transaction with writes began, by the
+# database's clock so skew against the app's clock doesn't matter
+_OLDEST_WRITER_AGE = text("""
+    SELECT EXTRACT(EPOCH FROM clock_timestamp() - min(xact_start))
+    FROM pg_stat_activity
+    WHERE datname = current_database() AND backend_xid IS NOT NULL AND pid <> pg_backend_pid()
+""")
+
+
+def write_horizon(connection, settle_seconds, now=None):
+    """
+    Latest flush-time stamp (UTC) that no open transaction can still commit
+    a row behind. Rows stamped at or before it are safe to read past.
+    """
+    now = now or datetime.utcnow()
+    held = settle_seconds
+    if connection.dialect.name == 'postgresql':
+        age = connection.execute(_OLDEST_WRITER_AGE).scalar()
+        if age is not None:
+            held += float(age)
+    return now - timedelta(seconds=held)
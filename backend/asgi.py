@@ -0,0 +1,5 @@
+# ASGI entry point; run.py remains the WSGI one
+from app.asgi import create_asgi_app
+from run import app as flask_app
+
+app = create_asgi_app(flask_app)
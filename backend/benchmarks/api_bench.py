@@ -0,0 +1,229 @@
+# benchmarks/api_bench.py
+"""
+Latency, queries and memory of the key API endpoints on a large dataset.
+
+Seeds one user with a property through generate_data, the same synthetic
+data as ``flask generate-data``: ``--years`` of expenses and monthly
+budgets, ``--documents`` documents, ``--maintenance`` tasks and
+``--checklist`` checklist items, plus its default volumes of everything
+else. Then calls each endpoint in-process through the Flask test client (no
+network or server) ``--requests`` times and records p50/p95/p99 latency,
+SQL statements per request and the peak Python memory allocated while
+serving one request. The response cache is off, so every request does the
+full work.
+
+Results can be written as JSON (``--output``) and compared against an
+earlier run (``--baseline``): the exit status is 1 when an endpoint's p95
+grew by more than ``--tolerance`` or it issues more queries than before.
+
+Usage (from backend/):
+    python -m benchmarks.api_bench [--years 5] [--documents 5000]
+        [--requests 50] [--output results.json] [--baseline old.json]
+        [--database-url postgresql://...]
+
+Without --database-url a temporary SQLite database is used. Against an
+existing database the benchmark adds its own user; point it at a scratch
+database.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def seed(args):
+    """Create the dataset through generate_data; returns (user_id, property_id, api_key, counts)"""
+    from werkzeug.security import generate_password_hash
+    from app import db
+    from app.models.api_key import APIKey
+    from generate_data import DEFAULT_VOLUMES, PASSWORD, create_owners, fill_owners
+
+    db.create_all()
+    volumes = dict(DEFAULT_VOLUMES, years=args.years, expense_scale=args.expense_scale, documents=args.documents,
+                   maintenance=args.maintenance, checklist=args.checklist)
+    rng = random.Random(args.seed)
+    [(user_id, property_id)] = create_owners(f'bench-{time.time_ns()}', 0, 1, generate_password_hash(PASSWORD), rng)
+    counts = fill_owners([(user_id, property_id)], volumes, args.seed, date.today())
+
+    api_key = APIKey.generate_key()
+    db.session.add(APIKey(user_id=user_id, name='benchmark', key_hash=APIKey.hash_key(api_key),
+                          key_prefix=api_key[:10], scopes='read:maintenance'))
+    db.session.commit()
+    return user_id, property_id, api_key, dict(counts)
+
+
+def endpoints(property_id, years):
+    """(name, URL or list of URLs to rotate through, auth) for each benchmarked endpoint"""
+    from generate_data import WORDS
+    this_year = date.today().year
+    return [
+        ('expenses', f'/api/finances/expenses?property_id={property_id}', 'jwt'),
+        ('expenses_last_year', f'/api/finances/expenses?property_id={property_id}'
+                               f'&start_date={this_year - 1}-01-01&end_date={this_year - 1}-12-31', 'jwt'),
+        ('monthly_summary', [f'/api/finances/reports/monthly-summary?property_id={property_id}&year={this_year - y}'
+                             f'&month={m}' for y in range(min(years, 3)) for m in range(1, 13)], 'jwt'),
+        ('yearly_summary', [f'/api/finances/reports/yearly-summary?property_id={property_id}&year={this_year - y}'
+                            for y in range(years)], 'jwt'),
+        ('property_comparison', f'/api/finances/reports/property-comparison?year={this_year - 1}', 'jwt'),
+        ('search_documents', [f'/api/documents/search?q={word}' for word in WORDS], 'jwt'),
+        ('checklist_stats', f'/api/maintenance/checklist/stats?property_id={property_id}', 'jwt'),
+        ('ha_maintenance', '/api/integrations/ha/maintenance', 'api_key'),
+    ]
+
+
+class QueryCounter:
+    """Counts SQL statements sent through an engine"""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self.count = 0
+        event.listen(engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def run_endpoint(client, urls, headers, requests, warmup, counter):
+    latencies, queries, statuses = [], [], set()
+    for i in range(warmup + requests):
+        url = urls[i % len(urls)]
+        before = counter.count
+        start = time.perf_counter()
+        response = client.get(url, headers=headers)
+        response.get_data()
+        elapsed = time.perf_counter() - start
+        statuses.add(response.status_code)
+        if i >= warmup:
+            latencies.append(elapsed)
+            queries.append(counter.count - before)
+
+    # Allocation tracing slows everything down, so it gets its own request
+    tracemalloc.start()
+    client.get(urls[0], headers=headers).get_data()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 2),
+        'queries': max(queries),
+        'peak_kb': round(peak / 1024, 1),
+        'status': sorted(statuses),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Lines describing regressions against a previous run"""
+    regressions = []
+    for name, before in baseline['endpoints'].items():
+        after = results['endpoints'].get(name)
+        if not after:
+            continue
+        if after['p95_ms'] > before['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {before['p95_ms']} ms -> {after['p95_ms']} ms")
+        if after['queries'] > before['queries']:
+            regressions.append(f"{name}: queries {before['queries']} -> {after['queries']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--years', type=int, default=5, help='Years of expenses and budgets.')
+    parser.add_argument('--expense-scale', type=float, default=1.0,
+                        help='Multiplier on how often variable expenses occur.')
+    parser.add_argument('--documents', type=int, default=5000)
+    parser.add_argument('--maintenance', type=int, default=2000)
+    parser.add_argument('--checklist', type=int, default=400)
+    parser.add_argument('--requests', type=int, default=50, help='Timed requests per endpoint.')
+    parser.add_argument('--warmup', type=int, default=3, help='Untimed requests per endpoint first.')
+    parser.add_argument('--only', action='append', help='Benchmark only this endpoint (repeatable).')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for the dataset.')
+    parser.add_argument('--database-url')
+    parser.add_argument('--output', help='Write results to this JSON file.')
+    parser.add_argument('--baseline', help='Compare with the results JSON of an earlier run.')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed p95 growth over the baseline.')
+    args = parser.parse_args()
+
+    database_url = args.database_url or 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+    os.environ['SQLALCHEMY_DATABASE_URI'] = database_url
+    from config import ProductionConfig
+    from app import create_app, db
+
+    class BenchmarkConfig(ProductionConfig):
+        SQLALCHEMY_DATABASE_URI = database_url
+        CACHE_TYPE = 'null'
+        RATE_LIMIT_ENABLED = False
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        started = time.perf_counter()
+        user_id, property_id, api_key, counts = seed(args)
+        dialect = db.engine.dialect.name
+        print(f"seeded {', '.join(f'{n:,} {name}' for name, n in counts.items())} "
+              f"in {time.perf_counter() - started:.1f}s ({dialect})")
+
+        from flask_jwt_extended import create_access_token
+        auth = {
+            'jwt': {'Authorization': f'Bearer {create_access_token(identity=str(user_id))}'},
+            'api_key': {'X-API-Key': api_key},
+        }
+        counter = QueryCounter(db.engine)
+
+    client = app.test_client()
+    results = {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+            'database': dialect,
+            'python': platform.python_version(),
+            'requests': args.requests,
+            'dataset': counts,
+        },
+        'endpoints': {},
+    }
+    print(f"{'endpoint':<22}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'queries':>9}{'peak KB':>10}  status")
+    for name, urls, kind in endpoints(property_id, args.years):
+        if args.only and name not in args.only:
+            continue
+        urls = urls if isinstance(urls, list) else [urls]
+        result = run_endpoint(client, urls, auth[kind], args.requests, args.warmup, counter)
+        results['endpoints'][name] = result
+        print(f"{name:<22}{result['p50_ms']:9.1f}{result['p95_ms']:9.1f}{result['p99_ms']:9.1f}"
+              f"{result['queries']:9d}{result['peak_kb']:10.0f}  {','.join(map(str, result['status']))}")
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results['meta']['max_rss_mb'] = round(max_rss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+    print(f"max RSS {results['meta']['max_rss_mb']} MB")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f'REGRESSION {line}')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+# benchmarks/ha_load_bench.py
+"""
+Home Assistant polling load test: WSGI (gunicorn gthread) vs ASGI (asgi.py).
+
+Seeds a database with one user, an API key and ``--tasks`` maintenance
+tasks, starts each server in turn with the same number of workers, and has
+``--clients`` concurrent clients poll ``GET /api/integrations/ha/maintenance``
+for ``--duration`` seconds, each waiting ``--think`` seconds between polls
+(Home Assistant's ``scan_interval``). Reports throughput, latency
+percentiles and errors for both.
+
+The client is a single asyncio process; with very many clients on a small
+machine it can become the bottleneck itself, so compare the two servers
+under the same settings rather than reading absolute numbers.
+
+Usage (from backend/, needs gunicorn, uvicorn and httpx):
+    python -m benchmarks.ha_load_bench [--clients 1000] [--duration 30]
+        [--think 1.0] [--workers 2] [--database-url postgresql://...]
+
+Without --database-url a temporary SQLite database is used.
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+SERVERS = {
+    'wsgi': ['--worker-class', 'gthread', '--threads', '8', 'run:app'],
+    'asgi': ['--worker-class', 'uvicorn.workers.UvicornWorker', 'asgi:app'],
+}
+
+
+def seed(database_url, tasks):
+    """Create the schema, a user with ``tasks`` tasks and an API key; returns the key"""
+    os.environ['SQLALCHEMY_DATABASE_URI'] = database_url
+    from config import ProductionConfig
+    from app import create_app, db
+    from app.models.api_key import APIKey
+    from app.models.maintenance import Maintenance
+    from app.models.property import Property
+    from app.models.user import User
+
+    app = create_app(ProductionConfig)
+    with app.app_context():
+        db.create_all()
+        user = User(email=f'loadtest-{time.time_ns()}@example.com', first_name='Load', last_name='Test')
+        user.password = 'load-test-password'
+        db.session.add(user)
+        db.session.flush()
+        home = Property(user_id=user.id, address='1 Test St', city='Testville', state='TS',
+                        zip='00000', property_type='residential')
+        db.session.add(home)
+        db.session.flush()
+        db.session.add_all(
+            Maintenance(user_id=user.id, property_id=home.id, title=f'Task {i}', priority='medium')
+            for i in range(tasks)
+        )
+        key = APIKey.generate_key()
+        db.session.add(APIKey(user_id=user.id, name='load test', key_hash=APIKey.hash_key(key),
+                              key_prefix=key[:10], scopes='read:maintenance'))
+        db.session.commit()
+    return key
+
+
+def start_server(kind, database_url, port, workers):
+    env = dict(
+        os.environ,
+        FLASK_ENV='production',
+        SQLALCHEMY_DATABASE_URI=database_url,
+        DATABASE_URL=database_url,
+        RATE_LIMIT_ENABLED='false',
+        CACHE_TYPE='null',
+        WEBHOOK_DISPATCHER='false',
+    )
+    command = [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}', '--workers', str(workers),
+               '--timeout', '120', '--log-level', 'warning'] + SERVERS[kind]
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+
+def wait_until_up(base_url, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f'{base_url}/health', timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f'Server at {base_url} did not start')
+
+
+async def poll(client, url, headers, deadline, think, latencies, errors):
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.get(url, headers=headers)
+            if response.status_code == 200:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors[response.status_code] = errors.get(response.status_code, 0) + 1
+        except httpx.HTTPError as e:
+            errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+        if think:
+            await asyncio.sleep(think)
+
+
+async def run_clients(base_url, api_key, clients, duration, think):
+    latencies, errors = [], {}
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        deadline = time.monotonic() + duration
+        # Spread the first polls over one think time, like independent HA instances
+        async def client_loop(index):
+            await asyncio.sleep(think * index / clients)
+            await poll(client, '/api/integrations/ha/maintenance', {'X-API-Key': api_key},
+                       deadline, think, latencies, errors)
+        await asyncio.gather(*(client_loop(i) for i in range(clients)))
+    return latencies, errors
+
+
+def report(kind, latencies, errors, duration):
+    latencies.sort()
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else float('nan')
+
+    failed = sum(errors.values())
+    print(f"{kind:<5} {len(latencies) / duration:9,.0f} req/s   p50 {percentile(0.50):7.1f} ms   "
+          f"p95 {percentile(0.95):7.1f} ms   p99 {percentile(0.99):7.1f} ms   errors {failed}"
+          + (f" {errors}" if errors else ''))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=1000)
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--think', type=float, default=1.0, help='Seconds between a client\'s polls.')
+    parser.add_argument('--tasks', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--port', type=int, default=5099)
+    parser.add_argument('--database-url')
+    parser.add_argument('--only', choices=sorted(SERVERS))
+    args = parser.parse_args()
+
+    database_url = args.database_url or 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'loadtest.db')
+    api_key = seed(database_url, args.tasks)
+    base_url = f'http://127.0.0.1:{args.port}'
+    print(f"{args.clients:,} clients, {args.think}s between polls, {args.duration:.0f}s, "
+          f"{args.workers} workers, {args.tasks} tasks")
+
+    for kind in [args.only] if args.only else SERVERS:
+        server = start_server(kind, database_url, args.port, args.workers)
+        try:
+            wait_until_up(base_url)
+            latencies, errors = asyncio.run(run_clients(base_url, api_key, args.clients, args.duration, args.think))
+            report(kind, latencies, errors, args.duration)
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+# benchmarks/serialization_bench.py
+"""
+Serialization throughput for 10k document rows.
+
+Compares the previous handler pattern (hand-built dict per row with
+``.isoformat()`` calls, stdlib ``json``) against the compiled row serializer
+and the app's JSON provider.
+
+Usage (from backend/):
+    python -m benchmarks.serialization_bench [--rows 10000] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask  # noqa: E402
+from app.api.serializers import document_serializer  # noqa: E402
+from app.utils.json_provider import AppJSONProvider, orjson  # noqa: E402
+
+
+def make_rows(count):
+    """Column tuples in ``document_serializer.columns`` order"""
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    return [
+        (
+            i, f'Document {i}', 'Lorem ipsum ' * 8, 'pdf', 120_000 + i, 'warranty',
+            now + timedelta(seconds=i), now + timedelta(seconds=i), i % 50, None,
+            date(2027, 1, 1) + timedelta(days=i % 365), 1, f'/uploads/doc_{i}.pdf',
+        )
+        for i in range(count)
+    ]
+
+
+def legacy(rows):
+    """Previous handler pattern: ORM attribute access + isoformat + stdlib json"""
+    docs = [SimpleNamespace(**dict(zip(
+        [column.key for column in document_serializer.columns], row
+    ))) for row in rows]
+
+    def run():
+        result = []
+        for doc in docs:
+            result.append({
+                'id': doc.id,
+                'title': doc.title,
+                'description': doc.description,
+                'file_type': doc.file_type,
+                'file_size': doc.file_size,
+                'category': doc.category,
+                'created_at': doc.created_at.isoformat() if doc.created_at else None,
+                'updated_at': doc.updated_at.isoformat() if doc.updated_at else None,
+                'property_id': doc.property_id,
+                'appliance_id': doc.appliance_id,
+                'expiration_date': doc.expiration_date.isoformat() if doc.expiration_date else None,
+                'created_by': doc.user_id,
+            })
+        return json.dumps(result)
+    return run
+
+
+def compiled(rows):
+    """Compiled row serializer + app JSON provider"""
+    provider = AppJSONProvider(Flask(__name__))
+
+    def run():
+        return provider.dumps(document_serializer.dump_rows(rows))
+    return run
+
+
+def bench(name, fn, count, repeat):
+    fn()  # warm up
+    best = min(_timed(fn) for _ in range(repeat))
+    print(f"{name:<32} {best * 1000:8.1f} ms   {count / best:12,.0f} rows/s")
+    return best
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    print(f"{args.rows:,} rows, best of {args.repeat} (orjson: {'yes' if orjson else 'no'})")
+    before = bench('before: dicts + stdlib json', legacy(rows), args.rows, args.repeat)
+    after = bench('after: RowSerializer + provider', compiled(rows), args.rows, args.repeat)
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/startup_bench.py
+"""
+Cold start of a web worker: a fresh interpreter importing ``run`` (which
+builds the app with ``create_app``), as gunicorn does for each new worker
+without ``--preload``.
+
+Reports the median wall time over ``--repeat`` runs, and with ``--imports``
+the modules with the largest cumulative import time (``python -X importtime``).
+
+Usage (from backend/):
+    python -m benchmarks.startup_bench [--repeat 5] [--imports 20]
+        [--database-url postgresql://...]
+
+Without --database-url a temporary SQLite database is used; create_app
+doesn't connect to it, so no schema is needed.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def worker_env(database_url):
+    return dict(
+        os.environ,
+        FLASK_ENV='production',
+        SQLALCHEMY_DATABASE_URI=database_url,
+        DATABASE_URL=database_url,
+    )
+
+
+def time_cold_start(env):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', 'import run'], cwd=BACKEND_DIR, env=env,
+                   check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def slowest_imports(env, count):
+    """(cumulative seconds, module) for the ``count`` slowest imports made by run and its direct imports"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import run'], cwd=BACKEND_DIR,
+                            env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nesting is shown by indentation, two spaces per level below run
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth in (1, 2):
+            imports.append((int(cumulative) / 1e6, name.strip()))
+    return sorted(imports, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--imports', type=int, default=0, help='Also list this many of the slowest imports.')
+    parser.add_argument('--database-url')
+    args = parser.parse_args()
+
+    database_url = args.database_url or 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'startup.db')
+    env = worker_env(database_url)
+    time_cold_start(env)  # Warm the OS file cache and write bytecode
+    timings = [time_cold_start(env) for _ in range(args.repeat)]
+    print(f"cold start (import run): median {statistics.median(timings) * 1000:.0f} ms, "
+          f"min {min(timings) * 1000:.0f} ms over {args.repeat} runs")
+
+    if args.imports:
+        print('\nslowest imports (cumulative):')
+        for seconds, name in slowest_imports(env, args.imports):
+            print(f'  {seconds * 1000:7.1f} ms  {name}')
+
+
+if __name__ == '__main__':
+    main()
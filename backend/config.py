@@ -21,6 +21,122 @@ class Config:
     # File upload settings
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
     MAX_CONTENT_LENGTH = 200 * 1024 * 1024  # 200MB max upload size
+
+    # Document text extraction for search (see app/services/content_service.py)
+    EXTRACT_ON_UPLOAD = os.environ.get('EXTRACT_ON_UPLOAD', 'true').lower() == 'true'
+    EXTRACTION_WORKERS = int(os.environ.get('EXTRACTION_WORKERS', 2))
+    EXTRACTION_MAX_CHARS = int(os.environ.get('EXTRACTION_MAX_CHARS', 1000000))
+
+    # Threads (and so DB connections) shared by all dashboard requests
+    DASHBOARD_WORKERS = int(os.environ.get('DASHBOARD_WORKERS', 6))
+
+    # How many days ahead expiring documents and warranties raise alerts
+    # (see app/services/notification_service.py)
+    ALERT_DOCUMENT_DAYS = int(os.environ.get('ALERT_DOCUMENT_DAYS', 30))
+    ALERT_WARRANTY_DAYS = int(os.environ.get('ALERT_WARRANTY_DAYS', 90))
+
+    # Change digests (see app/services/notification_service.py): a user's
+    # events go out once none arrived for COALESCE seconds, or at the latest
+    # MAX_DELAY seconds after the first
+    NOTIFICATION_COALESCE_SECONDS = int(os.environ.get('NOTIFICATION_COALESCE_SECONDS', 300))
+    NOTIFICATION_MAX_DELAY_SECONDS = int(os.environ.get('NOTIFICATION_MAX_DELAY_SECONDS', 3600))
+    NOTIFICATION_MAX_ATTEMPTS = int(os.environ.get('NOTIFICATION_MAX_ATTEMPTS', 5))
+    NOTIFICATION_WEBHOOK_TIMEOUT = int(os.environ.get('NOTIFICATION_WEBHOOK_TIMEOUT', 10))
+    # Webhook URLs (notification and outbox) must resolve to public
+    # addresses; set for self-hosted installs posting to hosts on the LAN
+    WEBHOOK_ALLOW_PRIVATE_HOSTS = os.environ.get('WEBHOOK_ALLOW_PRIVATE_HOSTS', 'false').lower() == 'true'
+    NOTIFICATION_RETENTION_DAYS = int(os.environ.get('NOTIFICATION_RETENTION_DAYS', 30))
+    # Seconds a worker may reuse a user's parsed notification settings
+    NOTIFICATION_SETTINGS_TTL = int(os.environ.get('NOTIFICATION_SETTINGS_TTL', 60))
+
+    # Outbox of changes pushed to webhooks and the event stream (see
+    # app/services/outbox_service.py)
+    OUTBOX_RETENTION_DAYS = int(os.environ.get('OUTBOX_RETENTION_DAYS', 7))
+    OUTBOX_SETTLE_SECONDS = float(os.environ.get('OUTBOX_SETTLE_SECONDS', 1))
+    OUTBOX_POLL_SECONDS = float(os.environ.get('OUTBOX_POLL_SECONDS', 1))
+    OUTBOX_STREAM_SECONDS = int(os.environ.get('OUTBOX_STREAM_SECONDS', 300))
+    OUTBOX_HEARTBEAT_SECONDS = int(os.environ.get('OUTBOX_HEARTBEAT_SECONDS', 15))
+    OUTBOX_WEBHOOK_TIMEOUT = int(os.environ.get('OUTBOX_WEBHOOK_TIMEOUT', 10))
+    OUTBOX_MAX_BACKOFF_SECONDS = int(os.environ.get('OUTBOX_MAX_BACKOFF_SECONDS', 3600))
+
+    # Most operations accepted by one Home Assistant batch request
+    HA_BATCH_MAX_OPERATIONS = int(os.environ.get('HA_BATCH_MAX_OPERATIONS', 100))
+
+    # Delta sync (see app/services/sync_service.py): changes are returned once
+    # SETTLE seconds older than any open transaction; cursors older than the
+    # tombstone retention expire
+    SYNC_SETTLE_SECONDS = float(os.environ.get('SYNC_SETTLE_SECONDS', 1))
+    SYNC_TOMBSTONE_RETENTION_DAYS = int(os.environ.get('SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+
+    # ASGI server (asgi.py): connections for the async Home Assistant
+    # endpoints, and threads running the rest of the app
+    ASYNC_DB_POOL_SIZE = int(os.environ.get('ASYNC_DB_POOL_SIZE', 10))
+    ASYNC_DB_MAX_OVERFLOW = int(os.environ.get('ASYNC_DB_MAX_OVERFLOW', 10))
+    ASGI_WSGI_THREADS = int(os.environ.get('ASGI_WSGI_THREADS', 16))
+
+    # Seconds a worker may reuse a user's property ids for ownership checks
+    # (see app/utils/auth_utils.py); 0 keeps them for a single request only
+    OWNERSHIP_CACHE_TTL = int(os.environ.get('OWNERSHIP_CACHE_TTL', 0))
+
+    # Response cache (see app/services/response_cache.py). The in-process
+    # 'memory' backend can't see other workers' writes, so with several
+    # workers it needs CACHE_REDIS_URL (any Redis-compatible server)
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL')
+    CACHE_TYPE = os.environ.get('CACHE_TYPE') or ('redis' if CACHE_REDIS_URL else 'null')
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 2048))
+    CACHE_TTL = int(os.environ.get('CACHE_TTL', 86400))
+
+    # Rate limiting (see app/services/rate_limiter.py). A limit such as
+    # '10/minute' allows bursts of 10 and refills at 10 a minute. The memory
+    # backend limits each worker separately; with several workers set
+    # RATE_LIMIT_REDIS_URL (or CACHE_REDIS_URL) to share the buckets
+    RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    RATE_LIMIT_REDIS_URL = os.environ.get('RATE_LIMIT_REDIS_URL') or CACHE_REDIS_URL
+    RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND') or ('redis' if RATE_LIMIT_REDIS_URL else 'memory')
+    RATE_LIMIT_MAX_BUCKETS = int(os.environ.get('RATE_LIMIT_MAX_BUCKETS', 10000))
+    # Reverse proxies in front of the app that append to X-Forwarded-For
+    # (1 for the bundled nginx); 0 trusts no proxy headers
+    RATE_LIMIT_TRUSTED_PROXIES = int(os.environ.get('RATE_LIMIT_TRUSTED_PROXIES', 0))
+    # Login, registration and password/verification emails: per client and
+    # in total per endpoint
+    RATE_LIMIT_AUTH_PER_IP = os.environ.get('RATE_LIMIT_AUTH_PER_IP', '10/minute')
+    RATE_LIMIT_AUTH_PER_ROUTE = os.environ.get('RATE_LIMIT_AUTH_PER_ROUTE', '300/minute')
+    # API-key (Home Assistant) endpoints: per client and per key
+    RATE_LIMIT_API_PER_IP = os.environ.get('RATE_LIMIT_API_PER_IP', '600/minute')
+    RATE_LIMIT_PER_API_KEY = os.environ.get('RATE_LIMIT_PER_API_KEY', '120/minute')
+
+    # Logging (see app/utils/structured_logging.py): JSON lines on stdout
+    # ('text' for plain lines), and an access log line per request, sampled
+    # for busy path prefixes; errors and slow requests are always logged
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+    LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json')
+    LOG_REQUESTS = os.environ.get('LOG_REQUESTS', 'true').lower() == 'true'
+    LOG_SAMPLE_RATES = os.environ.get('LOG_SAMPLE_RATES', '/uploads/=0.01,/health=0.01')
+    LOG_SLOW_REQUEST_MS = int(os.environ.get('LOG_SLOW_REQUEST_MS', 1000))
+
+    # Tracing (see app/utils/tracing.py): OpenTelemetry spans for requests,
+    # SQL, upload writes, email and background work, exported to an OTLP
+    # collector ('otlp', at TRACING_OTLP_ENDPOINT or the standard
+    # OTEL_EXPORTER_OTLP_* variables), a JSON-lines file ('file') or stdout
+    TRACING_ENABLED = os.environ.get('TRACING_ENABLED', 'false').lower() == 'true'
+    TRACING_EXPORTER = os.environ.get('TRACING_EXPORTER', 'otlp')
+    TRACING_OTLP_ENDPOINT = os.environ.get('TRACING_OTLP_ENDPOINT')
+    TRACING_FILE = os.environ.get('TRACING_FILE')
+    TRACING_SERVICE_NAME = os.environ.get('OTEL_SERVICE_NAME', 'propertypal-api')
+    # Fraction of new traces recorded; requests continuing a caller's trace follow its decision
+    TRACING_SAMPLE_RATE = float(os.environ.get('TRACING_SAMPLE_RATE', 1.0))
+
+    # Request profiling (see app/services/profiler.py). When enabled, requests
+    # with a signed X-Profile-Token header, requests while an admin has it
+    # switched on, and a PROFILING_SAMPLE_RATE fraction of the rest are
+    # profiled. PROFILER is 'cprofile' or 'pyinstrument' (if installed)
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'false').lower() == 'true'
+    PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', 0))
+    PROFILER = os.environ.get('PROFILER', 'cprofile')
+    PROFILING_MAX_PROFILES = int(os.environ.get('PROFILING_MAX_PROFILES', 50))
+    PROFILING_TOKEN_MAX_AGE = int(os.environ.get('PROFILING_TOKEN_MAX_AGE', 3600))
+    # Share profiles and the admin switch between workers
+    PROFILING_REDIS_URL = os.environ.get('PROFILING_REDIS_URL') or CACHE_REDIS_URL
     
     # Email settings (update with actual values in production)
     MAIL_SERVER = os.environ.get('MAIL_SERVER') or 'smtp.gmail.com'
@@ -36,6 +152,29 @@ class Config:
     AWS_REGION = os.environ.get('AWS_REGION') or 'us-east-1'
     S3_BUCKET = os.environ.get('S3_BUCKET') or 'propertypal-documents'
 
+    # Where uploads are stored (see app/services/file_service.py): 'local'
+    # disk, or 's3' for a bucket shared by every node. Set
+    # STORAGE_S3_ENDPOINT_URL (and usually addressing style 'path') for
+    # MinIO or another S3-compatible store
+    USE_S3 = os.environ.get('USE_S3', 'false').lower() == 'true'
+    STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND') or ('s3' if USE_S3 else 'local')
+    STORAGE_S3_ENDPOINT_URL = os.environ.get('STORAGE_S3_ENDPOINT_URL')
+    # Endpoint browsers reach the store at, when it isn't the one above
+    # (e.g. http://localhost:9000 for MinIO inside docker-compose)
+    STORAGE_S3_PUBLIC_ENDPOINT_URL = os.environ.get('STORAGE_S3_PUBLIC_ENDPOINT_URL')
+    STORAGE_S3_ADDRESSING_STYLE = os.environ.get('STORAGE_S3_ADDRESSING_STYLE', 'auto')
+    # Prepended to every object key, e.g. 'propertypal/'
+    STORAGE_S3_PREFIX = os.environ.get('STORAGE_S3_PREFIX', '')
+    # Connections per process; at least the number of threads doing uploads
+    STORAGE_S3_MAX_POOL_CONNECTIONS = int(os.environ.get('STORAGE_S3_MAX_POOL_CONNECTIONS', 20))
+    # Files larger than the threshold are uploaded in parts of CHUNK_MB,
+    # MAX_CONCURRENCY at a time
+    STORAGE_S3_MULTIPART_THRESHOLD_MB = int(os.environ.get('STORAGE_S3_MULTIPART_THRESHOLD_MB', 8))
+    STORAGE_S3_MULTIPART_CHUNK_MB = int(os.environ.get('STORAGE_S3_MULTIPART_CHUNK_MB', 8))
+    STORAGE_S3_MAX_CONCURRENCY = int(os.environ.get('STORAGE_S3_MAX_CONCURRENCY', 4))
+    # Seconds a presigned download URL stays valid
+    STORAGE_URL_EXPIRES = int(os.environ.get('STORAGE_URL_EXPIRES', 900))
+
     # for emails 
     FRONTEND_URL = os.environ.get('FRONTEND_URL') or 'http://localhost:3000'
 
@@ -53,9 +192,9 @@ class DevelopmentConfig(Config):
         basedir = os.path.abspath(os.path.dirname(__file__))
         SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
             'sqlite:///' + os.path.join(basedir, 'app.db')
-    
-    # Use local file storage instead of S3 in development
-    USE_S3 = False
+
+    # The dev server is a single process, so the in-process cache is safe
+    CACHE_TYPE = os.environ.get('CACHE_TYPE') or ('redis' if Config.CACHE_REDIS_URL else 'memory')
 
 
 class TestingConfig(Config):
@@ -65,13 +204,14 @@ class TestingConfig(Config):
     SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL') or \
         'postgresql://propertypal:propertypal@db:5432/propertypal_test'
     JWT_SECRET_KEY = 'testing-jwt-secret-key'
+    EXTRACT_ON_UPLOAD = False
+    RATE_LIMIT_ENABLED = False
 
 
 class ProductionConfig(Config):
     """Production configuration"""
     DEBUG = False
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
-    USE_S3 = True
 
 
 class DemoConfig(Config):
@@ -81,5 +221,4 @@ class DemoConfig(Config):
     SKIP_EMAIL_VERIFICATION = True
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=10)  # Short session for demo
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
-        'postgresql://propertypal:propertypal@db:5432/propertypal_demo'
-    USE_S3 = False  # Use local storage for demo
\ No newline at end of file
+        'postgresql://propertypal:propertypal@db:5432/propertypal_demo'
\ No newline at end of file
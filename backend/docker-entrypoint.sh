@@ -13,21 +13,10 @@ UPLOAD_DIR=${UPLOAD_FOLDER:-uploads}
 echo "Creating upload directories in $UPLOAD_DIR..."
 mkdir -p $UPLOAD_DIR/documents/photos
 
-# Initialize the database with Flask-Migrate
-if [ ! -d "migrations" ]; then
-  echo "Initializing the database..."
-  flask db init
-  flask db migrate -m "Initial migration"
-  flask db upgrade
-else
-  echo "Running database migrations if needed..."
-  flask db migrate -m "Auto-migration"
-  flask db upgrade
-fi
-
-# Create tables if they don't exist
-echo "Creating tables if they don't exist..."
-python -c "from app import create_app, db; app = create_app(); app.app_context().push(); db.create_all()"
+# Create or upgrade the schema, seed demo accounts and refresh alerts once,
+# here, rather than in every worker
+echo "Bootstrapping the database..."
+flask bootstrap
 
 # Execute the CMD
 exec "$@"
\ No newline at end of file
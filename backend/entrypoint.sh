@@ -33,35 +33,32 @@ until PGPASSWORD=$DB_PASSWORD psql -h $DB_HOST -p $DB_PORT -U $DB_USER -d $DB_NA
 done
 echo "Database is ready!"
 
-# Check if we need to initialize the database
-DB_TABLES=$(PGPASSWORD=$DB_PASSWORD psql -h $DB_HOST -p $DB_PORT -U $DB_USER -d $DB_NAME -t -c "SELECT COUNT(*) FROM information_schema.tables WHERE table_schema='public'" | tr -d ' ')
+# One-off start-up work (schema, demo accounts, alert refresh, tombstone
+# pruning) in a single process, so workers boot without touching the database.
+# It exits non-zero if the schema can't be set up, which stops the container
+flask bootstrap
 
-echo "Found $DB_TABLES tables in database"
-
-# For fresh databases, create tables directly from models
-if [ $DB_TABLES -lt 5 ]; then
-    echo "Database appears to be empty. Creating tables from models..."
-    python -c "
-from app import create_app, db
-app = create_app()
-with app.app_context():
-    db.create_all()
-    print('Tables created successfully!')
-"
-    echo "Database initialized!"
-else
-    echo "Database already has tables, checking migrations..."
-    # Only run migrations if migrations folder exists and has versions
-    if [ -d "migrations/versions" ] && [ "$(ls -A migrations/versions 2>/dev/null)" ]; then
-        echo "Applying any pending migrations..."
-        flask db upgrade || echo "Migration failed, but continuing..."
-    fi
+# Push outbox events to registered webhooks; restarted if it ever exits
+if [ "${WEBHOOK_DISPATCHER:-true}" = "true" ]; then
+    (while true; do
+        flask dispatch-webhooks --follow || echo "Webhook dispatcher exited, restarting..."
+        sleep 5
+    done) &
 fi
 
 # Start application based on environment
 if [ "$FLASK_ENV" = "production" ]; then
+    if [ "${ASGI_SERVER:-false}" = "true" ]; then
+        echo "Starting production server with gunicorn (ASGI)..."
+        # Home Assistant polling and event streams on an event loop, the rest
+        # of the app in each worker's thread pool (see app/asgi.py)
+        exec gunicorn --bind 0.0.0.0:5008 --workers 2 --worker-class uvicorn.workers.UvicornWorker --timeout 120 --preload "asgi:app"
+    fi
     echo "Starting production server with gunicorn..."
-    exec gunicorn --bind 0.0.0.0:5008 --workers 2 --timeout 120 "run:app"
+    # Threaded workers, so open event streams don't each tie up a whole worker.
+    # --preload builds the app once in the master; workers (and respawns) fork
+    # from it instead of importing everything again.
+    exec gunicorn --bind 0.0.0.0:5008 --workers 2 --worker-class gthread --threads "${GUNICORN_THREADS:-8}" --timeout 120 --preload "run:app"
 else
     echo "Starting development server..."
     exec python run.py
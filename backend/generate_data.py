@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Synthetic data in bulk, for benchmarks and index tuning
+
+Where seed_demo_accounts creates a few hand-written accounts, this creates
+any number of users, each with a property (modelled on the demo ones) and,
+per property, years of expenses and monthly budgets, documents and photos
+(optionally with dummy files on disk), appliances, projects, maintenance
+tasks and checklist items. Rows go in with chunked bulk inserts, skipping
+the ORM's per-object flush and its listeners, and users are split across
+worker processes. Run it with ``flask generate-data`` (see app/cli.py).
+
+Afterwards run ``flask rebuild-search-index`` and ``flask scan-alerts
+--no-email`` to build the unified search index and expiry alerts for the
+new rows; the document full-text index is kept by the database itself.
+Dummy files hold no text, so each document gets its document_contents row
+up front and ``flask extract-documents`` has nothing to do.
+"""
+import math
+import multiprocessing
+import os
+import random
+import uuid
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import select
+from werkzeug.security import generate_password_hash
+from app import db
+from app.models.appliance import Appliance
+from app.models.document import Document
+from app.models.document_content import DocumentContent
+from app.models.finance import Budget, Expense
+from app.models.maintenance import Maintenance
+from app.models.maintenance_checklist import MaintenanceChecklistItem
+from app.models.project import Project
+from app.models.property import Property
+from app.models.settings import Settings
+from app.models.user import User
+from app.services.content_service import EXTRACTABLE_EXTENSIONS, file_extension
+from app.utils.money import to_cents
+from seed_demo_accounts import DEMO_ACCOUNTS
+
+# Per property: years of expenses and budgets, a multiplier on how often
+# variable expenses occur, and row counts for everything else
+DEFAULT_VOLUMES = {
+    'years': 5,
+    'expense_scale': 1.0,
+    'documents': 200,
+    'photos': 10,
+    'appliances': 15,
+    'projects': 5,
+    'maintenance': 50,
+    'checklist': 40,
+}
+
+# (category, expenses per month, median amount in cents)
+VARIABLE_EXPENSES = [
+    ('Maintenance', 2.0, 15000),
+    ('Repairs', 0.7, 40000),
+    ('Landscaping', 2.5, 7500),
+    ('Cleaning', 2.0, 12000),
+    ('Pest Control', 0.3, 9000),
+    ('Furnishings', 0.5, 35000),
+    ('Appliances', 0.15, 90000),
+    ('Improvements', 0.2, 250000),
+    ('Other', 2.0, 4000),
+]
+# Paid on the first of the month (Property Tax quarterly); Utilities swing with the season
+MONTHLY_EXPENSES = [('Mortgage', 185000), ('Insurance', 14000), ('HOA Fees', 9000), ('Utilities', 22000)]
+QUARTERLY_EXPENSES = [('Property Tax', 126000)]
+# Landscaping happens in the warm months, heating and cooling bills peak in winter and summer
+SEASONAL = {
+    'Landscaping': [0.2, 0.2, 0.8, 1.5, 1.8, 1.8, 1.6, 1.5, 1.3, 1.0, 0.4, 0.2],
+    'Utilities': [1.5, 1.4, 1.1, 0.9, 0.8, 1.0, 1.2, 1.2, 0.9, 0.8, 1.1, 1.4],
+}
+
+WORDS = ('roof furnace boiler warranty insurance invoice receipt plumbing electrical gutter window water '
+         'heater inspection permit contract quote manual filter deck paint garage kitchen bath basement '
+         'attic siding fence driveway chimney dishwasher refrigerator washer dryer thermostat').split()
+DOCUMENT_CATEGORIES = ['receipt', 'invoice', 'contract', 'property_insurance', 'property_tax',
+                       'maintenance_receipt', 'appliance_manual', 'appliance_warranty', 'project_quote']
+APPLIANCES = [('Refrigerator', 'kitchen'), ('Dishwasher', 'kitchen'), ('Oven', 'kitchen'), ('Washer', 'laundry'),
+              ('Dryer', 'laundry'), ('Furnace', 'hvac'), ('Air Conditioner', 'hvac'), ('Water Heater', 'plumbing')]
+BRANDS = ['Whirlpool', 'GE', 'Samsung', 'LG', 'Bosch', 'Carrier', 'Rheem', 'Maytag']
+SEASONS = ['Spring', 'Summer', 'Fall', 'Winter']
+FIRST_NAMES = ['Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery', 'Quinn']
+LAST_NAMES = ['Smith', 'Johnson', 'Lee', 'Garcia', 'Brown', 'Nguyen', 'Patel', 'Kim', 'Lopez', 'Clark']
+
+# Dummy file contents: just enough of a header to be recognisable
+FILE_HEADERS = {'pdf': b'%PDF-1.4\n', 'jpg': b'\xff\xd8\xff\xe0\x00\x10JFIF\x00'}
+CHUNK = 5000
+# Every generated user's password
+PASSWORD = 'Generated123!'
+
+
+def bulk_insert(model, rows):
+    """
+    Insert dicts in chunks of one executemany each, bypassing the ORM. All
+    rows for a model must have the same keys, or the batch gets split up.
+    """
+    for start in range(0, len(rows), CHUNK):
+        db.session.execute(model.__table__.insert(), rows[start:start + CHUNK])
+
+
+def write_dummy_file(path, size, extension):
+    """A sparse file of ``size`` bytes, so large volumes cost little disk"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(FILE_HEADERS[extension])
+        f.truncate(max(size, len(FILE_HEADERS[extension])))
+
+
+def expense_rows(rng, owner, start, end, scale):
+    expenses, budgets = [], []
+    month = date(start.year, start.month, 1)
+    while month <= end:
+        month_index = month.month - 1
+        days = (date(month.year + month.month // 12, month.month % 12 + 1, 1) - month).days
+        fixed = list(MONTHLY_EXPENSES)
+        if month.month in (1, 4, 7, 10):
+            fixed += QUARTERLY_EXPENSES
+        for category, amount in fixed:
+            amount = amount * SEASONAL.get(category, [1] * 12)[month_index]
+            expenses.append(dict(owner, title=category, category=category, date=month, recurring=True,
+                                 recurring_interval='monthly', amount=int(rng.gauss(amount, amount * 0.05))))
+
+        for category, per_month, median in VARIABLE_EXPENSES:
+            rate = per_month * scale * SEASONAL.get(category, [1] * 12)[month_index]
+            # Poisson arrivals via exponential gaps
+            day = rng.expovariate(rate / days) if rate else days
+            while day < days:
+                expenses.append(dict(owner, title=f'{category}: {rng.choice(WORDS)}', category=category,
+                                     date=month + timedelta(days=int(day)), recurring=False, recurring_interval=None,
+                                     amount=max(100, int(rng.lognormvariate(math.log(median), 0.6)))))
+                day += rng.expovariate(rate / days)
+            budgets.append(dict(owner, category=category, month=month.month, year=month.year,
+                                amount=int(median * per_month * scale * 1.1)))
+
+        month = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+    return [e for e in expenses if e['date'] <= end], budgets
+
+
+def property_rows(rng, owner, volumes, today, upload_root=None, file_size=0):
+    """Every row belonging to one property, as ``{model: [row dicts]}``"""
+    start = today - timedelta(days=365 * volumes['years'])
+    property_id = owner['property_id']
+
+    def random_date(earliest=start, latest=today):
+        return earliest + timedelta(days=rng.randint(0, (latest - earliest).days))
+
+    def file_path(kind, extension):
+        folder = os.path.join('files' if kind == 'files' else 'photos', f'property_{property_id}')
+        path = os.path.join(upload_root or 'uploads/documents', folder, f'{uuid.UUID(int=rng.getrandbits(128))}.{extension}')
+        size = max(1, int(rng.gauss(file_size, file_size / 4))) if file_size else rng.randint(20_000, 4_000_000)
+        if upload_root and file_size:
+            write_dummy_file(path, size, extension)
+        return path, size
+
+    rows = {}
+    rows[Expense], rows[Budget] = expense_rows(rng, owner, start, today, volumes['expense_scale'])
+
+    rows[Appliance] = []
+    for i in range(volumes['appliances']):
+        name, category = APPLIANCES[i % len(APPLIANCES)]
+        purchased = random_date()
+        rows[Appliance].append(dict(
+            owner, name=name, category=category, brand=rng.choice(BRANDS), model=f'{name[:3].upper()}-{rng.randint(100, 999)}',
+            serial_number=uuid.UUID(int=rng.getrandbits(128)).hex[:12].upper(), purchase_date=purchased,
+            warranty_expiration=purchased + timedelta(days=365 * rng.choice([1, 2, 3, 5])), location=category,
+        ))
+
+    rows[Document] = []
+    for i in range(volumes['documents']):
+        path, size = file_path('files', 'pdf')
+        category = rng.choice(DOCUMENT_CATEGORIES)
+        rows[Document].append(dict(
+            owner, title=' '.join(rng.sample(WORDS, 3)).title(), description=' '.join(rng.choices(WORDS, k=25)),
+            file_path=path, file_type='application/pdf', file_size=size, category=category,
+            expiration_date=random_date(today, today + timedelta(days=730))
+            if category in ('property_insurance', 'appliance_warranty', 'contract') else None,
+        ))
+    for i in range(volumes['photos']):
+        path, size = file_path('photos', 'jpg')
+        rows[Document].append(dict(owner, title=f'Photo {i + 1}', description='', file_path=path,
+                                   file_type='image/jpeg', file_size=size, category='property_photo',
+                                   expiration_date=None))
+
+    rows[Project] = []
+    for i in range(volumes['projects']):
+        started = random_date()
+        budget = rng.randint(1_000, 60_000) * 100
+        status = rng.choice(['planning', 'in-progress', 'on-hold', 'completed'])
+        rows[Project].append(dict(
+            owner, name=f'{rng.choice(WORDS).title()} {rng.choice(["remodel", "upgrade", "repair"])}', status=status,
+            budget=budget, spent=int(budget * rng.uniform(0, 1.2)), start_date=started,
+            projected_end_date=started + timedelta(days=rng.randint(14, 180)),
+            completed_date=started + timedelta(days=rng.randint(14, 200)) if status == 'completed' else None,
+        ))
+
+    rows[Maintenance] = []
+    for i in range(volumes['maintenance']):
+        status = rng.choices(['pending', 'in-progress', 'completed', 'cancelled'], weights=[3, 1, 5, 1])[0]
+        due = random_date(start, today + timedelta(days=90))
+        rows[Maintenance].append(dict(
+            owner, title=f'{rng.choice(WORDS).title()} {rng.choice(["service", "inspection", "repair", "cleaning"])}',
+            description=' '.join(rng.choices(WORDS, k=12)), priority=rng.choice(['low', 'medium', 'high']),
+            status=status, due_date=due,
+            completed_at=datetime.combine(due, datetime.min.time()) if status == 'completed' else None,
+        ))
+
+    rows[MaintenanceChecklistItem] = [
+        dict(owner, task=f'{rng.choice(WORDS).title()} check', description=' '.join(rng.choices(WORDS, k=8)),
+             season=SEASONS[i % 4], is_completed=rng.random() < 0.4, is_default=i < 40)
+        for i in range(volumes['checklist'])
+    ]
+    return rows
+
+
+def content_rows(property_ids, now):
+    """
+    document_contents rows for the properties' documents: readable types as
+    extracted with no text, the rest unsupported, as an upload would end up
+    """
+    documents = db.session.execute(
+        select(Document.id, Document.file_path, Document.file_size).where(Document.property_id.in_(property_ids))
+    )
+    rows = []
+    for document_id, path, size in documents:
+        if file_extension(path) in EXTRACTABLE_EXTENSIONS:
+            rows.append(dict(document_id=document_id, status=DocumentContent.STATUS_EXTRACTED,
+                             file_size=size, extracted_at=now))
+        else:
+            rows.append(dict(document_id=document_id, status=DocumentContent.STATUS_UNSUPPORTED,
+                             file_size=None, extracted_at=None))
+    return rows
+
+
+def create_owners(prefix, first, count, password_hash, rng):
+    """Insert ``count`` users with settings and a property; returns (user_id, property_id) pairs"""
+    emails = [f'{prefix}-{n}@example.com' for n in range(first, first + count)]
+    bulk_insert(User, [
+        dict(email=email, password_hash=password_hash, first_name=rng.choice(FIRST_NAMES),
+             last_name=rng.choice(LAST_NAMES), email_verified=True)
+        for email in emails
+    ])
+    user_ids = db.session.scalars(select(User.id).where(User.email.in_(emails)).order_by(User.id)).all()
+
+    bulk_insert(Settings, [
+        dict(user_id=user_id, notifications=dict(Settings.DEFAULT_NOTIFICATIONS),
+             appearance=dict(Settings.DEFAULT_APPEARANCE))
+        for user_id in user_ids
+    ])
+    properties = []
+    for user_id in user_ids:
+        template = DEMO_ACCOUNTS[user_id % len(DEMO_ACCOUNTS)]['property']
+        properties.append(dict(
+            user_id=user_id, address=f"{rng.randint(1, 9999)} {template['address'].split(' ', 1)[1]}",
+            city=template['city'], state=template['state'], zip=template['zip'],
+            property_type=template['property_type'], bedrooms=template.get('bedrooms'),
+            bathrooms=template.get('bathrooms'), square_footage=template.get('square_footage'),
+            purchase_price=to_cents(template.get('purchase_price')), is_primary_residence=True,
+        ))
+    bulk_insert(Property, properties)
+    return db.session.execute(
+        select(Property.user_id, Property.id).where(Property.user_id.in_(user_ids)).order_by(Property.user_id)
+    ).all()
+
+
+def fill_owners(owners, volumes, seed, today, upload_root=None, file_size=0):
+    """Insert every property's rows for (user_id, property_id) pairs; returns row counts per table"""
+    batch = {}
+    for user_id, property_id in owners:
+        rng = random.Random(f'{seed}-{property_id}')
+        rows = property_rows(rng, {'user_id': user_id, 'property_id': property_id}, volumes, today,
+                             upload_root=upload_root, file_size=file_size)
+        for model, model_rows in rows.items():
+            batch.setdefault(model, []).extend(model_rows)
+
+    counts = Counter()
+    for model, rows in batch.items():
+        bulk_insert(model, rows)
+        counts[model.__tablename__] += len(rows)
+
+    if batch.get(Document):
+        contents = content_rows([property_id for _, property_id in owners], datetime.utcnow())
+        bulk_insert(DocumentContent, contents)
+        counts[DocumentContent.__tablename__] += len(contents)
+    return counts
+
+
+def generate_users(prefix, first, count, volumes, seed, batch_size, file_size):
+    """Create users ``first`` .. ``first + count - 1``; needs an app context"""
+    counts = Counter()
+    upload_root = os.path.join(current_app.root_path, 'uploads', 'documents') if file_size else None
+    password_hash = generate_password_hash(PASSWORD)
+    today = date.today()
+    for start in range(first, first + count, batch_size):
+        size = min(batch_size, first + count - start)
+        rng = random.Random(f'{seed}-users-{start}')
+        owners = create_owners(prefix, start, size, password_hash, rng)
+        counts['users'] += len(owners)
+        counts['user_settings'] += len(owners)
+        counts['properties'] += len(owners)
+        counts.update(fill_owners(owners, volumes, seed, today, upload_root, file_size))
+        db.session.commit()
+    return counts
+
+
+def generate_range(database_uri, *args):
+    """generate_users in a spawned worker process, which builds its own app"""
+    os.environ['SQLALCHEMY_DATABASE_URI'] = database_uri
+    from app import create_app
+    with create_app().app_context():
+        return generate_users(*args)
+
+
+def generate(database_uri, users, volumes=None, workers=None, batch_size=20, seed=42, file_size=0, prefix=None):
+    """
+    Create ``users`` users with a property each, filled per ``volumes``
+    (see DEFAULT_VOLUMES), in the current app's database. Returns row counts
+    per table.
+
+    SQLite allows one writer at a time, so there it always uses one process.
+    """
+    volumes = dict(DEFAULT_VOLUMES, **(volumes or {}))
+    prefix = prefix or f'generated-{datetime.utcnow():%Y%m%d%H%M%S}'
+    workers = workers or os.cpu_count() or 1
+    if database_uri.startswith('sqlite'):
+        workers = 1
+    workers = max(1, min(workers, users))
+
+    # Contiguous user ranges, one per worker
+    shares = [users // workers + (1 if i < users % workers else 0) for i in range(workers)]
+    ranges, first = [], 0
+    for share in shares:
+        ranges.append((first, share))
+        first += share
+
+    if workers == 1:
+        return generate_users(prefix, 0, users, volumes, seed, batch_size, file_size)
+
+    args = [(database_uri, prefix, first, count, volumes, seed, batch_size, file_size) for first, count in ranges]
+
+    counts = Counter()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        for result in pool.map(generate_range, *zip(*args)):
+            counts.update(result)
+    return counts
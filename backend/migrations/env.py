@@ -26,6 +26,33 @@ config.set_main_option(
         '%', '%%'))
 target_metadata = current_app.extensions['migrate'].db.metadata
 
+# Full-text search objects are created with raw DDL (see app/models/document.py,
+# document_content.py and search_entry.py) rather than declared on the models;
+# keep autogenerate from dropping them
+UNMANAGED_TABLE_PREFIXES = ('documents_fts', 'search_entries_fts')
+UNMANAGED_COLUMNS = {
+    ('documents', 'search_vector'),
+    ('document_contents', 'search_vector'),
+    ('search_entries', 'search_vector'),
+}
+UNMANAGED_INDEXES = {
+    'ix_documents_search_vector',
+    'ix_document_contents_search_vector',
+    'ix_search_entries_search_vector',
+}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if not reflected or compare_to is not None:
+        return True
+    if type_ == 'table':
+        return not name.startswith(UNMANAGED_TABLE_PREFIXES)
+    if type_ == 'column':
+        return (object.table.name, name) not in UNMANAGED_COLUMNS
+    if type_ == 'index':
+        return name not in UNMANAGED_INDEXES
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -46,7 +73,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=target_metadata, literal_binds=True
+        url=url, target_metadata=target_metadata, literal_binds=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -78,6 +106,11 @@ def run_migrations_online():
             connection=connection,
             target_metadata=target_metadata,
             process_revision_directives=process_revision_directives,
+            include_object=include_object,
+            # Commit each revision on its own, so a revision that steps out
+            # of its transaction (app/utils/migration_helpers.py) only
+            # commits its own work
+            transaction_per_migration=True,
             **current_app.extensions['migrate'].configure_args
         )
 
@@ -0,0 +1,93 @@
+"""Store money columns as integer cents
+
+Revision ID: 8963604aa3db
+Revises: aedf82680fbc
+Create Date: 2026-10-19 09:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8963604aa3db'
+down_revision = 'aedf82680fbc'
+branch_labels = None
+depends_on = None
+
+# Columns that used to hold float dollars and now hold integer cents
+FLOAT_DOLLAR_COLUMNS = {
+    'projects': ('budget', 'spent'),
+    'properties': ('purchase_price', 'current_value'),
+}
+
+# Columns that already held cents as INTEGER and are widened to BIGINT
+INTEGER_CENT_COLUMNS = {
+    'expenses': ('amount',),
+    'budgets': ('amount',),
+}
+
+
+def _float_columns(table):
+    """Return the money columns of a table that are still stored as floats"""
+    inspector = sa.inspect(op.get_bind())
+    if table not in inspector.get_table_names():
+        return []
+    types = {column['name']: column['type'] for column in inspector.get_columns(table)}
+    return [
+        name for name in FLOAT_DOLLAR_COLUMNS[table]
+        if name in types and isinstance(types[name], sa.Float)
+    ]
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    for table in FLOAT_DOLLAR_COLUMNS:
+        # Databases created from the current models already use cents
+        columns = _float_columns(table)
+        if not columns:
+            continue
+
+        if dialect == 'postgresql':
+            for column in columns:
+                op.execute(
+                    f'ALTER TABLE {table} ALTER COLUMN {column} TYPE BIGINT '
+                    f'USING ROUND({column} * 100)::BIGINT'
+                )
+        else:
+            for column in columns:
+                op.execute(f'UPDATE {table} SET {column} = ROUND({column} * 100)')
+            with op.batch_alter_table(table) as batch_op:
+                for column in columns:
+                    batch_op.alter_column(column, type_=sa.BigInteger(), existing_nullable=True)
+
+    if dialect == 'postgresql':
+        for table, columns in INTEGER_CENT_COLUMNS.items():
+            for column in columns:
+                op.alter_column(table, column, type_=sa.BigInteger(), existing_type=sa.Integer(),
+                                existing_nullable=False)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        for table, columns in INTEGER_CENT_COLUMNS.items():
+            for column in columns:
+                op.alter_column(table, column, type_=sa.Integer(), existing_type=sa.BigInteger(),
+                                existing_nullable=False)
+
+    for table, columns in FLOAT_DOLLAR_COLUMNS.items():
+        if dialect == 'postgresql':
+            for column in columns:
+                op.execute(
+                    f'ALTER TABLE {table} ALTER COLUMN {column} TYPE DOUBLE PRECISION '
+                    f'USING {column} / 100.0'
+                )
+        else:
+            with op.batch_alter_table(table) as batch_op:
+                for column in columns:
+                    batch_op.alter_column(column, type_=sa.Float(), existing_nullable=True)
+            for column in columns:
+                op.execute(f'UPDATE {table} SET {column} = {column} / 100.0')
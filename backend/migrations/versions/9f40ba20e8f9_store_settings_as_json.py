@@ -0,0 +1,79 @@
+"""Store user settings as JSON and seed missing settings
+
+Revision ID: 9f40ba20e8f9
+Revises: d589fbc52b54
+Create Date: 2026-10-21 10:04:52.630917
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '9f40ba20e8f9'
+down_revision = 'd589fbc52b54'
+branch_labels = None
+depends_on = None
+
+JSON_COLUMNS = ('notifications', 'appearance')
+
+# As of this revision; users created from now on get them when they register
+DEFAULT_NOTIFICATIONS = {
+    "email_notifications": True,
+    "maintenance_reminders": True,
+    "payment_reminders": True,
+    "project_updates": True,
+    "document_updates": False
+}
+DEFAULT_APPEARANCE = {
+    "theme": "dark",
+    "dashboard_layout": "default"
+}
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql':
+        columns = {c['name']: c['type'] for c in sa.inspect(bind).get_columns('user_settings')}
+        for column in JSON_COLUMNS:
+            if not isinstance(columns[column], postgresql.JSONB):
+                op.execute(
+                    f"ALTER TABLE user_settings ALTER COLUMN {column} TYPE JSONB "
+                    f"USING COALESCE(NULLIF({column}, ''), '{{}}')::jsonb"
+                )
+    # SQLite stores JSON as text already, so its rows need no conversion
+
+    json_type = sa.JSON().with_variant(postgresql.JSONB(), 'postgresql')
+    user_settings = sa.table(
+        'user_settings',
+        sa.column('user_id', sa.Integer),
+        sa.column('notifications', json_type),
+        sa.column('appearance', json_type),
+        sa.column('created_at', sa.DateTime),
+        sa.column('updated_at', sa.DateTime),
+    )
+    users = sa.table('users', sa.column('id', sa.Integer))
+    user_ids = bind.execute(
+        sa.select(users.c.id).where(~sa.exists().where(user_settings.c.user_id == users.c.id))
+    ).scalars().all()
+    if user_ids:
+        now = datetime.utcnow()
+        op.bulk_insert(user_settings, [
+            {
+                'user_id': user_id,
+                'notifications': DEFAULT_NOTIFICATIONS,
+                'appearance': DEFAULT_APPEARANCE,
+                'created_at': now,
+                'updated_at': now,
+            }
+            for user_id in user_ids
+        ])
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        for column in JSON_COLUMNS:
+            op.execute(f"ALTER TABLE user_settings ALTER COLUMN {column} TYPE TEXT USING {column}::text")
@@ -0,0 +1,68 @@
+"""Add change outbox and webhook endpoints
+
+Revision ID: b5ca7de8085d
+Revises: 9f40ba20e8f9
+Create Date: 2026-10-22 11:26:18.904571
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5ca7de8085d'
+down_revision = '9f40ba20e8f9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    # Either table may already exist, created from the current models
+    if not inspector.has_table('outbox_events'):
+        op.create_table(
+            'outbox_events',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('topic', sa.String(length=50), nullable=False),
+            sa.Column('entity_type', sa.String(length=20), nullable=False),
+            sa.Column('entity_id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('property_id', sa.Integer(), nullable=True),
+            sa.Column('payload', sa.Text(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_outbox_events_user_id_id', 'outbox_events', ['user_id', 'id'])
+        op.create_index('ix_outbox_events_property_id_id', 'outbox_events', ['property_id', 'id'])
+        op.create_index('ix_outbox_events_created_at', 'outbox_events', ['created_at'])
+
+    if not inspector.has_table('webhook_endpoints'):
+        op.create_table(
+            'webhook_endpoints',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('url', sa.String(length=500), nullable=False),
+            sa.Column('secret', sa.String(length=100), nullable=False),
+            sa.Column('topics', sa.String(length=500), nullable=False),
+            sa.Column('is_active', sa.Boolean(), nullable=True),
+            sa.Column('last_event_id', sa.Integer(), nullable=False),
+            sa.Column('failures', sa.Integer(), nullable=False),
+            sa.Column('next_attempt_at', sa.DateTime(), nullable=True),
+            sa.Column('last_error', sa.String(length=500), nullable=True),
+            sa.Column('last_delivered_at', sa.DateTime(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_webhook_endpoints_user_id', 'webhook_endpoints', ['user_id'])
+
+
+def downgrade():
+    op.drop_index('ix_webhook_endpoints_user_id', table_name='webhook_endpoints')
+    op.drop_table('webhook_endpoints')
+    op.drop_index('ix_outbox_events_created_at', table_name='outbox_events')
+    op.drop_index('ix_outbox_events_property_id_id', table_name='outbox_events')
+    op.drop_index('ix_outbox_events_user_id_id', table_name='outbox_events')
+    op.drop_table('outbox_events')
@@ -0,0 +1,65 @@
+"""Add delta sync tombstones and updated_at indexes
+
+Revision ID: bcbd277c3dff
+Revises: b5ca7de8085d
+Create Date: 2026-10-22 15:02:41.337190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.utils.migration_helpers import backfill, create_index, drop_index
+
+
+# revision identifiers, used by Alembic.
+revision = 'bcbd277c3dff'
+down_revision = 'b5ca7de8085d'
+branch_labels = None
+depends_on = None
+
+# table -> index columns; each gets (<column>, updated_at, id)
+SYNCED_TABLES = {
+    'properties': ['user_id'],
+    'maintenance_requests': ['user_id', 'property_id'],
+    'maintenance_checklist_items': ['user_id', 'property_id'],
+    'appliances': ['user_id', 'property_id'],
+    'projects': ['user_id', 'property_id'],
+}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    # The table may already exist, created from the current models
+    if not inspector.has_table('tombstones'):
+        op.create_table(
+            'tombstones',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('entity_type', sa.String(length=20), nullable=False),
+            sa.Column('entity_id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('property_id', sa.Integer(), nullable=True),
+            sa.Column('deleted_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_tombstones_entity_type_user_id_id', 'tombstones', ['entity_type', 'user_id', 'id'])
+        op.create_index('ix_tombstones_entity_type_property_id_id', 'tombstones',
+                        ['entity_type', 'property_id', 'id'])
+        op.create_index('ix_tombstones_deleted_at', 'tombstones', ['deleted_at'])
+
+    # These tables can be large: backfill in batches and build the indexes
+    # without blocking writes
+    for table, columns in SYNCED_TABLES.items():
+        # Rows without updated_at would never show up in a delta
+        backfill(table, 'updated_at = COALESCE(created_at, CURRENT_TIMESTAMP)', 'updated_at IS NULL')
+        for column in columns:
+            create_index(f'ix_{table}_{column}_updated_at', table, [column, 'updated_at', 'id'])
+
+
+def downgrade():
+    for table, columns in SYNCED_TABLES.items():
+        for column in columns:
+            drop_index(f'ix_{table}_{column}_updated_at', table)
+    op.drop_index('ix_tombstones_deleted_at', table_name='tombstones')
+    op.drop_index('ix_tombstones_entity_type_property_id_id', table_name='tombstones')
+    op.drop_index('ix_tombstones_entity_type_user_id_id', table_name='tombstones')
+    op.drop_table('tombstones')
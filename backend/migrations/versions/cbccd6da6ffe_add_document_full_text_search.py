@@ -0,0 +1,77 @@
+"""Add document full-text search index
+
+Revision ID: cbccd6da6ffe
+Revises: 8963604aa3db
+Create Date: 2026-10-19 11:02:17.504918
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.utils.migration_helpers import create_index
+
+
+# revision identifiers, used by Alembic.
+revision = 'cbccd6da6ffe'
+down_revision = '8963604aa3db'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if 'documents' not in inspector.get_table_names():
+        return
+
+    if bind.dialect.name == 'postgresql':
+        columns = {column['name'] for column in inspector.get_columns('documents')}
+        if 'search_vector' not in columns:
+            op.execute("""
+                ALTER TABLE documents ADD COLUMN search_vector tsvector
+                GENERATED ALWAYS AS (
+                    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                    setweight(to_tsvector('english', coalesce(description, '')), 'B')
+                ) STORED
+            """)
+        create_index('ix_documents_search_vector', 'documents', ['search_vector'], postgresql_using='gin')
+
+    elif bind.dialect.name == 'sqlite':
+        # Databases created from the current models already have the index
+        if inspector.has_table('documents_fts'):
+            return
+        op.execute("CREATE VIRTUAL TABLE documents_fts USING fts5(title, description, tokenize='porter unicode61')")
+        op.execute("""
+            CREATE TRIGGER documents_fts_insert AFTER INSERT ON documents BEGIN
+                INSERT INTO documents_fts (rowid, title, description)
+                VALUES (new.id, new.title, coalesce(new.description, ''));
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER documents_fts_update AFTER UPDATE OF title, description ON documents BEGIN
+                UPDATE documents_fts SET title = new.title, description = coalesce(new.description, '')
+                WHERE rowid = new.id;
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER documents_fts_delete AFTER DELETE ON documents BEGIN
+                DELETE FROM documents_fts WHERE rowid = old.id;
+            END
+        """)
+        op.execute("""
+            INSERT INTO documents_fts (rowid, title, description)
+            SELECT id, title, coalesce(description, '') FROM documents
+        """)
+
+
+def downgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_documents_search_vector")
+        op.execute("ALTER TABLE documents DROP COLUMN IF EXISTS search_vector")
+
+    elif bind.dialect.name == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS documents_fts_insert")
+        op.execute("DROP TRIGGER IF EXISTS documents_fts_update")
+        op.execute("DROP TRIGGER IF EXISTS documents_fts_delete")
+        op.execute("DROP TABLE IF EXISTS documents_fts")
@@ -0,0 +1,97 @@
+"""Add unified search_entries index
+
+Revision ID: ce3654c33abf
+Revises: e5f22d6a5e3c
+Create Date: 2026-10-19 16:20:05.117392
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ce3654c33abf'
+down_revision = 'e5f22d6a5e3c'
+branch_labels = None
+depends_on = None
+
+# (entity_type, table, title column, body columns); mirrors INDEXED_MODELS in
+# app/services/search_index.py at the time of this revision
+INDEXED_TABLES = [
+    ('document', 'documents', 'title', ('description', 'category')),
+    ('appliance', 'appliances', 'name', ('brand', 'model', 'serial_number', 'category')),
+    ('project', 'projects', 'name', ('description',)),
+    ('maintenance', 'maintenance', 'title', ('description',)),
+]
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if inspector.has_table('search_entries'):
+        # Created from the current models, index objects included
+        return
+
+    op.create_table(
+        'search_entries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('entity_type', sa.String(length=20), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('property_id', sa.Integer(), nullable=True),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('body', sa.Text(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('entity_type', 'entity_id', name='uq_search_entries_entity')
+    )
+    op.create_index('ix_search_entries_user_id', 'search_entries', ['user_id'])
+    op.create_index('ix_search_entries_property_id', 'search_entries', ['property_id'])
+
+    if bind.dialect.name == 'postgresql':
+        op.execute("""
+            ALTER TABLE search_entries ADD COLUMN search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(body, '')), 'B')
+            ) STORED
+        """)
+        op.execute("CREATE INDEX ix_search_entries_search_vector ON search_entries USING GIN (search_vector)")
+
+    elif bind.dialect.name == 'sqlite':
+        op.execute("CREATE VIRTUAL TABLE search_entries_fts USING fts5(title, body, tokenize='porter unicode61')")
+        op.execute("""
+            CREATE TRIGGER search_entries_fts_insert AFTER INSERT ON search_entries BEGIN
+                INSERT INTO search_entries_fts (rowid, title, body) VALUES (new.id, new.title, coalesce(new.body, ''));
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER search_entries_fts_update AFTER UPDATE OF title, body ON search_entries BEGIN
+                UPDATE search_entries_fts SET title = new.title, body = coalesce(new.body, '') WHERE rowid = new.id;
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER search_entries_fts_delete AFTER DELETE ON search_entries BEGIN
+                DELETE FROM search_entries_fts WHERE rowid = old.id;
+            END
+        """)
+
+    # Backfill from existing records
+    existing_tables = set(inspector.get_table_names())
+    for entity_type, table, title, body_columns in INDEXED_TABLES:
+        if table not in existing_tables:
+            continue
+        body = " || ' ' || ".join(f"coalesce(CAST({column} AS TEXT), '')" for column in body_columns)
+        op.execute(f"""
+            INSERT INTO search_entries (entity_type, entity_id, user_id, property_id, title, body, updated_at)
+            SELECT '{entity_type}', id, user_id, property_id, coalesce({title}, ''), trim({body}), CURRENT_TIMESTAMP
+            FROM {table}
+        """)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS search_entries_fts")
+    op.drop_index('ix_search_entries_property_id', table_name='search_entries')
+    op.drop_index('ix_search_entries_user_id', table_name='search_entries')
+    op.drop_table('search_entries')
@@ -0,0 +1,67 @@
+"""Add notification event buffer and delivery queue
+
+Revision ID: d589fbc52b54
+Revises: dc66679a3050
+Create Date: 2026-10-20 14:37:05.118642
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd589fbc52b54'
+down_revision = 'dc66679a3050'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    # Either table may already exist, created from the current models
+    if not inspector.has_table('notification_events'):
+        op.create_table(
+            'notification_events',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('category', sa.String(length=50), nullable=False),
+            sa.Column('entity_type', sa.String(length=20), nullable=False),
+            sa.Column('entity_id', sa.Integer(), nullable=False),
+            sa.Column('property_id', sa.Integer(), nullable=True),
+            sa.Column('action', sa.String(length=20), nullable=False),
+            sa.Column('title', sa.String(length=255), nullable=False),
+            sa.Column('occurrences', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_notification_events_user_id_entity', 'notification_events',
+                        ['user_id', 'entity_type', 'entity_id'])
+
+    if not inspector.has_table('notification_deliveries'):
+        op.create_table(
+            'notification_deliveries',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('channel', sa.String(length=20), nullable=False),
+            sa.Column('status', sa.String(length=20), nullable=False),
+            sa.Column('payload', sa.Text(), nullable=False),
+            sa.Column('attempts', sa.Integer(), nullable=False),
+            sa.Column('error', sa.String(length=500), nullable=True),
+            sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+            sa.Column('sent_at', sa.DateTime(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_notification_deliveries_user_id', 'notification_deliveries', ['user_id'])
+        op.create_index('ix_notification_deliveries_status_next_attempt_at', 'notification_deliveries',
+                        ['status', 'next_attempt_at'])
+
+
+def downgrade():
+    op.drop_index('ix_notification_deliveries_status_next_attempt_at', table_name='notification_deliveries')
+    op.drop_index('ix_notification_deliveries_user_id', table_name='notification_deliveries')
+    op.drop_table('notification_deliveries')
+    op.drop_index('ix_notification_events_user_id_entity', table_name='notification_events')
+    op.drop_table('notification_events')
@@ -0,0 +1,62 @@
+"""Add expiry alerts and index expiration dates
+
+Revision ID: dc66679a3050
+Revises: ce3654c33abf
+Create Date: 2026-10-20 09:12:41.503218
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.utils.migration_helpers import create_index
+
+
+# revision identifiers, used by Alembic.
+revision = 'dc66679a3050'
+down_revision = 'ce3654c33abf'
+branch_labels = None
+depends_on = None
+
+# (table, column, index) scanned by app/services/notification_service.py
+EXPIRATION_INDEXES = [
+    ('documents', 'expiration_date', 'ix_documents_expiration_date'),
+    ('appliances', 'warranty_expiration', 'ix_appliances_warranty_expiration'),
+]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    for table, column, index in EXPIRATION_INDEXES:
+        create_index(index, table, [column])
+
+    if inspector.has_table('alerts'):
+        # Created from the current models
+        return
+
+    op.create_table(
+        'alerts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=30), nullable=False),
+        sa.Column('entity_type', sa.String(length=20), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('property_id', sa.Integer(), nullable=True),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('due_date', sa.Date(), nullable=False),
+        sa.Column('notified_at', sa.DateTime(), nullable=True),
+        sa.Column('scanned_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('kind', 'entity_id', name='uq_alerts_kind_entity')
+    )
+    op.create_index('ix_alerts_user_id_due_date', 'alerts', ['user_id', 'due_date'])
+    op.create_index('ix_alerts_property_id_due_date', 'alerts', ['property_id', 'due_date'])
+    # Alerts are filled by `flask scan-alerts`, which the entrypoint runs on start
+
+
+def downgrade():
+    op.drop_index('ix_alerts_property_id_due_date', table_name='alerts')
+    op.drop_index('ix_alerts_user_id_due_date', table_name='alerts')
+    op.drop_table('alerts')
+    for table, _, index in EXPIRATION_INDEXES:
+        op.drop_index(index, table_name=table)
@@ -0,0 +1,137 @@
+"""Add document_contents and index extracted text
+
+Revision ID: e5f22d6a5e3c
+Revises: cbccd6da6ffe
+Create Date: 2026-10-19 14:37:52.661043
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5f22d6a5e3c'
+down_revision = 'cbccd6da6ffe'
+branch_labels = None
+depends_on = None
+
+SQLITE_FTS_TRIGGERS = {
+    'documents_fts_insert': """
+        CREATE TRIGGER documents_fts_insert AFTER INSERT ON documents BEGIN
+            INSERT INTO documents_fts (rowid, title, description, body)
+            VALUES (new.id, new.title, coalesce(new.description, ''), '');
+        END
+    """,
+    'documents_fts_update': """
+        CREATE TRIGGER documents_fts_update AFTER UPDATE OF title, description ON documents BEGIN
+            UPDATE documents_fts SET title = new.title, description = coalesce(new.description, '')
+            WHERE rowid = new.id;
+        END
+    """,
+    'documents_fts_delete': """
+        CREATE TRIGGER documents_fts_delete AFTER DELETE ON documents BEGIN
+            DELETE FROM documents_fts WHERE rowid = old.id;
+        END
+    """,
+    'document_contents_fts_insert': """
+        CREATE TRIGGER document_contents_fts_insert AFTER INSERT ON document_contents BEGIN
+            UPDATE documents_fts SET body = coalesce(new.body, '') WHERE rowid = new.document_id;
+        END
+    """,
+    'document_contents_fts_update': """
+        CREATE TRIGGER document_contents_fts_update AFTER UPDATE OF body ON document_contents BEGIN
+            UPDATE documents_fts SET body = coalesce(new.body, '') WHERE rowid = new.document_id;
+        END
+    """,
+    'document_contents_fts_delete': """
+        CREATE TRIGGER document_contents_fts_delete AFTER DELETE ON document_contents BEGIN
+            UPDATE documents_fts SET body = '' WHERE rowid = old.document_id;
+        END
+    """,
+}
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if 'documents' not in inspector.get_table_names():
+        return
+
+    if not inspector.has_table('document_contents'):
+        op.create_table(
+            'document_contents',
+            sa.Column('document_id', sa.Integer(), nullable=False),
+            sa.Column('status', sa.String(length=20), nullable=False),
+            sa.Column('body', sa.Text(), nullable=True),
+            sa.Column('file_size', sa.Integer(), nullable=True),
+            sa.Column('attempts', sa.Integer(), nullable=False),
+            sa.Column('error', sa.String(length=500), nullable=True),
+            sa.Column('extracted_at', sa.DateTime(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('document_id')
+        )
+        op.create_index('ix_document_contents_status', 'document_contents', ['status'])
+
+    if bind.dialect.name == 'postgresql':
+        columns = {column['name'] for column in sa.inspect(bind).get_columns('document_contents')}
+        if 'search_vector' not in columns:
+            op.execute("""
+                ALTER TABLE document_contents ADD COLUMN search_vector tsvector
+                GENERATED ALWAYS AS (setweight(to_tsvector('english', coalesce(body, '')), 'C')) STORED
+            """)
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_document_contents_search_vector "
+            "ON document_contents USING GIN (search_vector)"
+        )
+
+    elif bind.dialect.name == 'sqlite':
+        fts_columns = set()
+        if inspector.has_table('documents_fts'):
+            fts_columns = {column['name'] for column in inspector.get_columns('documents_fts')}
+        # Databases created from the current models already index the body
+        if 'body' in fts_columns:
+            return
+
+        # FTS5 tables can't gain columns, so rebuild it with a body column
+        for name in SQLITE_FTS_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+        op.execute("DROP TABLE IF EXISTS documents_fts")
+        op.execute(
+            "CREATE VIRTUAL TABLE documents_fts USING fts5(title, description, body, tokenize='porter unicode61')"
+        )
+        for statement in SQLITE_FTS_TRIGGERS.values():
+            op.execute(statement)
+        op.execute("""
+            INSERT INTO documents_fts (rowid, title, description, body)
+            SELECT documents.id, documents.title, coalesce(documents.description, ''),
+                   coalesce(document_contents.body, '')
+            FROM documents
+            LEFT OUTER JOIN document_contents ON document_contents.document_id = documents.id
+        """)
+
+
+def downgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'sqlite':
+        for name in SQLITE_FTS_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+        op.execute("DROP TABLE IF EXISTS documents_fts")
+        op.execute("CREATE VIRTUAL TABLE documents_fts USING fts5(title, description, tokenize='porter unicode61')")
+        op.execute("""
+            CREATE TRIGGER documents_fts_insert AFTER INSERT ON documents BEGIN
+                INSERT INTO documents_fts (rowid, title, description)
+                VALUES (new.id, new.title, coalesce(new.description, ''));
+            END
+        """)
+        op.execute(SQLITE_FTS_TRIGGERS['documents_fts_update'])
+        op.execute(SQLITE_FTS_TRIGGERS['documents_fts_delete'])
+        op.execute("""
+            INSERT INTO documents_fts (rowid, title, description)
+            SELECT id, title, coalesce(description, '') FROM documents
+        """)
+
+    op.drop_index('ix_document_contents_status', table_name='document_contents')
+    op.drop_table('document_contents')
@@ -1,6 +1,5 @@
 import os
 from dotenv import load_dotenv
-from flask_migrate import Migrate
 load_dotenv()  # Load environment variables from .env file if it exists
 
 # Import configs
@@ -30,11 +29,9 @@ elif flask_env == 'production':
 else:
     config_class = DevelopmentConfig
 
-print(f"Starting with config: {config_class.__name__}")
-
 # Create app with the appropriate config
 app = create_app(config_class)
-migrate = Migrate(app, db)
+app.logger.info("Starting with config: %s", config_class.__name__)
 
 if __name__ == '__main__':
     with app.app_context():
@@ -10,6 +10,8 @@ from datetime import datetime, timedelta
 from app import create_app, db
 from app.models.user import User
 from app.models.property import Property
+from app.models.settings import Settings
+from app.utils.money import to_cents
 from config import DemoConfig
 
 # Demo accounts configuration
@@ -95,6 +97,7 @@ def seed_demo_accounts(silent=False):
             email_verified=True
         )
         user.password = user_data['password']
+        user.settings = Settings.defaults()
         db.session.add(user)
         db.session.flush()
 
@@ -112,7 +115,7 @@ def seed_demo_accounts(silent=False):
             bedrooms=p.get('bedrooms'),
             bathrooms=p.get('bathrooms'),
             square_footage=p.get('square_footage'),
-            purchase_price=p.get('purchase_price'),
+            purchase_price=to_cents(p.get('purchase_price')),
             purchase_date=datetime.strptime(p['purchase_date'], '%Y-%m-%d').date() if p.get('purchase_date') else None
         )
         db.session.add(property)
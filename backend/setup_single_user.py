@@ -53,21 +53,11 @@ def create_admin_user(email, password, first_name=None, last_name=None):
             email_verified=True  # Auto-verify in single-user mode
         )
         user.password = password  # This uses the password setter to hash it
+        user.settings = Settings.defaults()
 
         db.session.add(user)
         db.session.commit()
 
-        # Create default settings for the user
-        settings = Settings(
-            user_id=user.id,
-            currency='USD',
-            date_format='MM/DD/YYYY',
-            notifications_enabled=True,
-            email_notifications=True
-        )
-        db.session.add(settings)
-        db.session.commit()
-
         print(f"\n✅ Admin user created successfully!")
         print(f"   Email: {email}")
         print(f"   Name: {user.first_name} {user.last_name}")
@@ -0,0 +1,66 @@
+import pytest
+from flask_jwt_extended import create_access_token
+
+from config import TestingConfig
+
+
+@pytest.fixture
+def config():
+    """Settings on top of TestingConfig; override in a test module to change them"""
+    return {}
+
+
+@pytest.fixture
+def app(config, tmp_path, monkeypatch):
+    """The app on a throwaway SQLite database, with uploads under tmp_path"""
+    monkeypatch.setenv('SQLALCHEMY_DATABASE_URI', 'sqlite:///' + str(tmp_path / 'test.db'))
+    monkeypatch.setenv('UPLOAD_FOLDER', str(tmp_path / 'uploads'))
+
+    from app import create_app, db
+    app = create_app(type('TestConfig', (TestingConfig,), config))
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def user(app):
+    from app import db
+    from app.models.user import User
+
+    user = User(email='owner@example.com', first_name='Owner')
+    user.password = 'password'
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def auth_headers(user):
+    return {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+
+
+@pytest.fixture
+def property_id(client, auth_headers):
+    response = client.post('/api/properties/', headers=auth_headers, json={
+        'address': '1 Main St', 'city': 'Springfield', 'state': 'IL', 'zip': '62701', 'property_type': 'house',
+    })
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+
+@pytest.fixture
+def api_key(client, auth_headers):
+    """A Home Assistant API key for ``user`` with read and write scopes"""
+    response = client.post('/api/integrations/api-keys', headers=auth_headers, json={
+        'name': 'Home Assistant', 'scopes': ['read:maintenance', 'write:maintenance'],
+    })
+    assert response.status_code == 201
+    return response.get_json()['api_key']
@@ -0,0 +1,86 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app import db, mail
+from app.models.alert import Alert
+from app.models.document import Document
+from app.models.settings import Settings
+from app.models.user import User
+from app.services import notification_service
+
+
+def add_user(email, email_notifications):
+    user = User(email=email, first_name=email.split('@')[0])
+    user.password = 'password'
+    db.session.add(user)
+    db.session.flush()
+    settings = Settings.defaults()
+    settings.user_id = user.id
+    settings.notifications = {**Settings.DEFAULT_NOTIFICATIONS, 'email_notifications': email_notifications}
+    db.session.add(settings)
+    db.session.add(Document(user_id=user.id, title='Lease', file_path='/tmp/lease.pdf', file_type='pdf', file_size=1024,
+                            category='Lease', expiration_date=date.today() + timedelta(days=5)))
+    db.session.commit()
+    return user.id
+
+
+@pytest.fixture
+def users(app):
+    return add_user('mailed@example.com', True), add_user('quiet@example.com', False)
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    """Counts SMTP connections, and sent messages by recipient"""
+    opened, sent = [], []
+
+    class Connection:
+        def __enter__(self):
+            opened.append(True)
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def send(self, message):
+            sent.extend(message.recipients)
+
+    monkeypatch.setattr(mail, 'connect', Connection)
+    return opened, sent
+
+
+def pending_users():
+    return {alert.user_id for alert in Alert.query.filter(Alert.notified_at.is_(None))}
+
+
+def test_digests_are_sent_over_one_connection_per_batch(users, connections):
+    opened, sent = connections
+    assert pending_users() == set(users)
+
+    assert notification_service.send_digests() == 1
+    assert sent == ['mailed@example.com']
+    assert len(opened) == 1
+    assert pending_users() == set()
+
+
+def test_no_connection_when_nobody_in_the_batch_gets_mail(users, connections):
+    opened, sent = connections
+
+    # Users are batched in id order: the mailed user, then the quiet one
+    assert notification_service.send_digests(batch_size=1) == 1
+    assert len(opened) == 1
+    assert pending_users() == set()
+
+
+def test_mail_server_outage(users, monkeypatch):
+    mailed, _ = users
+
+    def refuse():
+        raise ConnectionRefusedError('smtp is down')
+
+    monkeypatch.setattr(mail, 'connect', refuse)
+
+    assert notification_service.send_digests() == 0
+    # Users without email are still marked; the rest wait for the next run
+    assert pending_users() == {mailed}
@@ -0,0 +1,32 @@
+import os
+
+import pytest
+
+
+def test_create_app_leaves_the_upload_folder_alone(app):
+    assert not os.path.exists(app.config['UPLOAD_FOLDER'])
+
+
+def test_bootstrap(app):
+    from flask_migrate import Migrate
+    from app import db
+
+    Migrate(app, db)
+    result = app.test_cli_runner().invoke(args=['bootstrap'])
+
+    assert result.exit_code == 0, result.output
+    assert os.path.isdir(os.path.join(app.config['UPLOAD_FOLDER'], 'documents', 'photos'))
+    assert 'Pruned 0 tombstones.' in result.output
+
+
+def test_bootstrap_stops_when_the_schema_step_fails(app, monkeypatch):
+    from app.services import sync_service
+
+    monkeypatch.setattr(sync_service, 'prune_tombstones', lambda: pytest.fail('ran after a failed schema step'))
+    # Built outside the `flask` CLI, so Flask-Migrate isn't attached and the
+    # schema step can't run
+    result = app.test_cli_runner().invoke(args=['bootstrap'])
+
+    assert result.exit_code != 0
+    assert 'Schema setup failed' in result.output
+    assert not os.path.exists(app.config['UPLOAD_FOLDER'])
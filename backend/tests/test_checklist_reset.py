@@ -0,0 +1,26 @@
+import pytest
+
+from app.models.outbox import OutboxEvent
+
+
+@pytest.fixture
+def config():
+    # Return deletes to sync straight away
+    return {'SYNC_SETTLE_SECONDS': 0}
+
+
+def test_reset_records_deletes_for_sync_and_outbox(client, auth_headers, property_id):
+    url = f'/api/maintenance/checklist/Winter?property_id={property_id}'
+    old_ids = {item['id'] for item in client.get(url, headers=auth_headers).get_json()}
+    assert old_ids
+
+    cursor = client.get('/api/sync/checklist', headers=auth_headers).get_json()['cursor']
+
+    response = client.post(f'/api/maintenance/checklist/reset/Winter?property_id={property_id}', headers=auth_headers)
+    assert response.status_code == 200
+
+    changes = client.get(f'/api/sync/checklist?cursor={cursor}', headers=auth_headers).get_json()
+    assert old_ids <= set(changes['deleted'])
+
+    deleted_events = {event.entity_id for event in OutboxEvent.query.filter_by(topic='checklist.deleted')}
+    assert deleted_events == old_ids
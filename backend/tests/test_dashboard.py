@@ -0,0 +1,40 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app import db
+from app.models.maintenance import Maintenance
+from app.models.user import User
+
+
+@pytest.fixture
+def contractor(app):
+    user = User(email='contractor@example.com', first_name='Contractor')
+    user.password = 'password'
+    db.session.add(user)
+    db.session.commit()
+    return user.id
+
+
+def add_task(user_id, property_id, title):
+    db.session.add(Maintenance(user_id=user_id, property_id=property_id, title=title, status='pending',
+                               priority='medium', due_date=date.today() + timedelta(days=7)))
+    db.session.commit()
+
+
+def upcoming_titles(client, auth_headers, **params):
+    response = client.get('/api/dashboard/', headers=auth_headers, query_string=params)
+    assert response.status_code == 200
+    return sorted(task['title'] for task in response.get_json()['maintenance']['upcoming'])
+
+
+def test_dashboard_covers_records_others_added_to_owned_properties(client, auth_headers, user, property_id,
+                                                                   contractor):
+    add_task(user.id, property_id, 'Own task')
+    add_task(user.id, None, 'Unassigned task')
+    add_task(contractor, property_id, 'Contractor task')
+    add_task(contractor, None, "Contractor's own task")
+
+    # Same records as the list endpoints: the user's own plus anything on their properties
+    assert upcoming_titles(client, auth_headers) == ['Contractor task', 'Own task', 'Unassigned task']
+    assert upcoming_titles(client, auth_headers, property_id=property_id) == ['Contractor task', 'Own task']
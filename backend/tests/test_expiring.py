@@ -0,0 +1,56 @@
+import io
+from datetime import date, timedelta
+
+
+def add_document(client, auth_headers, title, expires_in):
+    response = client.post('/api/documents/', headers=auth_headers, content_type='multipart/form-data', data={
+        'title': title, 'category': 'Insurance',
+        'expiration_date': (date.today() + timedelta(days=expires_in)).isoformat(),
+        'file': (io.BytesIO(b'text'), f'{title}.txt'),
+    })
+    assert response.status_code == 201
+
+
+def expiring_titles(client, auth_headers, query=''):
+    response = client.get(f'/api/documents/expiring{query}', headers=auth_headers)
+    assert response.status_code == 200
+    return [doc['title'] for doc in response.get_json()]
+
+
+def test_documents_within_the_alert_window(client, auth_headers):
+    add_document(client, auth_headers, 'soon', 10)
+    add_document(client, auth_headers, 'later', 100)
+
+    assert expiring_titles(client, auth_headers) == ['soon']
+    assert expiring_titles(client, auth_headers, '?days=5') == []
+
+
+def test_documents_beyond_the_alert_window(app, client, auth_headers):
+    add_document(client, auth_headers, 'soon', 10)
+    add_document(client, auth_headers, 'later', 100)
+    add_document(client, auth_headers, 'much later', 400)
+
+    assert app.config['ALERT_DOCUMENT_DAYS'] < 180
+    assert expiring_titles(client, auth_headers, '?days=180') == ['soon', 'later']
+
+
+def test_invalid_days(client, auth_headers):
+    for days in ('soon', '-1'):
+        response = client.get(f'/api/documents/expiring?days={days}', headers=auth_headers)
+        assert response.status_code == 400
+
+
+def test_warranties_beyond_the_alert_window(app, client, auth_headers, property_id):
+    for name, expires_in in (('fridge', 30), ('oven', 200), ('boiler', 500)):
+        response = client.post('/api/appliances/', headers=auth_headers, json={
+            'property_id': property_id, 'name': name, 'category': 'Kitchen',
+            'warranty_expiration': (date.today() + timedelta(days=expires_in)).isoformat(),
+        })
+        assert response.status_code == 201
+
+    response = client.get(f'/api/appliances/expiring?property_id={property_id}', headers=auth_headers)
+    assert [a['name'] for a in response.get_json()] == ['fridge']
+
+    assert app.config['ALERT_WARRANTY_DAYS'] < 12 * 30
+    response = client.get(f'/api/appliances/expiring?property_id={property_id}&months=12', headers=auth_headers)
+    assert [a['name'] for a in response.get_json()] == ['fridge', 'oven']
@@ -0,0 +1,136 @@
+import io
+import os
+
+import pytest
+
+from app.models.document import Document
+from app.services.file_service import file_storage, is_s3, local_copy, parse_s3
+
+BUCKET = 'test-documents'
+KEY = 'documents/files/property_1/abc_notes.txt'
+
+
+def _upload(client, auth_headers, content, filename='notes.txt'):
+    response = client.post('/api/documents/', headers=auth_headers, content_type='multipart/form-data', data={
+        'title': 'Notes', 'category': 'Other', 'file': (io.BytesIO(content), filename),
+    })
+    assert response.status_code == 201
+    return Document.query.get(response.get_json()['id'])
+
+
+class TestLocalStorage:
+
+    def test_save_serve_and_delete(self, app, client):
+        location, size = file_storage.save(io.BytesIO(b'gutters'), KEY, 'text/plain')
+
+        assert location == os.path.join(app.config['UPLOAD_FOLDER'], *KEY.split('/'))
+        assert size == 7
+        assert file_storage.serve_upload(KEY) is None
+
+        response = client.get(f'/uploads/{KEY}')
+        assert response.status_code == 200
+        assert response.data == b'gutters'
+
+        with local_copy(location) as path:
+            assert path == location
+
+        file_storage.delete(location)
+        assert not os.path.exists(location)
+        assert client.get(f'/uploads/{KEY}').status_code == 404
+
+    @pytest.mark.parametrize('filename', ['../secret.txt', 'documents/../../secret.txt', '%2E%2E/secret.txt'])
+    def test_paths_outside_the_upload_folder(self, app, client, filename):
+        # A file next to the upload folder must not be served or even found
+        with open(os.path.join(os.path.dirname(app.config['UPLOAD_FOLDER']), 'secret.txt'), 'w') as f:
+            f.write('secret')
+
+        assert client.get(f'/uploads/{filename}').status_code == 404
+        assert file_storage.local.path('../secret.txt') is None
+        with pytest.raises(ValueError):
+            file_storage.save(io.BytesIO(b'secret'), '../secret.txt')
+
+    def test_document_upload_and_download(self, client, auth_headers):
+        document = _upload(client, auth_headers, b'furnace filter')
+        assert not is_s3(document.file_path)
+        assert document.file_size == 14
+
+        response = client.get(f'/api/documents/{document.id}/download', headers=auth_headers)
+        assert response.status_code == 200
+        assert response.data == b'furnace filter'
+
+
+class TestS3Storage:
+    """Against moto's in-process S3"""
+
+    @pytest.fixture
+    def config(self):
+        return {
+            'STORAGE_BACKEND': 's3',
+            'S3_BUCKET': BUCKET,
+            'AWS_REGION': 'us-east-1',
+            'AWS_ACCESS_KEY_ID': 'testing',
+            'AWS_SECRET_ACCESS_KEY': 'testing',
+            # S3's smallest part size, so a small file is enough for a multipart upload
+            'STORAGE_S3_MULTIPART_THRESHOLD_MB': 5,
+            'STORAGE_S3_MULTIPART_CHUNK_MB': 5,
+        }
+
+    @pytest.fixture
+    def s3(self, app):
+        moto = pytest.importorskip('moto')
+        with moto.mock_s3():
+            client = file_storage.s3.client
+            client.create_bucket(Bucket=BUCKET)
+            yield client
+
+    def test_save_streams_multipart_upload(self, s3):
+        content = os.urandom(11 * 1024 * 1024)
+        location, size = file_storage.save(io.BytesIO(content), KEY, 'text/plain')
+
+        assert location == f's3://{BUCKET}/{KEY}'
+        assert size == len(content)
+        head = s3.head_object(Bucket=BUCKET, Key=KEY)
+        assert head['ContentLength'] == len(content)
+        assert head['ContentType'] == 'text/plain'
+        # Three parts of at most 5 MB
+        assert head['ETag'].strip('"').endswith('-3')
+
+    def test_serve_upload_redirects_to_presigned_url(self, s3, client):
+        file_storage.save(io.BytesIO(b'gutters'), KEY)
+
+        response = client.get(f'/uploads/{KEY}')
+
+        assert response.status_code == 302
+        location = response.headers['Location']
+        assert f'/{BUCKET}/{KEY}' in location or location.startswith(f'https://{BUCKET}.')
+        assert 'X-Amz-Signature=' in location
+        assert 'X-Amz-Expires=900' in location
+        assert response.headers['Cache-Control'] == 'private, max-age=450'
+
+    def test_document_download_redirects_as_attachment(self, s3, client, auth_headers):
+        document = _upload(client, auth_headers, b'furnace filter')
+        assert parse_s3(document.file_path)[0] == BUCKET
+
+        response = client.get(f'/api/documents/{document.id}/download', headers=auth_headers)
+
+        assert response.status_code == 302
+        assert 'response-content-disposition=attachment' in response.headers['Location']
+
+    def test_delete(self, s3, client, auth_headers):
+        document = _upload(client, auth_headers, b'furnace filter')
+        bucket, object_key = parse_s3(document.file_path)
+
+        response = client.delete(f'/api/documents/{document.id}', headers=auth_headers)
+
+        assert response.status_code == 200
+        assert s3.list_objects_v2(Bucket=bucket).get('KeyCount') == 0
+
+    def test_local_copy_with_worker_options(self, s3):
+        location, _ = file_storage.save(io.BytesIO(b'sump pump'), KEY)
+
+        with local_copy(location, file_storage.worker_options()) as path:
+            assert path.endswith('.txt')
+            with open(path, 'rb') as f:
+                assert f.read() == b'sump pump'
+
+        assert not os.path.exists(path)
@@ -0,0 +1,23 @@
+from sqlalchemy import func, select
+
+from app import db
+from app.models.document import Document
+from app.models.document_content import DocumentContent
+from app.services import content_service
+from generate_data import generate
+
+SMALL = {'years': 1, 'documents': 6, 'photos': 2, 'appliances': 2, 'projects': 1, 'maintenance': 3, 'checklist': 4}
+
+
+def test_generated_documents_need_no_extraction(app):
+    counts = generate(app.config['SQLALCHEMY_DATABASE_URI'], 2, SMALL, seed=1, prefix='gen')
+
+    assert counts['users'] == 2
+    assert counts['documents'] == counts['document_contents'] == 16
+    statuses = dict(db.session.execute(
+        select(DocumentContent.status, func.count()).group_by(DocumentContent.status)
+    ).all())
+    assert statuses == {DocumentContent.STATUS_EXTRACTED: 12, DocumentContent.STATUS_UNSUPPORTED: 4}
+    assert db.session.scalar(select(func.count()).select_from(Document)) == 16
+    assert content_service.documents_needing_extraction().count() == 0
+    assert not content_service.extract_pending()
@@ -0,0 +1,154 @@
+import asyncio
+
+import pytest
+
+
+def get_async(app, path, headers):
+    """GET ``path`` from the ASGI app's async endpoints; returns (status, JSON body)"""
+    pytest.importorskip('quart')
+    from app.asgi import create_asgi_app
+
+    async_app = create_asgi_app(app).async_app
+
+    async def get():
+        async with async_app.test_app() as test_app:
+            response = await test_app.test_client().get(path, headers=headers)
+            return response.status_code, await response.get_json()
+
+    return asyncio.run(get())
+
+
+def test_properties_match_across_apps(app, client, api_key, property_id):
+    headers = {'X-API-Key': api_key}
+
+    response = client.get('/api/integrations/ha/properties', headers=headers)
+    assert response.status_code == 200
+    assert response.get_json() == {'properties': [{
+        'id': property_id, 'address': '1 Main St', 'city': 'Springfield', 'state': 'IL', 'zip_code': '62701',
+    }]}
+
+    assert get_async(app, '/api/integrations/ha/properties', headers) == (200, response.get_json())
+
+
+def test_maintenance_matches_across_apps(app, client, auth_headers, api_key, property_id):
+    response = client.post('/api/maintenance/', headers=auth_headers, json={
+        'title': 'Clean gutters', 'property_id': property_id, 'due_date': '2026-05-01',
+    })
+    assert response.status_code == 201
+    headers = {'X-API-Key': api_key}
+
+    response = client.get('/api/integrations/ha/maintenance', headers=headers)
+    assert response.status_code == 200
+    assert [task['title'] for task in response.get_json()['tasks']] == ['Clean gutters']
+
+    assert get_async(app, '/api/integrations/ha/maintenance', headers) == (200, response.get_json())
+
+
+@pytest.fixture
+def other_users_records(app):
+    """A property and a task belonging to someone else"""
+    from app import db
+    from app.models.maintenance import Maintenance
+    from app.models.property import Property
+    from app.models.user import User
+
+    other = User(email='other@example.com', first_name='Other')
+    other.password = 'password'
+    db.session.add(other)
+    db.session.flush()
+    prop = Property(user_id=other.id, address='2 Elm St', city='Shelbyville', state='IL', zip='62565',
+                    property_type='house')
+    db.session.add(prop)
+    db.session.flush()
+    task = Maintenance(user_id=other.id, property_id=prop.id, title='Not yours')
+    db.session.add(task)
+    db.session.commit()
+    return prop.id, task.id
+
+
+def batch(client, api_key, operations):
+    return client.post('/api/integrations/ha/maintenance/batch', headers={'X-API-Key': api_key},
+                       json={'operations': operations})
+
+
+def test_batch_applies_valid_operations_and_reports_the_rest(app, client, user, api_key, property_id,
+                                                             other_users_records):
+    from sqlalchemy import event
+    from app import db
+    from app.models.maintenance import Maintenance
+    from app.models.outbox import OutboxEvent
+    from app.models.tombstone import Tombstone
+
+    other_property_id, other_task_id = other_users_records
+    kept = Maintenance(user_id=user.id, property_id=property_id, title='Replace filter')
+    gone = Maintenance(user_id=user.id, property_id=property_id, title='Old task')
+    db.session.add_all([kept, gone])
+    db.session.commit()
+    kept_id, gone_id = kept.id, gone.id
+
+    task_flushes = []
+
+    def listener(session, context):
+        changed = [*session.new, *session.dirty, *session.deleted]
+        if any(isinstance(obj, Maintenance) for obj in changed):
+            task_flushes.append(len(changed))
+
+    event.listen(db.session, 'after_flush', listener)
+    try:
+        response = batch(client, api_key, [
+            {'op': 'create', 'title': 'Check sump pump', 'property_id': property_id, 'due_date': '2026-05-01'},
+            {'op': 'create', 'title': 'Bad date', 'due_date': 'soon'},
+            {'op': 'create', 'property_id': property_id},
+            {'op': 'create', 'title': 'Sneaky', 'property_id': other_property_id},
+            {'op': 'update', 'id': kept_id, 'status': 'completed'},
+            {'op': 'update', 'id': other_task_id, 'status': 'completed'},
+            {'op': 'delete', 'id': gone_id},
+            {'op': 'delete', 'id': other_task_id},
+            {'op': 'archive', 'id': kept_id},
+            'create',
+        ])
+    finally:
+        event.remove(db.session, 'after_flush', listener)
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert (body['succeeded'], body['failed']) == (3, 7)
+    results = body['results']
+    assert [result.get('error') for result in results] == [
+        None,
+        'Invalid due_date format. Use ISO format (YYYY-MM-DD)',
+        'Title is required',
+        'Property not found or access denied',
+        None,
+        'Task not found',
+        None,
+        'Task not found',
+        'op must be one of: create, update, delete',
+        'Operation must be an object',
+    ]
+    created = results[0]['task']
+    assert (created['title'], created['due_date']) == ('Check sump pump', '2026-05-01')
+    assert results[4]['task']['status'] == 'completed'
+    assert results[6]['id'] == gone_id
+
+    # The create, update and delete all went out in one flush
+    assert task_flushes == [3]
+
+    assert db.session.get(Maintenance, gone_id) is None
+    assert db.session.get(Maintenance, other_task_id).status == 'pending'
+    events = {(event.topic, event.entity_id) for event in OutboxEvent.query.filter(OutboxEvent.user_id == user.id)}
+    assert {('maintenance.created', created['id']), ('maintenance.updated', kept_id),
+            ('maintenance.deleted', gone_id)} <= events
+    assert [(t.entity_type, t.entity_id) for t in Tombstone.query] == [('maintenance', gone_id)]
+
+
+def test_batch_size_is_capped(app, client, api_key):
+    app.config['HA_BATCH_MAX_OPERATIONS'] = 2
+    operations = [{'op': 'create', 'title': f'Task {n}'} for n in range(3)]
+
+    response = batch(client, api_key, operations)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'At most 2 operations per batch'
+    assert batch(client, api_key, operations[:2]).status_code == 200
+
+    assert batch(client, api_key, []).status_code == 400
@@ -0,0 +1,105 @@
+import importlib.util
+import os
+from datetime import date
+from decimal import Decimal
+
+import pytest
+import sqlalchemy as sa
+
+from app.utils.money import cents_to_dollars, to_cents
+
+
+@pytest.mark.parametrize('value, cents', [
+    (19.99, 1999),
+    ('19.99', 1999),
+    (0.29, 29),
+    (1.005, 101),  # half-up on the decimal the user typed, not the float below it
+    ('2.675', 268),
+    ('0.004', 0),
+    (-1.005, -101),
+    (Decimal('12.345'), 1235),
+    (100, 10000),
+    ('1e3', 100000),
+])
+def test_to_cents(value, cents):
+    assert to_cents(value) == cents
+
+
+@pytest.mark.parametrize('value', [True, False, 'NaN', float('nan'), float('inf'), '-inf', 'abc', [], {}])
+def test_to_cents_rejects_non_numbers(value):
+    with pytest.raises(ValueError):
+        to_cents(value)
+
+
+def test_to_cents_of_nothing():
+    assert to_cents(None) is None
+    assert to_cents('') is None
+    assert cents_to_dollars(None) is None
+    assert cents_to_dollars(1999) == 19.99
+
+
+def test_report_sums_are_exact(client, user, auth_headers, property_id):
+    from app import db
+    from app.models.finance import Expense
+
+    response = client.post('/api/finances/expenses', headers=auth_headers, json={
+        'title': 'Paint', 'amount': 19.99, 'category': 'Repairs', 'date': '2026-03-01', 'property_id': property_id,
+    })
+    assert response.status_code == 201
+    assert db.session.get(Expense, response.get_json()['id']).amount == 1999
+
+    # A thousand ten-cent expenses, which sum to 99.9999999999986 as floats
+    db.session.add_all(
+        Expense(user_id=user.id, property_id=property_id, title='Stamp', amount=to_cents(0.1), category='Office',
+                date=date(2026, 3, 2))
+        for _ in range(1000)
+    )
+    db.session.commit()
+
+    monthly = client.get('/api/finances/reports/monthly-summary', headers=auth_headers,
+                         query_string={'property_id': property_id, 'year': 2026, 'month': 3}).get_json()
+    assert monthly['categories']['Office']['expenses'] == 100.0
+    assert monthly['totals']['expenses'] == 119.99
+
+    yearly = client.get('/api/finances/reports/yearly-summary', headers=auth_headers,
+                        query_string={'property_id': property_id, 'year': 2026}).get_json()
+    assert yearly['yearly_totals']['expenses'] == 119.99
+    assert yearly['category_totals'] == {'Office': 100.0, 'Repairs': 19.99}
+
+
+def run_migration(connection, name, direction='upgrade'):
+    from alembic.migration import MigrationContext
+    from alembic.operations import Operations
+
+    path = os.path.join(os.path.dirname(__file__), '..', 'migrations', 'versions', name)
+    spec = importlib.util.spec_from_file_location(name, path)
+    revision = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(revision)
+    with Operations.context(MigrationContext.configure(connection)):
+        getattr(revision, direction)()
+
+
+def test_migration_converts_float_dollars_to_cents(tmp_path):
+    engine = sa.create_engine('sqlite:///' + str(tmp_path / 'old.db'))
+    with engine.begin() as connection:
+        connection.execute(sa.text('CREATE TABLE projects (id INTEGER PRIMARY KEY, budget FLOAT, spent FLOAT)'))
+        connection.execute(sa.text(
+            'CREATE TABLE properties (id INTEGER PRIMARY KEY, purchase_price FLOAT, current_value FLOAT)'
+        ))
+        connection.execute(sa.text('INSERT INTO projects VALUES (1, 19.99, 0.1 + 0.2), (2, 1234567.89, NULL)'))
+        connection.execute(sa.text('INSERT INTO properties VALUES (1, 250000.5, 0.29)'))
+
+        run_migration(connection, '8963604aa3db_store_money_columns_as_cents.py')
+
+        assert connection.execute(sa.text('SELECT id, budget, spent FROM projects ORDER BY id')).all() == [
+            (1, 1999, 30), (2, 123456789, None),
+        ]
+        assert connection.execute(sa.text('SELECT purchase_price, current_value FROM properties')).one() == (
+            25000050, 29,
+        )
+        types = {column['name']: column['type'] for column in sa.inspect(connection).get_columns('projects')}
+        assert isinstance(types['budget'], sa.BigInteger)
+
+        # Running it again (as on a database made by create_all) changes nothing
+        run_migration(connection, '8963604aa3db_store_money_columns_as_cents.py')
+        assert connection.execute(sa.text('SELECT budget FROM projects WHERE id = 1')).scalar() == 1999
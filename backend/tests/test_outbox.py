@@ -0,0 +1,89 @@
+import pytest
+
+from app import db
+from app.models.maintenance import Maintenance
+from app.models.outbox import WebhookEndpoint
+from app.models.user import User
+from app.services import outbox_service
+
+
+@pytest.fixture
+def config():
+    return {'OUTBOX_SETTLE_SECONDS': 0}
+
+
+@pytest.fixture
+def endpoint(user):
+    endpoint = WebhookEndpoint(user_id=user.id, name='Home Assistant', url='https://8.8.8.8/hook',
+                               secret=WebhookEndpoint.generate_secret(), topics='*')
+    db.session.add(endpoint)
+    db.session.commit()
+    return endpoint
+
+
+@pytest.fixture
+def posted(monkeypatch):
+    batches = []
+    monkeypatch.setattr(outbox_service, '_post', lambda endpoint, events: batches.append([e.topic for e in events]))
+    return batches
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    """Endpoint ids events_after was asked about"""
+    calls = []
+    events_after = outbox_service.events_after
+
+    def spy(connection, user_id, after_id, limit=100, settled=None):
+        calls.append(user_id)
+        return events_after(connection, user_id, after_id, limit, settled)
+
+    monkeypatch.setattr(outbox_service, 'events_after', spy)
+    return calls
+
+
+def add_task(user_id, title):
+    db.session.add(Maintenance(user_id=user_id, title=title))
+    db.session.commit()
+
+
+def test_events_are_delivered(user, endpoint, posted):
+    add_task(user.id, 'Clean gutters')
+    add_task(user.id, 'Service boiler')
+
+    assert outbox_service.dispatch_webhooks()['events'] == 2
+    assert posted == [['maintenance.created', 'maintenance.created']]
+    assert endpoint.last_event_id == outbox_service.latest_event_id()
+
+
+def test_idle_endpoint_moves_to_the_end_of_the_stream(user, endpoint, posted, queries):
+    other = User(email='other@example.com', first_name='Other')
+    other.password = 'password'
+    db.session.add(other)
+    db.session.commit()
+    for n in range(3):
+        add_task(other.id, f'Task {n}')
+
+    outbox_service.dispatch_webhooks()
+    assert posted == []
+    assert queries == [user.id]
+    assert db.session.get(WebhookEndpoint, endpoint.id).last_event_id == outbox_service.latest_event_id()
+
+    # Nothing new: the endpoint isn't looked at again
+    outbox_service.dispatch_webhooks()
+    assert queries == [user.id]
+
+
+def test_failed_endpoint_keeps_its_position(user, endpoint, monkeypatch):
+    def fail(endpoint, events):
+        raise OSError('connection refused')
+
+    monkeypatch.setattr(outbox_service, '_post', fail)
+    add_task(user.id, 'Clean gutters')
+
+    counts = outbox_service.dispatch_webhooks()
+    assert (counts['events'], counts['failures']) == (0, 1)
+    endpoint = db.session.get(WebhookEndpoint, endpoint.id)
+    assert endpoint.last_event_id == 0
+    assert endpoint.failures == 1
+    assert endpoint.next_attempt_at is not None
@@ -0,0 +1,149 @@
+import pytest
+
+from app.services import rate_limiter as rate_limiter_module
+from app.services.rate_limiter import (MemoryBackend, RateLimiter, forwarded_ip, parse_rate, rate_limiter,
+                                       too_many_requests)
+
+
+@pytest.fixture
+def config():
+    return {
+        'RATE_LIMIT_ENABLED': True,
+        'RATE_LIMIT_BACKEND': 'memory',
+        'RATE_LIMIT_AUTH_PER_IP': '2/minute',
+        'RATE_LIMIT_AUTH_PER_ROUTE': '300/minute',
+        'RATE_LIMIT_API_PER_IP': '3/minute',
+        'RATE_LIMIT_PER_API_KEY': '2/minute',
+        'RATE_LIMIT_TRUSTED_PROXIES': 1,
+    }
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    class Clock:
+        now = 1000.0
+
+        def monotonic(self):
+            return self.now
+
+    clock = Clock()
+    monkeypatch.setattr(rate_limiter_module, 'time', clock)
+    return clock
+
+
+def test_parse_rate():
+    assert parse_rate('10/minute') == (10, 10 / 60)
+    assert parse_rate('5/seconds') == (5, 5)
+    for rate in ('10', 'ten/minute', '10/fortnight', '0/minute', None):
+        with pytest.raises(ValueError):
+            parse_rate(rate)
+
+
+def test_tokens_refill_over_time(clock):
+    backend = MemoryBackend()
+    assert backend.take('k', 2, 1) == 0
+    assert backend.take('k', 2, 1) == 0
+    assert backend.take('k', 2, 1) == pytest.approx(1)
+
+    clock.now += 0.25
+    assert backend.take('k', 2, 1) == pytest.approx(0.75)
+    clock.now += 0.75
+    assert backend.take('k', 2, 1) == 0
+
+    # Never refills past capacity
+    clock.now += 3600
+    assert [backend.take('k', 2, 1) for _ in range(3)][-1] == pytest.approx(1)
+
+
+def test_retry_after_rounds_up(app):
+    assert too_many_requests(0.2).headers['Retry-After'] == '1'
+    assert too_many_requests(1.01).headers['Retry-After'] == '2'
+    assert too_many_requests(30).headers['Retry-After'] == '30'
+    assert too_many_requests(0.2).status_code == 429
+
+
+def test_refused_request_spends_no_later_buckets(clock):
+    limiter = RateLimiter()
+    limiter.backend = MemoryBackend()
+    buckets = [('client', '1/minute'), ('shared', '2/minute')]
+
+    assert limiter.check(buckets) == 0
+    assert limiter.check(buckets) == pytest.approx(60)
+    assert limiter.check(buckets) == pytest.approx(60)
+    # The refusals above left the shared bucket its second token
+    assert limiter.check([('shared', '2/minute')]) == 0
+    assert limiter.check([('shared', '2/minute')]) == pytest.approx(30)
+
+
+def test_least_recently_used_bucket_is_evicted(clock):
+    backend = MemoryBackend(max_buckets=2)
+    assert backend.take('a', 1, 1) == 0
+    assert backend.take('b', 1, 1) == 0
+    assert backend.take('a', 1, 1) > 0  # a is now the most recent
+
+    assert backend.take('c', 1, 1) == 0  # evicts b
+    assert backend.take('a', 1, 1) > 0
+    assert backend.take('b', 1, 1) == 0  # back, full
+
+
+def test_backend_errors_let_requests_through():
+    class Broken:
+        def take(self, key, capacity, refill):
+            raise ConnectionError('redis is down')
+
+    limiter = RateLimiter()
+    limiter.backend = Broken()
+    assert limiter.check([('client', '1/minute')]) == 0
+
+
+@pytest.mark.parametrize('forwarded_for, proxies, expected', [
+    (None, 0, '10.0.0.1'),
+    ('6.6.6.6', 0, '10.0.0.1'),  # header ignored without a trusted proxy
+    ('203.0.113.7', 1, '203.0.113.7'),
+    ('6.6.6.6, 203.0.113.7', 1, '203.0.113.7'),  # the client's own entry is ignored
+    ('6.6.6.6, 203.0.113.7, 172.18.0.3', 2, '203.0.113.7'),
+    ('203.0.113.7', 2, '10.0.0.1'),  # fewer entries than proxies
+])
+def test_forwarded_ip_counts_trusted_proxies_from_the_right(forwarded_for, proxies, expected):
+    assert forwarded_ip('10.0.0.1', forwarded_for, proxies) == expected
+
+
+def test_forwarded_ip_without_an_address():
+    assert forwarded_ip(None, None, 0) == 'unknown'
+
+
+def login(client, ip):
+    return client.post('/api/auth/login', json={'email': 'nobody@example.com', 'password': 'wrong'},
+                       headers={'X-Forwarded-For': ip})
+
+
+def test_auth_endpoints_are_limited_per_client(client, clock):
+    assert [login(client, '203.0.113.7').status_code for _ in range(3)] == [401, 401, 429]
+    response = login(client, '203.0.113.7')
+    assert response.headers['Retry-After'] == '30'
+
+    # Another client behind the same proxy has its own bucket
+    assert login(client, '198.51.100.2').status_code == 401
+
+    clock.now += 30
+    assert login(client, '203.0.113.7').status_code == 401
+
+
+def ha_get(client, key, ip):
+    return client.get('/api/integrations/ha/properties', headers={'X-API-Key': key, 'X-Forwarded-For': ip})
+
+
+def test_api_keys_are_limited_per_key(client, api_key, clock):
+    assert rate_limiter.enabled
+    assert [ha_get(client, api_key, '203.0.113.7').status_code for _ in range(3)] == [200, 200, 429]
+    # Same key from elsewhere: still the key's bucket
+    response = ha_get(client, api_key, '198.51.100.2')
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '30'
+
+
+def test_api_keys_are_limited_per_client(client, clock):
+    # Made-up keys are throttled before the database lookup rejects them
+    statuses = [ha_get(client, f'pp_live_guess{n}', '203.0.113.7').status_code for n in range(4)]
+    assert statuses == [401, 401, 401, 429]
+    assert ha_get(client, 'pp_live_guess9', '198.51.100.2').status_code == 401
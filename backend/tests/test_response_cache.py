@@ -0,0 +1,33 @@
+import io
+
+import pytest
+
+
+@pytest.fixture
+def config():
+    return {'CACHE_TYPE': 'memory'}
+
+
+def test_checklist_seasons_are_cached_separately(client, auth_headers, property_id):
+    for season in ('Spring', 'Summer', 'Fall', 'Spring', 'Summer'):
+        response = client.get(f'/api/maintenance/checklist/{season}?property_id={property_id}', headers=auth_headers)
+        assert response.status_code == 200
+        items = response.get_json()
+        assert items
+        assert {item['season'] for item in items} == {season}
+
+
+def test_document_categories_are_cached_separately(client, auth_headers):
+    for category in ('Manual', 'Receipt'):
+        response = client.post('/api/documents/', headers=auth_headers, content_type='multipart/form-data', data={
+            'title': f'{category} doc', 'category': category, 'file': (io.BytesIO(b'text'), f'{category}.txt'),
+        })
+        assert response.status_code == 201
+
+    for category in ('Manual', 'Receipt', 'Manual'):
+        response = client.get(f'/api/documents/category/{category}', headers=auth_headers)
+        assert response.status_code == 200
+        assert [doc['title'] for doc in response.get_json()] == [f'{category} doc']
+
+    response = client.get('/api/documents/category/Receipt', headers=auth_headers)
+    assert response.headers['X-Cache'] == 'HIT'
@@ -0,0 +1,64 @@
+import io
+
+import pytest
+
+from app.services.search_service import render_highlight
+
+TITLE = '<img src=x onerror=alert(1)> Water heater'
+DESCRIPTION = 'Flush the <script>alert(1)</script> water tank yearly'
+
+
+@pytest.fixture
+def document(client, auth_headers):
+    response = client.post('/api/documents/', headers=auth_headers, content_type='multipart/form-data', data={
+        'title': TITLE, 'description': DESCRIPTION, 'category': 'Manual', 'file': (io.BytesIO(b'text'), 'manual.txt'),
+    })
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+
+def test_render_highlight_escapes_around_matches():
+    assert render_highlight('a <b> \x02water\x03 & more') == 'a &lt;b&gt; <mark>water</mark> &amp; more'
+    assert render_highlight(None) is None
+
+
+def test_document_search_highlights_are_escaped(client, auth_headers, document):
+    response = client.get('/api/documents/search?q=water', headers=auth_headers)
+    assert response.status_code == 200
+    [result] = response.get_json()['results']
+
+    highlights = result['highlights']
+    assert highlights['title'] == '&lt;img src=x onerror=alert(1)&gt; <mark>Water</mark> heater'
+
+    response = client.get('/api/documents/search?q=tank', headers=auth_headers)
+    [result] = response.get_json()['results']
+    snippet = result['highlights']['description']
+    assert '&lt;script&gt;alert(1)&lt;/script&gt;' in snippet
+    assert '<mark>tank</mark>' in snippet
+    assert '<script>' not in snippet
+
+
+def test_unified_search_highlights_are_escaped(client, auth_headers, document):
+    response = client.get('/api/search?q=tank', headers=auth_headers)
+    assert response.status_code == 200
+    [result] = response.get_json()['results']
+
+    highlights = result['highlights']
+    assert highlights['title'] == '&lt;img src=x onerror=alert(1)&gt; Water heater'
+    assert '&lt;script&gt;alert(1)&lt;/script&gt;' in highlights['body']
+    assert '<mark>tank</mark>' in highlights['body']
+
+
+def test_postgres_search_uses_one_index_per_branch(app):
+    from sqlalchemy.dialects import postgresql
+    from app.models.document import Document
+    from app.services.search_service import _postgres_search
+
+    query, *_ = _postgres_search(Document.query.filter(Document.user_id == 1), ['boil'])
+    sql = ' '.join(str(query.statement.compile(dialect=postgresql.dialect())).split())
+
+    # Each branch is a plain @@ on one table, which its GIN index answers
+    assert 'documents.id IN (SELECT documents.id FROM documents WHERE documents.search_vector @@ to_tsquery(' in sql
+    assert ('UNION SELECT document_contents.document_id FROM document_contents '
+            'WHERE document_contents.search_vector @@ to_tsquery(') in sql
+    assert ' OR ' not in sql
@@ -0,0 +1,25 @@
+import pytest
+
+from app.models.settings import Settings
+
+
+@pytest.mark.parametrize('section', ['notifications', 'appearance'])
+@pytest.mark.parametrize('body', ['[1, 2]', '"dark"', 'null', '42', 'not json'])
+def test_non_object_body_is_rejected(client, auth_headers, section, body):
+    response = client.put(f'/api/settings/{section}', headers=auth_headers, data=body, content_type='application/json')
+    assert response.status_code == 400
+    assert 'JSON object' in response.get_json()['error']
+
+
+def test_missing_keys_keep_their_defaults(client, auth_headers):
+    response = client.put('/api/settings/notifications', headers=auth_headers, json={'project_updates': False})
+    assert response.status_code == 200
+    assert response.get_json()['notifications'] == dict(Settings.DEFAULT_NOTIFICATIONS, project_updates=False)
+
+    response = client.put('/api/settings/appearance', headers=auth_headers, json={'theme': 'light'})
+    assert response.status_code == 200
+    assert response.get_json()['appearance'] == dict(Settings.DEFAULT_APPEARANCE, theme='light')
+
+    settings = client.get('/api/settings/', headers=auth_headers).get_json()
+    assert settings['notifications']['project_updates'] is False
+    assert settings['appearance']['dashboard_layout'] == 'default'
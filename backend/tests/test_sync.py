@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.sync_service import encode_cursor
+from app.utils.write_horizon import write_horizon
+
+
+@pytest.fixture
+def config():
+    # Return changes straight away
+    return {'SYNC_SETTLE_SECONDS': 0}
+
+
+def add_task(client, auth_headers, property_id, title):
+    response = client.post('/api/maintenance/', headers=auth_headers, json={'title': title, 'property_id': property_id})
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+
+def sync(client, auth_headers, resource='maintenance', **params):
+    response = client.get(f'/api/sync/{resource}', headers=auth_headers, query_string=params)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+class FakePostgres:
+    """A connection reporting an open writer that began ``age`` seconds ago"""
+
+    class dialect:
+        name = 'postgresql'
+
+    def __init__(self, age):
+        self.age = age
+
+    def execute(self, statement):
+        return self
+
+    def scalar(self):
+        return self.age
+
+
+def test_horizon_is_the_settle_margin_on_sqlite(app):
+    from app import db
+
+    now = datetime(2026, 5, 1, 12, 0, 0)
+    assert write_horizon(db.session.connection(), 1, now) == now - timedelta(seconds=1)
+
+
+def test_horizon_waits_for_open_writers_on_postgresql():
+    now = datetime(2026, 5, 1, 12, 0, 0)
+    assert write_horizon(FakePostgres(None), 1, now) == now - timedelta(seconds=1)
+    # A batch that has been writing for two minutes holds readers back with it
+    assert write_horizon(FakePostgres(120.5), 1, now) == now - timedelta(seconds=121.5)
+
+
+def test_full_sync_then_changes_since_the_cursor(client, auth_headers, property_id):
+    first = add_task(client, auth_headers, property_id, 'Clean gutters')
+    second = add_task(client, auth_headers, property_id, 'Service boiler')
+
+    changes = sync(client, auth_headers)
+    assert [row['title'] for row in changes['changed']] == ['Clean gutters', 'Service boiler']
+    assert changes['deleted'] == []
+    assert not changes['has_more']
+
+    # Nothing new
+    unchanged = sync(client, auth_headers, cursor=changes['cursor'])
+    assert unchanged['changed'] == [] and unchanged['deleted'] == []
+
+    response = client.put(f'/api/maintenance/{second}', headers=auth_headers, json={'status': 'completed'})
+    assert response.status_code == 200
+    third = add_task(client, auth_headers, property_id, 'Test smoke alarms')
+
+    changes = sync(client, auth_headers, cursor=unchanged['cursor'])
+    assert [(row['id'], row['status']) for row in changes['changed']] == [(second, 'completed'), (third, 'pending')]
+    assert first not in {row['id'] for row in changes['changed']}
+
+
+def test_session_deletes_are_synced_as_tombstones(client, auth_headers, property_id):
+    task_id = add_task(client, auth_headers, property_id, 'Clean gutters')
+    cursor = sync(client, auth_headers)['cursor']
+
+    assert client.delete(f'/api/maintenance/{task_id}', headers=auth_headers).status_code == 200
+
+    changes = sync(client, auth_headers, cursor=cursor)
+    assert changes['changed'] == []
+    assert changes['deleted'] == [task_id]
+    # A full sync doesn't replay deletes from before it
+    assert sync(client, auth_headers)['deleted'] == []
+
+
+def test_pages_until_has_more_is_false(client, auth_headers, property_id):
+    titles = [f'Task {n}' for n in range(5)]
+    for title in titles:
+        add_task(client, auth_headers, property_id, title)
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        changes = sync(client, auth_headers, limit=2, **({'cursor': cursor} if cursor else {}))
+        seen += [row['title'] for row in changes['changed']]
+        cursor, pages = changes['cursor'], pages + 1
+        if not changes['has_more']:
+            break
+
+    assert seen == titles
+    assert pages == 3
+
+
+def test_expired_cursor_is_refused(client, auth_headers):
+    long_ago = datetime.utcnow() - timedelta(days=31)
+    cursor = encode_cursor({'r': 'maintenance', 't': None, 'i': 0, 'd': 0, 'at': long_ago.isoformat()})
+
+    response = client.get('/api/sync/maintenance', headers=auth_headers, query_string={'cursor': cursor})
+    assert response.status_code == 410
+
+
+def test_cursor_for_another_resource_is_refused(client, auth_headers):
+    cursor = sync(client, auth_headers, 'projects')['cursor']
+
+    response = client.get('/api/sync/maintenance', headers=auth_headers, query_string={'cursor': cursor})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Cursor belongs to another resource'
+
+    response = client.get('/api/sync/maintenance', headers=auth_headers, query_string={'cursor': 'not-a-cursor'})
+    assert response.status_code == 400
@@ -0,0 +1,61 @@
+import pytest
+
+from app.utils.validators import InvalidWebhookURL, validate_webhook_url
+
+
+@pytest.mark.parametrize('url', [
+    'http://127.0.0.1:6379/',
+    'http://localhost/hook',
+    'http://10.0.0.5/hook',
+    'http://192.168.1.20:8123/api/webhook/x',
+    'http://169.254.169.254/latest/meta-data/',
+    'http://[::1]/hook',
+    'http://[::ffff:127.0.0.1]/hook',
+    'http://0.0.0.0/hook',
+])
+def test_private_addresses_are_rejected(url):
+    with pytest.raises(InvalidWebhookURL, match='private'):
+        validate_webhook_url(url)
+
+
+@pytest.mark.parametrize('url', ['ftp://example.com/hook', 'file:///etc/passwd', 'gopher://8.8.8.8/', 'http://', '', None])
+def test_only_http_urls_are_accepted(url):
+    with pytest.raises(InvalidWebhookURL):
+        validate_webhook_url(url)
+
+
+def test_public_address_is_accepted():
+    assert validate_webhook_url('https://8.8.8.8/hook') == 'https://8.8.8.8/hook'
+
+
+def test_private_hosts_can_be_allowed():
+    assert validate_webhook_url('http://192.168.1.20:8123/hook', allow_private=True)
+
+
+def test_settings_reject_private_webhook_url(client, auth_headers):
+    response = client.put('/api/settings/notifications', headers=auth_headers,
+                          json={'email_notifications': True, 'webhook_url': 'http://169.254.169.254/latest/'})
+    assert response.status_code == 400
+    assert 'private' in response.get_json()['error']
+
+
+def test_notification_delivery_rechecks_url(app):
+    from app.services.notification_service import DeliveryError, _post_webhook
+
+    with pytest.raises(DeliveryError, match='private'):
+        _post_webhook('http://127.0.0.1:6379/', '{}')
+
+
+def test_webhook_endpoint_rejects_private_url(client, auth_headers):
+    response = client.post('/api/integrations/webhooks', headers=auth_headers,
+                           json={'name': 'Internal', 'url': 'http://10.0.0.5:6379/'})
+    assert response.status_code == 400
+    assert 'private' in response.get_json()['error']
+
+
+def test_outbox_delivery_rechecks_url(app):
+    from types import SimpleNamespace
+    from app.services.outbox_service import _post
+
+    with pytest.raises(InvalidWebhookURL):
+        _post(SimpleNamespace(id=1, url='http://127.0.0.1:6379/', secret='s'), [])
@@ -21,6 +21,7 @@ const PropertyPalDashboard = () => {
   const [appliances, setAppliances] = useState([]);
   const [documents, setDocuments] = useState([]);
   const [projects, setProjects] = useState([]);
+  const [dashboardCounts, setDashboardCounts] = useState({ maintenanceDue: 0, appliances: 0 });
   const [loadingDashboardData, setLoadingDashboardData] = useState(true);
   
   // Budget and expense data
@@ -85,100 +86,43 @@ const PropertyPalDashboard = () => {
     }
   }, []);
 
-  // Fetch dashboard data from all services
+  // Fetch all dashboard counters and lists in one request
   const fetchDashboardData = useCallback(async (propertyId) => {
     setLoadingDashboardData(true);
-    console.log(`Fetching dashboard data for property ID: ${propertyId}`);
 
     try {
-      // Fetch maintenance items (limited to pending items)
-      try {
-        console.log('Fetching maintenance items...');
-        const maintenanceItems = await apiHelpers.get('maintenance/', {
-          status: 'pending',
-          property_id: propertyId
-        });
-
-        console.log('Maintenance response:', maintenanceItems);
-
-        if (maintenanceItems && Array.isArray(maintenanceItems)) {
-          setMaintenanceItems(maintenanceItems);
-        } else {
-          // API returned unexpected format
-          console.error('Unexpected maintenance data format:', maintenanceItems);
-          setMaintenanceItems([]);
-        }
-      } catch (err) {
-        console.error('Error fetching maintenance items:', err);
-        setMaintenanceItems([]);
-      }
-
-      // Fetch appliances
-      try {
-        console.log('Fetching appliances...');
-        const appliances = await apiHelpers.get('appliances/', { property_id: propertyId });
-        console.log('Appliances response:', appliances);
-
-        if (appliances && Array.isArray(appliances)) {
-          setAppliances(appliances);
-        } else {
-          console.error('Unexpected appliances data format:', appliances);
-          setAppliances([]);
-        }
-      } catch (err) {
-        console.error('Error fetching appliances:', err);
-        setAppliances([]);
-      }
-
-      // Fetch documents
-      try {
-        console.log('Fetching documents...');
-        const documents = await apiHelpers.get('documents/', { property_id: propertyId });
-        console.log('Documents response:', documents);
-
-        if (documents && Array.isArray(documents)) {
-          setDocuments(documents);
-        } else {
-          console.error('Unexpected documents data format:', documents);
-          setDocuments([]);
-        }
-      } catch (err) {
-        console.error('Error fetching documents:', err);
-        setDocuments([]);
-      }
+      const dashboard = await apiHelpers.get('dashboard/', { property_id: propertyId });
 
-      // Fetch projects
-      try {
-        console.log('Fetching projects...');
-        const projects = await apiHelpers.get('projects/', { property_id: propertyId });
-        console.log('Projects response:', projects);
-
-        if (projects && Array.isArray(projects)) {
-          setProjects(projects);
-        } else {
-          console.error('Unexpected projects data format:', projects);
-          setProjects([]);
-        }
-      } catch (err) {
-        console.error('Error fetching projects:', err);
-        setProjects([]);
-      }
-
-      // Fetch monthly expenses
-      fetchMonthlyExpenses(propertyId);
+      setMaintenanceItems(dashboard.maintenance.upcoming || []);
+      setAppliances(dashboard.appliances.recent || []);
+      setDocuments(dashboard.documents.recent || []);
+      setProjects(dashboard.projects.active || []);
+      setDashboardCounts({
+        maintenanceDue: dashboard.maintenance.counts.pending || 0,
+        appliances: dashboard.appliances.count || 0
+      });
 
-      setLoadingDashboardData(false);
+      // Month-to-date spending against this month's budget
+      const { expenses, budget, variance } = dashboard.finances;
+      setMonthlyExpenseTotal(expenses);
+      setBudgetStatus({
+        underBudget: budget > 0 && variance >= 0,
+        percentage: budget > 0 ? Math.abs(Math.round((variance / budget) * 100)) : 0
+      });
     } catch (err) {
-      console.error('Error in fetchDashboardData:', err);
+      console.error('Error fetching dashboard data:', err);
       setMaintenanceItems([]);
       setAppliances([]);
       setDocuments([]);
       setProjects([]);
+      setDashboardCounts({ maintenanceDue: 0, appliances: 0 });
       setMonthlyExpenseTotal(0);
       setBudgetStatus({
         underBudget: false,
         percentage: 0
       });
+    } finally {
+      setLoadingDashboardData(false);
     }
   }, []);
 
@@ -273,31 +217,6 @@ const PropertyPalDashboard = () => {
     };
   }, [navigate, location.state, fetchProperties]);
 
-  const fetchAppliancesData = async (propertyId) => {
-    console.log(`Fetching appliances for property ID: ${propertyId}`);
-    
-    try {
-      const appliances = await apiHelpers.get(`appliances/`, { property_id: propertyId });
-      if (appliances) {
-        // Set appliances state with the data
-        setAppliances(appliances);
-      } else {
-        console.error('No appliance data returned from API');
-        setAppliances([]);
-      }
-    } catch (error) {
-      console.error('Error fetching appliances:', error);
-      setAppliances([]);
-    }
-  };
-
-  // Call this function when property changes
-  useEffect(() => {
-    if (currentProperty && currentProperty.id) {
-      fetchAppliancesData(currentProperty.id);
-    }
-  }, [currentProperty]);
-
   // Handle property selection from dropdown
   const handleSelectProperty = (property) => {
     setCurrentProperty(property);
@@ -310,63 +229,6 @@ const PropertyPalDashboard = () => {
     fetchDashboardData(property.id);
   };
 
-  // Fetch monthly expenses
-  const fetchMonthlyExpenses = async (propertyId) => {
-    try {
-      // Get current month range
-      const now = new Date();
-      const startDate = new Date(now.getFullYear(), now.getMonth(), 1);
-      const endDate = new Date(now.getFullYear(), now.getMonth() + 1, 0);
-      
-      const startDateStr = startDate.toISOString().split('T')[0];
-      const endDateStr = endDate.toISOString().split('T')[0];
-      
-      // Fetch expenses
-      const expenses = await apiHelpers.get('finances/expenses/', {
-        property_id: propertyId,
-        start_date: startDateStr,
-        end_date: endDateStr
-      });
-      
-      // Calculate total expenses for the month
-      const total = (expenses || []).reduce((sum, expense) => sum + expense.amount, 0);
-      setMonthlyExpenseTotal(total);
-      
-      // Fetch budget for comparison
-      const budgets = await apiHelpers.get('finances/budgets/', {
-        property_id: propertyId,
-        year: now.getFullYear(),
-        month: now.getMonth() + 1
-      });
-      
-      const totalBudget = (budgets || []).reduce((sum, budget) => sum + budget.amount, 0);
-      
-      // Calculate budget status
-      if (totalBudget > 0) {
-        const difference = totalBudget - total;
-        const percentage = Math.round((difference / totalBudget) * 100);
-        
-        setBudgetStatus({
-          underBudget: difference >= 0,
-          percentage: Math.abs(percentage)
-        });
-      } else {
-        setBudgetStatus({
-          underBudget: false,
-          percentage: 0
-        });
-      }
-    } catch (err) {
-      console.error('Error fetching monthly expenses:', err);
-      setMonthlyExpenseTotal(0);
-      setBudgetStatus({
-        underBudget: false,
-        percentage: 0
-      });
-    }
-  };
-
-
   // PHOTO HANDLING FUNCTIONS
   
   // Handle file selection
@@ -905,7 +767,7 @@ const PropertyPalDashboard = () => {
                 <div>
                   <p className="text-gray-400 text-sm">Upcoming Maintenance</p>
                   <h3 className="text-xl font-bold mt-1">
-                    {maintenanceItems.length} items due
+                    {dashboardCounts.maintenanceDue} items due
                   </h3>
                 </div>
                 <div className="p-3 rounded-full bg-orange-900 bg-opacity-30">
@@ -1144,10 +1006,10 @@ const PropertyPalDashboard = () => {
                     );
                   })}
                   
-                  {appliances.length > 2 && (
+                  {dashboardCounts.appliances > 2 && (
                     <div className="pt-3 text-center">
                       <Link to="/appliances" className="text-sky-400 hover:text-sky-300 text-sm">
-                        View all {appliances.length} appliances
+                        View all {dashboardCounts.appliances} appliances
                       </Link>
                     </div>
                   )}
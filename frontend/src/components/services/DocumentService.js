@@ -117,10 +117,12 @@ class DocumentService {
    * Search documents by keyword
    * @param {string} keyword - Search keyword
    * @param {string} propertyId - Optional property ID to filter documents
-   * @returns {Promise} Promise with documents data
+   * @param {number} page - Page number (1-based)
+   * @param {number} perPage - Results per page
+   * @returns {Promise} Promise with { results, total, page, per_page }, best matches first
    */
-  searchDocuments(keyword, propertyId = null) {
-    let url = `/documents/search?q=${encodeURIComponent(keyword)}`;
+  searchDocuments(keyword, propertyId = null, page = 1, perPage = 10) {
+    let url = `/documents/search?q=${encodeURIComponent(keyword)}&page=${page}&per_page=${perPage}`;
     if (propertyId) {
       url += `&property_id=${propertyId}`;
     }